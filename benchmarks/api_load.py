@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Load-test benchmark for the SysAgent API server.
+
+Runs a local server with a stand-in agent whose chat calls take a fixed time
+(like an LLM round-trip) and whose tool calls are quick, then drives it with
+keep-alive clients sending a mix of chat, streaming chat, tool and health
+requests. Reports latency percentiles, throughput and 503 rejections per
+request type for the threaded server and, for comparison, the old
+single-threaded one.
+
+Usage:
+    python benchmarks/api_load.py                        # both modes
+    python benchmarks/api_load.py --mode threaded --clients 64 --duration 20
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+
+class BenchAgent:
+    """Stand-in agent with fixed chat and tool latencies."""
+
+    def __init__(self, chat_delay: float, tool_delay: float):
+        self.chat_delay = chat_delay
+        self.tool_delay = tool_delay
+        self.tool_executor = SimpleNamespace(execute_tool=self._execute_tool)
+
+    def process_command(self, message):
+        time.sleep(self.chat_delay)
+        return {"success": True, "message": f"echo: {message}", "tools_used": []}
+
+    def process_command_streaming(self, message):
+        steps = 5
+        for i in range(steps):
+            time.sleep(self.chat_delay / steps)
+            yield {"type": "token", "content": f"part {i} of {message}"}
+        yield {"type": "complete", "success": True}
+
+    def _execute_tool(self, tool_name, **kwargs):
+        from sysagent.types import ToolResult
+        time.sleep(self.tool_delay)
+        return ToolResult(success=True, data={"tool": tool_name}, message="ok")
+
+
+MIX = (
+    ("health", 0.4),
+    ("tool", 0.35),
+    ("chat", 0.15),
+    ("stream", 0.10),
+)
+
+
+def pick_kind(rng):
+    roll = rng.random()
+    for kind, weight in MIX:
+        if roll < weight:
+            return kind
+        roll -= weight
+    return MIX[-1][0]
+
+
+def send(conn, kind):
+    """Send one request and read the full response; returns the status."""
+    if kind == "health":
+        conn.request("GET", "/api/health")
+    elif kind == "tool":
+        body = json.dumps({"action": "info"})
+        conn.request("POST", "/api/tool/system_info_tool", body, {"Content-Type": "application/json"})
+    elif kind == "chat":
+        body = json.dumps({"message": "hello"})
+        conn.request("POST", "/api/chat", body, {"Content-Type": "application/json"})
+    else:
+        body = json.dumps({"message": "hello", "stream": True})
+        conn.request("POST", "/api/chat", body, {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def client_loop(port, deadline, seed, results, lock):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("localhost", port, timeout=60)
+    local = []
+    while time.perf_counter() < deadline:
+        kind = pick_kind(rng)
+        start = time.perf_counter()
+        try:
+            status = send(conn, kind)
+        except (OSError, http.client.HTTPException):
+            status = "error"
+            conn.close()
+            conn = http.client.HTTPConnection("localhost", port, timeout=60)
+        local.append((kind, status, time.perf_counter() - start))
+        if status == 503:
+            time.sleep(0.05)
+    conn.close()
+    with lock:
+        results.extend(local)
+
+
+def run(mode, clients, duration, chat_delay, tool_delay):
+    from sysagent.api.server import RateLimiter, SysAgentAPIServer
+
+    # Measure serving capacity, not the rate limits
+    server = SysAgentAPIServer(
+        port=0, require_auth=False, threaded=(mode == "threaded"),
+        agent=BenchAgent(chat_delay, tool_delay),
+        rate_limiter=RateLimiter(10 ** 9, endpoint_limits={}, global_limits={})
+    )
+    server.start()
+
+    results = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client_loop, args=(server.port, deadline, i, results, lock))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    print(f"\n{mode} server: {clients} clients, {elapsed:.1f}s, "
+          f"{len(results) / elapsed:.1f} req/s")
+    print(f"{'type':<8} {'count':>7} {'ok':>7} {'503':>6} {'err':>5} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for kind, _ in MIX:
+        rows = [r for r in results if r[0] == kind]
+        ok = [r[2] * 1000 for r in rows if r[1] == 200]
+        busy = sum(1 for r in rows if r[1] == 503)
+        errors = sum(1 for r in rows if r[1] not in (200, 503))
+        if ok:
+            ok.sort()
+            p50 = statistics.median(ok)
+            p95 = ok[min(len(ok) - 1, int(len(ok) * 0.95))]
+            worst = ok[-1]
+        else:
+            p50 = p95 = worst = float("nan")
+        print(f"{kind:<8} {len(rows):>7} {len(ok):>7} {busy:>6} {errors:>5} "
+              f"{p50:>9.1f} {p95:>9.1f} {worst:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["threaded", "single", "both"], default="both")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--chat-delay", type=float, default=1.0, help="seconds per chat call")
+    parser.add_argument("--tool-delay", type=float, default=0.01, help="seconds per tool call")
+    args = parser.parse_args()
+
+    modes = ["threaded", "single"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        run(mode, args.clients, args.duration, args.chat_delay, args.tool_delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DeepAgent.execute_plan.
+
+Runs plans against a stand-in base agent whose commands take a fixed time,
+once with max_parallel=1 (the old serial behaviour) and once with the
+dependency-aware scheduler, and reports wall-clock time for each.
+
+Usage:
+    python benchmarks/deep_agent_plan.py
+    python benchmarks/deep_agent_plan.py --delay 0.5 --parallel 8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+
+class SleepAgent:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def process_command(self, command):
+        time.sleep(self.delay)
+        return {"success": True, "message": command}
+
+
+def plans():
+    from sysagent.core.deep_agent import SubTask, TaskPlan
+
+    def fan_out(width):
+        steps = [SubTask(id=f"step_{i + 1}", description=f"check {i + 1}") for i in range(width)]
+        steps.append(SubTask(id=f"step_{width + 1}", description="summarize",
+                             depends_on=[s.id for s in steps]))
+        return steps
+
+    def diamond():
+        return [
+            SubTask(id="step_1", description="collect"),
+            SubTask(id="step_2", description="analyze cpu", depends_on=["step_1"]),
+            SubTask(id="step_3", description="analyze memory", depends_on=["step_1"]),
+            SubTask(id="step_4", description="analyze disk", depends_on=["step_1"]),
+            SubTask(id="step_5", description="report", depends_on=["step_2", "step_3", "step_4"]),
+        ]
+
+    def chain(length):
+        return [SubTask(id=f"step_{i + 1}", description=f"step {i + 1}",
+                        depends_on=[f"step_{i}"] if i else []) for i in range(length)]
+
+    return {
+        "fan-out 3 + summary": lambda: TaskPlan(id="p1", goal="fan", subtasks=fan_out(3)),
+        "fan-out 8 + summary": lambda: TaskPlan(id="p2", goal="fan", subtasks=fan_out(8)),
+        "diamond 5": lambda: TaskPlan(id="p3", goal="diamond", subtasks=diamond()),
+        "chain 4": lambda: TaskPlan(id="p4", goal="chain", subtasks=chain(4)),
+    }
+
+
+def run(make_plan, delay, parallel):
+    from sysagent.core.deep_agent import DeepAgent
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        agent = DeepAgent(SleepAgent(delay), config_dir=Path(config_dir), max_parallel=parallel)
+        start = time.perf_counter()
+        for _ in agent.execute_plan(make_plan()):
+            pass
+        elapsed = time.perf_counter() - start
+        agent.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds per subtask")
+    parser.add_argument("--parallel", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'plan':<22} {'serial s':>10} {'parallel s':>11} {'speedup':>8}")
+    for name, make_plan in plans().items():
+        serial = run(make_plan, args.delay, 1)
+        parallel = run(make_plan, args.delay, args.parallel)
+        print(f"{name:<22} {serial:>10.2f} {parallel:>11.2f} {serial / parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the disk usage analyzer.
+
+Compares the old storage analysis (os.walk with a Path.stat per file, then a
+separate rglob per directory of interest) with DiskUsageAnalyzer: a cold
+scan, a repeat scan of the unchanged tree, and a repeat scan after a few
+files were added.
+
+Usage:
+    python benchmarks/disk_usage.py
+    python benchmarks/disk_usage.py --path /usr --workers 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sysagent.utils.disk_usage import DiskUsageAnalyzer
+
+
+def build_tree(root: Path, dirs: int, files_per_dir: int):
+    for i in range(dirs):
+        directory = root / f"d{i % 20}" / f"s{i}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_dir):
+            (directory / f"f{j}").write_bytes(b"x" * (j * 97 % 4096))
+
+
+def old_scan(path: str):
+    large = []
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            try:
+                size = (Path(root) / f).stat().st_size
+                if size > 100 * 1024 * 1024:
+                    large.append(size)
+            except OSError:
+                continue
+    sizes = {}
+    for child in Path(path).iterdir():
+        if child.is_dir():
+            sizes[child] = sum(f.stat().st_size for f in child.rglob('*') if f.is_file())
+    return large, sizes
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", help="existing tree to scan instead of a generated one")
+    parser.add_argument("--dirs", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=25, help="files per directory")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.path
+        if path is None:
+            path = temp_dir
+            build_tree(Path(path), args.dirs, args.files)
+
+        timed("old walk + rglob", lambda: old_scan(path))
+        for workers in sorted({1, args.workers or DiskUsageAnalyzer().workers}):
+            analyzer = DiskUsageAnalyzer(workers=workers)
+            report = timed(f"cold scan ({workers} workers)", lambda: analyzer.scan([path]))
+            timed(f"repeat scan ({workers} workers)", lambda: analyzer.scan([path]))
+            analyzer.shutdown()
+        print(f"{report.total_files} files in {report.total_dirs} directories, "
+              f"{report.total_bytes / 1024**2:.1f} MiB")
+
+        if args.path is None:
+            for i in range(0, args.dirs, max(1, args.dirs // 10)):
+                (Path(path) / f"d{i % 20}" / f"s{i}" / "new").write_bytes(b"y" * 100)
+            report = timed("scan after 10 changes", lambda: analyzer.scan([path]))
+            print(f"listed={report.dirs_listed} reused={report.dirs_reused}")
+
+
+if __name__ == "__main__":
+    main()
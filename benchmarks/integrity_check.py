@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the file integrity baseline.
+
+Builds a temporary tree and compares the old approach (read every file whole
+and hash it on each check) with IntegrityDB: the first check that records the
+baseline, a repeat check of the unchanged tree, and a check after a few files
+were modified.
+
+Usage:
+    python benchmarks/integrity_check.py
+    python benchmarks/integrity_check.py --files 20000 --size 65536
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sysagent.utils.integrity import IntegrityDB
+
+
+def build_tree(root: Path, files: int, size: int):
+    for i in range(files):
+        directory = root / f"d{i % 100}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"f{i}.bin").write_bytes(os.urandom(size))
+
+
+def read_all_and_hash(root: Path):
+    hashes = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                hashes[path] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=32 * 1024, help="bytes per file")
+    parser.add_argument("--modify", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "tree"
+        root.mkdir()
+        build_tree(root, args.files, args.size)
+        print(f"{args.files} files of {args.size} bytes")
+
+        timed("read whole + hash", lambda: read_all_and_hash(root))
+
+        db = IntegrityDB(Path(temp_dir) / "integrity.db")
+        timed("baseline", lambda: db.check(str(root)))
+        timed("unchanged check", lambda: db.check(str(root)))
+
+        files = sorted(root.rglob("*.bin"))
+        for path in random.sample(files, min(args.modify, len(files))):
+            path.write_bytes(os.urandom(args.size))
+        report = timed(f"check after {args.modify} edits", lambda: db.check(str(root)))
+        print(f"modified={len(report.modified)} hashed={report.hashed} unchanged={report.unchanged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SmartLearningSystem.record_command.
+
+Pre-loads the learning system with histories and command tables of several
+sizes, then times individual record_command calls. With write-behind
+persistence the per-call latency should stay flat as the history grows; the
+"sync" column forces a flush after every call, which is roughly what the old
+write-everything-per-command behaviour cost.
+
+Usage:
+    python benchmarks/learning_record.py
+    python benchmarks/learning_record.py --calls 2000 --sizes 0 1000 100000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+def build(data_dir, size):
+    from sysagent.core.smart_learning import CommandUsage, SmartLearningSystem
+
+    learning = SmartLearningSystem(Path(data_dir), flush_delay=1.0)
+    now = datetime.now().isoformat()
+    learning.command_history = [
+        {"command": f"command {i % 500}", "timestamp": now, "success": True,
+         "context": "", "duration_ms": 0}
+        for i in range(size)
+    ]
+    learning.command_usage = {
+        f"command {i}": CommandUsage(command=f"command {i}", count=3, last_used=now)
+        for i in range(min(size, 5000))
+    }
+    return learning
+
+
+def measure(size, calls, sync):
+    with tempfile.TemporaryDirectory() as data_dir:
+        learning = build(data_dir, size)
+        timings = []
+        for i in range(calls):
+            start = time.perf_counter()
+            learning.record_command(f"command {i % 700} --flag", context="bench")
+            if sync:
+                learning.flush()
+            timings.append((time.perf_counter() - start) * 1e6)
+        learning.close()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'history':>8} {'p50 us':>10} {'p99 us':>10} {'sync p50 us':>12} {'sync p99 us':>12}")
+    for size in args.sizes:
+        p50, p99 = measure(size, args.calls, sync=False)
+        sync_p50, sync_p99 = measure(size, min(args.calls, 200), sync=True)
+        print(f"{size:>8} {p50:>10.1f} {p99:>10.1f} {sync_p50:>12.1f} {sync_p99:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
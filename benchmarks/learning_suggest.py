@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SmartLearningSystem.get_suggestions.
+
+Fills the learning system with synthetic command tables of several sizes and
+times get_suggestions for a set of partial inputs, as typed one keystroke at a
+time in the command palette. The "scan" column re-scores every command and
+sorts the full list, which is what the old implementation did per keystroke.
+
+Usage:
+    python benchmarks/learning_suggest.py
+    python benchmarks/learning_suggest.py --sizes 1000 100000 --rounds 20
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+WORDS = "git ls docker kubectl grep find cat tail disk memory process network".split()
+QUERIES = ["", "g", "gi", "git", "git s", "dock", "mem", "status", "zzz"]
+
+
+def build(data_dir, size, seed=0):
+    from sysagent.core.smart_learning import CommandUsage, SmartLearningSystem
+
+    rng = random.Random(seed)
+    now = datetime.now()
+    learning = SmartLearningSystem(Path(data_dir), flush_delay=60)
+    usage = {}
+    for i in range(size):
+        command = " ".join(rng.choice(WORDS) for _ in range(3)) + f" {i}"
+        usage[command] = CommandUsage(
+            command=command,
+            count=rng.randint(1, 80),
+            last_used=(now - timedelta(days=rng.randint(0, 10))).isoformat(),
+            avg_time_of_day=rng.randint(0, 23),
+            success_rate=rng.choice([1.0, 1.0, 1.0, 0.9, 0.5]),
+        )
+    learning.command_usage = usage
+    return learning
+
+
+def scan(learning, partial, limit=5):
+    """The previous full-scan scoring, kept here for comparison."""
+    now = datetime.now()
+    suggestions = []
+    for usage in learning.command_usage.values():
+        score = min(usage.count / 10.0, 5.0)
+        try:
+            score += max(0, 5 - (now - datetime.fromisoformat(usage.last_used)).days)
+        except Exception:
+            pass
+        hour_diff = abs(now.hour - usage.avg_time_of_day)
+        if hour_diff > 12:
+            hour_diff = 24 - hour_diff
+        score += max(0, 3 - hour_diff / 4)
+        if partial:
+            if usage.command.lower().startswith(partial.lower()):
+                score += 10
+            elif partial.lower() in usage.command.lower():
+                score += 5
+        suggestions.append((score * usage.success_rate, usage.command))
+    suggestions.sort(reverse=True)
+    return suggestions[:limit]
+
+
+def measure(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        for partial in QUERIES:
+            start = time.perf_counter()
+            func(partial)
+            timings.append((time.perf_counter() - start) * 1e3)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'commands':>8} {'p50 ms':>10} {'p99 ms':>10} {'scan p50 ms':>12}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            learning = build(data_dir, size)
+            learning.get_suggestions()  # builds the index
+            p50, p99 = measure(lambda partial: learning.get_suggestions(partial), args.rounds)
+            scan_p50, _ = measure(lambda partial: scan(learning, partial), max(1, args.rounds // 25))
+            learning.close()
+        print(f"{size:>8} {p50:>10.3f} {p99:>10.3f} {scan_p50:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
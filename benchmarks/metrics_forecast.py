@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark for metric baselines and forecasts.
+
+Generates synthetic metric history and compares per-slot and per-parameter
+Python loops with the vectorized NumPy versions in metrics_analysis: the
+hour-of-week quantile baseline and the Holt-Winters grid search.
+
+Usage:
+    python benchmarks/metrics_forecast.py
+    python benchmarks/metrics_forecast.py --days 14 --interval 60
+"""
+
+import argparse
+import itertools
+import statistics
+import time
+
+import numpy as np
+
+from sysagent.utils.metrics_analysis import (
+    BASELINE_QUANTILES, HOURS_PER_WEEK, _ALPHAS, _BETAS, _GAMMAS,
+    compute_baseline, fit_holt_winters, hour_of_week,
+)
+
+
+def loop_baseline(ts, values):
+    slots = {}
+    for t, v in zip(ts, values):
+        local = time.localtime(t)
+        slots.setdefault(local.tm_wday * 24 + local.tm_hour, []).append(v)
+    result = {}
+    for slot in range(HOURS_PER_WEEK):
+        if slot in slots:
+            cuts = statistics.quantiles(slots[slot], n=100, method="inclusive")
+            result[slot] = [cuts[int(q * 100) - 1] for q in BASELINE_QUANTILES]
+    return result
+
+
+def loop_holt_winters(y, season):
+    best = None
+    for alpha, beta, gamma in itertools.product(_ALPHAS, _BETAS, _GAMMAS):
+        first = sum(y[:season]) / season
+        level = first
+        trend = (sum(y[season:2 * season]) / season - first) / season
+        seasonal = [v - first for v in y[:season]]
+        sse = 0.0
+        for i in range(season, len(y)):
+            s = seasonal[i % season]
+            error = y[i] - (level + trend + s)
+            sse += error * error
+            new_level = alpha * (y[i] - s) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            seasonal[i % season] = gamma * (y[i] - new_level) + (1 - gamma) * s
+            level = new_level
+        if best is None or sse < best[0]:
+            best = (sse, alpha, beta, gamma)
+    return best
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<32} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--interval", type=int, default=60, help="seconds between samples")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ts = time.time() - args.days * 86400 + np.arange(0, args.days * 86400, args.interval, dtype=np.float64)
+    daily = np.sin(2 * np.pi * hour_of_week(ts) / 24)
+    values = 30 + 15 * daily + rng.normal(0, 3, len(ts))
+    print(f"{len(ts)} samples over {args.days} days")
+
+    timed("baseline, python loop", lambda: loop_baseline(ts.tolist(), values.tolist()))
+    timed("baseline, numpy", lambda: compute_baseline("cpu_percent", ts, values))
+
+    hourly = values[: len(values) // (3600 // args.interval) * (3600 // args.interval)]
+    hourly = hourly.reshape(-1, 3600 // args.interval).mean(axis=1)
+    print(f"Holt-Winters on {len(hourly)} hourly points, "
+          f"{len(_ALPHAS) * len(_BETAS) * len(_GAMMAS)} parameter sets")
+    timed("holt-winters grid, python loop", lambda: loop_holt_winters(hourly.tolist(), 24))
+    timed("holt-winters grid, numpy", lambda: fit_holt_winters(hourly, 24))
+
+
+if __name__ == "__main__":
+    main()
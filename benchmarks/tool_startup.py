@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for SysAgent tools.
+
+Reports the import and construction cost of every built-in tool, plus the
+cost of registering the whole catalog lazily versus eagerly.
+
+Usage:
+    python benchmarks/tool_startup.py              # all tools in one process
+    python benchmarks/tool_startup.py --isolated   # each tool in a fresh process
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+
+def measure_in_process():
+    """Load every built-in tool through a lazy executor and collect timings."""
+    from sysagent.tools.base import ToolExecutor
+    from sysagent.tools.catalog import BUILTIN_TOOLS
+
+    executor = ToolExecutor()
+
+    start_time = time.perf_counter()
+    executor.register_builtin_tools()
+    register_time = time.perf_counter() - start_time
+
+    errors = {}
+    for spec in BUILTIN_TOOLS:
+        try:
+            executor.factory.get_tool(spec.name)
+        except Exception as e:
+            errors[spec.name] = str(e)
+
+    return register_time, executor.get_load_times(), errors
+
+
+def measure_isolated(tool_name):
+    """Load a single tool in a fresh interpreter so import cost is not shared."""
+    code = (
+        "import json, sys\n"
+        "from sysagent.tools.base import ToolExecutor\n"
+        "executor = ToolExecutor()\n"
+        f"executor.register_builtin_tools([{tool_name!r}])\n"
+        f"executor.factory.get_tool({tool_name!r})\n"
+        "json.dump(executor.get_load_times(), sys.stdout)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout)[tool_name]
+
+
+def print_table(load_times, errors):
+    """Print per-tool timings sorted by total cost."""
+    rows = sorted(
+        load_times.items(),
+        key=lambda item: item[1]["import"] + item[1]["construct"],
+        reverse=True,
+    )
+    print(f"{'tool':<24} {'import ms':>10} {'construct ms':>13} {'total ms':>10}")
+    total_import = total_construct = 0.0
+    for name, times in rows:
+        total_import += times["import"]
+        total_construct += times["construct"]
+        print(
+            f"{name:<24} {times['import'] * 1000:>10.2f} "
+            f"{times['construct'] * 1000:>13.2f} "
+            f"{(times['import'] + times['construct']) * 1000:>10.2f}"
+        )
+    print(
+        f"{'TOTAL':<24} {total_import * 1000:>10.2f} "
+        f"{total_construct * 1000:>13.2f} "
+        f"{(total_import + total_construct) * 1000:>10.2f}"
+    )
+    for name, error in errors.items():
+        print(f"{name:<24} FAILED: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="measure each tool in a fresh interpreter",
+    )
+    args = parser.parse_args()
+
+    if args.isolated:
+        from sysagent.tools.catalog import list_builtin_tools
+
+        load_times, errors = {}, {}
+        for name in list_builtin_tools():
+            try:
+                load_times[name] = measure_isolated(name)
+            except Exception as e:
+                errors[name] = str(e)
+        print_table(load_times, errors)
+        return
+
+    register_time, load_times, errors = measure_in_process()
+    print(f"Lazy registration of the catalog: {register_time * 1000:.3f} ms\n")
+    print_table(load_times, errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,70 +3,393 @@ REST API Server for SysAgent - HTTP API for external integration.
 Enterprise-grade API with authentication and rate limiting.
 """
 
+import atexit
 import json
+import math
 import os
 import time
 import hashlib
 import secrets
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
 from functools import wraps
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
 from urllib.parse import urlparse, parse_qs
 import threading
 
 
+# Default (max concurrent, max queued) requests per endpoint class; chat runs
+# one request at a time unless the agent declares ``thread_safe``
+DEFAULT_CONCURRENCY = {
+    "chat": (4, 16),
+    "tool": (8, 32),
+    "default": (16, 64),
+}
+
+
+# Default per-client limits (requests per minute) for expensive endpoint classes
+DEFAULT_ENDPOINT_LIMITS = {
+    "chat": 20,
+    "tool": 120,
+}
+
+# Default limits (requests per minute) shared by all clients
+DEFAULT_GLOBAL_LIMITS = {
+    "chat": 60,
+    "tool": 600,
+}
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 1024 * 1024
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check for the most restrictive matching limit."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+    
+    def headers(self) -> Dict[str, str]:
+        """Get X-RateLimit-* (and, when denied, Retry-After) headers."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
 class RateLimiter:
-    """Simple rate limiter for API requests."""
+    """GCRA (token bucket) rate limiter for API requests.
     
-    def __init__(self, requests_per_minute: int = 60):
+    Every limit keeps a single "theoretical arrival time" per bucket, so each
+    check is O(1) in time and memory. Requests are checked against the
+    client's overall limit, the client's limit for the endpoint class, and
+    the global limit for the endpoint class; a request only consumes from
+    any of them if all of them allow it. Per-client buckets are kept in LRU
+    order and the least recently used are evicted beyond ``max_clients``;
+    the global buckets are kept apart so client churn cannot reset them.
+    """
+    
+    def __init__(self, requests_per_minute: int = 60, burst: Optional[int] = None,
+                 endpoint_limits: Optional[Dict[str, int]] = None,
+                 global_limits: Optional[Dict[str, int]] = None,
+                 max_clients: int = 10000):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, List[float]] = {}
+        self.burst = burst
+        self.endpoint_limits = DEFAULT_ENDPOINT_LIMITS if endpoint_limits is None else endpoint_limits
+        self.global_limits = DEFAULT_GLOBAL_LIMITS if global_limits is None else global_limits
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[tuple, float]" = OrderedDict()
+        self._global: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def _rules(self, client_id: str, endpoint: Optional[str]):
+        """Yield (bucket key, requests per minute, burst) for a request."""
+        yield ("client", client_id), self.requests_per_minute, self.burst
+        if endpoint in self.endpoint_limits:
+            yield ("endpoint", endpoint, client_id), self.endpoint_limits[endpoint], None
+        if endpoint in self.global_limits:
+            yield ("global", endpoint), self.global_limits[endpoint], None
+    
+    def check(self, client_id: str, endpoint: Optional[str] = None) -> RateLimitResult:
+        """Check, and if allowed count, a request from a client to an endpoint class."""
+        now = time.monotonic()
+        with self._lock:
+            updates = []
+            result = None
+            denied = None
+            for key, rate, burst in self._rules(client_id, endpoint):
+                burst = burst or rate
+                interval = 60.0 / rate
+                tolerance = interval * (burst - 1)
+                buckets = self._global if key[0] == "global" else self._buckets
+                tat = max(buckets.get(key, now), now)
+                
+                if tat - now > tolerance:
+                    retry_after = tat - now - tolerance
+                    if denied is None or retry_after > denied.retry_after:
+                        denied = RateLimitResult(False, rate, 0, tat - now, retry_after)
+                    continue
+                
+                new_tat = tat + interval
+                remaining = math.floor((tolerance - (new_tat - now)) / interval) + 1
+                updates.append((key, new_tat))
+                if result is None or remaining < result.remaining:
+                    result = RateLimitResult(True, rate, max(0, remaining), new_tat - now)
+            
+            if denied is not None:
+                return denied
+            
+            for key, new_tat in updates:
+                if key[0] == "global":
+                    self._global[key] = new_tat
+                    continue
+                self._buckets[key] = new_tat
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return result
     
     def is_allowed(self, client_id: str) -> bool:
         """Check if a request is allowed."""
-        now = time.time()
-        minute_ago = now - 60
-        
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        
-        # Clean old requests
-        self.requests[client_id] = [
-            t for t in self.requests[client_id] if t > minute_ago
-        ]
-        
-        if len(self.requests[client_id]) >= self.requests_per_minute:
-            return False
-        
-        self.requests[client_id].append(now)
-        return True
+        return self.check(client_id).allowed
+
+
+class ConcurrencyLimiter:
+    """Bounds concurrent requests per endpoint class.
+    
+    Each class has a number of worker slots and a bounded queue of requests
+    waiting for a slot. Requests that find the queue full, or wait longer
+    than ``queue_timeout``, are rejected so the caller can answer 503.
+    Health and info endpoints are never limited.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None, queue_timeout: float = 30.0):
+        self.limits = dict(DEFAULT_CONCURRENCY)
+        self.limits.update(limits or {})
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._active = {name: 0 for name in self.limits}
+        self._waiting = {name: 0 for name in self.limits}
+        self.rejected = {name: 0 for name in self.limits}
+    
+    @staticmethod
+    def classify(path: str) -> Optional[str]:
+        """Get the endpoint class of a request path."""
+        if path in ("/api/health", "/api/info"):
+            return None
+        if path.startswith("/api/chat"):
+            return "chat"
+        if path.startswith("/api/tool/"):
+            return "tool"
+        return "default"
+    
+    def acquire(self, endpoint_class: str) -> bool:
+        """Take a worker slot, waiting in the queue if needed."""
+        max_active, max_waiting = self.limits[endpoint_class]
+        with self._cond:
+            if self._active[endpoint_class] >= max_active:
+                if self._waiting[endpoint_class] >= max_waiting:
+                    self.rejected[endpoint_class] += 1
+                    return False
+                self._waiting[endpoint_class] += 1
+                try:
+                    acquired = self._cond.wait_for(
+                        lambda: self._active[endpoint_class] < max_active,
+                        timeout=self.queue_timeout
+                    )
+                finally:
+                    self._waiting[endpoint_class] -= 1
+                if not acquired:
+                    self.rejected[endpoint_class] += 1
+                    return False
+            self._active[endpoint_class] += 1
+            return True
+    
+    def release(self, endpoint_class: str):
+        """Give back a worker slot."""
+        with self._cond:
+            self._active[endpoint_class] -= 1
+            self._cond.notify_all()
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get active, queued and rejected counts per endpoint class."""
+        with self._cond:
+            return {
+                name: {
+                    "active": self._active[name],
+                    "queued": self._waiting[name],
+                    "rejected": self.rejected[name],
+                    "max_active": self.limits[name][0],
+                    "max_queued": self.limits[name][1],
+                }
+                for name in self.limits
+            }
+
+
+class KeyUsageStore:
+    """Write-behind store for per-key usage counters.
+    
+    Usage is recorded in memory and written to disk by a background thread
+    every ``flush_interval`` seconds, and at shutdown. Only the deltas since
+    the last flush are merged into the file, so several processes can share
+    it without losing each other's counts.
+    """
+    
+    def __init__(self, storage_path: Path, flush_interval: float = 10.0):
+        self.storage_path = storage_path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict] = self._read()
+        self._pending: Dict[str, Dict] = {}
+        self._forgotten: set = set()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _read(self) -> Dict[str, Dict]:
+        if self.storage_path.exists():
+            try:
+                with open(self.storage_path, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+    
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sysagent-key-usage", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+    
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+    
+    def seed(self, key_hash: str, last_used: Optional[str], request_count: int):
+        """Set the totals of a key that has no recorded usage yet."""
+        with self._lock:
+            if key_hash in self._totals or key_hash in self._pending:
+                return
+            if last_used or request_count:
+                self._pending[key_hash] = {"last_used": last_used, "request_count": request_count or 0}
+    
+    def record(self, key_hash: str):
+        """Record one request made with a key."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            pending = self._pending.setdefault(key_hash, {"last_used": now, "request_count": 0})
+            pending["last_used"] = now
+            pending["request_count"] += 1
+        self._start()
+    
+    def get(self, key_hash: str) -> Dict:
+        """Get the last use and request count of a key, including unflushed usage."""
+        with self._lock:
+            total = self._totals.get(key_hash, {})
+            pending = self._pending.get(key_hash, {})
+            return {
+                "last_used": pending.get("last_used") or total.get("last_used"),
+                "request_count": total.get("request_count", 0) + pending.get("request_count", 0),
+            }
+    
+    def forget(self, key_hash: str):
+        """Drop the usage of a revoked key."""
+        with self._lock:
+            self._pending.pop(key_hash, None)
+            self._totals.pop(key_hash, None)
+            self._forgotten.add(key_hash)
+    
+    def flush(self):
+        """Merge pending usage into the usage file."""
+        with self._lock:
+            if not self._pending and not self._forgotten:
+                return
+            pending, self._pending = self._pending, {}
+            forgotten, self._forgotten = self._forgotten, set()
+            totals = self._read()
+            for key_hash in forgotten:
+                totals.pop(key_hash, None)
+            for key_hash, delta in pending.items():
+                total = totals.setdefault(key_hash, {"last_used": None, "request_count": 0})
+                total["request_count"] = total.get("request_count", 0) + delta["request_count"]
+                if delta["last_used"] and (total.get("last_used") or "") < delta["last_used"]:
+                    total["last_used"] = delta["last_used"]
+            try:
+                temp_path = self.storage_path.with_suffix(".tmp")
+                with open(temp_path, 'w') as f:
+                    json.dump(totals, f)
+                os.replace(temp_path, self.storage_path)
+                self._totals = totals
+            except Exception as e:
+                # Keep the deltas for the next flush
+                for key_hash, delta in pending.items():
+                    self._pending.setdefault(key_hash, delta)
+                print(f"Warning: Could not save API key usage: {e}")
+    
+    def close(self):
+        """Stop the flush thread and write pending usage."""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
 
 
 class APIKeyManager:
-    """Manages API keys for authentication."""
+    """Manages API keys for authentication.
+    
+    Keys are validated from memory. Usage counters (``last_used`` and
+    ``request_count``) are kept in a separate ``KeyUsageStore`` that is
+    flushed in the background, so validating a key never rewrites the key
+    file. Changes made to the key file by other processes are picked up
+    within ``reload_interval`` seconds.
+    """
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(self, storage_path: Optional[Path] = None, reload_interval: float = 1.0,
+                 usage_flush_interval: float = 10.0):
         self.storage_path = storage_path or Path.home() / ".sysagent" / "api_keys.json"
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.reload_interval = reload_interval
         self.keys: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+        self._file_signature = None
+        self._last_reload_check = 0.0
+        self.usage = KeyUsageStore(
+            self.storage_path.with_name(self.storage_path.stem + "_usage.json"),
+            usage_flush_interval
+        )
         self._load_keys()
     
+    def _signature(self):
+        try:
+            st = self.storage_path.stat()
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+    
     def _load_keys(self):
         """Load API keys from storage."""
-        if self.storage_path.exists():
+        with self._lock:
+            self._file_signature = self._signature()
+            if self._file_signature is None:
+                self.keys = {}
+                return
             try:
                 with open(self.storage_path, 'r') as f:
-                    self.keys = json.load(f)
+                    keys = json.load(f)
             except Exception:
-                self.keys = {}
+                return
+            # Usage counters used to be stored in the key file
+            for key_hash, info in keys.items():
+                self.usage.seed(key_hash, info.pop("last_used", None), info.pop("request_count", 0))
+            self.keys = keys
+    
+    def _maybe_reload(self, force: bool = False):
+        """Reload keys if the key file changed on disk."""
+        now = time.monotonic()
+        if not force and now - self._last_reload_check < self.reload_interval:
+            return
+        self._last_reload_check = now
+        if self._signature() != self._file_signature:
+            self._load_keys()
     
     def _save_keys(self):
         """Save API keys to storage."""
         try:
-            with open(self.storage_path, 'w') as f:
+            temp_path = self.storage_path.with_suffix(".tmp")
+            with open(temp_path, 'w') as f:
                 json.dump(self.keys, f, indent=2)
+            os.replace(temp_path, self.storage_path)
+            self._file_signature = self._signature()
         except Exception as e:
             print(f"Warning: Could not save API keys: {e}")
     
@@ -75,15 +398,15 @@ class APIKeyManager:
         key = f"sysagent_{secrets.token_urlsafe(32)}"
         key_hash = hashlib.sha256(key.encode()).hexdigest()
         
-        self.keys[key_hash] = {
-            "name": name,
-            "created_at": datetime.now().isoformat(),
-            "permissions": permissions or ["read", "write", "execute"],
-            "last_used": None,
-            "request_count": 0
-        }
-        
-        self._save_keys()
+        with self._lock:
+            # Merge with keys other processes may have added
+            self._maybe_reload(force=True)
+            self.keys[key_hash] = {
+                "name": name,
+                "created_at": datetime.now().isoformat(),
+                "permissions": permissions or ["read", "write", "execute"],
+            }
+            self._save_keys()
         return key
     
     def validate_key(self, key: str) -> Optional[Dict]:
@@ -93,56 +416,149 @@ class APIKeyManager:
         
         key_hash = hashlib.sha256(key.encode()).hexdigest()
         
-        if key_hash in self.keys:
-            # Update last used
-            self.keys[key_hash]["last_used"] = datetime.now().isoformat()
-            self.keys[key_hash]["request_count"] += 1
-            self._save_keys()
-            return self.keys[key_hash]
+        self._maybe_reload()
+        info = self.keys.get(key_hash)
+        if info is None:
+            return None
         
-        return None
+        self.usage.record(key_hash)
+        return {**info, **self.usage.get(key_hash)}
+    
+    def known_hash(self, key: str) -> Optional[str]:
+        """Get the hash of a key if it is valid, without counting a use."""
+        if not key:
+            return None
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        self._maybe_reload()
+        return key_hash if key_hash in self.keys else None
     
     def revoke_key(self, key_hash: str) -> bool:
         """Revoke an API key."""
-        if key_hash in self.keys:
-            del self.keys[key_hash]
-            self._save_keys()
-            return True
+        with self._lock:
+            self._maybe_reload(force=True)
+            if key_hash in self.keys:
+                del self.keys[key_hash]
+                self._save_keys()
+                self.usage.forget(key_hash)
+                return True
         return False
     
     def list_keys(self) -> List[Dict]:
         """List all API keys (without the actual keys)."""
+        self._maybe_reload()
         return [
-            {"hash": k[:16] + "...", **v}
-            for k, v in self.keys.items()
+            {"hash": k[:16] + "...", **v, **self.usage.get(k)}
+            for k, v in list(self.keys.items())
         ]
+    
+    def close(self):
+        """Write pending usage counters."""
+        self.usage.close()
 
 
 class SysAgentAPIHandler(BaseHTTPRequestHandler):
     """HTTP request handler for SysAgent API."""
     
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Close idle keep-alive connections after this many seconds
+    timeout = 30
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+    
     agent = None
     key_manager = None
     rate_limiter = None
+    concurrency_limiter = None
+    _rate_limit_headers: Dict[str, str] = {}
+    _raw_body: Optional[bytes] = None
+    _content_length = 0
     require_auth = True
     
-    def _set_headers(self, status: int = 200, content_type: str = "application/json"):
+    def _set_headers(self, status: int = 200, content_type: str = "application/json",
+                     content_length: Optional[int] = 0, headers: Optional[Dict[str, str]] = None):
         """Set response headers."""
         self.send_response(status)
         self.send_header("Content-Type", content_type)
+        if content_length is not None:
+            self.send_header("Content-Length", str(content_length))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, X-API-Key")
+        if self._raw_body is None and self._content_length > 0:
+            # Answered without reading the body (rejected early); don't read
+            # it just to keep the connection alive
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        for name, value in {**self._rate_limit_headers, **(headers or {})}.items():
+            self.send_header(name, value)
         self.end_headers()
     
-    def _json_response(self, data: Dict, status: int = 200):
+    def _json_response(self, data: Dict, status: int = 200, headers: Optional[Dict[str, str]] = None):
         """Send a JSON response."""
-        self._set_headers(status)
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        body = json.dumps(data, indent=2).encode()
+        self._set_headers(status, content_length=len(body), headers=headers)
+        self.wfile.write(body)
     
-    def _error_response(self, message: str, status: int = 400):
+    def _error_response(self, message: str, status: int = 400, headers: Optional[Dict[str, str]] = None):
         """Send an error response."""
-        self._json_response({"error": message, "status": status}, status)
+        self._json_response({"error": message, "status": status}, status, headers)
+    
+    def _read_body(self) -> bytes:
+        """Read the body of the current request."""
+        return self.rfile.read(self._content_length) if self._content_length > 0 else b""
+    
+    def _begin_request(self) -> bool:
+        """Reset per-request state and check the declared body size.
+        
+        The handler instance is reused for every request on a keep-alive
+        connection. The body itself is only read once the request has passed
+        rate limiting and authentication.
+        
+        Returns:
+            False if an error response was sent.
+        """
+        self._raw_body = None
+        self._rate_limit_headers = {}
+        try:
+            self._content_length = int(self.headers.get("Content-Length", 0) or 0)
+        except ValueError:
+            self._content_length = -1
+        if self._content_length < 0:
+            self._content_length = 1  # unread, so the connection is closed
+            self._error_response("Invalid Content-Length", 400)
+            return False
+        if self._content_length > MAX_BODY_BYTES:
+            self._error_response("Request body too large", 413)
+            return False
+        return True
+    
+    def _limited(self, handler):
+        """Run a request handler within its endpoint class's concurrency limit.
+        
+        The rate limit is checked first, so throttled clients never hold or
+        queue for a worker slot.
+        """
+        if not self._begin_request():
+            return
+        
+        if not self._check_rate_limit():
+            self._error_response("Rate limit exceeded", 429)
+            return
+        
+        limiter = self.concurrency_limiter
+        endpoint_class = limiter.classify(urlparse(self.path).path) if limiter else None
+        if endpoint_class is None:
+            handler()
+            return
+        
+        if not limiter.acquire(endpoint_class):
+            self._error_response("Server busy, try again later", 503, {"Retry-After": "1"})
+            return
+        try:
+            handler()
+        finally:
+            limiter.release(endpoint_class)
     
     def _authenticate(self) -> Optional[Dict]:
         """Authenticate the request."""
@@ -157,18 +573,37 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         
         return self.key_manager.validate_key(api_key)
     
+    def _client_id(self) -> str:
+        """Identify the client by a known API key, falling back to its address.
+        
+        Unknown keys are not trusted as identities: a client sending a new
+        random key with each request would otherwise get a fresh bucket
+        every time.
+        """
+        api_key = self.headers.get("X-API-Key") or self.headers.get("Authorization", "").replace("Bearer ", "")
+        if api_key and self.key_manager is not None:
+            key_hash = self.key_manager.known_hash(api_key)
+            if key_hash is not None:
+                return "key:" + key_hash[:16]
+        return self.client_address[0]
+    
     def _check_rate_limit(self) -> bool:
-        """Check rate limit."""
-        client_ip = self.client_address[0]
-        return self.rate_limiter.is_allowed(client_ip)
+        """Check rate limit, remembering X-RateLimit-* headers for the response."""
+        if not self.rate_limiter:
+            return True
+        endpoint = ConcurrencyLimiter.classify(urlparse(self.path).path)
+        result = self.rate_limiter.check(self._client_id(), endpoint)
+        self._rate_limit_headers = result.headers()
+        return result.allowed
     
     def _get_body(self) -> Dict:
         """Get request body as JSON."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        if content_length == 0:
+        if self._raw_body is None:
+            self._raw_body = self._read_body()
+        body = self._raw_body
+        if not body:
             return {}
         
-        body = self.rfile.read(content_length)
         try:
             return json.loads(body.decode())
         except Exception:
@@ -176,15 +611,23 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
     
     def do_OPTIONS(self):
         """Handle CORS preflight."""
-        self._set_headers(204)
+        if self._begin_request():
+            self._set_headers(204)
     
     def do_GET(self):
         """Handle GET requests."""
-        # Rate limiting
-        if not self._check_rate_limit():
-            self._error_response("Rate limit exceeded", 429)
-            return
-        
+        self._limited(self._handle_get)
+    
+    def do_POST(self):
+        """Handle POST requests."""
+        self._limited(self._handle_post)
+    
+    def do_DELETE(self):
+        """Handle DELETE requests."""
+        self._limited(self._handle_delete)
+    
+    def _handle_get(self):
+        """Handle GET requests."""
         parsed = urlparse(self.path)
         path = parsed.path
         query = parse_qs(parsed.query)
@@ -205,7 +648,7 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
                 "endpoints": [
                     "GET /api/health - Health check",
                     "GET /api/info - API information",
-                    "POST /api/chat - Send a message",
+                    "POST /api/chat - Send a message (\"stream\": true for server-sent events)",
                     "GET /api/tools - List available tools",
                     "POST /api/tool/{name} - Execute a tool",
                     "GET /api/sessions - List sessions",
@@ -227,17 +670,18 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
             return
         
         if path == "/api/sessions":
-            from ..core.session_manager import SessionManager
-            sm = SessionManager()
-            sessions = sm.list_sessions(limit=int(query.get("limit", [50])[0]))
+            from ..core.session_manager import get_session_manager
+            sessions = get_session_manager().list_sessions(
+                limit=int(query.get("limit", [50])[0]),
+                search=query.get("search", [None])[0]
+            )
             self._json_response({"sessions": sessions})
             return
         
         if path.startswith("/api/session/"):
             session_id = path.split("/")[-1]
-            from ..core.session_manager import SessionManager
-            sm = SessionManager()
-            session = sm.load_session(session_id)
+            from ..core.session_manager import get_session_manager
+            session = get_session_manager().get_session(session_id)
             if session:
                 self._json_response(session.to_dict())
             else:
@@ -246,18 +690,15 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         
         if path == "/api/stats":
             stats = self._get_stats()
+            if self.concurrency_limiter:
+                stats["concurrency"] = self.concurrency_limiter.get_stats()
             self._json_response(stats)
             return
         
         self._error_response("Not found", 404)
     
-    def do_POST(self):
+    def _handle_post(self):
         """Handle POST requests."""
-        # Rate limiting
-        if not self._check_rate_limit():
-            self._error_response("Rate limit exceeded", 429)
-            return
-        
         # Authenticate
         auth = self._authenticate()
         if not auth:
@@ -274,6 +715,10 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
                 self._error_response("Message required")
                 return
             
+            if body.get("stream") or "text/event-stream" in self.headers.get("Accept", ""):
+                self._stream_chat(message)
+                return
+            
             response = self._process_chat(message)
             self._json_response(response)
             return
@@ -285,10 +730,9 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
             return
         
         if path == "/api/session":
-            from ..core.session_manager import SessionManager
-            sm = SessionManager()
+            from ..core.session_manager import get_session_manager
             title = body.get("title")
-            session = sm.create_session(title)
+            session = get_session_manager().create_session(title, make_current=False)
             self._json_response({"session_id": session.id, "title": session.title})
             return
         
@@ -306,7 +750,7 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         
         self._error_response("Not found", 404)
     
-    def do_DELETE(self):
+    def _handle_delete(self):
         """Handle DELETE requests."""
         auth = self._authenticate()
         if not auth:
@@ -318,9 +762,8 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         
         if path.startswith("/api/session/"):
             session_id = path.split("/")[-1]
-            from ..core.session_manager import SessionManager
-            sm = SessionManager()
-            if sm.delete_session(session_id):
+            from ..core.session_manager import get_session_manager
+            if get_session_manager().delete_session(session_id):
                 self._json_response({"deleted": session_id})
             else:
                 self._error_response("Session not found", 404)
@@ -359,6 +802,63 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    def _write_chunk(self, data: bytes):
+        """Write one chunk of a streamed response."""
+        if self._chunked:
+            data = f"{len(data):X}\r\n".encode() + data + b"\r\n"
+        self.wfile.write(data)
+        self.wfile.flush()
+    
+    def _end_chunks(self):
+        """Finish a streamed response."""
+        if self._chunked:
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+    
+    def _stream_chat(self, message: str):
+        """Stream chat events to the client as server-sent events."""
+        if not self.agent:
+            self._json_response({"error": "Agent not initialized", "success": False})
+            return
+        
+        # HTTP/1.0 clients don't understand chunked encoding; end the
+        # response by closing the connection instead
+        self._chunked = self.request_version != "HTTP/1.0"
+        headers = {"Cache-Control": "no-cache"}
+        if self._chunked:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            self.close_connection = True
+        self._set_headers(200, "text/event-stream", content_length=None, headers=headers)
+        
+        if hasattr(self.agent, "process_command_streaming"):
+            events = self.agent.process_command_streaming(message)
+        else:
+            events = iter([{"type": "complete", **self._process_chat(message)}])
+        
+        try:
+            for event in events:
+                self._write_chunk(
+                    f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n".encode()
+                )
+            self._write_chunk(b"event: done\ndata: {}\n\n")
+            self._end_chunks()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; stop generating
+            self.close_connection = True
+        except Exception as e:
+            try:
+                self._write_chunk(
+                    f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n".encode()
+                )
+                self._end_chunks()
+            except OSError:
+                self.close_connection = True
+        finally:
+            close = getattr(events, "close", None)
+            if close:
+                close()
+    
     def _execute_tool(self, tool_name: str, params: Dict) -> Dict:
         """Execute a specific tool."""
         if not self.agent:
@@ -393,6 +893,41 @@ class SysAgentAPIHandler(BaseHTTPRequestHandler):
         pass
 
 
+class ThreadedAPIServer(ThreadingMixIn, HTTPServer):
+    """HTTP server that handles each connection on its own thread.
+    
+    The number of open connections is capped; connections beyond the cap are
+    answered with 503 and closed instead of spawning more threads.
+    """
+    
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, max_connections: int = 256):
+        super().__init__(server_address, handler_class)
+        self.max_connections = max_connections
+        self._connection_slots = threading.BoundedSemaphore(max_connections)
+    
+    def process_request(self, request, client_address):
+        if not self._connection_slots.acquire(blocking=False):
+            try:
+                request.sendall(
+                    b"HTTP/1.1 503 Service Unavailable\r\n"
+                    b"Retry-After: 1\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+                )
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._connection_slots.release()
+
+
 class SysAgentAPIServer:
     """
     REST API Server for SysAgent.
@@ -401,28 +936,54 @@ class SysAgentAPIServer:
         server = SysAgentAPIServer(port=8080)
         server.start()  # Starts in background thread
         server.stop()   # Stops the server
+    
+    By default each connection is served on its own thread, with per endpoint
+    class limits on concurrent and queued requests (see ``ConcurrencyLimiter``),
+    so a slow chat request does not hold up health checks or tool calls.
+    Chat requests share the agent's conversation state, so they run one at
+    a time unless the agent sets ``thread_safe = True``.
+    Pass ``threaded=False`` for the old single-threaded server.
     """
     
     def __init__(self, host: str = "localhost", port: int = 8080, 
-                 require_auth: bool = True, agent=None):
+                 require_auth: bool = True, agent=None, threaded: bool = True,
+                 concurrency: Optional[Dict[str, tuple]] = None,
+                 max_connections: int = 256,
+                 rate_limiter: Optional[RateLimiter] = None):
         self.host = host
         self.port = port
         self.require_auth = require_auth
         self.agent = agent
+        self.threaded = threaded
+        self.max_connections = max_connections
         self.server: Optional[HTTPServer] = None
         self.thread: Optional[threading.Thread] = None
         self.key_manager = APIKeyManager()
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        limits = dict(concurrency or {})
+        if not getattr(agent, "thread_safe", False):
+            # One conversation thread and checkpointer; chats must not overlap
+            _, max_waiting = limits.get("chat", DEFAULT_CONCURRENCY["chat"])
+            limits["chat"] = (1, max_waiting)
+        self.concurrency_limiter = ConcurrencyLimiter(limits) if threaded else None
         
         # Configure handler
         SysAgentAPIHandler.agent = agent
         SysAgentAPIHandler.key_manager = self.key_manager
         SysAgentAPIHandler.rate_limiter = self.rate_limiter
+        SysAgentAPIHandler.concurrency_limiter = self.concurrency_limiter
         SysAgentAPIHandler.require_auth = require_auth
     
     def start(self, blocking: bool = False):
         """Start the API server."""
-        self.server = HTTPServer((self.host, self.port), SysAgentAPIHandler)
+        if self.threaded:
+            self.server = ThreadedAPIServer(
+                (self.host, self.port), SysAgentAPIHandler, self.max_connections
+            )
+        else:
+            self.server = HTTPServer((self.host, self.port), SysAgentAPIHandler)
+        # Pick up the real port when started on port 0
+        self.port = self.server.server_address[1]
         
         print(f"🚀 SysAgent API Server starting on http://{self.host}:{self.port}")
         print(f"   Authentication: {'required' if self.require_auth else 'disabled'}")
@@ -441,6 +1002,8 @@ class SysAgentAPIServer:
         """Stop the API server."""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
+            self.key_manager.close()
             print("🛑 SysAgent API Server stopped")
     
     def create_api_key(self, name: str = "default") -> str:
@@ -960,9 +960,9 @@ def sessions(ctx):
 @click.pass_context
 def list_sessions(ctx, limit, search):
     """List saved chat sessions."""
-    from ..core.session_manager import SessionManager
+    from ..core.session_manager import get_session_manager
     
-    sm = SessionManager()
+    sm = get_session_manager()
     sessions_list = sm.list_sessions(limit=limit, search=search)
     
     if not sessions_list:
@@ -984,9 +984,9 @@ def list_sessions(ctx, limit, search):
 @click.pass_context
 def show(ctx, session_id):
     """Show a specific session."""
-    from ..core.session_manager import SessionManager
+    from ..core.session_manager import get_session_manager
     
-    sm = SessionManager()
+    sm = get_session_manager()
     session = sm.load_session(session_id)
     
     if not session:
@@ -1009,9 +1009,9 @@ def show(ctx, session_id):
 @click.pass_context
 def export(ctx, session_id, format, output):
     """Export a session to file."""
-    from ..core.session_manager import SessionManager
+    from ..core.session_manager import get_session_manager
     
-    sm = SessionManager()
+    sm = get_session_manager()
     content = sm.export_session(session_id, format=format)
     
     if not content:
@@ -1032,14 +1032,14 @@ def export(ctx, session_id, format, output):
 @click.pass_context
 def delete(ctx, session_id, confirm):
     """Delete a session."""
-    from ..core.session_manager import SessionManager
+    from ..core.session_manager import get_session_manager
     
     if not confirm:
         if not click.confirm(f"Delete session '{session_id}'?"):
             console.print("[dim]Cancelled[/dim]")
             return
     
-    sm = SessionManager()
+    sm = get_session_manager()
     if sm.delete_session(session_id):
         console.print(f"[green]✓[/green] Session '{session_id}' deleted")
     else:
@@ -1050,9 +1050,9 @@ def delete(ctx, session_id, confirm):
 @click.pass_context
 def stats(ctx):
     """Show session statistics."""
-    from ..core.session_manager import SessionManager
+    from ..core.session_manager import get_session_manager
     
-    sm = SessionManager()
+    sm = get_session_manager()
     stats = sm.get_statistics()
     
     console.print("[bold]Session Statistics:[/bold]\n")
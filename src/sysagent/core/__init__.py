@@ -12,12 +12,14 @@ from .logging import (
     AuditEvent, 
     EventType, 
     LogLevel,
+    DurabilityPolicy,
+    BackpressurePolicy,
     get_audit_logger,
     log_tool_execution,
     log_permission_request,
     log_error
 )
-from .session_manager import SessionManager, Session, Message
+from .session_manager import SessionManager, Session, Message, get_session_manager
 from .agent_modes import AgentMode, AgentModeManager, ModeConfig, get_mode_manager
 from .activity_tracker import ActivityTracker, Activity, ActivityType, get_activity_tracker
 from .smart_learning import SmartLearningSystem, get_learning_system
@@ -50,6 +52,8 @@ __all__ = [
     "AuditEvent",
     "EventType",
     "LogLevel",
+    "DurabilityPolicy",
+    "BackpressurePolicy",
     "get_audit_logger",
     "log_tool_execution",
     "log_permission_request",
@@ -58,6 +62,7 @@ __all__ = [
     "SessionManager",
     "Session",
     "Message",
+    "get_session_manager",
     # Agent Modes
     "AgentMode",
     "AgentModeManager",
@@ -3,10 +3,12 @@ Activity Tracker for SysAgent - Audit trail and activity logging.
 Enterprise-grade activity monitoring and history.
 """
 
+import copy
 import json
 import os
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Deque, Iterator
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -61,47 +63,239 @@ class ActivityTracker:
     - Generate reports
     - Export audit logs
     - Real-time activity stream
+    
+    Activities are stored in one append-only JSONL file per day. Logging an
+    activity appends a single line; recent activities and per-day summaries
+    are kept in memory so queries don't need to load whole days.
     """
     
-    def __init__(self, storage_dir: Optional[Path] = None):
+    RECENT_SIZE = 500
+    
+    def __init__(self, storage_dir: Optional[Path] = None, recent_size: int = RECENT_SIZE):
         self.storage_dir = storage_dir or Path.home() / ".sysagent" / "activity"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.recent_size = recent_size
         self.current_day: Optional[str] = None
-        self.activities: List[Activity] = []
         self.lock = threading.Lock()
-        self._load_today()
+        self._write_lock = threading.Lock()
+        self._file = None
         self._activity_id = 0
+        self._recent: Deque[Activity] = deque(maxlen=recent_size)
+        self._recent_by_type: Dict[ActivityType, Deque[Activity]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self.compact()
+        self._load_today()
     
     def _get_day_file(self, date: Optional[datetime] = None) -> Path:
-        """Get the file path for a specific day."""
+        """Get the log file path for a specific day."""
+        date = date or datetime.now()
+        return self.storage_dir / f"{date.strftime('%Y-%m-%d')}.jsonl"
+    
+    def _get_legacy_day_file(self, date: Optional[datetime] = None) -> Path:
+        """Get the pre-JSONL (whole-day JSON array) file path for a day."""
         date = date or datetime.now()
         return self.storage_dir / f"{date.strftime('%Y-%m-%d')}.json"
     
+    def _get_summary_file(self, day: str) -> Path:
+        """Get the summary sidecar path for a day."""
+        return self.storage_dir / f"{day}.summary.json"
+    
     def _load_today(self):
-        """Load today's activities."""
+        """Switch to today's log, rebuilding the in-memory index if needed."""
         today = datetime.now().strftime("%Y-%m-%d")
-        if today != self.current_day:
-            self.current_day = today
-            self.activities = []
-            
-            file_path = self._get_day_file()
-            if file_path.exists():
+        if today == self.current_day:
+            return
+        
+        previous_day = self.current_day
+        self._close_file()
+        if previous_day and previous_day in self._summaries:
+            self._write_summary(previous_day, self._summaries[previous_day])
+        
+        self.current_day = today
+        self._activity_id = 0
+        self._recent = deque(maxlen=self.recent_size)
+        self._recent_by_type = {}
+        
+        summary = self._new_summary()
+        for activity in self._iter_day(datetime.now()):
+            self._activity_id += 1
+            self._index(activity, summary)
+        self._summaries[today] = summary
+    
+    def _iter_day(self, date: datetime) -> Iterator[Activity]:
+        """Stream the activities of a day from disk."""
+        file_path = self._get_day_file(date)
+        if not file_path.exists():
+            legacy_path = self._get_legacy_day_file(date)
+            if legacy_path.exists():
+                yield from self._read_legacy(legacy_path)
+            return
+        
+        try:
+            with open(file_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield Activity.from_dict(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        # Skip a partially written or corrupt record
+                        continue
+        except OSError:
+            return
+    
+    def _read_legacy(self, file_path: Path) -> List[Activity]:
+        """Read a whole-day JSON array written by older versions."""
+        try:
+            with open(file_path, 'r') as f:
+                return [Activity.from_dict(a) for a in json.load(f)]
+        except Exception:
+            return []
+    
+    def _append(self, activity: Activity):
+        """Append one activity record to today's log."""
+        line = json.dumps(activity.to_dict(), separators=(",", ":")) + "\n"
+        with self._write_lock:
+            try:
+                if self._file is None:
+                    self._file = open(self._get_day_file(), 'a')
+                self._file.write(line)
+                self._file.flush()
+            except Exception as e:
+                print(f"Warning: Could not save activity: {e}")
+    
+    def _close_file(self):
+        """Close the currently open day log."""
+        with self._write_lock:
+            if self._file is not None:
                 try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        self.activities = [Activity.from_dict(a) for a in data]
-                        self._activity_id = len(self.activities)
+                    self._file.close()
                 except Exception:
-                    self.activities = []
+                    pass
+                self._file = None
+    
+    def close(self):
+        """Close the open log file."""
+        with self.lock:
+            self._close_file()
     
-    def _save_today(self):
-        """Save today's activities."""
-        file_path = self._get_day_file()
+    @staticmethod
+    def _new_summary() -> Dict[str, Any]:
+        """Create an empty per-day summary."""
+        return {
+            "total": 0,
+            "by_type": {},
+            "tools": {},
+            "errors": 0,
+            "duration_sum": 0,
+            "duration_count": 0,
+        }
+    
+    def _index(self, activity: Activity, summary: Dict[str, Any]):
+        """Add an activity to the recent buffers and a day summary."""
+        self._recent.append(activity)
+        by_type = self._recent_by_type.get(activity.type)
+        if by_type is None:
+            by_type = self._recent_by_type[activity.type] = deque(maxlen=self.recent_size)
+        by_type.append(activity)
+        self._summarize(activity, summary)
+    
+    @staticmethod
+    def _summarize(activity: Activity, summary: Dict[str, Any]):
+        """Fold an activity into a day summary."""
+        summary["total"] += 1
+        type_name = activity.type.value
+        summary["by_type"][type_name] = summary["by_type"].get(type_name, 0) + 1
+        if activity.type == ActivityType.TOOL_CALL:
+            tool = activity.details.get("tool", "unknown")
+            summary["tools"][tool] = summary["tools"].get(tool, 0) + 1
+        if not activity.success:
+            summary["errors"] += 1
+        if activity.duration_ms > 0:
+            summary["duration_sum"] += activity.duration_ms
+            summary["duration_count"] += 1
+    
+    def _write_summary(self, day: str, summary: Dict[str, Any]):
+        """Persist the summary of a closed day."""
         try:
-            with open(file_path, 'w') as f:
-                json.dump([a.to_dict() for a in self.activities], f, indent=2)
+            with open(self._get_summary_file(day), 'w') as f:
+                json.dump(summary, f)
         except Exception as e:
-            print(f"Warning: Could not save activities: {e}")
+            print(f"Warning: Could not save activity summary: {e}")
+    
+    def _get_day_summary(self, date: datetime) -> Dict[str, Any]:
+        """Get the summary of a day, building it from the log if needed."""
+        day = date.strftime("%Y-%m-%d")
+        if day == self.current_day:
+            with self.lock:
+                return copy.deepcopy(self._summaries[day])
+        
+        summary = self._summaries.get(day)
+        if summary is not None:
+            return summary
+        
+        summary_path = self._get_summary_file(day)
+        if summary_path.exists():
+            try:
+                with open(summary_path, 'r') as f:
+                    summary = json.load(f)
+            except Exception:
+                summary = None
+        
+        if summary is None:
+            summary = self._new_summary()
+            found = False
+            for activity in self._iter_day(date):
+                found = True
+                self._summarize(activity, summary)
+            if found:
+                self._write_summary(day, summary)
+        
+        self._summaries[day] = summary
+        return summary
+    
+    def compact(self) -> int:
+        """Compact closed days of the activity log.
+        
+        Converts whole-day JSON files written by older versions into JSONL
+        and writes summary sidecars for days that don't have one yet.
+        
+        Returns:
+            Number of days that were compacted.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        compacted = 0
+        
+        for file in sorted(self.storage_dir.glob("*.json")):
+            day = file.name[:10]
+            if file.name != f"{day}.json":
+                continue
+            target = self.storage_dir / f"{day}.jsonl"
+            if not target.exists():
+                activities = self._read_legacy(file)
+                tmp_path = target.with_suffix(".jsonl.tmp")
+                try:
+                    with open(tmp_path, 'w') as f:
+                        for activity in activities:
+                            f.write(json.dumps(activity.to_dict(), separators=(",", ":")) + "\n")
+                    os.replace(tmp_path, target)
+                except Exception as e:
+                    print(f"Warning: Could not compact activities for {day}: {e}")
+                    continue
+            file.unlink()
+            compacted += 1
+        
+        for file in self.storage_dir.glob("*.jsonl"):
+            day = file.stem
+            if day == today or self._get_summary_file(day).exists():
+                continue
+            try:
+                self._get_day_summary(datetime.strptime(day, "%Y-%m-%d"))
+                compacted += 1
+            except ValueError:
+                continue
+        
+        return compacted
     
     def log(self, activity_type: ActivityType, action: str, 
             details: Dict = None, duration_ms: int = 0, 
@@ -122,10 +316,10 @@ class ActivityTracker:
                 session_id=session_id
             )
             
-            self.activities.append(activity)
-            self._save_today()
-            
-            return activity
+            self._index(activity, self._summaries[self.current_day])
+        
+        self._append(activity)
+        return activity
     
     def log_chat(self, message: str, response: str = "", session_id: str = None) -> Activity:
         """Log a chat interaction."""
@@ -196,90 +390,98 @@ class ActivityTracker:
         with self.lock:
             self._load_today()
             
-            activities = self.activities.copy()
-            
             if activity_type:
-                activities = [a for a in activities if a.type == activity_type]
+                source = self._recent_by_type.get(activity_type, ())
+            else:
+                source = self._recent
             
-            return list(reversed(activities[-limit:]))
+            if limit <= self.recent_size or len(source) < self.recent_size:
+                activities = list(source)[-limit:]
+                return list(reversed(activities))
+        
+        # Older than the in-memory window: stream today's log
+        window: Deque[Activity] = deque(maxlen=limit)
+        for activity in self._iter_day(datetime.now()):
+            if activity_type is None or activity.type == activity_type:
+                window.append(activity)
+        return list(reversed(window))
+    
+    def iter_by_date(self, date: datetime) -> Iterator[Activity]:
+        """Stream the activities of a specific date."""
+        return self._iter_day(date)
     
     def get_by_date(self, date: datetime) -> List[Activity]:
         """Get activities for a specific date."""
-        file_path = self._get_day_file(date)
-        if not file_path.exists():
-            return []
-        
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                return [Activity.from_dict(a) for a in data]
-        except Exception:
-            return []
+        return list(self._iter_day(date))
     
-    def get_date_range(self, start: datetime, end: datetime) -> List[Activity]:
-        """Get activities for a date range."""
-        activities = []
+    def iter_date_range(self, start: datetime, end: datetime) -> Iterator[Activity]:
+        """Stream activities for a date range."""
         current = start
         
         while current <= end:
-            activities.extend(self.get_by_date(current))
+            yield from self._iter_day(current)
             current += timedelta(days=1)
-        
-        return activities
+    
+    def get_date_range(self, start: datetime, end: datetime) -> List[Activity]:
+        """Get activities for a date range."""
+        return list(self.iter_date_range(start, end))
     
     def search(self, query: str, limit: int = 50) -> List[Activity]:
-        """Search activities."""
+        """Search today's activities, most recent first."""
         query_lower = query.lower()
-        results = []
+        results: Deque[Activity] = deque(maxlen=limit)
         
-        # Search in today's activities first
-        for activity in reversed(self.activities):
+        for activity in self._iter_day(datetime.now()):
             if query_lower in activity.action.lower():
                 results.append(activity)
             elif query_lower in str(activity.details).lower():
                 results.append(activity)
-            
-            if len(results) >= limit:
-                break
         
-        return results
+        return list(reversed(results))
     
-    def get_statistics(self, days: int = 7) -> Dict[str, Any]:
-        """Get activity statistics."""
+    def _get_range_summaries(self, days: int) -> Dict[str, Dict[str, Any]]:
+        """Get the day summaries covering the last ``days`` days."""
         end = datetime.now()
-        start = end - timedelta(days=days)
+        current = end - timedelta(days=days)
+        summaries = {}
         
-        activities = self.get_date_range(start, end)
+        while current <= end:
+            summary = self._get_day_summary(current)
+            if summary["total"]:
+                summaries[current.strftime("%Y-%m-%d")] = summary
+            current += timedelta(days=1)
         
-        # Count by type
-        type_counts = {}
-        for activity in activities:
-            type_name = activity.type.value
-            type_counts[type_name] = type_counts.get(type_name, 0) + 1
+        return summaries
+    
+    def get_statistics(self, days: int = 7) -> Dict[str, Any]:
+        """Get activity statistics."""
+        with self.lock:
+            self._load_today()
+        summaries = self._get_range_summaries(days)
         
-        # Count by day
+        type_counts = {}
+        tool_counts = {}
         day_counts = {}
-        for activity in activities:
-            day = activity.timestamp[:10]
-            day_counts[day] = day_counts.get(day, 0) + 1
+        total = errors = duration_sum = duration_count = 0
         
-        # Top tools
-        tool_counts = {}
-        for activity in activities:
-            if activity.type == ActivityType.TOOL_CALL:
-                tool = activity.details.get("tool", "unknown")
-                tool_counts[tool] = tool_counts.get(tool, 0) + 1
+        for day, summary in summaries.items():
+            day_counts[day] = summary["total"]
+            total += summary["total"]
+            errors += summary["errors"]
+            duration_sum += summary["duration_sum"]
+            duration_count += summary["duration_count"]
+            for type_name, count in summary["by_type"].items():
+                type_counts[type_name] = type_counts.get(type_name, 0) + count
+            for tool, count in summary["tools"].items():
+                tool_counts[tool] = tool_counts.get(tool, 0) + count
         
         top_tools = sorted(tool_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         
         # Error rate
-        total = len(activities)
-        errors = sum(1 for a in activities if not a.success)
         error_rate = (errors / total * 100) if total > 0 else 0
         
         # Average duration
-        durations = [a.duration_ms for a in activities if a.duration_ms > 0]
-        avg_duration = sum(durations) / len(durations) if durations else 0
+        avg_duration = duration_sum / duration_count if duration_count else 0
         
         return {
             "total_activities": total,
@@ -294,15 +496,13 @@ class ActivityTracker:
     
     def get_tool_usage(self, days: int = 30) -> Dict[str, int]:
         """Get tool usage statistics."""
-        end = datetime.now()
-        start = end - timedelta(days=days)
-        activities = self.get_date_range(start, end)
+        with self.lock:
+            self._load_today()
         
         usage = {}
-        for activity in activities:
-            if activity.type == ActivityType.TOOL_CALL:
-                tool = activity.details.get("tool", "unknown")
-                usage[tool] = usage.get(tool, 0) + 1
+        for summary in self._get_range_summaries(days).values():
+            for tool, count in summary["tools"].items():
+                usage[tool] = usage.get(tool, 0) + count
         
         return dict(sorted(usage.items(), key=lambda x: x[1], reverse=True))
     
@@ -310,7 +510,7 @@ class ActivityTracker:
         """Export activity log."""
         end = datetime.now()
         start = end - timedelta(days=days)
-        activities = self.get_date_range(start, end)
+        activities = self.iter_date_range(start, end)
         
         if format == "json":
             return json.dumps([a.to_dict() for a in activities], indent=2)
@@ -340,15 +540,17 @@ class ActivityTracker:
         cutoff = datetime.now() - timedelta(days=days)
         deleted = 0
         
-        for file in self.storage_dir.glob("*.json"):
+        for file in self.storage_dir.glob("*.json*"):
             try:
                 # Parse date from filename
-                date_str = file.stem
+                date_str = file.name[:10]
                 file_date = datetime.strptime(date_str, "%Y-%m-%d")
                 
                 if file_date < cutoff:
                     file.unlink()
-                    deleted += 1
+                    self._summaries.pop(date_str, None)
+                    if not file.name.endswith(".summary.json"):
+                        deleted += 1
             except Exception:
                 continue
         
@@ -2,12 +2,21 @@
 Context Awareness System for SysAgent.
 Provides intelligent suggestions based on current context,
 active application, time of day, and user patterns.
+
+Each context source (active window, clipboard, recent files, system state) is
+a cached probe with its own TTL. Expired probes are refreshed concurrently in
+the background while callers get the last value; probes that were never read,
+or whose change signature moved (such as a watched directory's mtime), are
+re-read before returning.
 """
 
+import heapq
 import subprocess
 import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, List, Dict, Any, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -15,6 +24,19 @@ from pathlib import Path
 from ..utils.platform import detect_platform, Platform
 
 
+# Seconds a probe result stays fresh
+WINDOW_TTL = 1.0
+CLIPBOARD_TTL = 2.0
+RECENT_FILES_TTL = 30.0
+SYSTEM_STATE_TTL = 2.0
+
+# Longest wait for probes that must be re-read before returning
+PROBE_WAIT = 2.0
+
+# Timeout for the external commands behind the probes
+COMMAND_TIMEOUT = 2.0
+
+
 @dataclass
 class ContextInfo:
     """Current context information."""
@@ -39,6 +61,86 @@ class Suggestion:
     context_match: str = ""  # Why this was suggested
 
 
+# Probe behind each ContextInfo field; other fields are computed inline
+FIELD_PROBES = {
+    "active_app": "window",
+    "active_window": "window",
+    "clipboard_content": "clipboard",
+    "recent_files": "recent_files",
+    "system_state": "system_state",
+}
+
+# ContextInfo fields read by each rule condition
+CONDITION_FIELDS = {
+    "time_of_day": "time_of_day",
+    "day_of_week": "day_of_week",
+    "active_app_contains": "active_app",
+    "cpu_high": "system_state",
+    "memory_high": "system_state",
+    "disk_high": "system_state",
+    "battery_low": "system_state",
+    "clipboard_is_url": "clipboard_content",
+    "clipboard_is_code": "clipboard_content",
+}
+
+
+class ContextProbe:
+    """A cached context source with a TTL and an optional change signature."""
+    
+    def __init__(self, name: str, fetch: Callable[[], Any], ttl: float,
+                 signature: Optional[Callable[[], Any]] = None, default: Any = None):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.signature = signature
+        self.value = default
+        self.fetched_at: Optional[float] = None
+        self._signature: Any = None
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+    
+    def needs_wait(self) -> bool:
+        """Whether the cached value must not be served (missing or invalidated)."""
+        if self.fetched_at is None:
+            return True
+        if self.signature is not None:
+            try:
+                return self.signature() != self._signature
+            except Exception:
+                return True
+        return False
+    
+    def expired(self) -> bool:
+        return self.fetched_at is None or time.monotonic() - self.fetched_at >= self.ttl
+    
+    def invalidate(self):
+        self.fetched_at = None
+    
+    def refresh(self, executor: ThreadPoolExecutor) -> Future:
+        """Start a refresh unless one is already running."""
+        with self._lock:
+            if self._future is None or self._future.done():
+                self._future = executor.submit(self._load)
+            return self._future
+    
+    def _load(self) -> Any:
+        # Read the signature first, so a change during the fetch is seen later
+        signature = None
+        if self.signature is not None:
+            try:
+                signature = self.signature()
+            except Exception:
+                pass
+        try:
+            value = self.fetch()
+        except Exception:
+            value = self.value
+        self.value = value
+        self._signature = signature
+        self.fetched_at = time.monotonic()
+        return value
+
+
 class ContextAwareness:
     """
     System for understanding current context and providing
@@ -49,14 +151,34 @@ class ContextAwareness:
         self.platform = detect_platform()
         self._suggestion_rules: List[Dict] = []
         self._load_default_rules()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sysagent-context")
+        self._probes: Dict[str, ContextProbe] = {
+            "window": ContextProbe("window", self._get_window_info, WINDOW_TTL, default=("", "")),
+            "clipboard": ContextProbe("clipboard", lambda: self._get_clipboard()[:200],
+                                      CLIPBOARD_TTL, default=""),
+            "recent_files": ContextProbe("recent_files", self._get_recent_files, RECENT_FILES_TTL,
+                                         signature=self._recent_dirs_signature, default=[]),
+            "system_state": ContextProbe("system_state", self._get_system_state,
+                                         SYSTEM_STATE_TTL, default={}),
+        }
     
-    def get_current_context(self) -> ContextInfo:
-        """Get the current context information."""
+    def get_current_context(self, fields: Optional[Iterable[str]] = None,
+                            max_wait: float = PROBE_WAIT) -> ContextInfo:
+        """Get the current context information.
+        
+        Args:
+            fields: ContextInfo fields to fill in; all of them by default.
+                Fields that are not requested keep their defaults.
+            max_wait: Longest time to wait for probes that have no usable
+                cached value.
+        """
+        wanted = set(FIELD_PROBES) if fields is None else set(fields)
+        probes = self._read_probes({FIELD_PROBES[f] for f in wanted if f in FIELD_PROBES}, max_wait)
         context = ContextInfo()
         
         # Get active application
-        context.active_app = self._get_active_app()
-        context.active_window = self._get_active_window()
+        if "window" in probes:
+            context.active_app, context.active_window = probes["window"]
         
         # Get current directory
         context.current_directory = os.getcwd()
@@ -75,17 +197,46 @@ class ContextAwareness:
         
         context.day_of_week = now.strftime("%A").lower()
         
-        # Get clipboard content
-        context.clipboard_content = self._get_clipboard()[:200]  # Limit size
-        
-        # Get recent files
-        context.recent_files = self._get_recent_files()
-        
-        # Get system state
-        context.system_state = self._get_system_state()
+        if "clipboard" in probes:
+            context.clipboard_content = probes["clipboard"]
+        if "recent_files" in probes:
+            context.recent_files = list(probes["recent_files"])
+        if "system_state" in probes:
+            context.system_state = dict(probes["system_state"])
         
         return context
     
+    def _read_probes(self, names: Set[str], max_wait: float) -> Dict[str, Any]:
+        """Read the named probes, refreshing expired ones concurrently."""
+        blocking = []
+        for name in names:
+            probe = self._probes[name]
+            if probe.needs_wait():
+                blocking.append(probe.refresh(self._executor))
+            elif probe.expired():
+                probe.refresh(self._executor)
+        if blocking:
+            wait(blocking, timeout=max_wait)
+        return {name: self._probes[name].value for name in names}
+    
+    def invalidate(self, *names: str):
+        """Drop cached probe values so the next read fetches them again.
+        
+        Args:
+            names: Probe names ("window", "clipboard", "recent_files",
+                "system_state"); all probes if none are given.
+        """
+        for name in names or self._probes:
+            self._probes[name].invalidate()
+    
+    def _get_window_info(self) -> tuple:
+        """Get the active application and window title."""
+        if self.platform == Platform.LINUX:
+            # One xdotool call gives both; the app is the title's last part
+            title = self._get_active_window()
+            return (title.split(" - ")[-1] if title else "", title)
+        return (self._get_active_app(), self._get_active_window())
+    
     def _get_active_app(self) -> str:
         """Get the currently active application."""
         try:
@@ -98,14 +249,14 @@ class ContextAwareness:
                 '''
                 result = subprocess.run(
                     ["osascript", "-e", script],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout.strip()
             
             elif self.platform == Platform.LINUX:
                 result = subprocess.run(
                     ["xdotool", "getactivewindow", "getwindowname"],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout.strip().split(" - ")[-1] if result.stdout else ""
             
@@ -128,7 +279,7 @@ class ContextAwareness:
                 '''
                 result = subprocess.run(
                     ["powershell", "-Command", ps_script],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout.strip()
         except Exception:
@@ -150,14 +301,14 @@ class ContextAwareness:
                 '''
                 result = subprocess.run(
                     ["osascript", "-e", script],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout.strip()
             
             elif self.platform == Platform.LINUX:
                 result = subprocess.run(
                     ["xdotool", "getactivewindow", "getwindowname"],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout.strip()
         except Exception:
@@ -170,50 +321,57 @@ class ContextAwareness:
             if self.platform == Platform.MACOS:
                 result = subprocess.run(
                     ["pbpaste"],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout
             
             elif self.platform == Platform.LINUX:
                 result = subprocess.run(
                     ["xclip", "-selection", "clipboard", "-o"],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout
             
             elif self.platform == Platform.WINDOWS:
                 result = subprocess.run(
                     ["powershell", "-Command", "Get-Clipboard"],
-                    capture_output=True, text=True
+                    capture_output=True, text=True, timeout=COMMAND_TIMEOUT
                 )
                 return result.stdout
         except Exception:
             pass
         return ""
     
+    def _recent_dirs(self) -> List[Path]:
+        home = Path.home()
+        return [home / "Desktop", home / "Documents", home / "Downloads"]
+    
+    def _recent_dirs_signature(self) -> tuple:
+        """Directory mtimes; they change when files are added, removed or renamed."""
+        signature = []
+        for dir_path in self._recent_dirs():
+            try:
+                signature.append(os.stat(dir_path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+    
     def _get_recent_files(self) -> List[str]:
         """Get recently modified files."""
         recent = []
-        try:
-            home = Path.home()
-            
-            # Check common directories
-            dirs_to_check = [
-                home / "Desktop",
-                home / "Documents",
-                home / "Downloads",
-            ]
-            
-            for dir_path in dirs_to_check:
-                if dir_path.exists():
-                    files = sorted(
-                        dir_path.glob("*"),
-                        key=lambda x: x.stat().st_mtime if x.is_file() else 0,
-                        reverse=True
-                    )
-                    recent.extend([str(f) for f in files[:5] if f.is_file()])
-        except Exception:
-            pass
+        for dir_path in self._recent_dirs():
+            try:
+                with os.scandir(dir_path) as entries:
+                    files = []
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                files.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            recent.extend(path for _, path in heapq.nlargest(5, files))
         
         return recent[:10]
     
@@ -222,20 +380,20 @@ class ContextAwareness:
         state = {}
         
         try:
-            import psutil
-            state["cpu_percent"] = psutil.cpu_percent(interval=0.1)
-            state["memory_percent"] = psutil.virtual_memory().percent
-            state["disk_percent"] = psutil.disk_usage("/").percent
+            from ..utils.metrics_sampler import get_sampler
+            snapshot = get_sampler().latest()
+            state["cpu_percent"] = snapshot.cpu_percent
+            state["memory_percent"] = snapshot.memory.percent
+            state["disk_percent"] = snapshot.disk.percent
             state["battery"] = None
             
-            if hasattr(psutil, "sensors_battery"):
-                battery = psutil.sensors_battery()
-                if battery:
-                    state["battery"] = {
-                        "percent": battery.percent,
-                        "charging": battery.power_plugged
-                    }
-        except ImportError:
+            battery = snapshot.battery
+            if battery:
+                state["battery"] = {
+                    "percent": battery.percent,
+                    "charging": battery.power_plugged
+                }
+        except (ImportError, RuntimeError):
             pass
         
         return state
@@ -352,7 +510,7 @@ class ContextAwareness:
     def get_suggestions(self, context: ContextInfo = None, limit: int = 5) -> List[Suggestion]:
         """Get contextual suggestions based on current context."""
         if context is None:
-            context = self.get_current_context()
+            context = self.get_current_context(fields=self._rule_fields())
         
         suggestions = []
         
@@ -367,6 +525,15 @@ class ContextAwareness:
         
         return suggestions[:limit]
     
+    def _rule_fields(self) -> Set[str]:
+        """ContextInfo fields that the suggestion rules look at."""
+        return {
+            CONDITION_FIELDS[key]
+            for rule in self._suggestion_rules
+            for key in rule["condition"]
+            if key in CONDITION_FIELDS
+        }
+    
     def _matches_condition(self, condition: Dict, context: ContextInfo) -> bool:
         """Check if a condition matches the current context."""
         for key, value in condition.items():
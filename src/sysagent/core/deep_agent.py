@@ -3,6 +3,8 @@ Deep Agent - Advanced AI Agent with planning, reflection, and goal tracking.
 
 Features:
 - Multi-step task planning and decomposition
+- Dependency-aware parallel execution of plan steps
+- Plan cache that reuses past successful plans for repeat goals
 - Self-reflection and response evaluation
 - Automatic tool chaining
 - Goal tracking and progress monitoring
@@ -11,8 +13,12 @@ Features:
 - Reasoning transparency
 """
 
+import hashlib
 import json
+import platform
 import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Callable, Generator
 from dataclasses import dataclass, field, asdict
@@ -21,6 +27,32 @@ from pathlib import Path
 import threading
 
 
+# Subtasks of one plan that may run at the same time, for base agents that
+# declare ``thread_safe``; other agents run one subtask at a time
+MAX_PARALLEL_SUBTASKS = 4
+
+# Retry delays grow from the base delay, doubling up to the maximum
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 8.0
+
+# Plans kept in the plan cache, and seconds before a cached plan expires
+PLAN_CACHE_SIZE = 256
+PLAN_CACHE_TTL = 7 * 24 * 3600
+
+# Token overlap (Jaccard) at which a past goal counts as the same goal, when
+# reuse of similar plans is enabled
+PLAN_SIMILARITY_THRESHOLD = 0.8
+
+# Ratings at or below this drop the plan from the cache
+NEGATIVE_RATING = 2
+
+# Plain words ignored when normalizing goals
+_GOAL_STOPWORDS = {
+    'a', 'an', 'the', 'my', 'me', 'please', 'and', 'then', 'to', 'of',
+    'for', 'on', 'in', 'can', 'you', 'could', 'would', 'i', 'want',
+}
+
+
 class TaskStatus(Enum):
     """Status of a task."""
     PENDING = "pending"
@@ -66,6 +98,7 @@ class SubTask:
     duration_ms: int = 0
     attempts: int = 0
     max_attempts: int = 3
+    depends_on: List[str] = field(default_factory=list)  # IDs of prerequisite subtasks
 
 
 @dataclass
@@ -79,6 +112,7 @@ class TaskPlan:
     completed_at: str = ""
     total_duration_ms: int = 0
     reasoning: List[ReasoningStep] = field(default_factory=list)
+    max_parallel: int = 0  # 0 uses the agent's limit
     
     def __post_init__(self):
         if not self.created_at:
@@ -96,6 +130,163 @@ class Feedback:
     response_improved: bool = False
 
 
+def _is_goal_word(token: str) -> bool:
+    """Whether a normalized goal token is a plain word, not an argument."""
+    return token.isalpha()
+
+
+def normalize_goal(goal: str) -> str:
+    """Normalize a goal for plan cache lookups.
+    
+    Plain words are lowercased and filler words dropped. Everything else
+    (paths, file names, numbers, flags) is an argument and kept verbatim.
+    """
+    tokens = []
+    for raw in goal.split():
+        token = raw.strip('"\'`').rstrip(',;:!?')
+        word = token.rstrip('.')
+        if word.isalpha():
+            word = word.lower()
+            if word not in _GOAL_STOPWORDS:
+                tokens.append(word)
+        elif token:
+            tokens.append(token)
+    return ' '.join(tokens)
+
+
+def goal_arguments(goal: str) -> List[str]:
+    """The arguments of a goal, in order."""
+    return [t for t in normalize_goal(goal).split() if not _is_goal_word(t)]
+
+
+class PlanCache:
+    """
+    LRU cache of successful plan decompositions.
+    
+    Entries are keyed on the normalized goal plus an environment fingerprint
+    and expire after ``ttl`` seconds. If ``similarity`` is set, a goal with
+    no exact entry falls back to the most similar past goal (token Jaccard
+    similarity) with the same fingerprint and the same arguments in the
+    same order.
+    """
+    
+    def __init__(self, max_entries: int = PLAN_CACHE_SIZE, ttl: float = PLAN_CACHE_TTL,
+                 similarity: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'similar_hits': 0,
+            'learned_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(goal: str, fingerprint: str) -> str:
+        return f"{fingerprint}:{normalize_goal(goal)}"
+    
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['created_at'] > self.ttl
+    
+    def get(self, goal: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached steps for a goal, or None.
+        
+        Hits are counted here; callers ``record`` what a miss led to.
+        """
+        now = time.time()
+        key = self.make_key(goal, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                del self._entries[key]
+                entry = None
+            hit = 'hits'
+            
+            if entry is None:
+                tokens = set(normalize_goal(goal).split())
+                arguments = goal_arguments(goal)
+                best, best_score = None, self.similarity
+                for other_key, other in list(self._entries.items()):
+                    if self._expired(other, now):
+                        del self._entries[other_key]
+                        continue
+                    if self.similarity is None or other['fingerprint'] != fingerprint:
+                        continue
+                    if goal_arguments(other['goal']) != arguments:
+                        continue
+                    other_tokens = set(other['goal'].split())
+                    union = tokens | other_tokens
+                    score = len(tokens & other_tokens) / len(union) if union else 0.0
+                    if score >= best_score:
+                        best, best_score, key = other, score, other_key
+                entry = best
+                hit = 'similar_hits'
+            
+            if entry is None:
+                return None
+            
+            self._entries.move_to_end(key)
+            entry['hits'] += 1
+            self.stats[hit] += 1
+            return [dict(step) for step in entry['steps']]
+    
+    def record(self, stat: str):
+        """Count a lookup outcome decided outside the cache."""
+        with self._lock:
+            self.stats[stat] += 1
+    
+    def put(self, goal: str, fingerprint: str, steps: List[Dict[str, Any]]):
+        """Cache the steps of a plan that succeeded."""
+        key = self.make_key(goal, fingerprint)
+        with self._lock:
+            self._entries[key] = {
+                'goal': normalize_goal(goal),
+                'fingerprint': fingerprint,
+                'steps': [dict(step) for step in steps],
+                'created_at': time.time(),
+                'hits': 0,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, goal: str, fingerprint: Optional[str] = None) -> int:
+        """Drop cached plans for a goal (under any fingerprint if none given)."""
+        normalized = normalize_goal(goal)
+        with self._lock:
+            keys = [
+                k for k, e in self._entries.items()
+                if e['goal'] == normalized and fingerprint in (None, e['fingerprint'])
+            ]
+            for k in keys:
+                del self._entries[k]
+            self.stats['invalidations'] += len(keys)
+            return len(keys)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(e) for e in self._entries.values()]
+    
+    def load(self, entries: List[Dict[str, Any]]):
+        now = time.time()
+        with self._lock:
+            for entry in entries:
+                if self._expired(entry, now):
+                    continue
+                self._entries[f"{entry['fingerprint']}:{entry['goal']}"] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 class DeepAgent:
     """
     Advanced AI Agent with deep reasoning capabilities.
@@ -109,13 +300,21 @@ class DeepAgent:
     - Learning from user feedback
     """
     
-    def __init__(self, base_agent, config_dir: Optional[Path] = None):
+    def __init__(self, base_agent, config_dir: Optional[Path] = None,
+                 max_parallel: Optional[int] = None, reuse_similar_plans: bool = False):
         """
         Initialize DeepAgent.
         
         Args:
             base_agent: The underlying LangGraph agent
             config_dir: Directory for storing agent data
+            max_parallel: Most subtasks of a plan run at once (default
+                MAX_PARALLEL_SUBTASKS). Independent steps call
+                ``base_agent.process_command`` concurrently, so this only
+                applies when the base agent sets ``thread_safe = True``;
+                otherwise subtasks run one at a time
+            reuse_similar_plans: Also reuse cached plans of similar goals and
+                learned approaches, not just plans for the same goal
         """
         self.base_agent = base_agent
         self.config_dir = config_dir or Path.home() / ".config" / "sysagent" / "deep_agent"
@@ -124,6 +323,7 @@ class DeepAgent:
         self.plans_file = self.config_dir / "plans.json"
         self.feedback_file = self.config_dir / "feedback.json"
         self.patterns_file = self.config_dir / "patterns.json"
+        self.plan_cache_file = self.config_dir / "plan_cache.json"
         
         self.current_plan: Optional[TaskPlan] = None
         self.reasoning_callbacks: List[Callable[[ReasoningStep], None]] = []
@@ -132,6 +332,23 @@ class DeepAgent:
         self.plans_history: List[TaskPlan] = []
         self.feedback_history: List[Feedback] = []
         self.learned_patterns: Dict[str, Any] = {}
+        self.reuse_similar_plans = reuse_similar_plans
+        self.plan_cache = PlanCache(
+            similarity=PLAN_SIMILARITY_THRESHOLD if reuse_similar_plans else None
+        )
+        # Steps as planned, per plan ID, until the plan finishes
+        self._planned_steps: Dict[str, List[Dict[str, Any]]] = {}
+        self._fingerprint: Optional[str] = None
+        
+        if not getattr(base_agent, 'thread_safe', False):
+            # Shared conversation thread and memory; calls must not overlap
+            max_parallel = 1
+        self.max_parallel = max(1, max_parallel or MAX_PARALLEL_SUBTASKS)
+        self.retry_base_delay = RETRY_BASE_DELAY
+        self.retry_max_delay = RETRY_MAX_DELAY
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._emit_lock = threading.Lock()
         
         self._load_data()
     
@@ -156,6 +373,12 @@ class DeepAgent:
                 self.learned_patterns = json.loads(self.patterns_file.read_text())
         except Exception:
             pass
+        
+        try:
+            if self.plan_cache_file.exists():
+                self.plan_cache.load(json.loads(self.plan_cache_file.read_text()))
+        except Exception:
+            pass
     
     def chain_of_thought(self, task: str) -> Generator[Dict[str, Any], None, None]:
         """
@@ -294,6 +517,7 @@ class DeepAgent:
                 indent=2
             ))
             self.patterns_file.write_text(json.dumps(self.learned_patterns, indent=2))
+            self.plan_cache_file.write_text(json.dumps(self.plan_cache.to_list(), indent=2))
         except Exception:
             pass
     
@@ -307,11 +531,13 @@ class DeepAgent:
     
     def _emit_reasoning(self, step: ReasoningStep):
         """Emit a reasoning step to callbacks."""
-        for callback in self.reasoning_callbacks:
-            try:
-                callback(step)
-            except Exception:
-                pass
+        # Subtasks run on worker threads; callbacks see one step at a time
+        with self._emit_lock:
+            for callback in self.reasoning_callbacks:
+                try:
+                    callback(step)
+                except Exception:
+                    pass
     
     def _emit_progress(self, message: str, progress: float):
         """Emit progress update to callbacks."""
@@ -383,8 +609,14 @@ class DeepAgent:
                 content="Task requires multi-step planning, decomposing..."
             ))
             
-            subtasks = self._decompose_with_llm(goal)
+            subtasks = self._plan_from_cache(goal)
+            if subtasks is None:
+                subtasks = self._decompose_with_llm(goal)
             plan.subtasks = subtasks
+            self._planned_steps[plan.id] = [
+                {'description': st.description, 'tool': st.tool, 'depends_on': list(st.depends_on)}
+                for st in subtasks
+            ]
         else:
             # Simple single-step task
             plan.subtasks = [SubTask(
@@ -401,23 +633,73 @@ class DeepAgent:
         self.current_plan = plan
         return plan
     
+    def _environment_fingerprint(self) -> str:
+        """Hash of what a plan depends on besides the goal: host and tools."""
+        if self._fingerprint is None:
+            tools = sorted(
+                getattr(t, 'name', str(t)) for t in (getattr(self.base_agent, 'tools', None) or [])
+            )
+            llm = getattr(self.base_agent, 'llm', None)
+            env = {
+                'system': platform.system(),
+                'release': platform.release(),
+                'host': platform.node(),
+                'tools': tools,
+                'model': getattr(llm, 'model_name', None) or getattr(llm, 'model', None),
+            }
+            digest = hashlib.sha1(json.dumps(env, sort_keys=True, default=str).encode())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+    
+    def _plan_from_cache(self, goal: str) -> Optional[List[SubTask]]:
+        """Build subtasks from a cached plan or a learned approach, if any."""
+        steps = self.plan_cache.get(goal, self._environment_fingerprint())
+        source = "cached plan"
+        if steps is None:
+            approach = self.get_learned_approach(goal) if self.reuse_similar_plans else None
+            if not approach:
+                self.plan_cache.record('misses')
+                return None
+            self.plan_cache.record('learned_hits')
+            source = "learned approach"
+            steps = [
+                {'description': d, 'depends_on': [f"step_{i}"] if i else []}
+                for i, d in enumerate(approach)
+            ]
+        
+        self._emit_reasoning(ReasoningStep(
+            step_type=ReasoningType.PLANNING.value,
+            content=f"Reusing {source} with {len(steps)} steps"
+        ))
+        return [
+            SubTask(
+                id=f"step_{i+1}",
+                description=step.get('description', ''),
+                tool=step.get('tool', ''),
+                depends_on=list(step.get('depends_on', []))
+            )
+            for i, step in enumerate(steps)
+        ]
+    
     def _decompose_with_llm(self, goal: str) -> List[SubTask]:
         """Use LLM to decompose a complex goal into subtasks."""
         try:
             # Create a planning prompt
-            planning_prompt = f"""Break down this task into clear, sequential steps:
+            planning_prompt = f"""Break down this task into clear steps:
 
 Task: {goal}
 
 Respond with a JSON array of steps, each with:
 - "description": what to do
 - "tool": suggested tool to use (if known)
+- "depends_on": numbers (1-based) of earlier steps that must finish first;
+  use [] for steps that can run independently
 
 Example format:
 [
-  {{"description": "Check current system status", "tool": "system_info"}},
-  {{"description": "Identify issues", "tool": ""}},
-  {{"description": "Apply fixes", "tool": ""}}
+  {{"description": "Check disk usage", "tool": "system_info", "depends_on": []}},
+  {{"description": "Check memory usage", "tool": "monitoring", "depends_on": []}},
+  {{"description": "Summarize issues found", "tool": "", "depends_on": [1, 2]}}
 ]
 
 Only return the JSON array, nothing else."""
@@ -440,7 +722,8 @@ Only return the JSON array, nothing else."""
                         subtasks.append(SubTask(
                             id=f"step_{i+1}",
                             description=step.get('description', ''),
-                            tool=step.get('tool', '')
+                            tool=step.get('tool', ''),
+                            depends_on=self._parse_dependencies(step, i)
                         ))
                     return subtasks
         except Exception as e:
@@ -452,11 +735,59 @@ Only return the JSON array, nothing else."""
         # Fallback: simple decomposition based on keywords
         return [SubTask(id="step_1", description=goal)]
     
+    def _parse_dependencies(self, step: Dict[str, Any], index: int) -> List[str]:
+        """Get the prerequisite IDs of the step at ``index`` in an LLM plan.
+        
+        Only earlier steps are accepted, so the plan is always acyclic. A
+        step without ``depends_on`` follows the previous step, as in a
+        sequential plan.
+        """
+        if 'depends_on' not in step:
+            return [f"step_{index}"] if index > 0 else []
+        
+        raw = step.get('depends_on') or []
+        if not isinstance(raw, list):
+            raw = [raw]
+        
+        depends_on = []
+        for dep in raw:
+            try:
+                number = int(str(dep).replace('step_', ''))
+            except ValueError:
+                continue
+            dep_id = f"step_{number}"
+            if 1 <= number <= index and dep_id not in depends_on:
+                depends_on.append(dep_id)
+        return depends_on
+    
     # ==================== EXECUTION ====================
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool shared by all plans."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_parallel,
+                    thread_name_prefix="sysagent-deep-agent"
+                )
+            return self._executor
+    
+    def shutdown(self):
+        """Stop the subtask worker pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
     def execute_plan(self, plan: TaskPlan) -> Generator[Dict[str, Any], None, None]:
         """
-        Execute a plan step by step with progress updates.
+        Execute a plan with progress updates.
+        
+        Subtasks start as soon as everything in their ``depends_on`` has
+        completed, up to the plan's concurrency limit, and results are
+        yielded in completion order. A failed subtask goes through error
+        recovery; if that fails too, nothing new is started, running
+        subtasks finish and the rest are cancelled.
         
         Yields:
             Progress updates and results
@@ -465,42 +796,88 @@ Only return the JSON array, nothing else."""
         start_time = time.time()
         
         total_steps = len(plan.subtasks)
-        
-        for i, subtask in enumerate(plan.subtasks):
-            # Update progress
-            progress = i / total_steps
-            self._emit_progress(f"Step {i+1}/{total_steps}: {subtask.description[:50]}...", progress)
-            
-            yield {
-                'type': 'progress',
-                'step': i + 1,
-                'total': total_steps,
-                'description': subtask.description,
-                'progress': progress
-            }
-            
-            # Execute subtask with retry
-            result = self._execute_subtask(subtask)
+        limit = max(1, min(plan.max_parallel or self.max_parallel, self.max_parallel))
+        executor = self._get_executor()
+        
+        step_numbers = {st.id: i + 1 for i, st in enumerate(plan.subtasks)}
+        pending = list(plan.subtasks)
+        # Subtasks whose dependents may run: completed, or skipped by recovery
+        resolved = set()
+        running: Dict[Future, tuple] = {}
+        finished = 0
+        failed = False
+        
+        while pending or running:
+            # Start every ready subtask the concurrency limit allows
+            if not failed:
+                for subtask in list(pending):
+                    if len(running) >= limit:
+                        break
+                    if any(dep in step_numbers and dep not in resolved for dep in subtask.depends_on):
+                        continue
+                    pending.remove(subtask)
+                    step = step_numbers[subtask.id]
+                    progress = finished / total_steps
+                    self._emit_progress(f"Step {step}/{total_steps}: {subtask.description[:50]}...", progress)
+                    
+                    yield {
+                        'type': 'progress',
+                        'step': step,
+                        'id': subtask.id,
+                        'total': total_steps,
+                        'description': subtask.description,
+                        'progress': progress
+                    }
+                    
+                    running[executor.submit(self._execute_subtask, subtask)] = (subtask, False)
             
-            yield {
-                'type': 'step_result',
-                'step': i + 1,
-                'success': subtask.status == TaskStatus.COMPLETED.value,
-                'result': subtask.result,
-                'error': subtask.error
-            }
+            if not running:
+                # Failed, or left with subtasks whose prerequisites never resolve
+                for subtask in pending:
+                    subtask.status = TaskStatus.CANCELLED.value
+                if pending:
+                    plan.status = TaskStatus.FAILED.value
+                break
             
-            # Check if we should continue
-            if subtask.status == TaskStatus.FAILED.value:
-                # Try error recovery
-                if not self._attempt_recovery(subtask, plan):
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                subtask, recovering = running.pop(future)
+                try:
+                    ok = bool(future.result()) if recovering else future.result().get('success', False)
+                except Exception as e:
+                    subtask.status = TaskStatus.FAILED.value
+                    subtask.error = str(e)
+                    ok = False
+                
+                if not ok and not recovering and not failed:
+                    # Try error recovery off the scheduler thread as well
+                    running[executor.submit(self._attempt_recovery, subtask, plan)] = (subtask, True)
+                    continue
+                
+                finished += 1
+                if ok:
+                    resolved.add(subtask.id)
+                elif not failed:
+                    failed = True
                     plan.status = TaskStatus.FAILED.value
-                    break
+                
+                yield {
+                    'type': 'step_result',
+                    'step': step_numbers[subtask.id],
+                    'id': subtask.id,
+                    'success': subtask.status == TaskStatus.COMPLETED.value,
+                    'result': subtask.result,
+                    'error': subtask.error
+                }
         
         # Final status
         if all(st.status == TaskStatus.COMPLETED.value for st in plan.subtasks):
             plan.status = TaskStatus.COMPLETED.value
         
+        planned = self._planned_steps.pop(plan.id, None)
+        if planned and plan.status == TaskStatus.COMPLETED.value:
+            self.plan_cache.put(plan.goal, self._environment_fingerprint(), planned)
+        
         plan.completed_at = datetime.now().isoformat()
         plan.total_duration_ms = int((time.time() - start_time) * 1000)
         
@@ -549,9 +926,9 @@ Only return the JSON array, nothing else."""
             except Exception as e:
                 subtask.error = str(e)
             
-            # Wait before retry
+            # Back off before retrying
             if subtask.attempts < subtask.max_attempts:
-                time.sleep(1)
+                time.sleep(self._retry_delay(subtask.attempts))
         
         if subtask.status != TaskStatus.COMPLETED.value:
             subtask.status = TaskStatus.FAILED.value
@@ -564,6 +941,10 @@ Only return the JSON array, nothing else."""
             'error': subtask.error
         }
     
+    def _retry_delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number ``attempt``."""
+        return min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1))
+    
     def _attempt_recovery(self, failed_subtask: SubTask, plan: TaskPlan) -> bool:
         """Attempt to recover from a failed subtask."""
         self._emit_reasoning(ReasoningStep(
@@ -809,6 +1190,15 @@ Please provide an improved, more complete response."""
         if not plan:
             return
         
+        if feedback.rating <= NEGATIVE_RATING:
+            # Bad feedback - plan this goal afresh next time
+            self.plan_cache.invalidate(plan.goal)
+            pattern = self.learned_patterns.get(self._extract_pattern_key(plan.goal))
+            if pattern:
+                approach = [st.description for st in plan.subtasks if st.status == TaskStatus.COMPLETED.value]
+                if approach in pattern['approaches']:
+                    pattern['approaches'].remove(approach)
+        
         # Update patterns based on feedback
         if feedback.rating >= 4:
             # Good feedback - remember this approach
@@ -836,15 +1226,17 @@ Please provide an improved, more complete response."""
         keywords = ['check', 'show', 'list', 'find', 'create', 'delete', 'update', 
                    'clean', 'analyze', 'fix', 'run', 'start', 'stop']
         
+        # Arguments are part of the intent: "delete a.txt" is not "delete b.txt"
+        arguments = goal_arguments(goal)
         goal_lower = goal.lower()
         for kw in keywords:
             if kw in goal_lower:
                 # Find what comes after the keyword
                 idx = goal_lower.index(kw)
-                rest = goal_lower[idx:].split()[:3]
-                return ' '.join(rest)
+                words = [t for t in normalize_goal(goal[idx:]).split() if _is_goal_word(t)]
+                return ' '.join(words[:3] + arguments)
         
-        return goal_lower[:30]
+        return normalize_goal(goal)
     
     def get_learned_approach(self, goal: str) -> Optional[List[str]]:
         """
@@ -965,11 +1357,12 @@ Please provide an improved, more complete response."""
             'success_rate': successful / total_plans * 100 if total_plans > 0 else 0,
             'total_feedback': len(self.feedback_history),
             'average_rating': avg_rating,
-            'learned_patterns': len(self.learned_patterns)
+            'learned_patterns': len(self.learned_patterns),
+            'plan_cache': {**self.plan_cache.stats, 'size': len(self.plan_cache)}
         }
 
 
 # Factory function
-def create_deep_agent(base_agent) -> DeepAgent:
+def create_deep_agent(base_agent, max_parallel: Optional[int] = None) -> DeepAgent:
     """Create a DeepAgent wrapping a base agent."""
-    return DeepAgent(base_agent)
+    return DeepAgent(base_agent, max_parallel=max_parallel)
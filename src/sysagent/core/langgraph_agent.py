@@ -866,72 +866,12 @@ class LangGraphAgent:
         return tools
 
     def _register_tools_with_executor(self):
-        """Register all tools with the ToolExecutor."""
-        from ..tools import (
-            FileTool, SystemInfoTool, ProcessTool, NetworkTool, 
-            SystemControlTool, CodeGenerationTool, SecurityTool, 
-            AutomationTool, MonitoringTool, OSIntelligenceTool, LowLevelOSTool,
-            DocumentTool, SpreadsheetTool, AppTool, ClipboardTool,
-            BrowserTool, WindowTool, MediaTool, NotificationTool,
-            GitTool, APITool, PackageManagerTool,
-            WorkflowTool, SmartSearchTool, SystemInsightsTool, ContextMemoryTool,
-            KeyboardMouseTool, ScreenshotTool, SchedulerTool, ServiceTool,
-            EmailTool, VoiceTool, AuthTool,
-            OCRTool, ScreenRecorderTool, MacroTool
-        )
-        
-        # Register all tools for complete OS control
-        tools_to_register = [
-            # Core system tools
-            FileTool(),
-            SystemInfoTool(),
-            ProcessTool(),
-            NetworkTool(),
-            SystemControlTool(),
-            CodeGenerationTool(),
-            SecurityTool(),
-            AutomationTool(),
-            MonitoringTool(),
-            OSIntelligenceTool(),
-            LowLevelOSTool(),
-            # Document and data tools
-            DocumentTool(),
-            SpreadsheetTool(),
-            # Application and UI control
-            AppTool(),
-            ClipboardTool(),
-            BrowserTool(),
-            WindowTool(),
-            MediaTool(),
-            NotificationTool(),
-            # Input simulation
-            KeyboardMouseTool(),
-            ScreenshotTool(),
-            VoiceTool(),
-            # Development tools
-            GitTool(),
-            APITool(),
-            PackageManagerTool(),
-            # Automation and scheduling
-            WorkflowTool(),
-            SchedulerTool(),
-            ServiceTool(),
-            # Communication
-            EmailTool(),
-            # Memory and intelligence
-            SmartSearchTool(),
-            SystemInsightsTool(),
-            ContextMemoryTool(),
-            # Security
-            AuthTool(),
-            # Advanced media & automation
-            OCRTool(),
-            ScreenRecorderTool(),
-            MacroTool(),
-        ]
-        
-        for tool in tools_to_register:
-            self.tool_executor.register_tool(tool)
+        """Register all tools with the ToolExecutor.
+
+        Tools are registered lazily from the built-in catalog; each tool
+        module is imported and the tool constructed on its first execution.
+        """
+        self.tool_executor.register_builtin_tools()
 
     def _create_react_agent(self):
         """Create the React agent using langgraph.prebuilt with checkpointer."""
@@ -6,11 +6,17 @@ Provides comprehensive logging, audit trails, and event tracking.
 
 import os
 import json
+import time
+import queue
+import atexit
+import bisect
+import heapq
 import logging
 import threading
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
@@ -66,6 +72,467 @@ class AuditEvent:
         return json.dumps(self.to_dict())
 
 
+class AuditLogIndex:
+    """Sidecar index for one audit log file.
+    
+    The index records the time range of the file, sparse (timestamp, offset)
+    checkpoints, and the byte offsets of every event by event type and by
+    session. It is stored next to the log as ``<name>.jsonl.idx`` and is
+    brought up to date incrementally by parsing only lines appended since
+    the last update.
+    """
+    
+    VERSION = 1
+    CHECKPOINT_INTERVAL = 256
+    
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self.index_path = log_path.with_name(log_path.name + ".idx")
+        self._reset()
+    
+    def _reset(self):
+        self.inode: Optional[int] = None
+        self.size = 0
+        self.count = 0
+        self.min_ts: Optional[str] = None
+        self.max_ts: Optional[str] = None
+        self.checkpoints: List[Tuple[str, int]] = []
+        self.types: Dict[str, List[int]] = {}
+        self.sessions: Dict[str, List[int]] = {}
+    
+    def load(self):
+        """Load the persisted index, if any."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            self.inode = data["inode"]
+            self.size = data["size"]
+            self.count = data["count"]
+            self.min_ts = data["min_ts"]
+            self.max_ts = data["max_ts"]
+            self.checkpoints = [tuple(c) for c in data["checkpoints"]]
+            self.types = data["types"]
+            self.sessions = data["sessions"]
+        except Exception:
+            self._reset()
+    
+    def save(self):
+        """Persist the index atomically."""
+        data = {
+            "version": self.VERSION,
+            "inode": self.inode,
+            "size": self.size,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "checkpoints": self.checkpoints,
+            "types": self.types,
+            "sessions": self.sessions,
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except Exception:
+            pass
+    
+    def update(self) -> bool:
+        """Index any lines appended to the log since the last update.
+        
+        Returns:
+            True if the index changed.
+        """
+        try:
+            stat = self.log_path.stat()
+        except OSError:
+            return False
+        
+        if stat.st_ino != self.inode or stat.st_size < self.size:
+            # Different or truncated file: start over
+            self._reset()
+            self.inode = stat.st_ino
+        
+        if stat.st_size == self.size:
+            return False
+        
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partially written record; index it next time
+                    break
+                self._add(line, offset)
+                offset += len(line)
+            self.size = offset
+        
+        return True
+    
+    def _add(self, line: bytes, offset: int):
+        """Add one log line to the index."""
+        try:
+            data = json.loads(line)
+            timestamp = data["timestamp"]
+        except (ValueError, KeyError, TypeError):
+            return
+        
+        if self.count % self.CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append((timestamp, offset))
+        self.count += 1
+        
+        if self.min_ts is None or timestamp < self.min_ts:
+            self.min_ts = timestamp
+        if self.max_ts is None or timestamp > self.max_ts:
+            self.max_ts = timestamp
+        
+        self.types.setdefault(data.get("event_type"), []).append(offset)
+        session_id = data.get("session_id")
+        if session_id:
+            self.sessions.setdefault(session_id, []).append(offset)
+    
+    def overlaps(self, start_date: Optional[str], end_date: Optional[str]) -> bool:
+        """Check whether the file may hold events in the given time range."""
+        if self.count == 0:
+            return False
+        if start_date and self.max_ts < start_date:
+            return False
+        if end_date and self.min_ts > end_date:
+            return False
+        return True
+    
+    def byte_range(self, start_date: Optional[str], end_date: Optional[str]) -> Tuple[int, int]:
+        """Get the byte range that can hold events in the given time range."""
+        keys = [c[0] for c in self.checkpoints]
+        lo, hi = 0, self.size
+        if start_date:
+            i = bisect.bisect_left(keys, start_date)
+            if i > 0:
+                lo = self.checkpoints[i - 1][1]
+        if end_date:
+            i = bisect.bisect_right(keys, end_date)
+            if i < len(self.checkpoints):
+                hi = self.checkpoints[i][1]
+        return lo, hi
+    
+    def candidate_offsets(
+        self,
+        event_types: Optional[List[str]],
+        session_id: Optional[str],
+        lo: int,
+        hi: int
+    ) -> Optional[List[int]]:
+        """Get offsets of events matching the type/session filters.
+        
+        Returns:
+            Sorted offsets within ``[lo, hi)``, or None if no index filter
+            applies and the byte range should be scanned sequentially.
+        """
+        offsets = None
+        if event_types:
+            offsets = list(heapq.merge(*(self.types.get(t, []) for t in event_types)))
+        if session_id:
+            session_offsets = self.sessions.get(session_id, [])
+            if offsets is None:
+                offsets = session_offsets
+            else:
+                wanted = set(session_offsets)
+                offsets = [o for o in offsets if o in wanted]
+        if offsets is None:
+            return None
+        return offsets[bisect.bisect_left(offsets, lo):bisect.bisect_left(offsets, hi)]
+
+
+class DurabilityPolicy(Enum):
+    """When the audit log writer fsyncs written events to disk."""
+    NONE = "none"          # leave it to the OS
+    INTERVAL = "interval"  # fsync at most once per fsync interval
+    BATCH = "batch"        # fsync after every flushed batch
+
+
+class BackpressurePolicy(Enum):
+    """What the audit log writer does when its queue is full."""
+    BLOCK = "block"  # lossless: the caller waits for room in the queue
+    DROP = "drop"    # the event is dropped and counted
+
+
+class AuditLogWriter:
+    """Background writer for audit log events.
+    
+    Events are put on a bounded queue and written by a daemon thread in
+    batches. A batch is flushed once it reaches ``batch_size`` events or
+    ``flush_interval`` seconds after its first event, and fsynced according
+    to the durability policy. The writer is flushed and stopped at exit.
+    """
+    
+    def __init__(
+        self,
+        logger: "AuditLogger",
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        durability: DurabilityPolicy = DurabilityPolicy.INTERVAL,
+        fsync_interval: float = 5.0,
+        backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK
+    ):
+        self._logger = logger
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = DurabilityPolicy(durability)
+        self.fsync_interval = fsync_interval
+        self.backpressure = BackpressurePolicy(backpressure)
+        
+        self._file = None
+        self._size = 0
+        self._last_fsync = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self.events_written = 0
+        self.events_dropped = 0
+        self.batches_written = 0
+        self.write_errors = 0
+        self.max_queue_depth = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+    
+    def _ensure_started(self) -> bool:
+        """Start the writer thread on first use.
+        
+        Returns:
+            False if the writer has been closed.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._start_lock:
+            if self._closed:
+                return False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sysagent-audit-writer", daemon=True
+                )
+                self._thread.start()
+        return True
+    
+    def submit(self, line: str) -> bool:
+        """Queue a serialized event for writing.
+        
+        Returns:
+            False if the event was dropped.
+        """
+        if self._closed or not self._ensure_started():
+            # Late events (e.g. logged during interpreter shutdown)
+            with self._start_lock:
+                if self._thread is not None and self._thread.is_alive():
+                    # close() writes these once the thread has stopped
+                    try:
+                        self._queue.put_nowait(line)
+                    except queue.Full:
+                        with self._stats_lock:
+                            self.events_dropped += 1
+                        return False
+                    return True
+                self._write_batch([line])
+                self._close_file()
+            return True
+        
+        
+        if self.backpressure == BackpressurePolicy.BLOCK:
+            self._queue.put(line)
+        else:
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                with self._stats_lock:
+                    self.events_dropped += 1
+                return False
+        
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return True
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event queued so far has been written.
+        
+        Returns:
+            True if the flush completed within the timeout.
+        """
+        if self._closed or self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        start = time.monotonic()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        if timeout is not None:
+            timeout = max(0.0, timeout - (time.monotonic() - start))
+        return done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = 10.0):
+        """Flush pending events and stop the writer thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            # Set first so no submit can restart the thread during shutdown
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+        
+        if thread is not None and thread.is_alive():
+            # Still writing after the timeout; leave the file to it
+            return
+        
+        with self._start_lock:
+            # Events queued after the stop sentinel
+            late = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is not None:
+                    late.append(item)
+            if late:
+                self._write_batch(late)
+            self._close_file(sync=True)
+    
+    def _run(self):
+        """Writer thread main loop."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch: List[str] = []
+            markers: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            
+            while True:
+                if isinstance(item, threading.Event):
+                    # Flush request: write what we have right away
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+            
+            if batch:
+                self._write_batch(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+    
+    def _write_batch(self, lines: List[str]):
+        """Write a batch of lines and fsync according to the policy."""
+        start = time.perf_counter()
+        try:
+            self._open_current_file()
+            data = "".join(line + "\n" for line in lines)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data.encode("utf-8"))
+            self._sync_if_needed()
+            
+            if self._size > self._logger._max_file_size:
+                self._close_file(sync=self.durability != DurabilityPolicy.NONE)
+                self._logger._rotate_if_needed()
+        except Exception:
+            with self._stats_lock:
+                self.write_errors += 1
+            self._close_file()
+            return
+        
+        latency = time.perf_counter() - start
+        with self._stats_lock:
+            self.events_written += len(lines)
+            self.batches_written += 1
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            self._total_flush_latency += latency
+    
+    def _open_current_file(self):
+        """Open the current log file, switching files when the date changes."""
+        path = self._logger._get_log_file_path()
+        if path != self._logger._current_log_file:
+            self._close_file(sync=self.durability != DurabilityPolicy.NONE)
+            self._logger._current_log_file = path
+        
+        if self._file is None:
+            self._logger._rotate_if_needed()
+            self._file = open(self._logger._current_log_file, 'a', encoding='utf-8')
+            self._size = self._file.tell()
+    
+    def _sync_if_needed(self):
+        """fsync the log file according to the durability policy."""
+        if self.durability == DurabilityPolicy.BATCH:
+            os.fsync(self._file.fileno())
+        elif self.durability == DurabilityPolicy.INTERVAL:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+    
+    def _close_file(self, sync: bool = False):
+        """Close the open log file."""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+        except Exception:
+            pass
+        self._file = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer metrics."""
+        with self._stats_lock:
+            batches = self.batches_written
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "max_queue_depth": self.max_queue_depth,
+                "events_written": self.events_written,
+                "events_dropped": self.events_dropped,
+                "batches_written": batches,
+                "write_errors": self.write_errors,
+                "last_flush_latency_ms": round(self.last_flush_latency * 1000, 3),
+                "max_flush_latency_ms": round(self.max_flush_latency * 1000, 3),
+                "avg_flush_latency_ms": round(
+                    self._total_flush_latency / batches * 1000, 3
+                ) if batches else 0.0,
+                "durability": self.durability.value,
+                "backpressure": self.backpressure.value,
+            }
+
+
 class AuditLogger:
     """Manages audit logging and event tracking."""
     
@@ -80,12 +547,26 @@ class AuditLogger:
                     cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self, log_dir: Optional[str] = None, max_file_size_mb: int = 10):
+    def __init__(
+        self,
+        log_dir: Optional[str] = None,
+        max_file_size_mb: int = 10,
+        durability: DurabilityPolicy = DurabilityPolicy.INTERVAL,
+        backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5
+    ):
         """Initialize audit logger.
         
         Args:
             log_dir: Directory for log files. Defaults to ~/.sysagent/logs
             max_file_size_mb: Maximum size of each log file in MB.
+            durability: When written events are fsynced to disk.
+            backpressure: What to do when the write queue is full.
+            queue_size: Maximum number of events waiting to be written.
+            batch_size: Maximum number of events written per batch.
+            flush_interval: Maximum time in seconds an event waits in a batch.
         """
         if hasattr(self, '_initialized') and self._initialized:
             return
@@ -108,6 +589,21 @@ class AuditLogger:
         
         # Current log file
         self._current_log_file = self._get_log_file_path()
+        
+        # Sidecar indexes by log file path
+        self._indexes: Dict[Path, AuditLogIndex] = {}
+        self._index_lock = threading.Lock()
+        
+        # Background writer for the audit log
+        self._writer = AuditLogWriter(
+            self,
+            queue_size=queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            durability=durability,
+            backpressure=backpressure
+        )
+        atexit.register(self.close)
     
     def _generate_session_id(self) -> str:
         """Generate a unique session ID."""
@@ -152,7 +648,18 @@ class AuditLogger:
                 # Rename current file with timestamp
                 timestamp = datetime.now().strftime("%H%M%S")
                 new_name = self._current_log_file.stem + f"_{timestamp}.jsonl"
-                self._current_log_file.rename(self._log_dir / new_name)
+                new_path = self._log_dir / new_name
+                self._current_log_file.rename(new_path)
+                
+                # Keep the sidecar index with the renamed log
+                index_path = self._current_log_file.with_name(
+                    self._current_log_file.name + ".idx"
+                )
+                if index_path.exists():
+                    index_path.rename(new_path.with_name(new_name + ".idx"))
+                with self._index_lock:
+                    self._indexes.pop(self._current_log_file, None)
+                
                 self._current_log_file = self._get_log_file_path()
     
     def log_event(self, event: AuditEvent):
@@ -165,11 +672,8 @@ class AuditLogger:
         if not event.session_id:
             event.session_id = self._session_id
         
-        # Write to audit log
-        self._rotate_if_needed()
-        
-        with open(self._current_log_file, 'a', encoding='utf-8') as f:
-            f.write(event.to_json() + '\n')
+        # Hand off to the background writer
+        self._writer.submit(event.to_json())
         
         # Notify handlers
         for handler in self._event_handlers:
@@ -371,68 +875,180 @@ class AuditLogger:
         if handler in self._event_handlers:
             self._event_handlers.remove(handler)
     
-    def get_events(
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all logged events have been written to disk.
+        
+        Args:
+            timeout: Maximum time to wait in seconds.
+            
+        Returns:
+            True if all events were written within the timeout.
+        """
+        return self._writer.flush(timeout)
+    
+    def close(self):
+        """Flush pending events and stop the background writer."""
+        self._writer.close()
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get background writer metrics (queue depth, flush latency, ...)."""
+        return self._writer.get_stats()
+    
+    def _get_index(self, log_file: Path) -> AuditLogIndex:
+        """Get the up-to-date sidecar index for a log file."""
+        with self._index_lock:
+            index = self._indexes.get(log_file)
+            if index is None:
+                index = AuditLogIndex(log_file)
+                index.load()
+                self._indexes[log_file] = index
+            if index.update():
+                index.save()
+            return index
+    
+    def iter_events(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         event_types: Optional[List[str]] = None,
-        limit: int = 100
-    ) -> List[AuditEvent]:
-        """Query audit events.
+        session_id: Optional[str] = None,
+        flush_timeout: float = 2.0
+    ) -> Iterator[AuditEvent]:
+        """Stream audit events matching the given filters.
+        
+        Uses the sidecar index of each log file to skip files outside the
+        time range and to seek straight to events of the requested types
+        or session.
         
         Args:
             start_date: Start date filter (ISO format).
             end_date: End date filter (ISO format).
             event_types: Filter by event types.
-            limit: Maximum number of events to return.
+            session_id: Filter by session ID.
+            flush_timeout: Longest wait in seconds for queued events to be
+                written; after that only events already on disk are read.
             
-        Returns:
-            List of matching events.
+        Yields:
+            Matching events.
         """
-        events = []
+        # Make sure events still in the write queue are visible, without
+        # letting a stalled writer block the query
+        self.flush(flush_timeout)
         
-        # Get all audit log files
         log_files = sorted(self._log_dir.glob("audit_*.jsonl"), reverse=True)
         
         for log_file in log_files:
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if not line.strip():
-                            continue
-                        
-                        try:
-                            data = json.loads(line)
-                            
-                            # Apply filters
-                            if start_date and data["timestamp"] < start_date:
-                                continue
-                            if end_date and data["timestamp"] > end_date:
-                                continue
-                            if event_types and data["event_type"] not in event_types:
-                                continue
-                            
-                            events.append(AuditEvent(**data))
-                            
-                            if len(events) >= limit:
-                                return events
-                                
-                        except json.JSONDecodeError:
-                            continue
+                index = self._get_index(log_file)
+                if not index.overlaps(start_date, end_date):
+                    continue
+                
+                lo, hi = index.byte_range(start_date, end_date)
+                offsets = index.candidate_offsets(event_types, session_id, lo, hi)
+                
+                with open(log_file, 'rb') as f:
+                    if offsets is None:
+                        f.seek(lo)
+                        lines = self._read_lines(f, hi - lo)
+                    else:
+                        lines = self._read_at(f, offsets)
+                    
+                    for line in lines:
+                        event = self._parse_event(
+                            line, start_date, end_date, event_types, session_id
+                        )
+                        if event is not None:
+                            yield event
                             
-            except Exception:
+            except OSError:
                 continue
+    
+    @staticmethod
+    def _read_lines(f, length: int) -> Iterator[bytes]:
+        """Read the lines of the next ``length`` bytes of a file."""
+        remaining = length
+        for line in f:
+            if remaining <= 0:
+                break
+            remaining -= len(line)
+            yield line
+    
+    @staticmethod
+    def _read_at(f, offsets: List[int]) -> Iterator[bytes]:
+        """Read the lines starting at the given offsets."""
+        for offset in offsets:
+            f.seek(offset)
+            yield f.readline()
+    
+    @staticmethod
+    def _parse_event(
+        line: bytes,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        event_types: Optional[List[str]],
+        session_id: Optional[str]
+    ) -> Optional[AuditEvent]:
+        """Parse a log line and apply the query filters."""
+        if not line.strip():
+            return None
+        
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("timestamp"), str) \
+                or "event_type" not in data:
+            return None
+        
+        # Apply filters
+        if start_date and data["timestamp"] < start_date:
+            return None
+        if end_date and data["timestamp"] > end_date:
+            return None
+        if event_types and data["event_type"] not in event_types:
+            return None
+        if session_id and data.get("session_id") != session_id:
+            return None
+        
+        try:
+            return AuditEvent(**data)
+        except TypeError:
+            return None
+    
+    def get_events(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        limit: int = 100,
+        session_id: Optional[str] = None
+    ) -> List[AuditEvent]:
+        """Query audit events.
         
-        return events
+        Args:
+            start_date: Start date filter (ISO format).
+            end_date: End date filter (ISO format).
+            event_types: Filter by event types.
+            limit: Maximum number of events to return.
+            session_id: Filter by session ID.
+            
+        Returns:
+            List of matching events.
+        """
+        events = self.iter_events(start_date, end_date, event_types, session_id)
+        return list(islice(events, limit))
     
-    def get_session_events(self) -> List[AuditEvent]:
-        """Get all events from the current session.
+    def get_session_events(self, session_id: Optional[str] = None) -> List[AuditEvent]:
+        """Get all events from a session.
+        
+        Args:
+            session_id: Session to query. Defaults to the current session.
         
         Returns:
-            List of events from this session.
+            List of events from the session.
         """
         return self.get_events(
-            event_types=None,
+            session_id=session_id or self._session_id,
             limit=1000
         )
     
@@ -440,31 +1056,44 @@ class AuditLogger:
         self,
         output_path: str,
         format: str = "json",
+        limit: Optional[int] = None,
         **filters
     ) -> str:
         """Export events to a file.
         
+        Events are streamed from the log to the output file, so large
+        exports don't have to fit in memory.
+        
         Args:
             output_path: Path for output file.
             format: Output format ('json' or 'csv').
-            **filters: Filters to apply.
+            limit: Maximum number of events to export.
+            **filters: Filters to apply (see ``iter_events``).
             
         Returns:
             Path to exported file.
         """
-        events = self.get_events(**filters)
+        events = self.iter_events(**filters)
+        if limit is not None:
+            events = islice(events, limit)
         
         if format == "json":
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump([e.to_dict() for e in events], f, indent=2)
+                f.write("[")
+                for i, event in enumerate(events):
+                    f.write(",\n" if i else "\n")
+                    f.write(json.dumps(event.to_dict(), indent=2))
+                f.write("\n]\n")
         elif format == "csv":
             import csv
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                if events:
-                    writer = csv.DictWriter(f, fieldnames=events[0].to_dict().keys())
-                    writer.writeheader()
-                    for event in events:
-                        writer.writerow(event.to_dict())
+                writer = None
+                for event in events:
+                    row = event.to_dict()
+                    if writer is None:
+                        writer = csv.DictWriter(f, fieldnames=row.keys())
+                        writer.writeheader()
+                    writer.writerow(row)
         
         return output_path
     
@@ -486,6 +1115,11 @@ class AuditLogger:
                 
                 if file_date < cutoff:
                     log_file.unlink()
+                    index_path = log_file.with_name(log_file.name + ".idx")
+                    if index_path.exists():
+                        index_path.unlink()
+                    with self._index_lock:
+                        self._indexes.pop(log_file, None)
             except Exception:
                 continue
     
@@ -6,6 +6,7 @@ time-travel, dynamic routing, and feedback collection.
 Based on LangGraph best practices for human-in-the-loop patterns.
 """
 
+import bisect
 import threading
 import queue
 import time
@@ -77,6 +78,309 @@ class StateSnapshot:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Snapshots between full message lists in the snapshot log
+SNAPSHOT_KEYFRAME_INTERVAL = 16
+
+
+@dataclass
+class _SnapshotRecord:
+    """A snapshot stored as a delta against its parent.
+    
+    Its messages are the parent's first ``pinned`` messages, the parent's
+    messages after the next ``dropped`` ones, then ``added``. Keyframes also
+    carry the full list of message IDs.
+    """
+    id: str
+    timestamp: float
+    step_number: int
+    parent: Optional[str]
+    pinned: int
+    dropped: int
+    added: List[int]
+    length: int
+    pending_action: Optional[Dict[str, Any]]
+    tools_used: List[str]
+    metadata: Dict[str, Any]
+    keyframe: Optional[List[int]] = None
+
+
+class SnapshotLog:
+    """
+    Append-only log of state snapshots with shared message storage.
+    
+    Each message is copied once into a store and referenced by ID. A new
+    snapshot is diffed against the previous one, so it records only the new
+    messages and how many of its parent's messages it keeps. This covers
+    both growing histories and windows that drop their oldest messages after
+    a pinned prefix (such as a system message); any other change is stored
+    as the common prefix plus the rest. Diffing compares messages in place
+    and copies only the new ones. Every ``SNAPSHOT_KEYFRAME_INTERVAL``
+    snapshots a full message-ID list is kept, so rebuilding a snapshot
+    replays a bounded number of deltas.
+    
+    With ``spill_dir`` set, every snapshot and message is also appended to
+    JSON-lines files there, and snapshots trimmed from memory can still be
+    looked up.
+    """
+    
+    def __init__(self, max_size: int = 50, spill_dir: Optional[Union[str, Path]] = None):
+        self.max_size = max_size
+        self._records: List[_SnapshotRecord] = []
+        self._steps: List[int] = []  # step_number of each record, nondecreasing
+        self._by_id: Dict[str, _SnapshotRecord] = {}
+        self._messages: Dict[int, Dict[str, Any]] = {}
+        self._next_message_id = 0
+        self._head_ids: List[int] = []
+        self._since_keyframe = 0
+        self._trimmed = 0
+        
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._spill_offsets: Dict[str, int] = {}
+        self._spill_steps: List[Tuple[int, str]] = []
+        self._message_offsets: Dict[int, int] = {}
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._snapshots_file = self.spill_dir / "snapshots.jsonl"
+            self._messages_file = self.spill_dir / "messages.jsonl"
+            # Each log is private to this instance
+            self._snapshots_file.write_text("")
+            self._messages_file.write_text("")
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    # --- Writing ---
+    
+    def _intern(self, message: Dict[str, Any]) -> int:
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        stored = copy.deepcopy(message)
+        self._messages[message_id] = stored
+        if self.spill_dir:
+            self._message_offsets[message_id] = self._append_line(
+                self._messages_file, {"id": message_id, "message": stored}
+            )
+        return message_id
+    
+    def _diff(self, messages: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Get (pinned, dropped, reused) of ``messages`` against the head.
+        
+        The first ``reused`` entries of ``messages`` are already in the head.
+        """
+        head = self._head_ids
+        size = len(head)
+        if not size:
+            return 0, 0, 0
+        
+        # Find where the head ends in ``messages``, scanning back from the
+        # end past the new messages, then check the kept messages match
+        last = self._message(head[-1])
+        for end in range(len(messages) - 1, -1, -1):
+            if messages[end] != last:
+                continue
+            dropped = size - (end + 1)
+            if dropped < 0:
+                continue
+            for pinned in ((0,) if dropped == 0 else (0, 1)):
+                if end < pinned:
+                    continue
+                if all(messages[i] == self._message(head[i]) for i in range(pinned)) and all(
+                    messages[i] == self._message(head[i + dropped]) for i in range(pinned, end)
+                ):
+                    return pinned, dropped, end + 1
+        
+        # Anything else: keep the common prefix
+        prefix = 0
+        limit = min(size, len(messages))
+        while prefix < limit and messages[prefix] == self._message(head[prefix]):
+            prefix += 1
+        return prefix, size - prefix, prefix
+    
+    def append(self, snapshot_id: str, step_number: int, messages: List[Dict[str, Any]],
+               pending_action: Optional[Dict[str, Any]], tools_used: List[str],
+               metadata: Dict[str, Any]) -> _SnapshotRecord:
+        """Record a snapshot of ``messages`` after the current head."""
+        pinned, dropped, reused = self._diff(messages)
+        added = [self._intern(m) for m in messages[reused:]]
+        parent = self._records[-1].id if self._records else None
+        
+        ids = self._head_ids[:pinned] + self._head_ids[pinned + dropped:] + added
+        record = _SnapshotRecord(
+            id=snapshot_id,
+            timestamp=time.time(),
+            step_number=step_number,
+            parent=parent,
+            pinned=pinned,
+            dropped=dropped,
+            added=added,
+            length=len(ids),
+            pending_action=copy.deepcopy(pending_action) if pending_action else None,
+            tools_used=list(tools_used) if tools_used else [],
+            metadata=metadata or {},
+        )
+        self._since_keyframe += 1
+        if parent is None or self._since_keyframe >= SNAPSHOT_KEYFRAME_INTERVAL:
+            record.keyframe = list(ids)
+            self._since_keyframe = 0
+        
+        self._head_ids = ids
+        self._records.append(record)
+        self._steps.append(step_number)
+        self._by_id[snapshot_id] = record
+        if self.spill_dir:
+            offset = self._append_line(self._snapshots_file, record.__dict__)
+            self._spill_offsets[snapshot_id] = offset
+            self._spill_steps.append((step_number, snapshot_id))
+        
+        if len(self._records) > self.max_size:
+            self._trim()
+        return record
+    
+    def _trim(self):
+        """Drop the oldest in-memory snapshots beyond ``max_size``."""
+        excess = len(self._records) - self.max_size
+        first = self._records[excess]
+        if first.keyframe is None:
+            first.keyframe = self._ids_of(first)
+        for record in self._records[:excess]:
+            del self._by_id[record.id]
+        del self._records[:excess]
+        del self._steps[:excess]
+        
+        # Forget unreferenced messages once per max_size trims
+        self._trimmed += excess
+        if self._trimmed >= self.max_size:
+            self._trimmed = 0
+            live = set(self._records[0].keyframe)
+            for record in self._records:
+                live.update(record.added)
+            for message_id in list(self._messages):
+                if message_id not in live:
+                    del self._messages[message_id]
+    
+    def _append_line(self, path: Path, data: Dict[str, Any]) -> int:
+        with open(path, "a", encoding="utf-8") as f:
+            offset = f.tell()
+            f.write(json.dumps(data, default=str) + "\n")
+        return offset
+    
+    # --- Reading ---
+    
+    def _message(self, message_id: int) -> Dict[str, Any]:
+        message = self._messages.get(message_id)
+        if message is None and message_id in self._message_offsets:
+            with open(self._messages_file, "r", encoding="utf-8") as f:
+                f.seek(self._message_offsets[message_id])
+                message = json.loads(f.readline())["message"]
+        return message
+    
+    def _record(self, snapshot_id: str) -> Optional[_SnapshotRecord]:
+        record = self._by_id.get(snapshot_id)
+        if record is None and snapshot_id in self._spill_offsets:
+            with open(self._snapshots_file, "r", encoding="utf-8") as f:
+                f.seek(self._spill_offsets[snapshot_id])
+                record = _SnapshotRecord(**json.loads(f.readline()))
+        return record
+    
+    def _ids_of(self, record: _SnapshotRecord) -> List[int]:
+        """Rebuild a snapshot's message IDs from its nearest keyframe."""
+        chain = []
+        while record.keyframe is None:
+            chain.append(record)
+            record = self._record(record.parent)
+        ids = list(record.keyframe)
+        for delta in reversed(chain):
+            ids = ids[:delta.pinned] + ids[delta.pinned + delta.dropped:] + delta.added
+        return ids
+    
+    def materialize(self, record: _SnapshotRecord) -> StateSnapshot:
+        """Build the public snapshot for a record.
+        
+        Message dicts are shared with the log and must not be modified.
+        """
+        ids = self._head_ids if self._records and record is self._records[-1] else self._ids_of(record)
+        return StateSnapshot(
+            id=record.id,
+            timestamp=record.timestamp,
+            step_number=record.step_number,
+            messages=[self._message(i) for i in ids],
+            pending_action=record.pending_action,
+            tools_used=list(record.tools_used),
+            metadata=record.metadata,
+        )
+    
+    def records(self) -> List[_SnapshotRecord]:
+        return list(self._records)
+    
+    def find(self, snapshot_id: str) -> Optional[_SnapshotRecord]:
+        """Find a snapshot in memory, or in the spill files."""
+        return self._record(snapshot_id)
+    
+    def at_step(self, step_number: int) -> Optional[_SnapshotRecord]:
+        """Find the first snapshot taken at ``step_number``."""
+        i = bisect.bisect_left(self._steps, step_number)
+        if i < len(self._records) and self._steps[i] == step_number:
+            if i > 0 or not self._spill_steps:
+                return self._records[i]
+        if self._spill_steps:
+            j = bisect.bisect_left(self._spill_steps, (step_number, ""))
+            if j < len(self._spill_steps) and self._spill_steps[j][0] == step_number:
+                return self._record(self._spill_steps[j][1])
+        return None
+    
+    # --- Time travel ---
+    
+    def truncate_after(self, snapshot_id: str) -> Optional[_SnapshotRecord]:
+        """Make ``snapshot_id`` the head, dropping every later snapshot."""
+        record = self._by_id.get(snapshot_id)
+        if record is not None:
+            index = self._records.index(record)
+            for later in self._records[index + 1:]:
+                del self._by_id[later.id]
+            del self._records[index + 1:]
+            del self._steps[index + 1:]
+        else:
+            record = self._record(snapshot_id)
+            if record is None:
+                return None
+            # A spilled snapshot becomes the only one in memory
+            record.keyframe = self._ids_of(record)
+            for message_id in record.keyframe:
+                if message_id not in self._messages:
+                    self._messages[message_id] = self._message(message_id)
+            self._records = [record]
+            self._steps = [record.step_number]
+            self._by_id = {record.id: record}
+        
+        self._head_ids = self._ids_of(record)
+        self._since_keyframe = 0
+        walk = record
+        while walk.keyframe is None:
+            self._since_keyframe += 1
+            walk = self._record(walk.parent)
+        if self.spill_dir:
+            # Later snapshots stay in the file but are no longer reachable
+            position = self._spill_steps.index((record.step_number, record.id))
+            for _, later_id in self._spill_steps[position + 1:]:
+                self._spill_offsets.pop(later_id, None)
+            del self._spill_steps[position + 1:]
+        return record
+    
+    def clear(self):
+        self._records.clear()
+        self._steps.clear()
+        self._by_id.clear()
+        self._messages.clear()
+        self._head_ids = []
+        self._since_keyframe = 0
+        if self.spill_dir:
+            self._spill_offsets.clear()
+            self._spill_steps.clear()
+            self._message_offsets.clear()
+            self._snapshots_file.write_text("")
+            self._messages_file.write_text("")
+
+
 @dataclass
 class FeedbackEntry:
     """User feedback on agent actions."""
@@ -122,7 +426,8 @@ class HumanInTheLoopMiddleware:
     Based on LangGraph patterns for human-in-the-loop.
     """
     
-    def __init__(self, auto_approve: bool = False, timeout_seconds: int = 60):
+    def __init__(self, auto_approve: bool = False, timeout_seconds: int = 60,
+                 snapshot_dir: Optional[Union[str, Path]] = None):
         self.auto_approve = auto_approve
         self.timeout_seconds = timeout_seconds
         
@@ -150,8 +455,9 @@ class HumanInTheLoopMiddleware:
         self._pause_event.set()  # Not paused initially
         
         # Time-travel / State snapshots
-        self._state_history: List[StateSnapshot] = []
         self._max_history_size = 50
+        self._state_log = SnapshotLog(self._max_history_size, spill_dir=snapshot_dir)
+        self._snapshot_counter = 0
         self._current_step = 0
         
         # Feedback collection
@@ -519,25 +825,20 @@ class HumanInTheLoopMiddleware:
         tools_used: List[str] = None,
         metadata: Dict[str, Any] = None
     ) -> StateSnapshot:
-        """Save current state for time-travel."""
-        with self._lock:
-            snapshot_id = f"state_{len(self._state_history)}_{int(time.time())}"
-        
-        snapshot = StateSnapshot(
-            id=snapshot_id,
-            timestamp=time.time(),
-            step_number=self._current_step,
-            messages=copy.deepcopy(messages),
-            pending_action=copy.deepcopy(pending_action) if pending_action else None,
-            tools_used=list(tools_used) if tools_used else [],
-            metadata=metadata or {}
-        )
-        
-        self._state_history.append(snapshot)
+        """Save current state for time-travel.
         
-        # Trim history if needed
-        if len(self._state_history) > self._max_history_size:
-            self._state_history = self._state_history[-self._max_history_size:]
+        Only the messages that are new since the previous snapshot are
+        stored; the returned snapshot shares message dicts with the log.
+        """
+        with self._lock:
+            snapshot_id = f"state_{self._snapshot_counter}_{int(time.time())}"
+            self._snapshot_counter += 1
+            self._state_log.max_size = self._max_history_size
+            record = self._state_log.append(
+                snapshot_id, self._current_step, messages,
+                pending_action, tools_used, metadata
+            )
+            snapshot = self._state_log.materialize(record)
         
         if self._on_state_change:
             self._on_state_change(snapshot)
@@ -546,41 +847,38 @@ class HumanInTheLoopMiddleware:
     
     def get_state_history(self) -> List[StateSnapshot]:
         """Get all state snapshots."""
-        return list(self._state_history)
+        with self._lock:
+            return [self._state_log.materialize(r) for r in self._state_log.records()]
     
     def get_state_at(self, step_number: int) -> Optional[StateSnapshot]:
         """Get state snapshot at a specific step."""
-        for snapshot in self._state_history:
-            if snapshot.step_number == step_number:
-                return snapshot
-        return None
+        with self._lock:
+            record = self._state_log.at_step(step_number)
+            return self._state_log.materialize(record) if record else None
     
     def rollback_to(self, snapshot_id: str) -> Optional[StateSnapshot]:
         """Rollback to a specific state snapshot."""
-        for i, snapshot in enumerate(self._state_history):
-            if snapshot.id == snapshot_id:
-                # Remove all states after this one
-                self._state_history = self._state_history[:i + 1]
-                self._current_step = snapshot.step_number
-                return snapshot
-        return None
+        with self._lock:
+            # Remove all states after this one
+            record = self._state_log.truncate_after(snapshot_id)
+            if record is None:
+                return None
+            self._current_step = record.step_number
+            return self._state_log.materialize(record)
     
     def rollback_steps(self, num_steps: int) -> Optional[StateSnapshot]:
         """Rollback by a number of steps."""
-        if num_steps <= 0 or num_steps >= len(self._state_history):
-            return None
-        
-        target_index = len(self._state_history) - num_steps - 1
-        if target_index >= 0:
-            self._state_history = self._state_history[:target_index + 1]
-            snapshot = self._state_history[-1]
-            self._current_step = snapshot.step_number
-            return snapshot
-        return None
+        with self._lock:
+            records = self._state_log.records()
+            if num_steps <= 0 or num_steps >= len(records):
+                return None
+            target = records[len(records) - num_steps - 1]
+        return self.rollback_to(target.id)
     
     def clear_history(self):
         """Clear state history."""
-        self._state_history.clear()
+        with self._lock:
+            self._state_log.clear()
         self._current_step = 0
     
     # === Feedback Collection ===
@@ -18,6 +18,11 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+from ..utils.disk_usage import get_disk_usage
+from ..utils.log_follower import get_log_follower
+from ..utils.metrics_sampler import METRIC_UNITS, get_sampler
+from ..utils.timeseries import get_metrics_store
+
 
 class AlertLevel(Enum):
     """Alert severity levels."""
@@ -73,6 +78,7 @@ class MonitorConfig:
     disk_critical_percent: float = 95.0
     battery_warning_percent: float = 20.0
     battery_critical_percent: float = 10.0
+    security_events_warning: int = 5
     check_interval_seconds: int = 30
     alert_cooldown_minutes: int = 5
 
@@ -104,6 +110,7 @@ class ProactiveMonitor:
         self.alert_cooldowns: Dict[str, datetime] = {}
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._log_seq: Optional[int] = None
         
         self._load_alerts()
         self._load_config()
@@ -176,13 +183,25 @@ class ProactiveMonitor:
         if not PSUTIL_AVAILABLE:
             return
         
+        self._record_metrics()
         self._check_cpu()
         self._check_memory()
         self._check_disk()
         self._check_battery()
         self._check_network()
+        self._check_security_logs()
         self._check_maintenance()
     
+    def _record_metrics(self):
+        """Persist the latest sample; baselines and forecasts are built from it."""
+        try:
+            snapshot = get_sampler().latest(max_age=self.config.check_interval_seconds)
+            get_metrics_store().append_many(
+                snapshot.to_metrics(), timestamp=snapshot.timestamp, units=METRIC_UNITS
+            )
+        except Exception:
+            pass
+    
     def _can_alert(self, alert_type: str) -> bool:
         """Check if we can send an alert (cooldown)."""
         if alert_type in self.alert_cooldowns:
@@ -215,7 +234,7 @@ class ProactiveMonitor:
     def _check_cpu(self):
         """Check CPU usage."""
         try:
-            cpu = psutil.cpu_percent(interval=1)
+            cpu = get_sampler().latest().cpu_percent
             
             if cpu >= self.config.cpu_critical_percent:
                 self._send_alert(Alert(
@@ -243,7 +262,7 @@ class ProactiveMonitor:
     def _check_memory(self):
         """Check memory usage."""
         try:
-            mem = psutil.virtual_memory()
+            mem = get_sampler().latest().memory
             percent = mem.percent
             
             if percent >= self.config.memory_critical_percent:
@@ -308,7 +327,7 @@ class ProactiveMonitor:
     def _check_battery(self):
         """Check battery status."""
         try:
-            battery = psutil.sensors_battery()
+            battery = get_sampler().latest().battery
             if battery is None:
                 return
             
@@ -358,6 +377,38 @@ class ProactiveMonitor:
         except Exception:
             pass
     
+    def _check_security_logs(self):
+        """Check security log events appended since the last check."""
+        try:
+            follower = get_log_follower()
+            follower.poll()
+            if self._log_seq is None:
+                # Lines found on the first poll predate this monitor
+                self._log_seq = follower.last_seq
+                return
+            
+            events = follower.events_since(self._log_seq)
+            if not events:
+                return
+            self._log_seq = events[-1].seq
+            
+            if len(events) >= self.config.security_events_warning:
+                keywords: Dict[str, int] = {}
+                for event in events:
+                    keywords[event.keyword] = keywords.get(event.keyword, 0) + 1
+                summary = ", ".join(f"{k}: {v}" for k, v in sorted(keywords.items(), key=lambda x: -x[1]))
+                self._send_alert(Alert(
+                    id="",
+                    alert_type=AlertType.SECURITY_ISSUE.value,
+                    level=AlertLevel.WARNING.value,
+                    title="Security Log Activity",
+                    message=f"{len(events)} new security log events ({summary})",
+                    suggestion="Review recent entries in the system logs",
+                    action="Monitor security logs"
+                ))
+        except Exception:
+            pass
+    
     def _check_maintenance(self):
         """Check if maintenance is needed."""
         try:
@@ -368,15 +419,11 @@ class ProactiveMonitor:
                 Path.home() / "Library" / "Caches" if Path.home().joinpath("Library").exists() else None
             ]
             
-            total_temp_size = 0
-            for temp_dir in temp_dirs:
-                if temp_dir and temp_dir.exists():
-                    try:
-                        for f in temp_dir.rglob("*"):
-                            if f.is_file():
-                                total_temp_size += f.stat().st_size
-                    except Exception:
-                        pass
+            # Repeat checks only re-list directories that changed
+            report = get_disk_usage().scan(
+                [str(d) for d in temp_dirs if d], top_files=0, top_dirs=0
+            )
+            total_temp_size = report.total_bytes
             
             temp_size_gb = total_temp_size / (1024**3)
             if temp_size_gb > 5:  # More than 5GB in temp
@@ -470,15 +517,17 @@ class ProactiveMonitor:
             return results
         
         try:
+            snapshot = get_sampler().latest()
+            
             # CPU
-            cpu = psutil.cpu_percent(interval=1)
+            cpu = snapshot.cpu_percent
             results['metrics']['cpu_percent'] = cpu
             if cpu >= self.config.cpu_warning_percent:
                 results['issues'].append(f"High CPU: {cpu}%")
                 results['status'] = 'warning'
             
             # Memory
-            mem = psutil.virtual_memory()
+            mem = snapshot.memory
             results['metrics']['memory_percent'] = mem.percent
             results['metrics']['memory_available_gb'] = mem.available / (1024**3)
             if mem.percent >= self.config.memory_warning_percent:
@@ -486,7 +535,7 @@ class ProactiveMonitor:
                 results['status'] = 'warning'
             
             # Disk
-            disk = psutil.disk_usage('/')
+            disk = snapshot.disk
             results['metrics']['disk_percent'] = disk.percent
             results['metrics']['disk_free_gb'] = disk.free / (1024**3)
             if disk.percent >= self.config.disk_warning_percent:
@@ -494,7 +543,7 @@ class ProactiveMonitor:
                 results['status'] = 'warning'
             
             # Battery
-            battery = psutil.sensors_battery()
+            battery = snapshot.battery
             if battery:
                 results['metrics']['battery_percent'] = battery.percent
                 results['metrics']['battery_plugged'] = battery.power_plugged
@@ -1,16 +1,24 @@
 """
 Session Manager for SysAgent - Save, load, and manage chat sessions.
 Enterprise-grade conversation persistence.
+
+Each session is stored as an append-only JSON-lines log (``<id>.jsonl``): a
+header record followed by one record per message, so adding a message costs
+one short append instead of rewriting the whole session. Logs are compacted
+when superseded records pile up. The session index lives in memory and is
+persisted in SQLite (``sessions.db``), together with a full-text index over
+message content that backs ``list_sessions(search=...)``.
 """
 
 import json
 import os
+import sqlite3
+import threading
 import uuid
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
-import hashlib
 
 
 @dataclass
@@ -64,48 +72,163 @@ class Session:
         )
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    preview TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS message_rows (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_message_rows_session ON message_rows(session_id);
+"""
+
+# Message text, keyed by message_rows.id. The trigram tokenizer gives
+# case-insensitive substring matches; without FTS5 a plain table is scanned.
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS message_text USING fts5(content, tokenize='trigram')"
+_PLAIN_SCHEMA = "CREATE TABLE IF NOT EXISTS message_text (content TEXT NOT NULL)"
+
+# Compact a log once it holds more superseded records than this (or than live
+# messages, whichever is larger), so compaction cost stays amortized O(1)
+COMPACT_THRESHOLD = 64
+
+
 class SessionManager:
     """
     Manages chat sessions with persistence.
     
     Features:
     - Create, save, load, delete sessions
-    - Auto-save on changes
-    - Session search and filtering
+    - Auto-save on changes (append-only, one record per message)
+    - Session search over titles and message content
     - Export/import sessions
     - Session statistics
     """
     
-    def __init__(self, storage_dir: Optional[Path] = None):
+    def __init__(self, storage_dir: Optional[Path] = None, compact_threshold: int = COMPACT_THRESHOLD):
         self.storage_dir = storage_dir or Path.home() / ".sysagent" / "sessions"
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_threshold = compact_threshold
         self.current_session: Optional[Session] = None
         self.sessions_index: Dict[str, Dict] = {}
+        # Per-session log state: messages persisted and superseded records
+        self._logs: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.RLock()
+        
+        self._conn = sqlite3.connect(str(self.storage_dir / "sessions.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self._conn.execute(_PLAIN_SCHEMA)
+            self.full_text = False
+        self._conn.commit()
+        self._data_version = None
+        
         self._load_index()
     
     def _load_index(self):
-        """Load the sessions index."""
-        index_file = self.storage_dir / "index.json"
-        if index_file.exists():
-            try:
-                with open(index_file, 'r') as f:
-                    self.sessions_index = json.load(f)
-            except Exception:
-                self.sessions_index = {}
-        else:
-            self.sessions_index = {}
+        """Load the sessions index, importing a legacy index.json once."""
+        with self._lock:
+            index_file = self.storage_dir / "index.json"
+            if index_file.exists():
+                self._migrate_index(index_file)
+            self.sessions_index = {
+                row[0]: {
+                    "id": row[0],
+                    "title": row[1],
+                    "created_at": row[2],
+                    "updated_at": row[3],
+                    "message_count": row[4],
+                    "preview": row[5]
+                }
+                for row in self._conn.execute(
+                    "SELECT id, title, created_at, updated_at, message_count, preview FROM sessions"
+                )
+            }
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _sync_index(self):
+        """Reload the index if another process or manager changed it."""
+        with self._lock:
+            if self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+                self._load_index()
     
-    def _save_index(self):
-        """Save the sessions index."""
-        index_file = self.storage_dir / "index.json"
+    def _migrate_index(self, index_file: Path):
+        """Import index.json and the content of the legacy session files."""
         try:
-            with open(index_file, 'w') as f:
-                json.dump(self.sessions_index, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save session index: {e}")
+            with open(index_file, 'r') as f:
+                legacy = json.load(f)
+        except Exception:
+            legacy = {}
+        
+        for session_id, info in legacy.items():
+            self._write_index_row(info)
+            session = self._read_legacy(session_id)
+            if session:
+                self._reindex_messages(session)
+        self._conn.commit()
+        try:
+            index_file.rename(index_file.with_suffix(".json.migrated"))
+        except OSError:
+            pass
+    
+    def _write_index_row(self, entry: Dict):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions "
+            "(id, title, created_at, updated_at, message_count, preview) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entry["id"], entry.get("title", "Untitled"), entry.get("created_at", ""),
+                entry.get("updated_at", entry.get("created_at", "")),
+                entry.get("message_count", 0), entry.get("preview", "")
+            )
+        )
+    
+    def _index_messages(self, session_id: str, messages: List[Message]):
+        """Add message text to the content index (caller holds the lock)."""
+        for message in messages:
+            row_id = self._conn.execute(
+                "INSERT INTO message_rows (session_id) VALUES (?)", (session_id,)
+            ).lastrowid
+            self._conn.execute(
+                "INSERT INTO message_text (rowid, content) VALUES (?, ?)", (row_id, message.content)
+            )
+    
+    def _unindex_messages(self, session_id: str):
+        """Remove a session's message text from the content index."""
+        rows = [
+            row_id for (row_id,) in self._conn.execute(
+                "SELECT id FROM message_rows WHERE session_id = ?", (session_id,)
+            )
+        ]
+        self._conn.executemany("DELETE FROM message_text WHERE rowid = ?", ((r,) for r in rows))
+        self._conn.execute("DELETE FROM message_rows WHERE session_id = ?", (session_id,))
+    
+    def _reindex_messages(self, session: Session):
+        self._unindex_messages(session.id)
+        self._index_messages(session.id, session.messages)
+    
+    def _log_file(self, session_id: str) -> Path:
+        return self.storage_dir / f"{session_id}.jsonl"
     
-    def create_session(self, title: Optional[str] = None) -> Session:
-        """Create a new session."""
+    def _legacy_file(self, session_id: str) -> Path:
+        return self.storage_dir / f"{session_id}.json"
+    
+    def create_session(self, title: Optional[str] = None, make_current: bool = True) -> Session:
+        """Create a new session.
+        
+        Args:
+            title: Session title (default: based on the creation time).
+            make_current: Make the new session the current session.
+        """
         session_id = str(uuid.uuid4())[:8]
         now = datetime.now().isoformat()
         
@@ -122,15 +245,15 @@ class SessionManager:
             }
         )
         
-        self.current_session = session
-        self._update_index(session)
+        if make_current:
+            self.current_session = session
         self.save_session(session)
         
         return session
     
     def _update_index(self, session: Session):
-        """Update the session index."""
-        self.sessions_index[session.id] = {
+        """Update the session index (caller commits)."""
+        entry = {
             "id": session.id,
             "title": session.title,
             "created_at": session.created_at,
@@ -138,7 +261,8 @@ class SessionManager:
             "message_count": len(session.messages),
             "preview": self._get_preview(session)
         }
-        self._save_index()
+        self.sessions_index[session.id] = entry
+        self._write_index_row(entry)
     
     def _get_preview(self, session: Session, max_length: int = 100) -> str:
         """Get a preview of the session."""
@@ -152,95 +276,223 @@ class SessionManager:
     
     def add_message(self, role: str, content: str, **kwargs) -> Message:
         """Add a message to the current session."""
-        if not self.current_session:
-            self.create_session()
-        
-        message = Message(
-            role=role,
-            content=content,
-            timestamp=datetime.now().isoformat(),
-            **kwargs
-        )
-        
-        self.current_session.messages.append(message)
-        self.current_session.updated_at = datetime.now().isoformat()
-        self.current_session.metadata["message_count"] = len(self.current_session.messages)
-        
-        if role == "tool":
-            self.current_session.metadata["tool_calls"] = \
-                self.current_session.metadata.get("tool_calls", 0) + 1
-            self.current_session.metadata["last_tool"] = kwargs.get("tool_name")
-        
-        # Auto-title based on first user message
-        if role == "user" and len(self.current_session.messages) == 1:
-            self.current_session.title = content[:50] + ("..." if len(content) > 50 else "")
-        
-        self._update_index(self.current_session)
-        self.save_session(self.current_session)
-        
-        return message
+        with self._lock:
+            if not self.current_session:
+                self.create_session()
+            
+            message = Message(
+                role=role,
+                content=content,
+                timestamp=datetime.now().isoformat(),
+                **kwargs
+            )
+            
+            self.current_session.messages.append(message)
+            self.current_session.updated_at = datetime.now().isoformat()
+            self.current_session.metadata["message_count"] = len(self.current_session.messages)
+            
+            if role == "tool":
+                self.current_session.metadata["tool_calls"] = \
+                    self.current_session.metadata.get("tool_calls", 0) + 1
+                self.current_session.metadata["last_tool"] = kwargs.get("tool_name")
+            
+            # Auto-title based on first user message
+            if role == "user" and len(self.current_session.messages) == 1:
+                self.current_session.title = content[:50] + ("..." if len(content) > 50 else "")
+            
+            self.save_session(self.current_session)
+            
+            return message
+    
+    @staticmethod
+    def _state(session: Session) -> Dict[str, Any]:
+        return {
+            "title": session.title,
+            "updated_at": session.updated_at,
+            "metadata": session.metadata
+        }
     
     def save_session(self, session: Optional[Session] = None):
-        """Save a session to disk."""
+        """Save a session to disk.
+        
+        Messages added since the last save are appended to the session log;
+        the log is only rewritten when messages were removed, the session
+        was not read through this manager, or it is due for compaction.
+        """
         session = session or self.current_session
         if not session:
             return
         
-        session_file = self.storage_dir / f"{session.id}.json"
-        try:
-            with open(session_file, 'w') as f:
-                json.dump(session.to_dict(), f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save session: {e}")
+        with self._lock:
+            try:
+                log = self._logs.get(session.id)
+                if log is None or len(session.messages) < log["messages"]:
+                    self._compact(session)
+                    self._reindex_messages(session)
+                else:
+                    new = session.messages[log["messages"]:]
+                    records = [{"type": "message", "message": m.to_dict()} for m in new]
+                    if records:
+                        records[-1]["session"] = self._state(session)
+                    else:
+                        records.append({"type": "update", "session": self._state(session)})
+                        log["dead"] += 1
+                    with open(self._log_file(session.id), 'a') as f:
+                        f.write("".join(json.dumps(r) + "\n" for r in records))
+                    log["messages"] = len(session.messages)
+                    self._index_messages(session.id, new)
+                    if log["dead"] > max(self.compact_threshold, log["messages"]):
+                        self._compact(session)
+                self._update_index(session)
+                self._conn.commit()
+            except Exception as e:
+                print(f"Warning: Could not save session: {e}")
     
-    def load_session(self, session_id: str) -> Optional[Session]:
-        """Load a session from disk."""
-        session_file = self.storage_dir / f"{session_id}.json"
+    def _compact(self, session: Session):
+        """Rewrite a session log as a header plus its live messages."""
+        header = {"type": "session", "id": session.id, "created_at": session.created_at}
+        header.update(self._state(session))
+        path = self._log_file(session.id)
+        temp_file = path.with_suffix(".tmp")
+        with open(temp_file, 'w') as f:
+            f.write(json.dumps(header) + "\n")
+            for message in session.messages:
+                f.write(json.dumps({"type": "message", "message": message.to_dict()}) + "\n")
+        os.replace(temp_file, path)
+        self._logs[session.id] = {"messages": len(session.messages), "dead": 0}
+        
+        legacy = self._legacy_file(session.id)
+        if legacy.exists():
+            legacy.unlink()
+    
+    def _read_log(self, session_id: str) -> Optional[Session]:
+        """Replay a session log; converts legacy JSON sessions on first read."""
+        path = self._log_file(session_id)
+        if not path.exists():
+            session = self._read_legacy(session_id)
+            if session:
+                self._compact(session)
+            return session
+        
+        session = None
+        dead = 0
+        damaged = False
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from an interrupted append
+                    damaged = True
+                    continue
+                kind = record.get("type")
+                if kind == "session":
+                    session = Session.from_dict(dict(record, messages=[]))
+                elif session is None:
+                    damaged = True
+                elif kind == "message":
+                    session.messages.append(Message.from_dict(record["message"]))
+                elif kind == "update":
+                    dead += 1
+                if session is not None and "session" in record:
+                    state = record["session"]
+                    session.title = state.get("title", session.title)
+                    session.updated_at = state.get("updated_at", session.updated_at)
+                    session.metadata = state.get("metadata", session.metadata)
+        
+        if session is None:
+            return None
+        if damaged:
+            self._compact(session)
+        else:
+            self._logs[session_id] = {"messages": len(session.messages), "dead": dead}
+        return session
+    
+    def _read_legacy(self, session_id: str) -> Optional[Session]:
+        session_file = self._legacy_file(session_id)
         if not session_file.exists():
             return None
-        
         try:
             with open(session_file, 'r') as f:
-                data = json.load(f)
-            session = Session.from_dict(data)
-            self.current_session = session
-            return session
+                return Session.from_dict(json.load(f))
         except Exception as e:
             print(f"Warning: Could not load session: {e}")
             return None
     
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """Get a session without making it the current session."""
+        with self._lock:
+            if self.current_session and self.current_session.id == session_id:
+                return self.current_session
+            try:
+                return self._read_log(session_id)
+            except Exception as e:
+                print(f"Warning: Could not load session: {e}")
+                return None
+    
+    def load_session(self, session_id: str) -> Optional[Session]:
+        """Load a session from disk and make it the current session."""
+        with self._lock:
+            session = self.get_session(session_id)
+            if session:
+                self.current_session = session
+            return session
+    
     def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
-        session_file = self.storage_dir / f"{session_id}.json"
-        
-        try:
-            if session_file.exists():
-                session_file.unlink()
-            
-            if session_id in self.sessions_index:
-                del self.sessions_index[session_id]
-                self._save_index()
-            
-            if self.current_session and self.current_session.id == session_id:
-                self.current_session = None
-            
-            return True
-        except Exception as e:
-            print(f"Warning: Could not delete session: {e}")
-            return False
+        with self._lock:
+            try:
+                found = session_id in self.sessions_index
+                for session_file in (self._log_file(session_id), self._legacy_file(session_id)):
+                    if session_file.exists():
+                        session_file.unlink()
+                        found = True
+                
+                self.sessions_index.pop(session_id, None)
+                self._logs.pop(session_id, None)
+                self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                self._unindex_messages(session_id)
+                self._conn.commit()
+                
+                if self.current_session and self.current_session.id == session_id:
+                    self.current_session = None
+                
+                return found
+            except Exception as e:
+                print(f"Warning: Could not delete session: {e}")
+                return False
+    
+    def search_content(self, query: str) -> List[str]:
+        """Get the IDs of sessions with a message containing ``query`` (case-insensitive)."""
+        with self._lock:
+            if self.full_text and len(query) >= 3:
+                sql = ("SELECT DISTINCT r.session_id FROM message_text t "
+                       "JOIN message_rows r ON r.id = t.rowid WHERE message_text MATCH ?")
+                params = ('"' + query.replace('"', '""') + '"',)
+            else:
+                # Too short for trigrams (or no FTS5): scan the text
+                escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                sql = ("SELECT DISTINCT r.session_id FROM message_text t "
+                       "JOIN message_rows r ON r.id = t.rowid WHERE t.content LIKE ? ESCAPE '\\'")
+                params = (f"%{escaped}%",)
+            return [session_id for (session_id,) in self._conn.execute(sql, params)]
     
     def list_sessions(self, limit: int = 50, search: Optional[str] = None) -> List[Dict]:
-        """List all sessions with optional search."""
-        sessions = list(self.sessions_index.values())
-        
-        # Filter by search
-        if search:
-            search_lower = search.lower()
-            sessions = [
-                s for s in sessions
-                if search_lower in s.get("title", "").lower()
-                or search_lower in s.get("preview", "").lower()
-            ]
+        """List all sessions with optional search over titles and message content."""
+        self._sync_index()
+        with self._lock:
+            sessions = list(self.sessions_index.values())
+            
+            # Filter by search
+            if search:
+                search_lower = search.lower()
+                matches = set(self.search_content(search))
+                sessions = [
+                    s for s in sessions
+                    if s["id"] in matches
+                    or search_lower in s.get("title", "").lower()
+                    or search_lower in s.get("preview", "").lower()
+                ]
         
         # Sort by updated_at descending
         sessions.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
@@ -253,19 +505,18 @@ class SessionManager:
     
     def clear_current_session(self):
         """Clear the current session (start fresh)."""
-        if self.current_session:
-            self.current_session.messages = []
-            self.current_session.updated_at = datetime.now().isoformat()
-            self.current_session.metadata = {"message_count": 0, "tool_calls": 0}
-            self._update_index(self.current_session)
-            self.save_session()
+        with self._lock:
+            if self.current_session:
+                self.current_session.messages = []
+                self.current_session.updated_at = datetime.now().isoformat()
+                self.current_session.metadata = {"message_count": 0, "tool_calls": 0}
+                self.save_session()
     
     def export_session(self, session_id: str, format: str = "json") -> Optional[str]:
         """Export a session to a string."""
-        session = self.load_session(session_id) if session_id != self.current_session.id else self.current_session
+        session = self.get_session(session_id)
         if not session:
             return None
-        
         if format == "json":
             return json.dumps(session.to_dict(), indent=2)
         elif format == "markdown":
@@ -309,7 +560,6 @@ class SessionManager:
             session_data["title"] = f"Imported: {session_data.get('title', 'Untitled')}"
             
             session = Session.from_dict(session_data)
-            self._update_index(session)
             self.save_session(session)
             
             return session
@@ -319,6 +569,7 @@ class SessionManager:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get session statistics."""
+        self._sync_index()
         total_sessions = len(self.sessions_index)
         total_messages = sum(s.get("message_count", 0) for s in self.sessions_index.values())
         
@@ -346,3 +597,22 @@ class SessionManager:
                     deleted += 1
         
         return deleted
+    
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+
+_session_manager: Optional[SessionManager] = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Get the global session manager instance."""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = SessionManager()
+    return _session_manager
@@ -1,9 +1,19 @@
 """
 Smart Learning System for SysAgent.
 Learns user patterns, remembers preferences, and provides intelligent suggestions.
+
+Learning data lives in memory and is persisted by a background flusher: each
+change marks its store (commands, patterns, shortcuts, snippets, history)
+dirty, and the dirty stores are written together, atomically, shortly after
+the first change and again at shutdown.
 """
 
+import atexit
+import bisect
+import heapq
 import json
+import os
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -13,6 +23,26 @@ from collections import Counter
 from enum import Enum
 
 
+# Commands kept in the history
+HISTORY_LIMIT = 1000
+
+# Seconds between the first unsaved change and the write that persists it
+FLUSH_DELAY = 2.0
+
+# Followers remembered per command for next-command suggestions
+MAX_FOLLOWERS = 20
+
+# Prefix or substring matches up to this many are scored directly; larger
+# match sets are found while walking commands in score order
+MATERIALIZE_LIMIT = 512
+
+# New commands checked one by one before the substring blob is rebuilt
+BLOB_PENDING_LIMIT = 256
+
+# Commands walked in score order before substring matches are looked up
+WALK_LIMIT = 64
+
+
 class PatternType(Enum):
     """Types of patterns the system can learn."""
     COMMAND = "command"
@@ -31,6 +61,7 @@ class CommandUsage:
     success_rate: float = 1.0
     contexts: List[str] = field(default_factory=list)
     following_commands: List[str] = field(default_factory=list)
+    following_counts: Dict[str, int] = field(default_factory=dict)
 
 
 @dataclass 
@@ -66,6 +97,250 @@ class Snippet:
     created_at: str = ""
 
 
+class SuggestionIndex:
+    """Incremental index for ranking command suggestions.
+    
+    The static part of each command's score (frequency, recency, time of day
+    and success rate) is cached and only recomputed for commands that were
+    used, or for all commands when the wall-clock hour changes. Commands are
+    kept ordered by that base score, their lowercase text is kept in a sorted
+    array for prefix lookups and in one joined string for substring lookups,
+    and each context maps to the commands used in it. A query scores the
+    prefix, substring and context matches directly, then walks the remaining
+    commands in base-score order and stops as soon as no remaining command
+    could enter the top k.
+    """
+    
+    def __init__(self, usage: Dict[str, "CommandUsage"]):
+        self.usage = usage
+        self._bucket: Optional[Tuple] = None
+        self._now = datetime.now()
+        self._raw: Dict[str, float] = {}
+        self._base: Dict[str, float] = {}
+        self._last_used: Dict[str, Optional[datetime]] = {}
+        self._lower: Dict[str, str] = {}
+        self._order: List[Tuple[float, str]] = []
+        self._names: List[Tuple[str, str]] = []
+        self._contexts: Dict[str, set] = {}
+        self._key_contexts: Dict[str, Tuple[str, ...]] = {}
+        # Joined lowercase commands for substring search; commands added
+        # since it was built are checked one by one
+        self._blob = ""
+        self._blob_offsets: List[int] = []
+        self._blob_keys: List[str] = []
+        self._blob_pending: List[str] = []
+        self._substring_cache: Optional[Tuple[str, Optional[set]]] = None
+    
+    def __len__(self) -> int:
+        return len(self._base)
+    
+    def _parse_last_used(self, usage: "CommandUsage") -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(usage.last_used)
+        except Exception:
+            return None
+    
+    def _raw_score(self, key: str, usage: "CommandUsage") -> float:
+        """Frequency, recency and time-of-day score for the current bucket."""
+        score = min(usage.count / 10.0, 5.0)
+        
+        last = self._last_used[key]
+        if last is not None:
+            try:
+                # Clamped: commands used since the bucket started count as today
+                score += max(0, 5 - max(0, (self._now - last).days))
+            except TypeError:
+                pass
+        
+        hour_diff = abs(self._now.hour - usage.avg_time_of_day)
+        if hour_diff > 12:
+            hour_diff = 24 - hour_diff
+        score += max(0, 3 - hour_diff / 4)
+        return score
+    
+    def _rebuild(self):
+        """Recompute every cached score (on first use and hourly)."""
+        self._now = datetime.now()
+        self._bucket = (self._now.date(), self._now.hour)
+        self._raw.clear()
+        self._base.clear()
+        for key, usage in self.usage.items():
+            if key not in self._last_used:
+                self._last_used[key] = self._parse_last_used(usage)
+                self._lower[key] = usage.command.lower()
+            self._index_contexts(key, usage)
+            raw = self._raw_score(key, usage)
+            self._raw[key] = raw
+            self._base[key] = raw * usage.success_rate
+        self._order = sorted((-base, key) for key, base in self._base.items())
+        if len(self._names) != len(self._base):
+            self._names = sorted((self._lower[key], key) for key in self._base)
+            self._build_blob()
+    
+    def _index_contexts(self, key: str, usage: "CommandUsage"):
+        contexts = tuple(usage.contexts)
+        old = self._key_contexts.get(key, ())
+        if contexts == old:
+            return
+        for context in old:
+            keys = self._contexts.get(context)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._contexts[context]
+        for context in contexts:
+            self._contexts.setdefault(context, set()).add(key)
+        self._key_contexts[key] = contexts
+    
+    def _build_blob(self):
+        self._blob_keys = [key for _, key in self._names]
+        self._blob_offsets = []
+        offset = 0
+        for key in self._blob_keys:
+            self._blob_offsets.append(offset)
+            offset += len(self._lower[key]) + 1
+        self._blob = "\n".join(self._lower[key] for key in self._blob_keys)
+        self._blob_pending = []
+        self._substring_cache = None
+    
+    def refresh(self):
+        """Recompute cached scores if the hour changed."""
+        now = datetime.now()
+        if self._bucket != (now.date(), now.hour) or len(self._base) != len(self.usage):
+            self._rebuild()
+    
+    def update(self, key: str):
+        """Re-score one command after its usage changed."""
+        if self._bucket is None:
+            # Not built yet; the first query scores everything
+            return
+        usage = self.usage[key]
+        old = self._base.get(key)
+        if old is not None:
+            i = bisect.bisect_left(self._order, (-old, key))
+            if i < len(self._order) and self._order[i] == (-old, key):
+                del self._order[i]
+        else:
+            self._lower[key] = usage.command.lower()
+            bisect.insort(self._names, (self._lower[key], key))
+            self._blob_pending.append(key)
+            self._substring_cache = None
+            if len(self._blob_pending) > BLOB_PENDING_LIMIT:
+                self._build_blob()
+        
+        self._last_used[key] = self._parse_last_used(usage)
+        self._index_contexts(key, usage)
+        raw = self._raw_score(key, usage)
+        self._raw[key] = raw
+        self._base[key] = raw * usage.success_rate
+        bisect.insort(self._order, (-self._base[key], key))
+    
+    def _substring_matches(self, needle: str) -> Optional[set]:
+        """Get the keys whose command contains ``needle``.
+        
+        Returns None if there are more than ``MATERIALIZE_LIMIT``. The last
+        result is reused when the needle is extended, as it is while typing.
+        """
+        cached = self._substring_cache
+        if cached is not None and cached[1] is not None and needle.startswith(cached[0]):
+            hits = {key for key in cached[1] if needle in self._lower[key]}
+            self._substring_cache = (needle, hits)
+            return hits
+        
+        hits = {key for key in self._blob_pending if needle in self._lower[key]}
+        blob, offsets, keys = self._blob, self._blob_offsets, self._blob_keys
+        i = blob.find(needle)
+        while i != -1:
+            idx = bisect.bisect_right(offsets, i) - 1
+            key = keys[idx]
+            # Matches spanning the separator are not real matches
+            if needle in self._lower[key]:
+                hits.add(key)
+                if len(hits) > MATERIALIZE_LIMIT:
+                    hits = None
+                    break
+            if idx + 1 >= len(offsets):
+                break
+            i = blob.find(needle, offsets[idx + 1])
+        self._substring_cache = (needle, hits)
+        return hits
+    
+    def top(self, partial: str = "", context: str = "", limit: int = 5) -> List[Tuple[float, str]]:
+        """Get the ``limit`` best (score, key) pairs, best first."""
+        self.refresh()
+        if limit <= 0:
+            return []
+        
+        needle = partial.lower()
+        usage_of, raw_of, lower_of = self.usage, self._raw, self._lower
+        heap: List[Tuple[float, int, str]] = []
+        scored = set()
+        
+        def offer(key: str):
+            scored.add(key)
+            usage = usage_of[key]
+            bonus = 0.0
+            if needle:
+                text = lower_of[key]
+                if text.startswith(needle):
+                    bonus += 10
+                elif needle in text:
+                    bonus += 5
+            if context and context in usage.contexts:
+                bonus += 3
+            item = ((raw_of[key] + bonus) * usage.success_rate, -len(scored), key)
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        
+        # Scores are (raw + bonus) * success_rate with success_rate <= 1, so
+        # an unscored command can score at most its base plus the largest
+        # bonus it could still get
+        context_bonus = 0.0
+        if context:
+            in_context = self._contexts.get(context, ())
+            if len(in_context) <= MATERIALIZE_LIMIT:
+                for key in in_context:
+                    offer(key)
+            else:
+                context_bonus = 3.0
+        prefix_done = substring_done = not needle
+        if needle:
+            lo = bisect.bisect_left(self._names, (needle,))
+            hi = bisect.bisect_left(self._names, (needle + "\U0010ffff",))
+            if hi - lo <= MATERIALIZE_LIMIT:
+                for _, key in self._names[lo:hi]:
+                    if key not in scored:
+                        offer(key)
+                prefix_done = True
+        
+        steps = 0
+        lookup_substrings = prefix_done and not substring_done
+        for neg_base, key in self._order:
+            if len(heap) >= limit:
+                pending = context_bonus + (0 if substring_done else 5 if prefix_done else 10)
+                if -neg_base + pending <= heap[0][0]:
+                    break
+            if lookup_substrings and steps >= WALK_LIMIT:
+                # The walk is long; score the substring matches directly
+                # so that the remaining commands only need the context bonus
+                lookup_substrings = False
+                matches = self._substring_matches(needle)
+                if matches is not None:
+                    for match in matches:
+                        if match not in scored:
+                            offer(match)
+                    substring_done = True
+                    if len(heap) >= limit and -neg_base + context_bonus <= heap[0][0]:
+                        break
+            steps += 1
+            if key not in scored:
+                offer(key)
+        
+        return [(score, key) for score, _, key in sorted(heap, reverse=True)]
+
+
 class SmartLearningSystem:
     """
     Learns from user behavior to provide smarter suggestions.
@@ -79,7 +354,7 @@ class SmartLearningSystem:
     - Favorites
     """
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, flush_delay: float = FLUSH_DELAY):
         self.data_dir = data_dir or Path.home() / ".config" / "sysagent" / "learning"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
@@ -95,6 +370,17 @@ class SmartLearningSystem:
         self.snippets: Dict[str, Snippet] = {}
         self.command_history: List[Dict] = []
         
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty: set = set()
+        self._flush_seq = 0
+        self._written_seq: Dict[str, int] = {}
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._suggestion_index: Optional[SuggestionIndex] = None
+        
         self._load_data()
     
     def _load_data(self):
@@ -106,6 +392,9 @@ class SmartLearningSystem:
                 self.command_usage = {
                     k: CommandUsage(**v) for k, v in data.items()
                 }
+                for usage in self.command_usage.values():
+                    if usage.following_commands and not usage.following_counts:
+                        usage.following_counts = dict.fromkeys(usage.following_commands, 1)
             except Exception:
                 pass
         
@@ -136,98 +425,169 @@ class SmartLearningSystem:
         # Load history (last 1000 commands)
         if self.history_file.exists():
             try:
-                self.command_history = json.loads(self.history_file.read_text())[-1000:]
+                self.command_history = json.loads(self.history_file.read_text())[-HISTORY_LIMIT:]
             except Exception:
                 pass
     
-    def _save_data(self):
-        """Save all learning data."""
-        try:
-            # Save command usage
-            self.commands_file.write_text(json.dumps(
-                {k: asdict(v) for k, v in self.command_usage.items()},
-                indent=2
-            ))
-            
-            # Save patterns
-            self.patterns_file.write_text(json.dumps(
-                [asdict(p) for p in self.patterns],
-                indent=2
-            ))
-            
-            # Save shortcuts
-            self.shortcuts_file.write_text(json.dumps(
-                {k: asdict(v) for k, v in self.shortcuts.items()},
-                indent=2
-            ))
-            
-            # Save snippets
-            self.snippets_file.write_text(json.dumps(
-                {k: asdict(v) for k, v in self.snippets.items()},
-                indent=2
-            ))
-            
-            # Save history
-            self.history_file.write_text(json.dumps(self.command_history[-1000:]))
-        except Exception:
-            pass
+    def _store_files(self) -> Dict[str, Path]:
+        return {
+            "commands": self.commands_file,
+            "patterns": self.patterns_file,
+            "shortcuts": self.shortcuts_file,
+            "snippets": self.snippets_file,
+            "history": self.history_file,
+        }
+    
+    def _serialize(self, store: str) -> str:
+        """Serialize one store (caller holds the lock)."""
+        if store == "commands":
+            return json.dumps({k: asdict(v) for k, v in self.command_usage.items()}, indent=2)
+        if store == "patterns":
+            return json.dumps([asdict(p) for p in self.patterns], indent=2)
+        if store == "shortcuts":
+            return json.dumps({k: asdict(v) for k, v in self.shortcuts.items()}, indent=2)
+        if store == "snippets":
+            return json.dumps({k: asdict(v) for k, v in self.snippets.items()}, indent=2)
+        return json.dumps(self.command_history[-HISTORY_LIMIT:])
+    
+    def _mark_dirty(self, *stores: str):
+        """Schedule the given stores to be written by the flusher."""
+        with self._lock:
+            self._dirty.update(stores)
+            closed = self._closed
+            if not closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="sysagent-learning-flush", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.close)
+                self._wakeup.notify()
+        if closed:
+            # No flusher after shutdown; write through
+            self.flush()
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._wakeup.wait()
+                # Let changes that follow shortly after be written in one batch
+                deadline = time.monotonic() + self.flush_delay
+                while not self._closed and time.monotonic() < deadline:
+                    self._wakeup.wait(deadline - time.monotonic())
+                if self._closed:
+                    return
+            self.flush()
+    
+    def flush(self):
+        """Write all dirty stores to disk now."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._flush_seq += 1
+            seq = self._flush_seq
+            payloads = {store: self._serialize(store) for store in dirty}
+        
+        failed = []
+        files = self._store_files()
+        with self._write_lock:
+            for store, payload in payloads.items():
+                if self._written_seq.get(store, 0) > seq:
+                    # A later flush already wrote a newer copy
+                    continue
+                path = files[store]
+                temp_file = path.with_suffix(".tmp")
+                try:
+                    temp_file.write_text(payload)
+                    os.replace(temp_file, path)
+                    self._written_seq[store] = seq
+                except Exception:
+                    failed.append(store)
+        
+        if failed:
+            # Retry on the next flush
+            with self._lock:
+                self._dirty.update(failed)
+    
+    def close(self):
+        """Stop the flusher and write pending changes."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
     
     # === Command Learning ===
     
     def record_command(self, command: str, success: bool = True, 
                        context: str = "", duration_ms: int = 0):
         """Record a command execution for learning."""
-        now = datetime.now()
-        hour = now.hour + now.minute / 60.0
-        
-        # Get or create usage record
-        key = self._normalize_command(command)
-        if key not in self.command_usage:
-            self.command_usage[key] = CommandUsage(command=command)
-        
-        usage = self.command_usage[key]
-        usage.count += 1
-        usage.last_used = now.isoformat()
-        
-        # Update average time of day
-        if usage.avg_time_of_day == 0:
-            usage.avg_time_of_day = hour
-        else:
-            usage.avg_time_of_day = (usage.avg_time_of_day * 0.9) + (hour * 0.1)
-        
-        # Update success rate
-        usage.success_rate = (usage.success_rate * 0.95) + (1.0 if success else 0.0) * 0.05
-        
-        # Track context
-        if context and context not in usage.contexts:
-            usage.contexts.append(context)
-            if len(usage.contexts) > 10:
-                usage.contexts = usage.contexts[-10:]
-        
-        # Track command sequences
-        if self.command_history:
-            last_cmd = self._normalize_command(self.command_history[-1].get('command', ''))
-            if last_cmd in self.command_usage:
-                following = self.command_usage[last_cmd].following_commands
-                if key not in following:
-                    following.append(key)
-                    if len(following) > 20:
-                        self.command_usage[last_cmd].following_commands = following[-20:]
-        
-        # Add to history
-        self.command_history.append({
-            'command': command,
-            'timestamp': now.isoformat(),
-            'success': success,
-            'context': context,
-            'duration_ms': duration_ms
-        })
-        
-        # Detect patterns periodically
-        if len(self.command_history) % 10 == 0:
-            self._detect_patterns()
-        
-        self._save_data()
+        with self._lock:
+            now = datetime.now()
+            hour = now.hour + now.minute / 60.0
+            
+            # Get or create usage record
+            key = self._normalize_command(command)
+            if key not in self.command_usage:
+                self.command_usage[key] = CommandUsage(command=command)
+            
+            usage = self.command_usage[key]
+            usage.count += 1
+            usage.last_used = now.isoformat()
+            
+            # Update average time of day
+            if usage.avg_time_of_day == 0:
+                usage.avg_time_of_day = hour
+            else:
+                usage.avg_time_of_day = (usage.avg_time_of_day * 0.9) + (hour * 0.1)
+            
+            # Update success rate
+            usage.success_rate = (usage.success_rate * 0.95) + (1.0 if success else 0.0) * 0.05
+            
+            # Track context
+            if context and context not in usage.contexts:
+                usage.contexts.append(context)
+                if len(usage.contexts) > 10:
+                    usage.contexts = usage.contexts[-10:]
+            
+            # Track command sequences
+            if self.command_history:
+                last_cmd = self._normalize_command(self.command_history[-1].get('command', ''))
+                if last_cmd in self.command_usage:
+                    previous = self.command_usage[last_cmd]
+                    following = previous.following_commands
+                    if key not in following:
+                        following.append(key)
+                        if len(following) > MAX_FOLLOWERS:
+                            previous.following_commands = following[-MAX_FOLLOWERS:]
+                    counts = previous.following_counts
+                    counts[key] = counts.get(key, 0) + 1
+                    if len(counts) > MAX_FOLLOWERS:
+                        # Forget the least frequent other follower
+                        del counts[min((k for k in counts if k != key), key=counts.get)]
+            
+            if self._suggestion_index is not None and self._suggestion_index.usage is self.command_usage:
+                self._suggestion_index.update(key)
+            
+            # Add to history
+            self.command_history.append({
+                'command': command,
+                'timestamp': now.isoformat(),
+                'success': success,
+                'context': context,
+                'duration_ms': duration_ms
+            })
+            if len(self.command_history) > 2 * HISTORY_LIMIT:
+                # Trim in batches so the cost is amortized over many calls
+                del self.command_history[:-HISTORY_LIMIT]
+            
+            # Detect patterns periodically
+            if len(self.command_history) % 10 == 0:
+                self._detect_patterns()
+                self._mark_dirty("commands", "history", "patterns")
+            else:
+                self._mark_dirty("commands", "history")
     
     def _normalize_command(self, command: str) -> str:
         """Normalize command for comparison."""
@@ -243,66 +603,36 @@ class SmartLearningSystem:
     
     def get_suggestions(self, partial: str = "", context: str = "", 
                         limit: int = 5) -> List[Dict[str, Any]]:
-        """Get smart command suggestions."""
-        suggestions = []
-        now = datetime.now()
-        current_hour = now.hour
-        
-        for key, usage in self.command_usage.items():
-            score = 0.0
-            
-            # Frequency score
-            score += min(usage.count / 10.0, 5.0)
-            
-            # Recency score
-            try:
-                last = datetime.fromisoformat(usage.last_used)
-                days_ago = (now - last).days
-                score += max(0, 5 - days_ago)
-            except Exception:
-                pass
-            
-            # Time of day score (higher if usually used at this time)
-            hour_diff = abs(current_hour - usage.avg_time_of_day)
-            if hour_diff > 12:
-                hour_diff = 24 - hour_diff
-            score += max(0, 3 - hour_diff / 4)
+        """Get smart command suggestions.
+        
+        Commands are scored on frequency, recency, usual time of day, match
+        with ``partial`` (prefix or substring), ``context`` and success rate.
+        """
+        with self._lock:
+            index = self._suggestion_index
+            if index is None or index.usage is not self.command_usage:
+                index = self._suggestion_index = SuggestionIndex(self.command_usage)
             
-            # Partial match score
-            if partial:
-                if usage.command.lower().startswith(partial.lower()):
-                    score += 10
-                elif partial.lower() in usage.command.lower():
-                    score += 5
-            
-            # Context match score
-            if context and context in usage.contexts:
-                score += 3
-            
-            # Success rate bonus
-            score *= usage.success_rate
-            
-            suggestions.append({
-                'command': usage.command,
-                'score': score,
-                'count': usage.count,
-                'last_used': usage.last_used
-            })
-        
-        # Sort by score
-        suggestions.sort(key=lambda x: x['score'], reverse=True)
-        return suggestions[:limit]
+            suggestions = []
+            for score, key in index.top(partial, context, limit):
+                usage = self.command_usage[key]
+                suggestions.append({
+                    'command': usage.command,
+                    'score': score,
+                    'count': usage.count,
+                    'last_used': usage.last_used
+                })
+            return suggestions
     
     def get_next_command_suggestions(self, current_command: str, 
                                      limit: int = 3) -> List[str]:
         """Suggest commands that usually follow the current one."""
         key = self._normalize_command(current_command)
-        if key in self.command_usage:
-            following = self.command_usage[key].following_commands
-            # Sort by frequency in history
-            counter = Counter(following)
-            return [cmd for cmd, _ in counter.most_common(limit)]
-        return []
+        usage = self.command_usage.get(key)
+        if usage is None:
+            return []
+        counts = usage.following_counts
+        return heapq.nlargest(limit, counts, key=counts.get)
     
     # === Pattern Detection ===
     
@@ -405,30 +735,33 @@ class SmartLearningSystem:
         if not name or not command:
             return False
         
-        self.shortcuts[name.lower()] = Shortcut(
-            name=name,
-            command=command,
-            description=description,
-            created_at=datetime.now().isoformat()
-        )
-        self._save_data()
+        with self._lock:
+            self.shortcuts[name.lower()] = Shortcut(
+                name=name,
+                command=command,
+                description=description,
+                created_at=datetime.now().isoformat()
+            )
+            self._mark_dirty("shortcuts")
         return True
     
     def remove_shortcut(self, name: str) -> bool:
         """Remove a shortcut."""
-        if name.lower() in self.shortcuts:
-            del self.shortcuts[name.lower()]
-            self._save_data()
-            return True
+        with self._lock:
+            if name.lower() in self.shortcuts:
+                del self.shortcuts[name.lower()]
+                self._mark_dirty("shortcuts")
+                return True
         return False
     
     def get_shortcut(self, name: str) -> Optional[str]:
         """Get command for shortcut."""
-        shortcut = self.shortcuts.get(name.lower())
-        if shortcut:
-            shortcut.usage_count += 1
-            self._save_data()
-            return shortcut.command
+        with self._lock:
+            shortcut = self.shortcuts.get(name.lower())
+            if shortcut:
+                shortcut.usage_count += 1
+                self._mark_dirty("shortcuts")
+                return shortcut.command
         return None
     
     def list_shortcuts(self) -> List[Dict[str, Any]]:
@@ -449,32 +782,35 @@ class SmartLearningSystem:
                      tags: List[str] = None) -> str:
         """Save a command snippet."""
         snippet_id = f"snip_{int(time.time() * 1000)}"
-        self.snippets[snippet_id] = Snippet(
-            id=snippet_id,
-            name=name,
-            command=command,
-            description=description,
-            tags=tags or [],
-            created_at=datetime.now().isoformat()
-        )
-        self._save_data()
+        with self._lock:
+            self.snippets[snippet_id] = Snippet(
+                id=snippet_id,
+                name=name,
+                command=command,
+                description=description,
+                tags=tags or [],
+                created_at=datetime.now().isoformat()
+            )
+            self._mark_dirty("snippets")
         return snippet_id
     
     def delete_snippet(self, snippet_id: str) -> bool:
         """Delete a snippet."""
-        if snippet_id in self.snippets:
-            del self.snippets[snippet_id]
-            self._save_data()
-            return True
+        with self._lock:
+            if snippet_id in self.snippets:
+                del self.snippets[snippet_id]
+                self._mark_dirty("snippets")
+                return True
         return False
     
     def get_snippet(self, snippet_id: str) -> Optional[Dict[str, Any]]:
         """Get a snippet."""
-        snippet = self.snippets.get(snippet_id)
-        if snippet:
-            snippet.usage_count += 1
-            self._save_data()
-            return asdict(snippet)
+        with self._lock:
+            snippet = self.snippets.get(snippet_id)
+            if snippet:
+                snippet.usage_count += 1
+                self._mark_dirty("snippets")
+                return asdict(snippet)
         return None
     
     def search_snippets(self, query: str = "", tags: List[str] = None) -> List[Dict[str, Any]]:
@@ -510,10 +846,11 @@ class SmartLearningSystem:
     
     def toggle_favorite(self, snippet_id: str) -> bool:
         """Toggle favorite status of a snippet."""
-        if snippet_id in self.snippets:
-            self.snippets[snippet_id].is_favorite = not self.snippets[snippet_id].is_favorite
-            self._save_data()
-            return self.snippets[snippet_id].is_favorite
+        with self._lock:
+            if snippet_id in self.snippets:
+                self.snippets[snippet_id].is_favorite = not self.snippets[snippet_id].is_favorite
+                self._mark_dirty("snippets")
+                return self.snippets[snippet_id].is_favorite
         return False
     
     def get_favorites(self) -> List[Dict[str, Any]]:
@@ -586,11 +923,14 @@ class SmartLearningSystem:
 
 # Global instance
 _learning_system: Optional[SmartLearningSystem] = None
+_learning_system_lock = threading.Lock()
 
 
 def get_learning_system() -> SmartLearningSystem:
     """Get the global learning system instance."""
     global _learning_system
     if _learning_system is None:
-        _learning_system = SmartLearningSystem()
+        with _learning_system_lock:
+            if _learning_system is None:
+                _learning_system = SmartLearningSystem()
     return _learning_system
@@ -209,8 +209,8 @@ class MainWindow:
         """Initialize all smart features."""
         # Session Manager
         try:
-            from ..core.session_manager import SessionManager
-            self.session_manager = SessionManager()
+            from ..core.session_manager import get_session_manager
+            self.session_manager = get_session_manager()
             sessions = self.session_manager.list_sessions(limit=1)
             if sessions:
                 self.session_manager.load_session(sessions[0]['id'])
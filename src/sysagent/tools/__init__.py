@@ -3,42 +3,21 @@ System tools for SysAgent CLI.
 """
 
 from .base import BaseTool, ToolMetadata, ToolFactory, ToolExecutor, register_tool
-from .file_tool import FileTool
-from .system_info_tool import SystemInfoTool
-from .process_tool import ProcessTool
-from .network_tool import NetworkTool
-from .system_control_tool import SystemControlTool
-from .code_generation_tool import CodeGenerationTool
-from .security_tool import SecurityTool
-from .automation_tool import AutomationTool
-from .monitoring_tool import MonitoringTool
-from .os_intelligence_tool import OSIntelligenceTool
-from .low_level_os_tool import LowLevelOSTool
-from .app_tool import AppTool
-from .clipboard_tool import ClipboardTool
-from .screenshot_tool import ScreenshotTool
-from .voice_tool import VoiceTool
-from .auth_tool import AuthTool
-from .scheduler_tool import SchedulerTool
-from .service_tool import ServiceTool
-from .document_tool import DocumentTool
-from .spreadsheet_tool import SpreadsheetTool
-from .browser_tool import BrowserTool
-from .window_tool import WindowTool
-from .keyboard_mouse_tool import KeyboardMouseTool
-from .media_tool import MediaTool
-from .notification_tool import NotificationTool
-from .package_manager_tool import PackageManagerTool
-from .git_tool import GitTool
-from .api_tool import APITool
-from .email_tool import EmailTool
-from .workflow_tool import WorkflowTool
-from .smart_search_tool import SmartSearchTool
-from .system_insights_tool import SystemInsightsTool
-from .context_memory_tool import ContextMemoryTool
-from .ocr_tool import OCRTool
-from .screen_recorder_tool import ScreenRecorderTool
-from .macro_tool import MacroTool
+from .catalog import ToolSpec, BUILTIN_TOOLS
+
+# Tool classes are imported on first attribute access so that importing the
+# package does not pull in every tool module and its dependencies.
+_LAZY_CLASSES = {spec.class_name: spec for spec in BUILTIN_TOOLS}
+
+
+def __getattr__(name):
+    spec = _LAZY_CLASSES.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    tool_class = spec.load_class()
+    globals()[name] = tool_class
+    return tool_class
+
 
 __all__ = [
     "BaseTool",
@@ -46,6 +25,8 @@ __all__ = [
     "ToolFactory",
     "ToolExecutor",
     "register_tool",
+    "ToolSpec",
+    "BUILTIN_TOOLS",
     "FileTool",
     "SystemInfoTool",
     "ProcessTool",
@@ -3,6 +3,7 @@ Base tool classes for SysAgent CLI.
 """
 
 import json
+import threading
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -10,6 +11,7 @@ from typing import Dict, List, Any, Optional, Union, Type
 from pathlib import Path
 
 from ..types import ToolCategory, PermissionLevel
+from .catalog import ToolSpec, BUILTIN_TOOLS, get_builtin_spec, get_builtin_spec_by_class
 
 
 @dataclass
@@ -122,10 +124,18 @@ Permissions: {', '.join(self.permissions) if self.permissions else 'None'}
 
 
 class ToolFactory:
-    """Factory for creating tool instances."""
+    """Factory for creating tool instances.
+
+    Tools can be registered either as ready-made instances or as lazy
+    ``ToolSpec`` entries. Lazy tools are imported and constructed the first
+    time they are requested.
+    """
 
     def __init__(self):
         self._tools = {}
+        self._specs: Dict[str, ToolSpec] = {}
+        self._lock = threading.RLock()
+        self.load_times: Dict[str, Dict[str, float]] = {}
 
     def register_tool(self, tool_class: type):
         """Register a tool class."""
@@ -133,13 +143,51 @@ class ToolFactory:
         self._tools[tool_instance.metadata.name] = tool_instance
         return tool_class
 
+    def register_spec(self, spec: ToolSpec):
+        """Register a tool to be loaded on first use."""
+        with self._lock:
+            if spec.name not in self._tools:
+                self._specs[spec.name] = spec
+
     def get_tool(self, name: str) -> Optional[BaseTool]:
-        """Get a tool by name."""
-        return self._tools.get(name)
+        """Get a tool by name, loading it if it was registered lazily."""
+        tool = self._tools.get(name)
+        if tool is not None or name not in self._specs:
+            return tool
+
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is None:
+                tool = self._load_spec(self._specs[name])
+                self._tools[name] = tool
+                del self._specs[name]
+            return tool
+
+    def _load_spec(self, spec: ToolSpec) -> BaseTool:
+        """Import and construct a lazily registered tool."""
+        start_time = time.perf_counter()
+        tool_class = spec.load_class()
+        import_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        tool = tool_class()
+        construct_time = time.perf_counter() - start_time
+
+        self.load_times[spec.name] = {
+            'import': import_time,
+            'construct': construct_time,
+        }
+        return tool
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a tool has been constructed."""
+        return name in self._tools
 
     def list_tools(self) -> List[str]:
         """List all available tools."""
-        return list(self._tools.keys())
+        return list(self._tools.keys()) + [
+            name for name in self._specs if name not in self._tools
+        ]
 
     def get_tool_metadata(self, name: str) -> Optional[ToolMetadata]:
         """Get metadata for a tool."""
@@ -166,9 +214,28 @@ class ToolExecutor:
         """Register a tool with the executor."""
         self.factory._tools[tool.metadata.name] = tool
 
+    def register_lazy_tool(self, spec: ToolSpec):
+        """Register a tool that is only loaded when first executed."""
+        self.factory.register_spec(spec)
+
+    def register_builtin_tools(self, names: Optional[List[str]] = None):
+        """Lazily register the built-in tools, optionally limited to ``names``."""
+        for spec in BUILTIN_TOOLS:
+            if names is None or spec.name in names:
+                self.factory.register_spec(spec)
+
     def execute_tool(self, tool_name: str, **kwargs) -> ToolResult:
         """Execute a tool by name."""
-        tool = self.factory.get_tool(tool_name)
+        try:
+            tool = self.factory.get_tool(tool_name)
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                data={},
+                message=f"Tool '{tool_name}' failed to load: {str(e)}",
+                error=str(e)
+            )
+
         if not tool:
             return ToolResult(
                 success=False,
@@ -186,6 +253,10 @@ class ToolExecutor:
         """List all available tools."""
         return self.factory.list_tools()
 
+    def get_load_times(self) -> Dict[str, Dict[str, float]]:
+        """Get import and construction time for each tool loaded so far."""
+        return dict(self.factory.load_times)
+
 
 # Global tool registry
 _tool_registry: Dict[str, Type[BaseTool]] = {}
@@ -195,15 +266,16 @@ _tool_name_to_class: Dict[str, Type[BaseTool]] = {}
 
 
 def register_tool(tool_class: Type[BaseTool]) -> Type[BaseTool]:
-    """Decorator to register a tool."""
+    """Decorator to register a tool.
+
+    The tool is not instantiated here; its name is resolved lazily by
+    ``get_tool_class`` so that importing a tool module stays cheap.
+    """
     _tool_registry[tool_class.__name__] = tool_class
     
-    # Create a temporary instance to get the tool name
-    try:
-        temp_instance = tool_class()
-        _tool_name_to_class[temp_instance.metadata.name] = tool_class
-    except Exception:
-        pass
+    spec = get_builtin_spec_by_class(tool_class.__name__)
+    if spec is not None:
+        _tool_name_to_class[spec.name] = tool_class
     
     return tool_class
 
@@ -219,6 +291,16 @@ def get_tool_class(tool_name: str) -> Optional[Type[BaseTool]]:
     if tool_name in _tool_name_to_class:
         return _tool_name_to_class[tool_name]
     
+    # Built-in tools are imported on demand
+    spec = get_builtin_spec(tool_name)
+    if spec is not None:
+        try:
+            tool_class = spec.load_class()
+            _tool_name_to_class[tool_name] = tool_class
+            return tool_class
+        except Exception:
+            pass
+    
     # Try to find by class name patterns
     class_name_patterns = [
         tool_name,
@@ -247,6 +329,13 @@ def list_available_tools() -> List[Dict[str, Any]]:
     """List all available tools with their metadata."""
     tools = []
     
+    # Make sure every built-in tool has been imported and registered
+    for spec in BUILTIN_TOOLS:
+        try:
+            spec.load_class()
+        except Exception:
+            continue
+    
     for class_name, tool_class in _tool_registry.items():
         try:
             instance = tool_class()
@@ -0,0 +1,92 @@
+"""
+Catalog of built-in tools for SysAgent CLI.
+
+Each tool is described by a lightweight ``ToolSpec`` so that callers can
+register it without importing its module. The module is only imported, and
+the tool only constructed, the first time it is actually used.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Lightweight description of a tool that can be loaded on demand."""
+    name: str
+    module: str
+    class_name: str
+
+    def load_class(self):
+        """Import the tool module and return the tool class."""
+        module = importlib.import_module(self.module, package=__package__)
+        return getattr(module, self.class_name)
+
+
+BUILTIN_TOOLS: Tuple[ToolSpec, ...] = (
+    # Core system tools
+    ToolSpec("file_tool", ".file_tool", "FileTool"),
+    ToolSpec("system_info_tool", ".system_info_tool", "SystemInfoTool"),
+    ToolSpec("process_tool", ".process_tool", "ProcessTool"),
+    ToolSpec("network_tool", ".network_tool", "NetworkTool"),
+    ToolSpec("system_control_tool", ".system_control_tool", "SystemControlTool"),
+    ToolSpec("code_generation_tool", ".code_generation_tool", "CodeGenerationTool"),
+    ToolSpec("security_tool", ".security_tool", "SecurityTool"),
+    ToolSpec("automation_tool", ".automation_tool", "AutomationTool"),
+    ToolSpec("monitoring_tool", ".monitoring_tool", "MonitoringTool"),
+    ToolSpec("os_intelligence_tool", ".os_intelligence_tool", "OSIntelligenceTool"),
+    ToolSpec("low_level_os_tool", ".low_level_os_tool", "LowLevelOSTool"),
+    # Document and data tools
+    ToolSpec("document_tool", ".document_tool", "DocumentTool"),
+    ToolSpec("spreadsheet_tool", ".spreadsheet_tool", "SpreadsheetTool"),
+    # Application and UI control
+    ToolSpec("app_tool", ".app_tool", "AppTool"),
+    ToolSpec("clipboard_tool", ".clipboard_tool", "ClipboardTool"),
+    ToolSpec("browser_tool", ".browser_tool", "BrowserTool"),
+    ToolSpec("window_tool", ".window_tool", "WindowTool"),
+    ToolSpec("media_tool", ".media_tool", "MediaTool"),
+    ToolSpec("notification_tool", ".notification_tool", "NotificationTool"),
+    # Input simulation
+    ToolSpec("keyboard_mouse_tool", ".keyboard_mouse_tool", "KeyboardMouseTool"),
+    ToolSpec("screenshot_tool", ".screenshot_tool", "ScreenshotTool"),
+    ToolSpec("voice_tool", ".voice_tool", "VoiceTool"),
+    # Development tools
+    ToolSpec("git_tool", ".git_tool", "GitTool"),
+    ToolSpec("api_tool", ".api_tool", "APITool"),
+    ToolSpec("package_manager_tool", ".package_manager_tool", "PackageManagerTool"),
+    # Automation and scheduling
+    ToolSpec("workflow_tool", ".workflow_tool", "WorkflowTool"),
+    ToolSpec("scheduler_tool", ".scheduler_tool", "SchedulerTool"),
+    ToolSpec("service_tool", ".service_tool", "ServiceTool"),
+    # Communication
+    ToolSpec("email_tool", ".email_tool", "EmailTool"),
+    # Memory and intelligence
+    ToolSpec("smart_search_tool", ".smart_search_tool", "SmartSearchTool"),
+    ToolSpec("system_insights_tool", ".system_insights_tool", "SystemInsightsTool"),
+    ToolSpec("context_memory_tool", ".context_memory_tool", "ContextMemoryTool"),
+    # Security
+    ToolSpec("auth_tool", ".auth_tool", "AuthTool"),
+    # Advanced media & automation
+    ToolSpec("ocr_tool", ".ocr_tool", "OCRTool"),
+    ToolSpec("screen_recorder_tool", ".screen_recorder_tool", "ScreenRecorderTool"),
+    ToolSpec("macro_tool", ".macro_tool", "MacroTool"),
+)
+
+_BUILTIN_BY_NAME: Dict[str, ToolSpec] = {spec.name: spec for spec in BUILTIN_TOOLS}
+_BUILTIN_BY_CLASS: Dict[str, ToolSpec] = {spec.class_name: spec for spec in BUILTIN_TOOLS}
+
+
+def get_builtin_spec(tool_name: str) -> Optional[ToolSpec]:
+    """Get the spec of a built-in tool by tool name."""
+    return _BUILTIN_BY_NAME.get(tool_name)
+
+
+def get_builtin_spec_by_class(class_name: str) -> Optional[ToolSpec]:
+    """Get the spec of a built-in tool by class name."""
+    return _BUILTIN_BY_CLASS.get(class_name)
+
+
+def list_builtin_tools() -> List[str]:
+    """List the names of all built-in tools."""
+    return [spec.name for spec in BUILTIN_TOOLS]
@@ -4,13 +4,13 @@ File system operations tool for SysAgent CLI.
 
 import os
 import shutil
-import glob
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from .base import BaseTool, register_tool, ToolMetadata
 from ..types import ToolResult, ToolCategory
+from ..utils.fs_walk import DEFAULT_PRUNE, scan_tree
 
 
 @register_tool
@@ -59,12 +59,25 @@ class FileTool(BaseTool):
                 error=f"Unsupported action: {action}"
             )
     
+    @staticmethod
+    def _exclude_dirs(**kwargs) -> set:
+        """Directory names to skip: ``exclude_dirs``, plus DEFAULT_PRUNE if ``prune`` is set."""
+        exclude_dirs = kwargs.get("exclude_dirs") or []
+        if isinstance(exclude_dirs, str):
+            exclude_dirs = [exclude_dirs]
+        exclude = set(exclude_dirs)
+        if kwargs.get("prune", False):
+            exclude |= DEFAULT_PRUNE
+        return exclude
+    
     def _list_files(self, **kwargs) -> ToolResult:
         """List files in a directory."""
         path = kwargs.get("path", ".")
         pattern = kwargs.get("pattern", "*")
         recursive = kwargs.get("recursive", False)
         show_hidden = kwargs.get("show_hidden", False)
+        exclude_dirs = self._exclude_dirs(**kwargs)
+        max_results = kwargs.get("max_results")
         
         try:
             target_path = Path(path).resolve()
@@ -84,29 +97,22 @@ class FileTool(BaseTool):
                     error=f"Not a directory: {path}"
                 )
             
-            # Build search pattern
-            search_pattern = str(target_path / pattern)
-            if recursive:
-                search_pattern = str(target_path / "**" / pattern)
-            
             files = []
-            for file_path in glob.glob(search_pattern, recursive=recursive):
-                file_obj = Path(file_path)
-                
-                # Skip hidden files unless requested
-                if not show_hidden and file_obj.name.startswith("."):
-                    continue
-                
+            for entry in scan_tree(
+                target_path, pattern=pattern, recursive=recursive,
+                include_hidden=show_hidden, include_dirs=True,
+                exclude_dirs=exclude_dirs, max_results=max_results
+            ):
                 try:
-                    stat = file_obj.stat()
+                    stat = entry.stat()
                     files.append({
-                        "name": file_obj.name,
-                        "path": str(file_obj),
+                        "name": entry.name,
+                        "path": entry.path,
                         "size": stat.st_size,
                         "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "is_dir": file_obj.is_dir(),
-                        "is_file": file_obj.is_file(),
-                        "is_symlink": file_obj.is_symlink(),
+                        "is_dir": entry.is_dir(),
+                        "is_file": entry.is_file(),
+                        "is_symlink": entry.is_symlink(),
                     })
                 except (OSError, PermissionError):
                     # Skip files we can't access
@@ -436,22 +442,21 @@ class FileTool(BaseTool):
                 if not path.exists():
                     continue
                 
-                for pattern in patterns:
-                    for file_path in path.glob(pattern):
-                        try:
-                            if file_path.is_file():
-                                stat = file_path.stat()
-                                if stat.st_mtime < cutoff_time:
-                                    file_size = stat.st_size
-                                    file_path.unlink()
-                                    cleaned_files.append({
-                                        "path": str(file_path),
-                                        "size": file_size,
-                                        "age_days": (datetime.now().timestamp() - stat.st_mtime) / (24 * 60 * 60)
-                                    })
-                                    total_size += file_size
-                        except (OSError, PermissionError):
-                            continue
+                for entry in scan_tree(path, pattern=patterns, recursive=False, include_hidden=True):
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            if stat.st_mtime < cutoff_time:
+                                file_size = stat.st_size
+                                os.unlink(entry.path)
+                                cleaned_files.append({
+                                    "path": entry.path,
+                                    "size": file_size,
+                                    "age_days": (datetime.now().timestamp() - stat.st_mtime) / (24 * 60 * 60)
+                                })
+                                total_size += file_size
+                    except (OSError, PermissionError):
+                        continue
             
             return ToolResult(
                 success=True,
@@ -499,8 +504,11 @@ class FileTool(BaseTool):
             organized_files = {}
             total_moved = 0
             
-            for file_path in source_path.iterdir():
-                if file_path.is_file():
+            # Materialize the listing first since files are moved as we go
+            entries = list(scan_tree(source_path, recursive=False, include_hidden=True))
+            for entry in entries:
+                file_path = Path(entry.path)
+                if entry.is_file():
                     extension = file_path.suffix.lower()
                     
                     # Find the category for this extension
@@ -552,6 +560,9 @@ class FileTool(BaseTool):
         content_contains = kwargs.get("content_contains")
         recursive = kwargs.get("recursive", True)
         max_results = kwargs.get("max_results", 100)
+        min_size = kwargs.get("min_size")
+        max_size = kwargs.get("max_size")
+        exclude_dirs = self._exclude_dirs(**kwargs)
         
         try:
             search_path = Path(path).resolve()
@@ -565,36 +576,48 @@ class FileTool(BaseTool):
             
             found_files = []
             
-            # Build search pattern
-            search_pattern = str(search_path / pattern)
-            if recursive:
-                search_pattern = str(search_path / "**" / pattern)
-            
-            for file_path in glob.glob(search_pattern, recursive=recursive):
-                file_obj = Path(file_path)
-                
-                if not file_obj.is_file():
+            # Narrow content searches to files the content index says may match.
+            # The index is refreshed on its own interval; files it has not read
+            # in their current state (new, changed, binary, too large, pruned)
+            # are checked directly.
+            content_candidates = None
+            indexed = {}
+            if content_contains:
+                from ..utils.content_index import get_content_index
+                content_index = get_content_index()
+                content_candidates = content_index.candidates(
+                    content_contains, root=str(search_path)
+                )
+                if content_candidates is not None:
+                    indexed = content_index.indexed_files(str(search_path))
+            
+            # Content checks happen after the walk filters, so only let the
+            # walker stop early when every filter is applied during the walk
+            for entry in scan_tree(
+                search_path, pattern=pattern, recursive=recursive,
+                name_contains=name_contains, min_size=min_size, max_size=max_size,
+                exclude_dirs=exclude_dirs,
+                max_results=None if content_contains else max_results
+            ):
+                if not entry.is_file():
                     continue
                 
-                # Filter by name if specified
-                if name_contains and name_contains.lower() not in file_obj.name.lower():
+                try:
+                    stat = entry.stat()
+                except OSError:
                     continue
                 
                 # Filter by content if specified
-                if content_contains:
-                    try:
-                        with open(file_obj, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            if content_contains.lower() not in content.lower():
-                                continue
-                    except (OSError, UnicodeDecodeError):
-                        continue
-                
+                if content_candidates is not None and entry.path not in content_candidates \
+                        and indexed.get(entry.path) == (stat.st_size, stat.st_mtime):
+                    continue
+                if content_contains and not self._file_contains(Path(entry.path), content_contains):
+                    continue
                 found_files.append({
-                    "name": file_obj.name,
-                    "path": str(file_obj),
-                    "size": file_obj.stat().st_size,
-                    "modified": datetime.fromtimestamp(file_obj.stat().st_mtime).isoformat()
+                    "name": entry.name,
+                    "path": entry.path,
+                    "size": stat.st_size,
+                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
                 })
                 
                 if len(found_files) >= max_results:
@@ -621,6 +644,15 @@ class FileTool(BaseTool):
                 error=str(e)
             )
     
+    def _file_contains(self, file_obj: Path, text: str) -> bool:
+        """Check whether a file contains text (case-insensitive), line by line."""
+        needle = text.lower()
+        try:
+            with open(file_obj, 'r', encoding='utf-8', errors='ignore') as f:
+                return any(needle in line.lower() for line in f)
+        except (OSError, UnicodeDecodeError):
+            return False
+    
     def _get_file_info(self, **kwargs) -> ToolResult:
         """Get detailed information about a file."""
         path = kwargs.get("path")
@@ -716,5 +748,7 @@ class FileTool(BaseTool):
             "Clean up temp files: file_tool --action cleanup --paths ['/tmp', '/var/tmp']",
             "Organize downloads: file_tool --action organize --source_dir ~/Downloads",
             "Search for files: file_tool --action search --path . --name_contains 'test'",
+            "Find large logs: file_tool --action search --path /var/log --pattern '*.log' --min_size 10485760",
+            "Search skipping node_modules, venv and VCS dirs: file_tool --action search --path . --pattern '*.py' --prune true",
             "Get file info: file_tool --action info --path /path/to/file.txt"
         ] 
\ No newline at end of file
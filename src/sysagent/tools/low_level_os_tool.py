@@ -25,6 +25,7 @@ import json
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.metrics_sampler import get_sampler
 
 
 @register_tool
@@ -322,7 +323,7 @@ class LowLevelOSTool(BaseTool):
             
             # Get CPU usage per core
             try:
-                cpu_data["usage_per_core"] = psutil.cpu_percent(interval=1, percpu=True)
+                cpu_data["usage_per_core"] = get_sampler().latest().cpu_per_core
             except:
                 cpu_data["usage_per_core"] = "Not available"
 
@@ -6,12 +6,14 @@ import os
 import time
 import json
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.metrics_sampler import METRIC_UNITS, get_sampler
+from ..utils.timeseries import RESOLUTIONS, get_metrics_store
 
 
 @dataclass
@@ -57,6 +59,8 @@ class MonitoringTool(BaseTool):
         self.alerts_file = os.path.expanduser("~/.sysagent/alerts.json")
         self.metrics_file = os.path.expanduser("~/.sysagent/metrics.json")
         self._ensure_directories()
+        # Shared with the monitor and OS intelligence, which read the same files
+        self.metrics_store = get_metrics_store()
         self._load_data()
         self.monitoring_active = False
         self.monitoring_thread = None
@@ -69,7 +73,6 @@ class MonitoringTool(BaseTool):
     def _load_data(self):
         """Load alerts and metrics from files."""
         self.alerts = {}
-        self.metrics = []
         
         # Load alerts
         if os.path.exists(self.alerts_file):
@@ -81,12 +84,19 @@ class MonitoringTool(BaseTool):
             except:
                 pass
         
-        # Load metrics (keep only last 1000)
+        # Import metrics saved by older versions into the time-series store
         if os.path.exists(self.metrics_file):
             try:
                 with open(self.metrics_file, 'r') as f:
                     data = json.load(f)
-                    self.metrics = [Metric(**metric) for metric in data[-1000:]]
+                for metric in data:
+                    self.metrics_store.append(
+                        metric["name"], metric["value"],
+                        datetime.fromisoformat(metric["timestamp"]).timestamp(),
+                        metric.get("unit", ""), metric.get("category", "")
+                    )
+                self.metrics_store.flush()
+                os.replace(self.metrics_file, self.metrics_file + ".migrated")
             except:
                 pass
     
@@ -110,19 +120,8 @@ class MonitoringTool(BaseTool):
         with open(self.alerts_file, 'w') as f:
             json.dump(alerts_data, f, indent=2)
         
-        # Save metrics (keep only last 1000)
-        metrics_data = []
-        for metric in self.metrics[-1000:]:
-            metrics_data.append({
-                "name": metric.name,
-                "value": metric.value,
-                "unit": metric.unit,
-                "timestamp": metric.timestamp.isoformat(),
-                "category": metric.category
-            })
-        
-        with open(self.metrics_file, 'w') as f:
-            json.dump(metrics_data, f, indent=2)
+        # Metrics are written to the store as they are collected
+        self.metrics_store.flush()
     
     def _execute(self, action: str, alert_id: str = None, name: str = None,
                  condition: str = None, threshold: float = None, severity: str = "medium",
@@ -139,7 +138,7 @@ class MonitoringTool(BaseTool):
             elif action == "check_alerts":
                 return self._check_alerts()
             elif action == "get_metrics":
-                return self._get_metrics(duration)
+                return self._get_metrics(duration, kwargs.get("resolution"), kwargs.get("metric"))
             elif action == "start_monitoring":
                 return self._start_monitoring()
             elif action == "stop_monitoring":
@@ -284,14 +283,13 @@ class MonitoringTool(BaseTool):
     def _check_alerts(self) -> ToolResult:
         """Check all alerts against current metrics."""
         try:
-            import psutil
-            
             triggered_alerts = []
             
             # Get current system metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            snapshot = get_sampler().latest()
+            cpu_percent = snapshot.cpu_percent
+            memory = snapshot.memory
+            disk = snapshot.disk
             
             # Check each alert
             for alert in self.alerts.values():
@@ -341,40 +339,50 @@ class MonitoringTool(BaseTool):
                 error=str(e)
             )
     
-    def _get_metrics(self, duration: int = 60) -> ToolResult:
-        """Get system metrics for the specified duration."""
+    def _get_metrics(self, duration: int = 60, resolution: str = None, metric: str = None) -> ToolResult:
+        """Get system metrics for the specified duration.
+        
+        Args:
+            duration: How many seconds of history to return.
+            resolution: None for raw samples, or '1m', '5m', '1h' for
+                min/max/avg rollups.
+            metric: Only return this metric.
+        """
         try:
-            import psutil
-            
-            now = datetime.now()
-            cutoff_time = now - timedelta(seconds=duration)
+            if resolution is not None and resolution not in RESOLUTIONS:
+                return ToolResult(
+                    success=False,
+                    data={},
+                    message=f"Unknown resolution: {resolution}",
+                    error=f"Resolution must be one of: {', '.join(RESOLUTIONS)}"
+                )
             
-            # Filter metrics by time
-            recent_metrics = [
-                metric for metric in self.metrics
-                if metric.timestamp >= cutoff_time
-            ]
+            cutoff_time = time.time() - duration
+            names = [metric] if metric else self.metrics_store.names()
             
             # Group by category
             metrics_by_category = {}
-            for metric in recent_metrics:
-                if metric.category not in metrics_by_category:
-                    metrics_by_category[metric.category] = []
-                metrics_by_category[metric.category].append({
-                    "name": metric.name,
-                    "value": metric.value,
-                    "unit": metric.unit,
-                    "timestamp": metric.timestamp.isoformat()
-                })
+            total_metrics = 0
+            for name in names:
+                info = self.metrics_store.info(name)
+                for point in self.metrics_store.query(name, start=cutoff_time, resolution=resolution):
+                    point["timestamp"] = datetime.fromtimestamp(point["timestamp"]).isoformat()
+                    metrics_by_category.setdefault(info["category"], []).append({
+                        "name": name,
+                        "unit": info["unit"],
+                        **point
+                    })
+                    total_metrics += 1
             
             return ToolResult(
                 success=True,
                 data={
                     "metrics": metrics_by_category,
                     "duration_seconds": duration,
-                    "total_metrics": len(recent_metrics)
+                    "resolution": resolution or "raw",
+                    "total_metrics": total_metrics
                 },
-                message=f"Retrieved {len(recent_metrics)} metrics for the last {duration} seconds"
+                message=f"Retrieved {total_metrics} metrics for the last {duration} seconds"
             )
             
         except Exception as e:
@@ -444,26 +452,20 @@ class MonitoringTool(BaseTool):
     def _monitoring_loop(self):
         """Background monitoring loop."""
         try:
-            import psutil
-            
+            sampler = get_sampler()
+            iterations = 0
             while self.monitoring_active:
-                now = datetime.now()
-                
-                # Collect metrics
-                cpu_percent = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
-                disk = psutil.disk_usage('/')
+                # Read the shared sampler's latest snapshot
+                snapshot = sampler.latest()
+                now = datetime.fromtimestamp(snapshot.timestamp)
+                cpu_percent = snapshot.cpu_percent
+                memory = snapshot.memory
+                disk = snapshot.disk
                 
                 # Add metrics
-                self.metrics.extend([
-                    Metric("cpu_percent", cpu_percent, "%", now, "cpu"),
-                    Metric("memory_percent", memory.percent, "%", now, "memory"),
-                    Metric("memory_used", memory.used / 1024 / 1024 / 1024, "GB", now, "memory"),
-                    Metric("memory_available", memory.available / 1024 / 1024 / 1024, "GB", now, "memory"),
-                    Metric("disk_percent", disk.percent, "%", now, "disk"),
-                    Metric("disk_used", disk.used / 1024 / 1024 / 1024, "GB", now, "disk"),
-                    Metric("disk_free", disk.free / 1024 / 1024 / 1024, "GB", now, "disk")
-                ])
+                self.metrics_store.append_many(
+                    snapshot.to_metrics(), timestamp=now.timestamp(), units=METRIC_UNITS
+                )
                 
                 # Check alerts
                 for alert in self.alerts.values():
@@ -483,7 +485,8 @@ class MonitoringTool(BaseTool):
                         alert.last_triggered = now
                 
                 # Save data every 10 iterations
-                if len(self.metrics) % 10 == 0:
+                iterations += 1
+                if iterations % 10 == 0:
                     self._save_data()
                 
                 time.sleep(5)  # Collect metrics every 5 seconds
@@ -497,12 +500,12 @@ class MonitoringTool(BaseTool):
         try:
             import psutil
             
-            now = datetime.now()
-            
             # Get current metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            snapshot = get_sampler().latest()
+            now = datetime.fromtimestamp(snapshot.timestamp)
+            cpu_percent = snapshot.cpu_percent
+            memory = snapshot.memory
+            disk = snapshot.disk
             
             # Get CPU frequency
             try:
@@ -511,11 +514,7 @@ class MonitoringTool(BaseTool):
             except:
                 cpu_freq_current = 0
             
-            # Get load average
-            try:
-                load_avg = os.getloadavg()
-            except:
-                load_avg = (0, 0, 0)
+            load_avg = snapshot.load_average
             
             performance_data = {
                 "cpu": {
@@ -616,14 +615,14 @@ class MonitoringTool(BaseTool):
     def _get_system_health(self) -> ToolResult:
         """Get overall system health assessment."""
         try:
-            import psutil
-            
             health_score = 100
             issues = []
             warnings = []
             
+            snapshot = get_sampler().latest()
+            
             # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = snapshot.cpu_percent
             if cpu_percent > 90:
                 health_score -= 30
                 issues.append(f"High CPU usage: {cpu_percent:.1f}%")
@@ -632,7 +631,7 @@ class MonitoringTool(BaseTool):
                 warnings.append(f"Elevated CPU usage: {cpu_percent:.1f}%")
             
             # Check memory usage
-            memory = psutil.virtual_memory()
+            memory = snapshot.memory
             if memory.percent > 90:
                 health_score -= 30
                 issues.append(f"High memory usage: {memory.percent:.1f}%")
@@ -641,7 +640,7 @@ class MonitoringTool(BaseTool):
                 warnings.append(f"High memory usage: {memory.percent:.1f}%")
             
             # Check disk usage
-            disk = psutil.disk_usage('/')
+            disk = snapshot.disk
             if disk.percent > 95:
                 health_score -= 25
                 issues.append(f"Critical disk usage: {disk.percent:.1f}%")
@@ -650,7 +649,7 @@ class MonitoringTool(BaseTool):
                 warnings.append(f"High disk usage: {disk.percent:.1f}%")
             
             # Check for too many processes
-            process_count = len(list(psutil.process_iter()))
+            process_count = snapshot.process_count
             if process_count > 500:
                 health_score -= 10
                 warnings.append(f"High process count: {process_count}")
@@ -12,6 +12,7 @@ from dataclasses import dataclass
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.port_scanner import DEFAULT_CONCURRENCY, PortScanner, expand_hosts, parse_ports
 
 
 @dataclass
@@ -48,7 +49,8 @@ class NetworkTool(BaseTool):
             if action == "ping":
                 return self._ping_host(host, count, timeout)
             elif action == "port_scan":
-                return self._scan_ports(host, ports, protocol, timeout)
+                return self._scan_ports(host, ports, protocol, timeout,
+                                        kwargs.get("concurrency", DEFAULT_CONCURRENCY))
             elif action == "connectivity":
                 return self._test_connectivity(host, port, protocol, timeout)
             elif action == "dns":
@@ -171,8 +173,8 @@ class NetworkTool(BaseTool):
             )
     
     def _scan_ports(self, host: str, ports: str = None, protocol: str = "tcp", 
-                   timeout: int = 5) -> ToolResult:
-        """Scan ports on a host."""
+                   timeout: int = 5, concurrency: int = DEFAULT_CONCURRENCY) -> ToolResult:
+        """Scan ports on a host, a comma-separated host list or a CIDR range."""
         try:
             if not host:
                 return ToolResult(
@@ -182,52 +184,59 @@ class NetworkTool(BaseTool):
                     error="Missing host parameter"
                 )
             
-            # Parse ports to scan
-            port_list = []
-            if ports:
-                if "," in ports:
-                    port_list = [int(p.strip()) for p in ports.split(",")]
-                elif "-" in ports:
-                    start, end = map(int, ports.split("-"))
-                    port_list = list(range(start, end + 1))
-                else:
-                    port_list = [int(ports)]
-            else:
-                # Default common ports
-                port_list = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3306, 5432, 8080]
+            # Parse ports and hosts to scan
+            port_list = parse_ports(ports)
+            hosts = expand_hosts(host)
             
-            open_ports = []
-            closed_ports = []
+            scanner = PortScanner(timeout=timeout, concurrency=concurrency)
+            summary = scanner.scan(hosts, port_list)
             
-            for port in port_list:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(timeout)
-                    result = sock.connect_ex((host, port))
-                    sock.close()
-                    
-                    if result == 0:
-                        open_ports.append(port)
-                    else:
-                        closed_ports.append(port)
-                        
-                except Exception:
-                    closed_ports.append(port)
+            if len(hosts) == 1 and hosts[0] == host:
+                if host in summary.unresolved:
+                    raise socket.gaierror(f"Cannot resolve {host}")
+                open_ports = summary.ports(host, "open")
+                filtered_ports = summary.ports(host, "filtered")
+                scan_result = {
+                    "host": host,
+                    "protocol": protocol,
+                    "total_ports": len(port_list),
+                    "open_ports": open_ports,
+                    # Everything not open, as before; filtered is the subset that timed out
+                    "closed_ports": sorted(summary.ports(host, "closed") + filtered_ports),
+                    "filtered_ports": filtered_ports,
+                    "open_count": len(open_ports),
+                    "closed_count": len(port_list) - len(open_ports),
+                    "duration_ms": int(summary.duration * 1000)
+                }
+                return ToolResult(
+                    success=True,
+                    data=scan_result,
+                    message=f"Port scan completed: {len(open_ports)} open ports found"
+                )
             
+            host_results = {
+                h: {
+                    "open_ports": summary.ports(h, "open"),
+                    "filtered_count": len(summary.ports(h, "filtered")),
+                }
+                for h in summary.hosts
+            }
+            up = {h: r for h, r in host_results.items() if r["open_ports"]}
+            open_total = sum(len(r["open_ports"]) for r in host_results.values())
             scan_result = {
-                "host": host,
+                "target": host,
                 "protocol": protocol,
+                "total_hosts": len(hosts),
                 "total_ports": len(port_list),
-                "open_ports": open_ports,
-                "closed_ports": closed_ports,
-                "open_count": len(open_ports),
-                "closed_count": len(closed_ports)
+                "hosts_with_open_ports": up,
+                "unresolved_hosts": summary.unresolved,
+                "open_count": open_total,
+                "duration_ms": int(summary.duration * 1000)
             }
-            
             return ToolResult(
                 success=True,
                 data=scan_result,
-                message=f"Port scan completed: {len(open_ports)} open ports found"
+                message=f"Port scan completed: {open_total} open ports on {len(up)} of {len(hosts)} hosts"
             )
             
         except Exception as e:
@@ -20,6 +20,36 @@ import tempfile
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.disk_usage import get_disk_usage
+from ..utils.metrics_analysis import (
+    NUMPY_AVAILABLE, compute_baseline, detect_anomalies, forecast_threshold,
+    load_baselines, save_baselines, series_arrays,
+)
+from ..utils.metrics_sampler import METRIC_UNITS, get_sampler
+from ..utils.timeseries import RESOLUTIONS, get_metrics_store
+
+
+# Metrics with hour-of-week baselines and anomaly checks
+BASELINE_METRICS = ("cpu_percent", "memory_percent", "disk_percent")
+
+# Days of history a baseline is built from (what the 1m rollups hold)
+BASELINE_DAYS = 14
+
+# Fewest samples a baseline or anomaly check is computed from
+MIN_HISTORY_SAMPLES = 30
+
+# Seconds of recent samples checked for anomalies
+ANOMALY_LOOKBACK = 6 * 3600
+
+# Days of history forecasts are fitted to
+FORECAST_DAYS = 90
+
+# Forecast thresholds in percent
+DISK_THRESHOLDS = (90.0, 100.0)
+MEMORY_THRESHOLD = 95.0
+CPU_THRESHOLD = 90.0
+
+_METRIC_LABELS = {"cpu_percent": "CPU", "memory_percent": "Memory", "disk_percent": "Disk"}
 
 
 @dataclass
@@ -128,7 +158,7 @@ class OSIntelligenceTool(BaseTool):
             # Simple performance metrics
             performance_metrics = {
                 "cpu": {
-                    "overall_percent": psutil.cpu_percent(interval=1),
+                    "overall_percent": get_sampler().latest().cpu_percent,
                     "count": psutil.cpu_count()
                 },
                 "memory": {
@@ -226,10 +256,8 @@ class OSIntelligenceTool(BaseTool):
 
     def _get_performance_metrics(self) -> Dict[str, Any]:
         """Get comprehensive performance metrics."""
-        try:
-            cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
-        except Exception:
-            cpu_percent = [0] * psutil.cpu_count()
+        snapshot = get_sampler().latest()
+        cpu_percent = snapshot.cpu_per_core
         
         try:
             memory = psutil.virtual_memory()
@@ -248,7 +276,7 @@ class OSIntelligenceTool(BaseTool):
 
         return {
             "cpu": {
-                "overall_percent": psutil.cpu_percent(interval=1),
+                "overall_percent": snapshot.cpu_percent,
                 "per_core": cpu_percent,
                 "frequency": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
                 "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else None
@@ -277,7 +305,7 @@ class OSIntelligenceTool(BaseTool):
         recommendations = []
 
         # CPU Health
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = get_sampler().latest().cpu_percent
         if cpu_percent > 90:
             health_scores["cpu"] = 0.2
             issues.append("Critical CPU usage")
@@ -442,7 +470,7 @@ class OSIntelligenceTool(BaseTool):
         patterns = {}
         
         # CPU usage patterns
-        cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
+        cpu_percent = get_sampler().latest().cpu_per_core or [0.0]
         patterns["cpu"] = {
             "average_usage": sum(cpu_percent) / len(cpu_percent),
             "max_usage": max(cpu_percent),
@@ -802,32 +830,23 @@ class OSIntelligenceTool(BaseTool):
 
     def _find_large_files(self, min_size_mb: int = 100) -> List[Dict[str, Any]]:
         """Find large files in the system."""
-        large_files = []
-        
         # Search common directories
         search_dirs = [os.path.expanduser("~"), "/tmp", "/var/tmp"]
         
-        for search_dir in search_dirs:
-            if os.path.exists(search_dir):
-                try:
-                    for root, dirs, files in os.walk(search_dir):
-                        for file in files:
-                            try:
-                                file_path = os.path.join(root, file)
-                                if os.path.isfile(file_path):
-                                    size = os.path.getsize(file_path)
-                                    if size > min_size_mb * 1024 * 1024:
-                                        large_files.append({
-                                            "path": file_path,
-                                            "size_mb": size / (1024 * 1024),
-                                            "modified": datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                                        })
-                            except:
-                                continue
-                except:
-                    continue
-
-        return large_files[:10]  # Limit to top 10
+        report = get_disk_usage().scan(
+            search_dirs,
+            top_files=10,
+            top_dirs=0,
+            min_file_size=min_size_mb * 1024 * 1024
+        )
+        return [
+            {
+                "path": f["path"],
+                "size_mb": f["size"] / (1024 * 1024),
+                "modified": datetime.fromtimestamp(f["modified"]).isoformat()
+            }
+            for f in report.largest_files
+        ]
 
     def _estimate_performance_improvement(self, optimizations: List[Dict]) -> Dict[str, Any]:
         """Estimate performance improvement from optimizations."""
@@ -1116,46 +1135,184 @@ class OSIntelligenceTool(BaseTool):
             message="Intelligent automation setup completed"
         )
 
+    def _record_sample(self):
+        """Store the current sample unless the monitor already stored it."""
+        snapshot = get_sampler().latest(max_age=5)
+        store = get_metrics_store()
+        last = store.latest("cpu_percent")
+        if last is None or snapshot.timestamp > last[0]:
+            store.append_many(snapshot.to_metrics(), timestamp=snapshot.timestamp, units=METRIC_UNITS)
+        return snapshot
+
+    @staticmethod
+    def _baseline_file() -> Path:
+        return get_metrics_store().directory / "baseline.json"
+
+    @staticmethod
+    def _history(name: str, start: float, resolutions: Tuple[Optional[str], ...],
+                 min_samples: int = MIN_HISTORY_SAMPLES):
+        """Read a series at the first resolution with enough samples.
+
+        Returns (timestamps, values, resolution); rollups are coarser but
+        cover more time than the raw ring.
+        """
+        store = get_metrics_store()
+        ts = values = None
+        resolution = None
+        for resolution in resolutions:
+            ts, values = series_arrays(store, name, start=start, resolution=resolution)
+            if len(values) >= min_samples:
+                break
+        return ts, values, resolution
+
     def _establish_performance_baseline(self) -> ToolResult:
-        """Establish performance baseline."""
+        """Establish per hour-of-week baselines from stored metric history."""
+        snapshot = self._record_sample()
         baseline = {
-            "cpu_baseline": psutil.cpu_percent(interval=1),
-            "memory_baseline": psutil.virtual_memory().percent,
+            "cpu_baseline": snapshot.cpu_percent,
+            "memory_baseline": snapshot.memory.percent,
             "disk_baseline": [psutil.disk_usage(p.mountpoint).percent for p in psutil.disk_partitions() if os.path.exists(p.mountpoint)],
             "timestamp": datetime.now().isoformat()
         }
+        if not NUMPY_AVAILABLE:
+            baseline["metrics"] = {}
+            return ToolResult(
+                success=True,
+                data=baseline,
+                message="Performance baseline is the current sample only (numpy is not installed)"
+            )
+
+        start = time.time() - BASELINE_DAYS * 86400
+        baselines = {}
+        metrics = {}
+        for name in BASELINE_METRICS:
+            ts, values, resolution = self._history(name, start, ("1m", None))
+            if len(values) < MIN_HISTORY_SAMPLES:
+                metrics[name] = {"samples": int(len(values)), "message": "Not enough history yet"}
+                continue
+            result = compute_baseline(name, ts, values)
+            baselines[name] = result
+            metrics[name] = {
+                "samples": result.samples,
+                "resolution": resolution or "raw",
+                "span_days": result.span_days,
+                "coverage": round(result.coverage, 2),
+                "current_slot": result.slot(),
+            }
+
+        if baselines:
+            save_baselines(self._baseline_file(), baselines)
+        baseline["metrics"] = metrics
+        self.performance_baseline = baseline
         return ToolResult(
             success=True,
             data=baseline,
-            message="Performance baseline established"
+            message=f"Performance baseline established for {len(baselines)} metrics"
         )
 
     def _detect_system_anomalies(self) -> ToolResult:
-        """Detect system anomalies."""
+        """Detect anomalies in recent metrics against history and the baseline."""
+        snapshot = self._record_sample()
         anomalies = []
-        
-        # CPU anomaly
-        cpu_percent = psutil.cpu_percent(interval=1)
-        if cpu_percent > 90:
+        details = {}
+        flagged = set()
+
+        if NUMPY_AVAILABLE:
+            baselines = load_baselines(self._baseline_file())
+            start = time.time() - ANOMALY_LOOKBACK
+            for name in BASELINE_METRICS:
+                # Same resolution as the baseline, so their spreads compare
+                ts, values, resolution = self._history(name, start, ("1m", None), min_samples=3)
+                if len(values) < 3:
+                    details[name] = {"samples": int(len(values)), "message": "Not enough history yet"}
+                    continue
+                result = detect_anomalies(ts, values, baselines.get(name))
+                result["resolution"] = resolution or "raw"
+                result["baseline"] = name in baselines
+                details[name] = result
+
+                current = result["current"]
+                if current["anomalous"]:
+                    scores = [z for z in (current["rolling_z"], current.get("seasonal_z")) if z is not None]
+                    z = max(scores, key=abs) if scores else 0.0
+                    anomalies.append(
+                        f"{_METRIC_LABELS[name]} usage {current['value']:.1f}% is unusually "
+                        f"{'high' if z > 0 else 'low'} (robust z-score {z:.1f})"
+                    )
+                    flagged.add(name)
+
+        # Hard limits apply even without history
+        if snapshot.cpu_percent > 90 and "cpu_percent" not in flagged:
             anomalies.append("Unusually high CPU usage")
-        
-        # Memory anomaly
-        memory = psutil.virtual_memory()
-        if memory.percent > 95:
+        if snapshot.memory.percent > 95 and "memory_percent" not in flagged:
             anomalies.append("Critical memory usage")
-        
+
         return ToolResult(
             success=True,
-            data={"anomalies": anomalies},
+            data={"anomalies": anomalies, "details": details},
             message=f"Detected {len(anomalies)} system anomalies"
         )
 
+    def _forecast_metric(self, name: str, threshold: float) -> Dict[str, Any]:
+        """Forecast when a stored metric reaches a threshold."""
+        start = time.time() - FORECAST_DAYS * 86400
+        ts, values, resolution = self._history(name, start, ("1h", "5m", None))
+        if resolution is None:
+            # Raw samples are not evenly spaced; use their mean spacing
+            step = max(1.0, float(ts[-1] - ts[0]) / (len(ts) - 1)) if len(ts) > 1 else 5.0
+        else:
+            step = float(RESOLUTIONS[resolution])
+        result = forecast_threshold(ts, values, threshold, step_seconds=step,
+                                    season=max(1, int(86400 // step)))
+        result["resolution"] = resolution or "raw"
+        return result
+
+    @staticmethod
+    def _describe_forecast(label: str, forecast: Dict[str, Any]) -> str:
+        """Summarise a forecast in one sentence."""
+        if forecast.get("model") is None:
+            return f"Not enough {label.lower()} usage history to forecast yet"
+        threshold = f"{forecast['threshold']:.0f}%"
+        days = forecast["time_to_threshold_days"]
+        if days == 0:
+            return f"{label} usage is already at or above {threshold}"
+        if days is None:
+            trend = forecast["trend_per_day"]
+            if abs(trend) < 0.1:
+                return f"{label} usage stable around {forecast['current']:.0f}%"
+            return f"{label} usage not projected to reach {threshold} within a year ({trend:+.2f}% per day)"
+        low, high = forecast["time_to_threshold_range_days"]
+        span = ""
+        if low is not None and high is not None:
+            span = f", likely {low:.0f}-{high:.0f} days"
+        return (
+            f"{label} usage will reach {threshold} in about {days:.0f} days{span} "
+            f"(confidence {forecast['confidence']:.0%})"
+        )
+
     def _resource_usage_forecasting(self) -> ToolResult:
-        """Forecast resource usage."""
+        """Forecast resource usage from stored metric history."""
+        self._record_sample()
+        if not NUMPY_AVAILABLE:
+            return ToolResult(
+                success=False,
+                data={},
+                message="Resource usage forecasting requires numpy",
+                error="numpy is not installed"
+            )
+
+        disk = [self._forecast_metric("disk_percent", threshold) for threshold in DISK_THRESHOLDS]
+        memory = self._forecast_metric("memory_percent", MEMORY_THRESHOLD)
+        cpu = self._forecast_metric("cpu_percent", CPU_THRESHOLD)
         forecasts = {
-            "disk_forecast": "Disk usage will reach 90% within 3 months",
-            "memory_forecast": "Memory usage stable",
-            "cpu_forecast": "CPU usage within normal range"
+            "disk_forecast": self._describe_forecast("Disk", disk[0]),
+            "memory_forecast": self._describe_forecast("Memory", memory),
+            "cpu_forecast": self._describe_forecast("CPU", cpu),
+            "details": {
+                "disk": {f"{threshold:.0f}%": f for threshold, f in zip(DISK_THRESHOLDS, disk)},
+                "memory": memory,
+                "cpu": cpu,
+            },
         }
         return ToolResult(
             success=True,
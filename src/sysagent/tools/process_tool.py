@@ -10,6 +10,7 @@ from datetime import datetime
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory
+from ..utils.process_table import get_process_table
 
 
 @register_tool
@@ -61,19 +62,16 @@ class ProcessTool(BaseTool):
     def _list_processes(self, **kwargs) -> ToolResult:
         """List running processes."""
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-                try:
-                    proc_info = proc.info
-                    processes.append({
-                        'pid': proc_info['pid'],
-                        'name': proc_info['name'],
-                        'cpu_percent': proc_info['cpu_percent'],
-                        'memory_percent': proc_info['memory_percent'],
-                        'status': proc_info['status']
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            processes = [
+                {
+                    'pid': entry.pid,
+                    'name': entry.name,
+                    'cpu_percent': entry.cpu_percent,
+                    'memory_percent': entry.memory_percent,
+                    'status': entry.status
+                }
+                for entry in get_process_table().processes(sample=True)
+            ]
             
             # Sort by CPU usage
             processes.sort(key=lambda x: x['cpu_percent'] or 0, reverse=True)
@@ -130,15 +128,14 @@ class ProcessTool(BaseTool):
                     )
             else:
                 # Kill by name
-                for proc in psutil.process_iter(['pid', 'name']):
+                for entry in get_process_table().find_by_name(name):
                     try:
-                        if proc.info['name'] == name:
-                            proc.terminate()
-                            killed_processes.append({
-                                'pid': proc.info['pid'],
-                                'name': name,
-                                'status': 'terminated'
-                            })
+                        entry.process.terminate()
+                        killed_processes.append({
+                            'pid': entry.pid,
+                            'name': name,
+                            'status': 'terminated'
+                        })
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         continue
             
@@ -180,13 +177,9 @@ class ProcessTool(BaseTool):
             if pid:
                 target_proc = psutil.Process(pid)
             else:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if proc.info['name'] == name:
-                            target_proc = proc
-                            break
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
+                matches = get_process_table().find_by_name(name)
+                if matches:
+                    target_proc = matches[0].process
             
             if not target_proc:
                 return ToolResult(
@@ -254,13 +247,9 @@ class ProcessTool(BaseTool):
             if pid:
                 target_proc = psutil.Process(pid)
             else:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if proc.info['name'] == name:
-                            target_proc = proc
-                            break
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
+                matches = get_process_table().find_by_name(name)
+                if matches:
+                    target_proc = matches[0].process
             
             if not target_proc:
                 return ToolResult(
@@ -325,20 +314,14 @@ class ProcessTool(BaseTool):
                     error="Missing required parameter: pattern"
                 )
             
-            matching_processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    proc_info = proc.info
-                    if (pattern.lower() in proc_info['name'].lower() or
-                        any(pattern.lower() in arg.lower() for arg in proc_info['cmdline'])):
-                        matching_processes.append({
-                            'pid': proc_info['pid'],
-                            'name': proc_info['name'],
-                            'cmdline': proc_info['cmdline']
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            matching_processes = [
+                {
+                    'pid': entry.pid,
+                    'name': entry.name,
+                    'cmdline': entry.cmdline
+                }
+                for entry in get_process_table().search(pattern)
+            ]
             
             return ToolResult(
                 success=True,
@@ -365,18 +348,7 @@ class ProcessTool(BaseTool):
             
             if not pid:
                 # Get root processes (no parent or parent is init)
-                root_processes = []
-                for proc in psutil.process_iter(['pid', 'name', 'ppid']):
-                    try:
-                        proc_info = proc.info
-                        if proc_info['ppid'] == 1 or proc_info['ppid'] == 0:
-                            root_processes.append({
-                                'pid': proc_info['pid'],
-                                'name': proc_info['name'],
-                                'children': self._get_children(proc_info['pid'])
-                            })
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
+                root_processes = get_process_table().roots()
                 
                 return ToolResult(
                     success=True,
@@ -385,26 +357,20 @@ class ProcessTool(BaseTool):
                 )
             else:
                 # Get tree for specific process
-                try:
-                    target_proc = psutil.Process(pid)
-                    tree = {
-                        'pid': target_proc.pid,
-                        'name': target_proc.name(),
-                        'children': self._get_children(pid)
-                    }
-                    
-                    return ToolResult(
-                        success=True,
-                        data={'process_tree': tree},
-                        message=f"Retrieved process tree for PID {pid}"
-                    )
-                except psutil.NoSuchProcess:
+                tree = get_process_table().tree(pid)
+                if not tree:
                     return ToolResult(
                         success=False,
                         data={},
                         message=f"Process with PID {pid} not found",
                         error="Process not found"
                     )
+                
+                return ToolResult(
+                    success=True,
+                    data={'process_tree': tree},
+                    message=f"Retrieved process tree for PID {pid}"
+                )
 
         except Exception as e:
             return ToolResult(
@@ -416,19 +382,4 @@ class ProcessTool(BaseTool):
 
     def _get_children(self, pid: int) -> List[Dict[str, Any]]:
         """Get children of a process."""
-        children = []
-        try:
-            parent = psutil.Process(pid)
-            for child in parent.children():
-                try:
-                    children.append({
-                        'pid': child.pid,
-                        'name': child.name(),
-                        'children': self._get_children(child.pid)
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-        
-        return children 
\ No newline at end of file
+        return get_process_table().tree(pid).get('children', [])
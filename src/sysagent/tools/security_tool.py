@@ -3,8 +3,6 @@ Security tool for SysAgent CLI.
 """
 
 import os
-import subprocess
-import hashlib
 import json
 import time
 from typing import Dict, List, Any, Optional
@@ -12,6 +10,21 @@ from pathlib import Path
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.integrity import get_integrity_db
+from ..utils.log_follower import get_log_follower
+from ..utils.port_scanner import COMMON_PORTS, PortScanner
+
+# Buffered log events returned by monitor_logs
+LOG_EVENT_LIMIT = 200
+
+# Files checked by check_integrity when no path is given
+INTEGRITY_FILES = [
+    "/etc/passwd",
+    "/etc/shadow",
+    "/etc/hosts",
+    "/etc/resolv.conf",
+    "/etc/ssh/sshd_config"
+]
 
 
 @register_tool
@@ -42,7 +55,7 @@ class SecurityTool(BaseTool):
             elif action == "monitor_processes":
                 return self._monitor_processes()
             elif action == "check_integrity":
-                return self._check_integrity(path, algorithm)
+                return self._check_integrity(path, algorithm, kwargs.get("update_baseline", False))
             elif action == "analyze_network":
                 return self._analyze_network()
             elif action == "audit_users":
@@ -212,25 +225,41 @@ class SecurityTool(BaseTool):
                     except:
                         pass
             
-            # Check for open network services
+            # Check for network services listening on all interfaces
             try:
-                result = subprocess.run(["netstat", "-tlnp"], capture_output=True, text=True)
-                if result.returncode == 0:
-                    lines = result.stdout.split('\n')
-                    for line in lines[1:]:  # Skip header
-                        if line.strip():
-                            parts = line.split()
-                            if len(parts) >= 4:
-                                address = parts[3]
-                                if address.startswith("0.0.0.0:"):
-                                    vulnerabilities.append({
-                                        "type": "open_network_service",
-                                        "service": address,
-                                        "severity": "medium"
-                                    })
-            except:
+                import psutil
+                seen = set()
+                for conn in psutil.net_connections(kind="tcp"):
+                    if conn.status != psutil.CONN_LISTEN or not conn.laddr:
+                        continue
+                    if conn.laddr.ip in ("0.0.0.0", "::"):
+                        address = f"{conn.laddr.ip}:{conn.laddr.port}"
+                        if address not in seen:
+                            seen.add(address)
+                            vulnerabilities.append({
+                                "type": "open_network_service",
+                                "service": address,
+                                "severity": "medium"
+                            })
+            except Exception:
                 pass
             
+            # Check a remote target for plaintext services
+            if target and target not in ("localhost", "127.0.0.1", "::1"):
+                try:
+                    summary = PortScanner(timeout=1).scan([target], COMMON_PORTS)
+                    for port in summary.ports(target, "open"):
+                        if port in (21, 23, 110, 143):
+                            vulnerabilities.append({
+                                "type": "plaintext_service",
+                                "target": target,
+                                "port": port,
+                                "service": self._get_service_name(port),
+                                "severity": "high" if port == 23 else "medium"
+                            })
+                except Exception:
+                    pass
+            
             return ToolResult(
                 success=True,
                 data={
@@ -297,58 +326,49 @@ class SecurityTool(BaseTool):
                 error=str(e)
             )
     
-    def _check_integrity(self, path: str = None, algorithm: str = "sha256") -> ToolResult:
-        """Check file integrity using hashes."""
+    def _check_integrity(self, path: str = None, algorithm: str = "sha256",
+                         update_baseline: bool = False) -> ToolResult:
+        """Check file integrity against a stored hash baseline.
+
+        The first check of a path records its baseline; later checks report
+        files added, removed or modified since, re-hashing only files whose
+        size, mtime or inode changed.
+        """
         try:
-            if not path:
-                path = "/etc"
-            
-            integrity_checks = []
+            if path:
+                paths = [path]
+            else:
+                # Important system files to check
+                paths = [p for p in INTEGRITY_FILES if os.path.exists(p)]
             
-            # Important system files to check
-            important_files = [
-                "/etc/passwd",
-                "/etc/shadow",
-                "/etc/hosts",
-                "/etc/resolv.conf",
-                "/etc/ssh/sshd_config"
-            ]
+            report = get_integrity_db().check(paths, algorithm, update=update_baseline)
             
-            for file_path in important_files:
-                if os.path.exists(file_path):
-                    try:
-                        with open(file_path, 'rb') as f:
-                            content = f.read()
-                            
-                        if algorithm == "sha256":
-                            file_hash = hashlib.sha256(content).hexdigest()
-                        elif algorithm == "md5":
-                            file_hash = hashlib.md5(content).hexdigest()
-                        else:
-                            file_hash = hashlib.sha1(content).hexdigest()
-                        
-                        integrity_checks.append({
-                            "file": file_path,
-                            "hash": file_hash,
-                            "algorithm": algorithm,
-                            "size": len(content),
-                            "last_modified": time.ctime(os.path.getmtime(file_path))
-                        })
-                        
-                    except Exception as e:
-                        integrity_checks.append({
-                            "file": file_path,
-                            "error": str(e),
-                            "status": "failed"
-                        })
+            if report.new_baselines and not report.changed:
+                message = f"Integrity baseline recorded for {report.hashed} files"
+            elif report.changed:
+                message = (
+                    f"Integrity check found {len(report.modified)} modified, "
+                    f"{len(report.added)} added and {len(report.removed)} removed files"
+                )
+            else:
+                message = f"Integrity check completed: {report.unchanged} files unchanged"
             
             return ToolResult(
                 success=True,
                 data={
-                    "integrity_checks": integrity_checks,
-                    "algorithm": algorithm
+                    "paths": report.paths,
+                    "algorithm": algorithm,
+                    "new_baselines": report.new_baselines,
+                    "added": report.added,
+                    "removed": report.removed,
+                    "modified": report.modified,
+                    "unchanged": report.unchanged,
+                    "hashed": report.hashed,
+                    "errors": report.errors,
+                    "baseline_updated": update_baseline,
+                    "duration": round(report.duration, 3)
                 },
-                message=f"Integrity check completed for {len(integrity_checks)} files"
+                message=message
             )
             
         except Exception as e:
@@ -502,33 +522,22 @@ class SecurityTool(BaseTool):
             if not target:
                 target = "localhost"
             
-            import socket
-            
-            common_ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3306, 5432, 8080]
-            open_ports = []
-            
-            for port in common_ports:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)
-                    result = sock.connect_ex((target, port))
-                    sock.close()
-                    
-                    if result == 0:
-                        open_ports.append({
-                            "port": port,
-                            "service": self._get_service_name(port),
-                            "status": "open"
-                        })
-                except:
-                    continue
+            summary = PortScanner(timeout=1).scan([target], COMMON_PORTS)
+            open_ports = [
+                {
+                    "port": port,
+                    "service": self._get_service_name(port),
+                    "status": "open"
+                }
+                for port in summary.ports(target, "open")
+            ]
             
             return ToolResult(
                 success=True,
                 data={
                     "target": target,
                     "open_ports": open_ports,
-                    "total_scanned": len(common_ports)
+                    "total_scanned": len(COMMON_PORTS)
                 },
                 message=f"Port scan completed: {len(open_ports)} open ports found"
             )
@@ -542,43 +551,35 @@ class SecurityTool(BaseTool):
             )
     
     def _monitor_logs(self) -> ToolResult:
-        """Monitor system logs for security events."""
+        """Monitor system logs for security events.
+
+        Only lines appended since the previous call are read; the follower
+        keeps per-file offsets and buffers matches for other consumers.
+        """
         try:
-            log_events = []
-            
-            # Common log files to monitor
-            log_files = [
-                "/var/log/auth.log",
-                "/var/log/syslog",
-                "/var/log/messages"
+            follower = get_log_follower()
+            new_events = follower.poll()
+            events = follower.events_since(0, limit=LOG_EVENT_LIMIT)
+            
+            log_events = [
+                {
+                    "log_file": e.log_file,
+                    "event": e.event,
+                    "keyword": e.keyword,
+                    "timestamp": time.ctime(e.timestamp)
+                }
+                for e in events
             ]
             
-            for log_file in log_files:
-                if os.path.exists(log_file):
-                    try:
-                        with open(log_file, 'r') as f:
-                            lines = f.readlines()
-                            # Get last 50 lines
-                            recent_lines = lines[-50:] if len(lines) > 50 else lines
-                            
-                            for line in recent_lines:
-                                line_lower = line.lower()
-                                if any(keyword in line_lower for keyword in ['failed', 'error', 'denied', 'unauthorized', 'attack']):
-                                    log_events.append({
-                                        "log_file": log_file,
-                                        "event": line.strip(),
-                                        "timestamp": time.ctime()
-                                    })
-                    except:
-                        continue
-            
             return ToolResult(
                 success=True,
                 data={
                     "log_events": log_events,
-                    "total_events": len(log_events)
+                    "total_events": len(log_events),
+                    "new_events": new_events,
+                    "monitored_files": [p for p in follower.paths if os.path.exists(p)]
                 },
-                message=f"Log monitoring completed: {len(log_events)} security events found"
+                message=f"Log monitoring completed: {len(log_events)} security events found ({new_events} new)"
             )
             
         except Exception as e:
@@ -11,6 +11,8 @@ from datetime import datetime
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory
 from ..utils.platform import detect_platform, Platform
+from ..utils.file_index import get_file_index
+from ..utils.content_index import get_content_index
 
 
 @register_tool
@@ -37,6 +39,7 @@ class SmartSearchTool(BaseTool):
                 "recent": self._search_recent,
                 "commands": self._search_commands,
                 "history": self._search_history,
+                "index": self._index_status,
             }
             
             if action in actions:
@@ -133,23 +136,22 @@ class SmartSearchTool(BaseTool):
                                 "size": p.stat().st_size if p.is_file() else 0
                             })
             else:
-                # Use find command
-                cmd = ["find", path, "-iname", f"*{query}*", "-maxdepth", "5"]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                
-                for line in result.stdout.strip().split("\n")[:limit]:
-                    if line:
-                        p = Path(line)
-                        if p.exists():
-                            files.append({
-                                "name": p.name,
-                                "path": str(p),
-                                "type": p.suffix or "folder",
-                            })
+                # Answer from the persistent file index
+                for entry in get_file_index().search(
+                    query, root=path, ext=file_type, limit=limit
+                ):
+                    files.append({
+                        "name": entry["name"],
+                        "path": entry["path"],
+                        "type": "folder" if entry["is_dir"] else ("." + entry["ext"] if entry["ext"] else "file"),
+                        "size": entry["size"],
+                        "modified": datetime.fromtimestamp(entry["mtime"]).isoformat()
+                    })
             
             # Filter by type if specified
             if file_type:
-                files = [f for f in files if f.get("type", "").endswith(file_type)]
+                suffix = file_type.lower().lstrip(".")
+                files = [f for f in files if f.get("type", "").lower().endswith(suffix)]
             
             return ToolResult(
                 success=True,
@@ -265,7 +267,7 @@ class SmartSearchTool(BaseTool):
         )
 
     def _search_content(self, **kwargs) -> ToolResult:
-        """Search file contents using grep/ripgrep."""
+        """Search file contents using the content index."""
         query = kwargs.get("query") or kwargs.get("q")
         path = kwargs.get("path", ".")
         file_type = kwargs.get("type")
@@ -274,26 +276,22 @@ class SmartSearchTool(BaseTool):
         if not query:
             return ToolResult(success=False, data={}, message="Search query required")
         
-        matches = []
-        
         try:
-            # Try ripgrep first (faster)
-            cmd = ["rg", "-l", "-i", query, path]
-            if file_type:
-                cmd.extend(["-t", file_type])
-            
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                for line in result.stdout.strip().split("\n")[:limit]:
-                    if line:
-                        matches.append({"file": line, "type": "content_match"})
-            except FileNotFoundError:
-                # Fall back to grep
-                cmd = ["grep", "-r", "-l", "-i", query, path]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                for line in result.stdout.strip().split("\n")[:limit]:
-                    if line:
-                        matches.append({"file": line, "type": "content_match"})
+            results = get_content_index().search(
+                query,
+                root=path,
+                extensions=[file_type] if file_type else None,
+                limit=limit
+            )
+            matches = [
+                {
+                    "file": r["path"],
+                    "type": "content_match",
+                    "score": r["score"],
+                    "lines": r["lines"],
+                }
+                for r in results
+            ]
             
             return ToolResult(
                 success=True,
@@ -329,7 +327,7 @@ class SmartSearchTool(BaseTool):
                 for f in files:
                     if f and Path(f).exists():
                         p = Path(f)
-                        if file_type and not p.suffix.endswith(file_type):
+                        if file_type and not p.suffix.lower().endswith(file_type.lower().lstrip(".")):
                             continue
                         recent.append({
                             "name": p.name,
@@ -339,20 +337,15 @@ class SmartSearchTool(BaseTool):
                         if len(recent) >= limit:
                             break
             else:
-                # Use find for recently modified
-                result = subprocess.run(
-                    ["find", str(Path.home()), "-type", "f", "-mtime", "-7", "-maxdepth", "4"],
-                    capture_output=True, text=True, timeout=30
-                )
-                
-                for line in result.stdout.strip().split("\n")[:limit]:
-                    if line:
-                        p = Path(line)
-                        if p.exists():
-                            recent.append({
-                                "name": p.name,
-                                "path": str(p)
-                            })
+                # Answer from the persistent file index
+                for entry in get_file_index().recent(
+                    root=str(Path.home()), days=7, ext=file_type, limit=limit
+                ):
+                    recent.append({
+                        "name": entry["name"],
+                        "path": entry["path"],
+                        "modified": datetime.fromtimestamp(entry["mtime"]).isoformat()
+                    })
             
             return ToolResult(
                 success=True,
@@ -443,6 +436,40 @@ class SmartSearchTool(BaseTool):
                 error=str(e)
             )
 
+    def _index_status(self, **kwargs) -> ToolResult:
+        """Show the file index status, optionally rescanning a path.
+        
+        ``content_root`` adds a directory to the content index, which only
+        indexes the roots it is given.
+        """
+        path = kwargs.get("path")
+        rebuild = kwargs.get("rebuild", False)
+        content_root = kwargs.get("content_root")
+        
+        try:
+            index = get_file_index()
+            data = {}
+            if path or rebuild:
+                root = index.ensure_indexed(path or str(Path.home()), background=False)
+                data["rescan"] = index.rescan(root)
+            if content_root:
+                data["content_refresh"] = get_content_index().add_root(content_root)
+            data.update(index.get_stats())
+            data["content_roots"] = get_content_index().roots()
+            
+            return ToolResult(
+                success=True,
+                data=data,
+                message=f"File index has {data['files']} files in {len(data['roots'])} roots"
+            )
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                data={},
+                message=f"File index status failed: {str(e)}",
+                error=str(e)
+            )
+
     def get_usage_examples(self) -> List[str]:
         return [
             "Unified search: smart_search_tool --action search --query 'python'",
@@ -450,4 +477,6 @@ class SmartSearchTool(BaseTool):
             "Search apps: smart_search_tool --action apps --query 'chrome'",
             "Search content: smart_search_tool --action content --query 'TODO'",
             "Recent files: smart_search_tool --action recent --limit 10",
+            "Index status: smart_search_tool --action index --rebuild true",
+            "Index contents: smart_search_tool --action index --content_root ~/projects",
         ]
@@ -12,6 +12,7 @@ from dataclasses import dataclass
 
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory, PermissionLevel
+from ..utils.metrics_sampler import get_sampler
 
 
 @dataclass
@@ -577,7 +578,7 @@ class SystemControlTool(BaseTool):
                 "hostname": platform.node(),
                 "python_version": platform.python_version(),
                 "cpu_count": psutil.cpu_count(),
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                "cpu_percent": get_sampler().latest().cpu_percent,
                 "memory": psutil.virtual_memory()._asdict(),
                 "disk": psutil.disk_usage('/')._asdict(),
                 "boot_time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(psutil.boot_time())),
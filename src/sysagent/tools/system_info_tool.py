@@ -14,6 +14,7 @@ import psutil
 from .base import BaseTool, register_tool, ToolMetadata
 from ..types import ToolResult, ToolCategory
 from ..utils.platform import detect_platform, get_platform_info
+from ..utils.metrics_sampler import get_sampler
 
 
 @register_tool
@@ -78,7 +79,7 @@ class SystemInfoTool(BaseTool):
             cpu_info = {
                 "count": psutil.cpu_count(),
                 "count_logical": psutil.cpu_count(logical=True),
-                "usage_percent": psutil.cpu_percent(interval=1),
+                "usage_percent": get_sampler().latest().cpu_percent,
                 "frequency": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
             }
             
@@ -140,7 +141,8 @@ class SystemInfoTool(BaseTool):
             cpu_count_logical = psutil.cpu_count(logical=True)
             
             # Get CPU usage for each core
-            cpu_percent_per_core = psutil.cpu_percent(interval=1, percpu=True)
+            snapshot = get_sampler().latest()
+            cpu_percent_per_core = snapshot.cpu_per_core
             
             # Get CPU frequency
             cpu_freq = psutil.cpu_freq()
@@ -155,7 +157,7 @@ class SystemInfoTool(BaseTool):
             cpu_info = {
                 "physical_cores": cpu_count,
                 "logical_cores": cpu_count_logical,
-                "usage_percent": psutil.cpu_percent(interval=1),
+                "usage_percent": snapshot.cpu_percent,
                 "usage_per_core": cpu_percent_per_core,
                 "frequency": freq_info,
                 "stats": {
@@ -12,6 +12,8 @@ from datetime import datetime
 from .base import BaseTool, ToolMetadata, ToolResult, register_tool
 from ..types import ToolCategory
 from ..utils.platform import detect_platform, Platform
+from ..utils.disk_usage import get_disk_usage
+from ..utils.metrics_sampler import get_sampler
 
 
 @register_tool
@@ -65,8 +67,10 @@ class SystemInsightsTool(BaseTool):
         good = []
         score = 100
         
+        snapshot = get_sampler().latest()
+        
         # CPU Check
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = snapshot.cpu_percent
         if cpu_percent > 90:
             issues.append(f"Critical: CPU usage at {cpu_percent:.1f}%")
             score -= 20
@@ -77,7 +81,7 @@ class SystemInsightsTool(BaseTool):
             good.append(f"CPU usage normal: {cpu_percent:.1f}%")
         
         # Memory Check
-        memory = psutil.virtual_memory()
+        memory = snapshot.memory
         if memory.percent > 90:
             issues.append(f"Critical: Memory usage at {memory.percent:.1f}%")
             score -= 20
@@ -104,7 +108,7 @@ class SystemInsightsTool(BaseTool):
             good.append("Disk space adequate")
         
         # Swap Check
-        swap = psutil.swap_memory()
+        swap = snapshot.swap
         if swap.percent > 80:
             warnings.append(f"High swap usage: {swap.percent:.1f}%")
             score -= 5
@@ -163,7 +167,8 @@ class SystemInsightsTool(BaseTool):
         # CPU analysis
         cpu_freq = psutil.cpu_freq()
         cpu_count = psutil.cpu_count()
-        cpu_percent_per_core = psutil.cpu_percent(interval=1, percpu=True)
+        snapshot = get_sampler().latest()
+        cpu_percent_per_core = snapshot.cpu_per_core
         
         analysis["cpu"] = {
             "cores": cpu_count,
@@ -173,7 +178,7 @@ class SystemInsightsTool(BaseTool):
         }
         
         # Memory analysis
-        mem = psutil.virtual_memory()
+        mem = snapshot.memory
         analysis["memory"] = {
             "total_gb": round(mem.total / (1024**3), 2),
             "used_gb": round(mem.used / (1024**3), 2),
@@ -236,7 +241,7 @@ class SystemInsightsTool(BaseTool):
             })
         
         # Check CPU
-        cpu = psutil.cpu_percent(interval=1)
+        cpu = get_sampler().latest().cpu_percent
         if cpu > 80:
             recommendations.append({
                 "type": "cpu",
@@ -488,34 +493,9 @@ class SystemInsightsTool(BaseTool):
 
     def _storage_analysis(self, **kwargs) -> ToolResult:
         """Analyze storage usage and find large files."""
-        path = kwargs.get("path", str(Path.home()))
-        large_files = []
-        large_dirs = []
+        path = os.path.abspath(os.path.expanduser(kwargs.get("path", str(Path.home()))))
         
         try:
-            # Find large files
-            for root, dirs, files in os.walk(path):
-                # Skip hidden and system directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
-                
-                for f in files:
-                    try:
-                        fp = Path(root) / f
-                        size = fp.stat().st_size
-                        if size > 100 * 1024 * 1024:  # > 100MB
-                            large_files.append({
-                                "path": str(fp),
-                                "size_mb": round(size / (1024**2), 2)
-                            })
-                    except:
-                        continue
-                
-                if len(large_files) > 20:
-                    break
-            
-            large_files.sort(key=lambda x: x['size_mb'], reverse=True)
-            large_files = large_files[:10]
-            
             # Check common directories
             common_dirs = [
                 Path.home() / "Downloads",
@@ -524,24 +504,58 @@ class SystemInsightsTool(BaseTool):
                 Path("/tmp")
             ]
             
-            for d in common_dirs:
-                if d.exists():
-                    try:
-                        total_size = sum(f.stat().st_size for f in d.rglob('*') if f.is_file())
-                        large_dirs.append({
-                            "path": str(d),
-                            "size_mb": round(total_size / (1024**2), 2)
-                        })
-                    except:
-                        continue
+            report = get_disk_usage().scan(
+                [path] + [str(d) for d in common_dirs],
+                top_files=30,
+                top_dirs=10,
+                min_file_size=100 * 1024 * 1024  # > 100MB
+            )
+            
+            # Large files below the requested path
+            prefix = path.rstrip(os.sep) + os.sep
+            large_files = [
+                {
+                    "path": f["path"],
+                    "size_mb": round(f["size"] / (1024**2), 2)
+                }
+                for f in report.largest_files
+                if f["path"].startswith(prefix)
+            ][:10]
             
+            large_dirs = []
+            for d in common_dirs:
+                size = report.size_of(str(d))
+                if size is not None:
+                    large_dirs.append({
+                        "path": str(d),
+                        "size_mb": round(size / (1024**2), 2)
+                    })
             large_dirs.sort(key=lambda x: x['size_mb'], reverse=True)
             
+            largest_dirs = [
+                {
+                    "path": d["path"],
+                    "size_mb": round(d["size"] / (1024**2), 2),
+                    "files": d["files"]
+                }
+                for d in report.largest_dirs
+            ]
+            
+            scanned = report.size_of(path) or 0
             return ToolResult(
                 success=True,
                 data={
                     "large_files": large_files,
-                    "directory_sizes": large_dirs
+                    "directory_sizes": large_dirs,
+                    "largest_directories": largest_dirs,
+                    "scan": {
+                        "path": path,
+                        "size_gb": round(scanned / (1024**3), 2),
+                        "files_scanned": report.total_files,
+                        "directories_scanned": report.total_dirs,
+                        "directories_reused": report.dirs_reused,
+                        "duration": round(report.duration, 3)
+                    }
                 },
                 message=f"Found {len(large_files)} large files"
             )
@@ -670,15 +684,16 @@ class SystemInsightsTool(BaseTool):
 
     def _quick_insights(self, **kwargs) -> ToolResult:
         """Get quick system insights summary."""
-        cpu = psutil.cpu_percent(interval=0.5)
-        mem = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        snapshot = get_sampler().latest()
+        cpu = snapshot.cpu_percent
+        mem = snapshot.memory
+        disk = snapshot.disk
         
         insights = {
             "cpu_usage": f"{cpu:.1f}%",
             "memory_usage": f"{mem.percent:.1f}%",
             "disk_usage": f"{disk.percent:.1f}%",
-            "running_processes": len(list(psutil.process_iter())),
+            "running_processes": snapshot.process_count,
             "status": "healthy"
         }
         
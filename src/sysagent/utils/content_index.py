@@ -0,0 +1,451 @@
+"""
+Full-text content index for SysAgent CLI.
+
+Maintains a trigram inverted index over the text files below user-configured
+root directories, stored in SQLite. A content query is narrowed to the files
+that contain every trigram of the query, and only those files are read to
+produce ranked line hits. Roots are refreshed incrementally: files whose size
+and mtime are unchanged are not re-read. Binary files and files over the size
+limit are skipped.
+
+Roots are only added with ``add_root``; a query below no root reads the
+files under its path directly. Stale roots are refreshed in the background,
+never on the query path.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .file_index import subtree_bounds
+from .fs_walk import DEFAULT_PRUNE, scan_tree
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    tri TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (tri, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    last_refresh REAL NOT NULL DEFAULT 0
+);
+"""
+
+BINARY_SNIFF_BYTES = 8192
+
+
+def trigrams(text: str) -> Set[str]:
+    """Get the set of lowercase trigrams of a text, ignoring line breaks."""
+    text = text.lower()
+    return {
+        text[i:i + 3]
+        for i in range(len(text) - 2)
+        if "\n" not in text[i:i + 3]
+    }
+
+
+class ContentIndex:
+    """Trigram inverted index over file contents."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_file_size: int = 1024 * 1024,
+        refresh_interval: float = 60.0,
+        prune: Optional[Set[str]] = None
+    ):
+        """Initialize the content index.
+
+        Args:
+            db_path: SQLite database path. Defaults to ~/.sysagent/index/content.db
+            max_file_size: Files larger than this many bytes are not indexed.
+            refresh_interval: Seconds after which a queried root is
+                refreshed in the background.
+            prune: Directory names that are never descended into.
+        """
+        self.db_path = db_path or Path.home() / ".sysagent" / "index" / "content.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_file_size = max_file_size
+        self.refresh_interval = refresh_interval
+        self.prune = DEFAULT_PRUNE if prune is None else set(prune)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    def roots(self) -> Dict[str, float]:
+        """Get the indexed roots and the time of their last refresh."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT path, last_refresh FROM roots"))
+
+    def add_root(self, path: str, refresh: bool = True) -> Dict[str, int]:
+        """Add a root directory to the index."""
+        path = os.path.abspath(os.path.expanduser(path))
+        with self._lock:
+            low, high = subtree_bounds(path)
+            self._conn.execute(
+                "DELETE FROM roots WHERE path >= ? AND path < ?", (low, high)
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO roots (path, last_refresh) VALUES (?, 0)", (path,)
+            )
+            self._conn.commit()
+        return self.refresh(path) if refresh else {}
+
+    def remove_root(self, path: str):
+        """Remove a root directory and its documents from the index."""
+        path = os.path.abspath(os.path.expanduser(path))
+        with self._lock:
+            self._conn.execute("DELETE FROM roots WHERE path = ?", (path,))
+            for (doc_id,) in self._conn.execute(
+                "SELECT id FROM docs WHERE path >= ? AND path < ?", subtree_bounds(path)
+            ).fetchall():
+                self._delete_doc(doc_id)
+            self._conn.commit()
+
+    def ensure_indexed(self, path: str) -> Optional[str]:
+        """Get the root covering ``path``, refreshing it in the background if stale.
+
+        Returns:
+            The root covering ``path``, or None if no root does.
+        """
+        path = os.path.abspath(os.path.expanduser(path))
+        roots = self.roots()
+        for root, last_refresh in roots.items():
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                if time.time() - last_refresh > self.refresh_interval:
+                    self.refresh_async(root)
+                return root
+        return None
+
+    def refresh_async(self, root: str):
+        """Refresh a root in a background thread."""
+        with self._refresh_lock:
+            if root in self._refreshing:
+                return
+            self._refreshing.add(root)
+
+        def run():
+            try:
+                self.refresh(root)
+            except sqlite3.Error:
+                pass  # Closed while refreshing
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(root)
+
+        threading.Thread(target=run, name="sysagent-content-index", daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _walk(self, root: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield regular files below ``root`` with their stat data."""
+        for entry in scan_tree(root, pattern=None, include_hidden=True, exclude_dirs=self.prune):
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+
+    def refresh(self, root: str) -> Dict[str, int]:
+        """Bring a root up to date, re-reading only changed files.
+
+        Returns:
+            Counts of indexed, unchanged and removed files.
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            known = {
+                path: (doc_id, size, mtime)
+                for doc_id, path, size, mtime in self._conn.execute(
+                    "SELECT id, path, size, mtime FROM docs WHERE path >= ? AND path < ?",
+                    subtree_bounds(root),
+                )
+            }
+
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        for path, st in self._walk(root):
+            previous = known.pop(path, None)
+            if previous is not None and previous[1:] == (st.st_size, st.st_mtime):
+                counts["unchanged"] += 1
+                continue
+            self.index_file(path, st, commit=False)
+            counts["indexed"] += 1
+            if counts["indexed"] % 200 == 0:
+                with self._lock:
+                    self._conn.commit()
+
+        with self._lock:
+            for doc_id, _, _ in known.values():
+                self._delete_doc(doc_id)
+                counts["removed"] += 1
+            self._conn.execute(
+                "UPDATE roots SET last_refresh = ? WHERE path = ?", (time.time(), root)
+            )
+            self._conn.commit()
+
+        return counts
+
+    def _read_text(self, path: str, size: int) -> Optional[str]:
+        """Read a file as text, or None if it is binary or too large."""
+        if size > self.max_file_size:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read(self.max_file_size + 1)
+        except OSError:
+            return None
+        if len(data) > self.max_file_size or b"\0" in data[:BINARY_SNIFF_BYTES]:
+            return None
+        return data.decode("utf-8", errors="ignore")
+
+    def index_file(self, path: str, st: Optional[os.stat_result] = None, commit: bool = True):
+        """(Re)index a single file."""
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                self.remove_file(path)
+                return
+
+        text = self._read_text(path, st.st_size)
+        grams = trigrams(text) if text is not None else set()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM docs WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None:
+                doc_id = row[0]
+                self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                self._conn.execute(
+                    "UPDATE docs SET size = ?, mtime = ?, indexed = ? WHERE id = ?",
+                    (st.st_size, st.st_mtime, int(text is not None), doc_id),
+                )
+            else:
+                doc_id = self._conn.execute(
+                    "INSERT INTO docs (path, size, mtime, indexed) VALUES (?, ?, ?, ?)",
+                    (path, st.st_size, st.st_mtime, int(text is not None)),
+                ).lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO postings (tri, doc_id) VALUES (?, ?)",
+                ((gram, doc_id) for gram in grams),
+            )
+            if commit:
+                self._conn.commit()
+
+    def remove_file(self, path: str):
+        """Remove a single file from the index."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM docs WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None:
+                self._delete_doc(row[0])
+                self._conn.commit()
+
+    def _delete_doc(self, doc_id: int):
+        """Delete a document and its postings (caller holds the lock)."""
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def candidates(
+        self,
+        query: str,
+        root: Optional[str] = None,
+        fresh: bool = False
+    ) -> Optional[Set[str]]:
+        """Get the indexed files that may contain ``query``.
+
+        Args:
+            query: Text to look for (case-insensitive).
+            root: Only return files below this directory.
+            fresh: Refresh ``root`` first instead of relying on the refresh
+                interval, so recently changed files are accounted for.
+
+        Returns:
+            Paths of files containing every trigram of the query, or None if
+            the query is too short for the index to narrow the search or
+            ``root`` is not below an indexed root.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+
+        if root:
+            root = os.path.abspath(os.path.expanduser(root))
+            covering = self.ensure_indexed(root)
+            if covering is None:
+                return None
+            if fresh:
+                self.refresh(covering)
+
+        with self._lock:
+            doc_ids: Optional[Set[int]] = None
+            for gram in grams:
+                ids = {
+                    doc_id for (doc_id,) in self._conn.execute(
+                        "SELECT doc_id FROM postings WHERE tri = ?", (gram,)
+                    )
+                }
+                doc_ids = ids if doc_ids is None else doc_ids & ids
+                if not doc_ids:
+                    return set()
+
+            paths = set()
+            for chunk_start in range(0, len(doc_ids), 500):
+                chunk = list(doc_ids)[chunk_start:chunk_start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                paths.update(
+                    path for (path,) in self._conn.execute(
+                        f"SELECT path FROM docs WHERE id IN ({placeholders})", chunk
+                    )
+                )
+
+        if root:
+            low, high = subtree_bounds(root)
+            paths = {p for p in paths if low <= p < high}
+        return paths
+
+    def indexed_files(self, root: Optional[str] = None) -> Dict[str, Tuple[int, float]]:
+        """Get the size and mtime each indexed text file had when it was read.
+
+        A file whose current size and mtime match is covered by
+        ``candidates``; any other file has to be checked directly.
+        """
+        sql = "SELECT path, size, mtime FROM docs WHERE indexed = 1"
+        params: Tuple = ()
+        if root:
+            sql += " AND path >= ? AND path < ?"
+            params = subtree_bounds(os.path.abspath(os.path.expanduser(root)))
+        with self._lock:
+            return {path: (size, mtime) for path, size, mtime in self._conn.execute(sql, params)}
+
+    def _all_indexed(self, root: Optional[str]) -> Set[str]:
+        """Get every indexed text file, optionally below ``root``."""
+        sql = "SELECT path FROM docs WHERE indexed = 1"
+        params: Tuple = ()
+        if root:
+            sql += " AND path >= ? AND path < ?"
+            params = subtree_bounds(root)
+        with self._lock:
+            return {path for (path,) in self._conn.execute(sql, params)}
+
+    def search(
+        self,
+        query: str,
+        root: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+        limit: int = 20,
+        max_lines: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Search file contents for ``query`` (case-insensitive substring).
+
+        Only candidate files from the index are read; below a path that no
+        root covers, every text file is read instead. Results are ranked by
+        the number of matching lines.
+
+        Returns:
+            Dicts with ``path``, ``score`` and up to ``max_lines`` line hits.
+        """
+        if root:
+            root = os.path.abspath(os.path.expanduser(root))
+
+        if root and self.ensure_indexed(root) is None:
+            paths = {
+                path for path, st in self._walk(root)
+                if self._read_text(path, st.st_size) is not None
+            }
+        else:
+            paths = self.candidates(query, root)
+            if paths is None:
+                paths = self._all_indexed(root)
+
+        if extensions:
+            suffixes = tuple("." + e.lower().lstrip(".") for e in extensions)
+            paths = {p for p in paths if p.lower().endswith(suffixes)}
+
+        needle = query.lower()
+        results = []
+        for path in paths:
+            hits = []
+            score = 0
+            try:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    for line_number, line in enumerate(f, 1):
+                        if needle in line.lower():
+                            score += 1
+                            if len(hits) < max_lines:
+                                hits.append({"line": line_number, "text": line.rstrip()[:200]})
+            except OSError:
+                continue
+            if score:
+                results.append({"path": path, "score": score, "lines": hits})
+
+        results.sort(key=lambda r: (-r["score"], r["path"]))
+        return results[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            docs, indexed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(indexed), 0) FROM docs"
+            ).fetchone()
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        return {
+            "db_path": str(self.db_path),
+            "files": docs,
+            "indexed_files": indexed,
+            "skipped_files": docs - indexed,
+            "postings": postings,
+            "roots": self.roots(),
+        }
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global instance
+_content_index: Optional[ContentIndex] = None
+_content_index_lock = threading.Lock()
+
+
+def get_content_index() -> ContentIndex:
+    """Get the global content index instance."""
+    global _content_index
+    if _content_index is None:
+        with _content_index_lock:
+            if _content_index is None:
+                _content_index = ContentIndex()
+    return _content_index
@@ -0,0 +1,315 @@
+"""
+Disk usage analyzer for SysAgent CLI.
+
+``DiskUsageAnalyzer`` crawls directory trees with ``os.scandir`` on a pool of
+worker threads (directory listing and stat calls release the GIL), in batches
+of directories so small directories do not pay a task each. Each directory
+is summarised once (bytes and count of its own files, its largest files,
+its subdirectories) and the summaries are cached keyed on the directory's
+mtime: a repeat scan stats every directory but only re-lists the ones whose
+mtime changed. A directory's mtime does not change when a file inside it
+grows in place, so summaries older than ``max_age`` are re-listed anyway.
+Aggregate sizes are summed bottom-up, and the largest files and directories
+are kept in bounded heaps.
+"""
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+# Largest files remembered per directory; bounds top_files in scan()
+CACHE_TOP_FILES = 32
+
+# Seconds after which a cached directory summary is re-listed
+CACHE_MAX_AGE = 300.0
+
+# Directories listed per worker task
+BATCH_DIRS = 64
+
+# Directories modified this close to the scan are listed again next time,
+# since a change within the same mtime tick would go unnoticed
+_RACY_NS = 2_000_000_000
+
+
+class _DirRecord:
+    """Summary of one directory's direct contents."""
+
+    __slots__ = ("mtime_ns", "scanned", "racy", "files", "bytes", "links", "top", "subdirs")
+
+    def __init__(self, mtime_ns: int, scanned: float, racy: bool, files: int, size: int,
+                 links: List[Tuple[int, int]], top: List[Tuple[int, str, float]],
+                 subdirs: List[str]):
+        self.mtime_ns = mtime_ns
+        self.scanned = scanned
+        self.racy = racy
+        self.files = files
+        self.bytes = size
+        # (inode, size) of hard-linked files, counted once per scan
+        self.links = links
+        self.top = top
+        self.subdirs = subdirs
+
+
+@dataclass
+class DiskUsageReport:
+    """Result of a disk usage scan."""
+    roots: List[str]
+    total_bytes: int = 0
+    total_files: int = 0
+    total_dirs: int = 0
+    largest_files: List[Dict[str, Any]] = field(default_factory=list)
+    largest_dirs: List[Dict[str, Any]] = field(default_factory=list)
+    dirs_listed: int = 0
+    dirs_reused: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    dir_sizes: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def size_of(self, path: str) -> Optional[int]:
+        """Get the total size of a scanned directory, or None if not scanned."""
+        return self.dir_sizes.get(os.path.abspath(os.path.expanduser(path)))
+
+
+class DiskUsageAnalyzer:
+    """Parallel, mtime-cached directory size analyzer."""
+
+    def __init__(self, workers: Optional[int] = None, max_age: float = CACHE_MAX_AGE):
+        # Listing is GIL-bound on a warm cache; extra threads only pay off on
+        # more cores or slow (cold, network) filesystems
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.max_age = max_age
+        self._cache: Dict[Tuple, Dict[str, _DirRecord]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="sysagent-du"
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def clear_cache(self):
+        """Forget all cached directory summaries."""
+        with self._lock:
+            self._cache.clear()
+
+    def _scan_dir(self, path: str, dev: int, cached: Optional[_DirRecord],
+                  include_hidden: bool, exclude_dirs: FrozenSet[str],
+                  now: float, now_ns: int):
+        """Summarise one directory; returns (record, reused) or None."""
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return None
+        if st.st_dev != dev:
+            # Another filesystem is mounted here
+            return None
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns \
+                and not cached.racy and now - cached.scanned < self.max_age:
+            return cached, True
+
+        files = 0
+        total = 0
+        links = []
+        top: List[Tuple[int, str, float]] = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not include_hidden and name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in exclude_dirs:
+                                subdirs.append(name)
+                        elif entry.is_file(follow_symlinks=False):
+                            est = entry.stat(follow_symlinks=False)
+                            if est.st_nlink > 1:
+                                links.append((est.st_ino, est.st_size))
+                            else:
+                                files += 1
+                                total += est.st_size
+                            item = (est.st_size, name, est.st_mtime)
+                            if len(top) < CACHE_TOP_FILES:
+                                heapq.heappush(top, item)
+                            elif item[0] > top[0][0]:
+                                heapq.heapreplace(top, item)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        racy = now_ns - st.st_mtime_ns < _RACY_NS
+        return _DirRecord(st.st_mtime_ns, now, racy, files, total, links, top, subdirs), False
+
+    def _scan_batch(self, batch, cache, include_hidden, exclude_dirs, now, now_ns):
+        return [
+            (path, dev, depth,
+             self._scan_dir(path, dev, cache.get(path), include_hidden, exclude_dirs, now, now_ns))
+            for path, dev, depth in batch
+        ]
+
+    def scan(self, roots: Iterable[str], top_files: int = 10, top_dirs: int = 10,
+             min_file_size: int = 0, include_hidden: bool = True,
+             exclude_dirs: Optional[Iterable[str]] = None) -> DiskUsageReport:
+        """Scan directory trees and summarise their disk usage.
+
+        Args:
+            roots: Directories to scan. Each stays on its own filesystem and
+                symlinks are not followed.
+            top_files: Number of largest files to report (at most
+                ``CACHE_TOP_FILES``).
+            top_dirs: Number of largest directories below the roots to report.
+            min_file_size: Only report files at least this many bytes long.
+            include_hidden: Include entries whose name starts with '.'.
+            exclude_dirs: Directory names that are never descended into.
+        """
+        start = time.perf_counter()
+        now = time.time()
+        now_ns = time.time_ns()
+        exclude = frozenset(exclude_dirs or ())
+
+        root_paths = []
+        for root in roots:
+            root = os.path.abspath(os.path.expanduser(root))
+            if root not in root_paths and os.path.isdir(root):
+                root_paths.append(root)
+        # A root inside another root is covered by the outer crawl
+        root_paths = [
+            root for root in root_paths
+            if not any(root.startswith(other.rstrip(os.sep) + os.sep) for other in root_paths)
+        ]
+        report = DiskUsageReport(roots=root_paths)
+
+        records: Dict[str, Tuple[_DirRecord, int]] = {}
+        totals: Dict[str, int] = {}
+        counts: Dict[str, int] = {}
+        for root in root_paths:
+            key = (root, include_hidden, exclude)
+            with self._lock:
+                cache = self._cache.get(key, {})
+            visited = self._crawl(root, cache, include_hidden, exclude, now, now_ns, report)
+            with self._lock:
+                self._cache[key] = {path: record for path, (record, _) in visited.items()}
+            records.update(visited)
+
+            for path, (record, _) in visited.items():
+                totals[path] = record.bytes
+                counts[path] = record.files
+            # Hard links count once, in the first directory (in path order) holding one
+            seen_links = set()
+            for path in sorted(path for path, (record, _) in visited.items() if record.links):
+                for inode, link_size in visited[path][0].links:
+                    if inode not in seen_links:
+                        seen_links.add(inode)
+                        totals[path] += link_size
+                        counts[path] += 1
+
+        # Sum sizes bottom-up, deepest directories first
+        for path, (_, depth) in sorted(records.items(), key=lambda item: -item[1][1]):
+            if depth > 0:
+                parent = os.path.dirname(path)
+                totals[parent] = totals.get(parent, 0) + totals[path]
+                counts[parent] = counts.get(parent, 0) + counts[path]
+
+        report.dir_sizes = totals
+        report.total_dirs = len(records)
+        for root in root_paths:
+            if root in totals:
+                report.total_bytes += totals[root]
+                report.total_files += counts[root]
+
+        files = (
+            (size, os.path.join(path, name), mtime)
+            for path, (record, _) in records.items()
+            for size, name, mtime in record.top
+            if size >= min_file_size
+        )
+        report.largest_files = [
+            {"path": path, "size": size, "modified": mtime}
+            for size, path, mtime in heapq.nlargest(min(top_files, CACHE_TOP_FILES), files)
+        ]
+        roots_set = set(root_paths)
+        report.largest_dirs = [
+            {"path": path, "size": size, "files": counts[path]}
+            for size, path in heapq.nlargest(
+                top_dirs, ((size, path) for path, size in totals.items() if path not in roots_set)
+            )
+        ]
+        report.duration = time.perf_counter() - start
+        return report
+
+    def _crawl(self, root: str, cache: Dict[str, _DirRecord], include_hidden: bool,
+               exclude: FrozenSet[str], now: float, now_ns: int,
+               report: DiskUsageReport) -> Dict[str, Tuple[_DirRecord, int]]:
+        """Visit every directory below ``root``; returns path -> (record, depth)."""
+        try:
+            dev = os.stat(root).st_dev
+        except OSError:
+            report.errors += 1
+            return {}
+
+        visited: Dict[str, Tuple[_DirRecord, int]] = {}
+        pending = [(root, dev, 0)]
+
+        def collect(results):
+            for path, dev, depth, result in results:
+                if result is None:
+                    report.errors += 1
+                    continue
+                record, reused = result
+                if reused:
+                    report.dirs_reused += 1
+                else:
+                    report.dirs_listed += 1
+                visited[path] = (record, depth)
+                pending.extend((os.path.join(path, name), dev, depth + 1) for name in record.subdirs)
+
+        if self.workers <= 1:
+            while pending:
+                batch, pending[:] = pending[-BATCH_DIRS:], pending[:-BATCH_DIRS]
+                collect(self._scan_batch(batch, cache, include_hidden, exclude, now, now_ns))
+            return visited
+
+        executor = self._get_executor()
+        running = set()
+        while pending or running:
+            while pending and len(running) < self.workers * 2:
+                # Split the queue so every idle worker gets a share
+                size = max(1, min(BATCH_DIRS, len(pending) // self.workers))
+                batch, pending[:] = pending[-size:], pending[:-size]
+                running.add(executor.submit(
+                    self._scan_batch, batch, cache, include_hidden, exclude, now, now_ns
+                ))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future.result())
+        return visited
+
+
+# Global instance
+_analyzer: Optional[DiskUsageAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_disk_usage() -> DiskUsageAnalyzer:
+    """Get the global disk usage analyzer instance."""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = DiskUsageAnalyzer()
+    return _analyzer
@@ -0,0 +1,569 @@
+"""
+Persistent file index for SysAgent CLI.
+
+Keeps an on-disk SQLite table of path, name, extension, size and mtime for a
+set of root directories so name, extension and recency searches can be
+answered without walking the filesystem. The index is refreshed by periodic
+rescans that only write the rows that changed, and, when ``watchdog`` is
+installed, kept current between rescans from filesystem (inotify) events.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+from .fs_walk import DEFAULT_PRUNE
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_parent ON files(parent);
+CREATE INDEX IF NOT EXISTS idx_files_ext ON files(ext);
+CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    last_scan REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def _normalize_ext(ext: Optional[str]) -> str:
+    """Normalize an extension filter such as 'PDF' or '.pdf' to 'pdf'."""
+    return (ext or "").lower().lstrip(".")
+
+
+def subtree_bounds(path: str) -> Tuple[str, str]:
+    """Get a [low, high) key range covering every path below ``path``."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards in user input."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    """Forwards filesystem events to the file index."""
+
+    def __init__(self, index: "FileIndex"):
+        super().__init__()
+        self.index = index
+
+    def on_created(self, event):
+        self.index.refresh_path(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.index.refresh_path(event.src_path)
+
+    def on_deleted(self, event):
+        self.index.remove_path(event.src_path)
+
+    def on_moved(self, event):
+        self.index.remove_path(event.src_path)
+        self.index.refresh_path(event.dest_path)
+
+
+class FileIndex:
+    """On-disk index of files below a set of root directories."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        rescan_interval: float = 300.0,
+        max_depth: Optional[int] = 8,
+        prune: Optional[Set[str]] = None,
+        watch: bool = True
+    ):
+        """Initialize the file index.
+
+        Args:
+            db_path: SQLite database path. Defaults to ~/.sysagent/index/files.db
+            rescan_interval: Seconds after which a root is rescanned in the
+                background when it is queried.
+            max_depth: Maximum directory depth indexed below each root.
+            prune: Directory names that are never descended into.
+            watch: Keep the index current from filesystem events when
+                ``watchdog`` is available.
+        """
+        self.db_path = db_path or Path.home() / ".sysagent" / "index" / "files.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.rescan_interval = rescan_interval
+        self.max_depth = max_depth
+        self.prune = DEFAULT_PRUNE if prune is None else set(prune)
+        self.watch = watch and WATCHDOG_AVAILABLE
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._scanning: Set[str] = set()
+        self._scan_lock = threading.Lock()
+        self._observer = None
+        self._handler = _IndexEventHandler(self)
+        self._watched: Set[str] = set()
+        self._watches: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Roots and scanning
+    # ------------------------------------------------------------------
+
+    def roots(self) -> Dict[str, float]:
+        """Get the indexed roots and the time of their last scan."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT path, last_scan FROM roots"))
+
+    def _covering_root(self, path: str) -> Optional[str]:
+        """Get the indexed root that contains ``path``, if any."""
+        for root in self.roots():
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def ensure_indexed(self, path: str, background: bool = True) -> str:
+        """Make sure ``path`` is covered by an indexed root.
+
+        An unknown path is added as a new root and scanned, in the
+        background unless ``background`` is False; ``is_scanned`` tells
+        when its first scan is done. A root
+        whose last scan is older than the rescan interval is refreshed in
+        the background.
+
+        Returns:
+            The root covering ``path``.
+        """
+        path = os.path.abspath(os.path.expanduser(path))
+        root = self._covering_root(path)
+
+        if root is None:
+            self.add_root(path, scan=not background)
+            if background:
+                self.rescan_async(path)
+                self._start_watch(path)
+            return path
+
+        last_scan = self.roots().get(root, 0)
+        if time.time() - last_scan > self.rescan_interval:
+            self.rescan_async(root)
+        self._start_watch(root)
+        return root
+
+    def is_scanned(self, root: str) -> bool:
+        """Whether a root has finished its first scan."""
+        return self.roots().get(root, 0) > 0
+
+    def add_root(self, path: str, scan: bool = True):
+        """Add a root directory to the index."""
+        path = os.path.abspath(os.path.expanduser(path))
+        with self._lock:
+            # A new root supersedes any roots below it
+            low, high = subtree_bounds(path)
+            self._conn.execute(
+                "DELETE FROM roots WHERE path >= ? AND path < ?", (low, high)
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO roots (path, last_scan) VALUES (?, 0)", (path,)
+            )
+            self._conn.commit()
+        if scan:
+            self.rescan(path)
+            self._start_watch(path)
+
+    def rescan_async(self, root: str):
+        """Rescan a root in a background thread."""
+        with self._scan_lock:
+            if root in self._scanning:
+                return
+        threading.Thread(
+            target=self.rescan, args=(root,), name="sysagent-file-index", daemon=True
+        ).start()
+
+    def rescan(self, root: str) -> Dict[str, int]:
+        """Rescan a root, writing only the entries that changed.
+
+        Returns:
+            Counts of added, updated and removed entries.
+        """
+        with self._scan_lock:
+            if root in self._scanning:
+                return {"added": 0, "updated": 0, "removed": 0}
+            self._scanning.add(root)
+
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        try:
+            stack = [(root, 0)]
+            while stack:
+                directory, depth = stack.pop()
+                subdirs = self._scan_directory(directory, counts)
+                if self.max_depth is None or depth < self.max_depth:
+                    stack.extend((d, depth + 1) for d in subdirs)
+
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE roots SET last_scan = ? WHERE path = ?", (time.time(), root)
+                )
+                self._conn.commit()
+        finally:
+            with self._scan_lock:
+                self._scanning.discard(root)
+
+        return counts
+
+    def _list_directory(self, directory: str) -> Tuple[Dict[str, Tuple], List[str]]:
+        """Get the rows of one directory and the subdirectories to descend into."""
+        current: Dict[str, Tuple] = {}
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and entry.name in self.prune:
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    current[entry.path] = self._row(
+                        entry.path, directory, entry.name, is_dir, st
+                    )
+                    if is_dir:
+                        subdirs.append(entry.path)
+        except OSError:
+            pass
+        return current, subdirs
+
+    def _scan_directory(self, directory: str, counts: Dict[str, int]) -> List[str]:
+        """Diff one directory listing against the index.
+
+        Returns:
+            Subdirectories to descend into.
+        """
+        current, subdirs = self._list_directory(directory)
+        with self._lock:
+            known = {
+                path: (size, mtime)
+                for path, size, mtime in self._conn.execute(
+                    "SELECT path, size, mtime FROM files WHERE parent = ?", (directory,)
+                )
+            }
+
+            changed = []
+            for path, row in current.items():
+                previous = known.get(path)
+                if previous is None:
+                    counts["added"] += 1
+                    changed.append(row)
+                elif previous != (row[6], row[7]):
+                    counts["updated"] += 1
+                    changed.append(row)
+            if changed:
+                self._upsert(changed)
+
+            for path in known.keys() - current.keys():
+                counts["removed"] += 1
+                self._delete_subtree(path)
+
+            self._conn.commit()
+
+        return subdirs
+
+    @staticmethod
+    def _row(path: str, parent: str, name: str, is_dir: bool, st: os.stat_result) -> Tuple:
+        """Build a files table row."""
+        ext = "" if is_dir else _normalize_ext(os.path.splitext(name)[1])
+        return (
+            path, parent, name, name.lower(), ext,
+            1 if is_dir else 0, 0 if is_dir else st.st_size, st.st_mtime,
+        )
+
+    def _upsert(self, rows: Iterable[Tuple], conn: Optional[sqlite3.Connection] = None):
+        """Insert or replace rows (caller holds the lock)."""
+        (conn or self._conn).executemany(
+            "INSERT OR REPLACE INTO files "
+            "(path, parent, name, name_lower, ext, is_dir, size, mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _delete_subtree(self, path: str):
+        """Delete a path and everything below it (caller holds the lock)."""
+        low, high = subtree_bounds(path)
+        self._conn.execute(
+            "DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+            (path, low, high),
+        )
+
+    # ------------------------------------------------------------------
+    # Event-driven updates
+    # ------------------------------------------------------------------
+
+    def _covers(self, path: str) -> Optional[str]:
+        """Get the root a rescan would reach ``path`` from, or None.
+
+        Paths below a pruned directory or deeper than ``max_depth`` are not
+        indexed. A pruned name as the last component is only skipped for
+        directories, which the caller checks.
+        """
+        root = self._covering_root(path)
+        if root is None or path == root:
+            return None
+        parts = os.path.relpath(path, root).split(os.sep)
+        if self.max_depth is not None and len(parts) - 1 > self.max_depth:
+            return None
+        if any(part in self.prune for part in parts[:-1]):
+            return None
+        return root
+
+    def refresh_path(self, path: str):
+        """Re-stat a single path and update its entry."""
+        path = os.path.abspath(path)
+        root = self._covers(path)
+        if root is None:
+            return
+        name = os.path.basename(path)
+        parent = os.path.dirname(path)
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            self.remove_path(path)
+            return
+
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        if is_dir and name in self.prune:
+            return
+        with self._lock:
+            self._upsert([self._row(path, parent, name, is_dir, st)])
+            self._conn.commit()
+        if is_dir and parent == root and root in self._watched:
+            self._watch_subdir(path)
+
+    def remove_path(self, path: str):
+        """Remove a path and everything below it from the index."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._delete_subtree(path)
+            self._conn.commit()
+        watch = self._watches.pop(path, None)
+        if watch is not None and path not in self._watched:
+            try:
+                self._observer.unschedule(watch)
+            except Exception:
+                pass
+
+    def _watch_subdir(self, path: str):
+        """Watch a directory directly below a root recursively."""
+        if path in self._watches or os.path.basename(path) in self.prune:
+            return
+        try:
+            self._watches[path] = self._observer.schedule(self._handler, path, recursive=True)
+        except Exception:
+            pass
+
+    def _start_watch(self, root: str):
+        """Watch a root for changes if watchdog is available.
+
+        Recursive watches cannot leave subtrees out, so the root itself is
+        watched on its own and each of its subdirectories that is not pruned
+        recursively. Events from below deeper pruned directories are dropped
+        in ``refresh_path``.
+        """
+        if not self.watch or root in self._watched:
+            return
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._watches[root] = self._observer.schedule(self._handler, root, recursive=False)
+            self._watched.add(root)
+        except Exception:
+            # e.g. inotify watch limit reached; periodic rescans still apply
+            self.watch = False
+            return
+        if self.max_depth is not None and self.max_depth < 1:
+            return
+        try:
+            with os.scandir(root) as entries:
+                subdirs = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for path in subdirs:
+            self._watch_subdir(path)
+
+    def close(self):
+        """Stop watching and close the database."""
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+            self._observer = None
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(
+        self,
+        where: List[str],
+        params: List[Any],
+        root: Optional[str],
+        order: str,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Run a files query restricted to the subtree below ``root``.
+
+        Until the covering root's first scan is done, the query runs on a
+        walk of ``root`` instead of the index.
+        """
+        conn = None
+        if root:
+            path = os.path.abspath(os.path.expanduser(root))
+            covering = self.ensure_indexed(path)
+            low, high = subtree_bounds(path)
+            where.append("path >= ? AND path < ?")
+            params.extend([low, high])
+            if not self.is_scanned(covering):
+                conn = self._walk_into_memory(path, covering)
+
+        sql = "SELECT path, name, ext, is_dir, size, mtime FROM files"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        if conn is not None:
+            try:
+                rows = conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        else:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                "path": path,
+                "name": name,
+                "ext": ext,
+                "is_dir": bool(is_dir),
+                "size": size,
+                "mtime": mtime,
+            }
+            for path, name, ext, is_dir, size, mtime in rows
+        ]
+
+    def _walk_into_memory(self, path: str, root: str) -> sqlite3.Connection:
+        """Walk ``path`` as a scan of ``root`` would into an in-memory table."""
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_SCHEMA)
+        start = 0 if path == root else len(os.path.relpath(path, root).split(os.sep))
+        stack = [(path, start)]
+        while stack:
+            directory, depth = stack.pop()
+            current, subdirs = self._list_directory(directory)
+            self._upsert(current.values(), conn)
+            if self.max_depth is None or depth < self.max_depth:
+                stack.extend((d, depth + 1) for d in subdirs)
+        return conn
+
+    def search(
+        self,
+        query: str,
+        root: Optional[str] = None,
+        ext: Optional[str] = None,
+        files_only: bool = False,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Find entries whose name contains ``query`` (case-insensitive)."""
+        where = ["name_lower LIKE ? ESCAPE '\\'"]
+        params: List[Any] = [f"%{_escape_like(query.lower())}%"]
+        if ext:
+            where.append("ext = ?")
+            params.append(_normalize_ext(ext))
+        if files_only:
+            where.append("is_dir = 0")
+        return self._query(where, params, root, "mtime DESC", limit)
+
+    def by_extension(
+        self,
+        ext: str,
+        root: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Find files with the given extension, most recently modified first."""
+        return self._query(
+            ["ext = ?", "is_dir = 0"], [_normalize_ext(ext)], root, "mtime DESC", limit
+        )
+
+    def recent(
+        self,
+        root: Optional[str] = None,
+        days: float = 7,
+        ext: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Find files modified in the last ``days`` days, newest first."""
+        where = ["mtime >= ?", "is_dir = 0"]
+        params: List[Any] = [time.time() - days * 86400]
+        if ext:
+            where.append("ext = ?")
+            params.append(_normalize_ext(ext))
+        return self._query(where, params, root, "mtime DESC", limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            files, dirs = self._conn.execute(
+                "SELECT COALESCE(SUM(is_dir = 0), 0), COALESCE(SUM(is_dir = 1), 0) FROM files"
+            ).fetchone()
+        return {
+            "db_path": str(self.db_path),
+            "files": files,
+            "directories": dirs,
+            "roots": self.roots(),
+            "watching": sorted(self._watched),
+            "watch_available": WATCHDOG_AVAILABLE,
+        }
+
+
+# Global instance
+_file_index: Optional[FileIndex] = None
+_file_index_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex:
+    """Get the global file index instance."""
+    global _file_index
+    if _file_index is None:
+        with _file_index_lock:
+            if _file_index is None:
+                _file_index = FileIndex()
+    return _file_index
@@ -0,0 +1,123 @@
+"""
+Streaming directory walker for SysAgent CLI.
+
+``scan_tree`` walks a directory tree with ``os.scandir`` and yields matching
+``os.DirEntry`` objects as it goes. Name, pattern and size filters are applied
+while walking, ``DirEntry`` stat data is reused instead of stat'ing each path
+again, pruned directories are never entered, and the walk stops as soon as
+``max_results`` entries have been produced, so memory use does not grow with
+the size of the tree.
+"""
+
+import fnmatch
+import os
+from typing import Iterable, Iterator, Optional, Set, Union
+
+
+DEFAULT_PRUNE = {
+    ".git", ".hg", ".svn", "node_modules", "__pycache__",
+    ".cache", ".venv", "venv", ".tox", ".mypy_cache", ".Trash",
+}
+
+
+def _compile_patterns(pattern: Union[str, Iterable[str], None]):
+    """Split glob patterns into name patterns and relative-path patterns."""
+    if pattern is None:
+        return None, None
+    patterns = [pattern] if isinstance(pattern, str) else list(pattern)
+    if not patterns or "*" in patterns:
+        return None, None
+    name_patterns = [p for p in patterns if os.sep not in p and "/" not in p]
+    path_patterns = [p.replace("/", os.sep) for p in patterns if os.sep in p or "/" in p]
+    return name_patterns, path_patterns
+
+
+def scan_tree(
+    root: Union[str, os.PathLike],
+    pattern: Union[str, Iterable[str], None] = "*",
+    recursive: bool = True,
+    include_hidden: bool = False,
+    include_dirs: bool = False,
+    name_contains: Optional[str] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    exclude_dirs: Optional[Set[str]] = None,
+    max_results: Optional[int] = None,
+    max_depth: Optional[int] = None
+) -> Iterator[os.DirEntry]:
+    """Walk a directory tree, yielding the entries that match the filters.
+
+    Args:
+        root: Directory to walk.
+        pattern: Glob pattern, or list of patterns, matched against entry
+            names (or relative paths if they contain a separator) with the
+            platform's case sensitivity.
+        recursive: Descend into subdirectories.
+        include_hidden: Include, and descend into, entries starting with '.'.
+        include_dirs: Yield matching directories as well as files.
+        name_contains: Only yield entries whose name contains this text
+            (case-insensitive).
+        min_size: Only yield files at least this many bytes long.
+        max_size: Only yield files at most this many bytes long.
+        exclude_dirs: Directory names that are never descended into.
+        max_results: Stop after yielding this many entries.
+        max_depth: Maximum depth of subdirectories to descend into.
+
+    Yields:
+        ``os.DirEntry`` objects; call ``entry.stat()`` for cached stat data.
+    """
+    name_patterns, path_patterns = _compile_patterns(pattern)
+    needle = name_contains.lower() if name_contains else None
+    exclude_dirs = exclude_dirs or set()
+    check_size = min_size is not None or max_size is not None
+    root = os.fspath(root)
+    root_prefix = len(root.rstrip(os.sep)) + 1
+
+    produced = 0
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not include_hidden and name.startswith("."):
+                        continue
+
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir and recursive and name not in exclude_dirs \
+                                and not entry.is_symlink() \
+                                and (max_depth is None or depth < max_depth):
+                            subdirs.append(entry.path)
+                        if is_dir and not include_dirs:
+                            continue
+
+                        if needle and needle not in name.lower():
+                            continue
+                        if name_patterns is not None:
+                            matched = any(fnmatch.fnmatch(name, p) for p in name_patterns)
+                            if not matched and path_patterns:
+                                relative = entry.path[root_prefix:]
+                                matched = any(fnmatch.fnmatch(relative, p) for p in path_patterns)
+                            if not matched:
+                                continue
+                        if check_size and not is_dir:
+                            size = entry.stat().st_size
+                            if min_size is not None and size < min_size:
+                                continue
+                            if max_size is not None and size > max_size:
+                                continue
+                    except OSError:
+                        continue
+
+                    yield entry
+                    produced += 1
+                    if max_results is not None and produced >= max_results:
+                        return
+        except OSError:
+            continue
+
+        # Visit subdirectories in listing order
+        stack.extend((d, depth + 1) for d in reversed(subdirs))
@@ -0,0 +1,320 @@
+"""
+File integrity baseline for SysAgent CLI.
+
+``IntegrityDB`` keeps an on-disk SQLite table of path, size, mtime, ctime,
+inode and content hash for the files below the paths it is asked to check. A
+check walks the tree, compares each file's stat data with the baseline and
+only re-hashes files whose size, mtime, ctime or inode changed, so repeated
+checks of an unchanged tree cost one ``stat`` per file. The ctime cannot be
+set back like the mtime can, so an edit hidden with ``touch -r`` is still
+re-hashed. Files are hashed in fixed-size
+chunks, never read into memory whole, and large batches are hashed across a
+process pool. The result is a diff against the baseline: added, removed and
+modified files.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .file_index import subtree_bounds
+from .fs_walk import scan_tree
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL DEFAULT 0,
+    inode INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    checked REAL NOT NULL
+);
+"""
+
+CHUNK_SIZE = 1024 * 1024
+
+# Batches this large (in files or bytes) are hashed in a process pool
+PARALLEL_MIN_FILES = 1000
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# Directories under "/" that do not hold regular files
+PSEUDO_FILESYSTEMS = {"/proc", "/sys", "/dev", "/run"}
+
+
+_buffers = threading.local()
+
+
+def _chunk_buffer(chunk_size: int) -> memoryview:
+    """Get a reusable read buffer for this thread."""
+    buffer = getattr(_buffers, "view", None)
+    if buffer is None or len(buffer) != chunk_size:
+        buffer = _buffers.view = memoryview(bytearray(chunk_size))
+    return buffer
+
+
+def hash_file(path: str, algorithm: str = "sha256", chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash a file in fixed-size chunks."""
+    digest = hashlib.new(algorithm)
+    buffer = _chunk_buffer(chunk_size)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(buffer[:n])
+    return digest.hexdigest()
+
+
+def _hash_job(job: Tuple[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """Process pool entry point; returns (hash, error)."""
+    path, algorithm = job
+    try:
+        return hash_file(path, algorithm), None
+    except OSError as e:
+        return None, str(e)
+
+
+@dataclass
+class IntegrityReport:
+    """Differences between the files on disk and the baseline."""
+    paths: List[str]
+    algorithm: str
+    new_baselines: List[str] = field(default_factory=list)
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    modified: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+    hashed: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class IntegrityDB:
+    """Persistent hash baseline with stat-based change detection."""
+
+    def __init__(self, db_path: Optional[Path] = None, max_workers: Optional[int] = None):
+        """Initialize the integrity database.
+
+        Args:
+            db_path: SQLite database path. Defaults to
+                ~/.config/sysagent/security/integrity.db
+            max_workers: Processes used to hash large batches.
+        """
+        self.db_path = db_path or Path.home() / ".config" / "sysagent" / "security" / "integrity.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "ctime_ns" not in columns:
+            # Baselines from before ctime was recorded; their files are re-hashed once
+            self._conn.execute("ALTER TABLE files ADD COLUMN ctime_ns INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def _walk(self, root: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield regular files at or below ``root`` with their stat data."""
+        if not os.path.isdir(root):
+            try:
+                st = os.stat(root, follow_symlinks=False)
+            except OSError:
+                return
+            if os.path.isfile(root) and not os.path.islink(root):
+                yield root, st
+            return
+
+        if root == os.sep:
+            # Walk "/" one top-level directory at a time, skipping /proc and co.
+            for entry in scan_tree(root, pattern=None, recursive=False,
+                                   include_hidden=True, include_dirs=True):
+                if entry.path in PSEUDO_FILESYSTEMS or entry.is_symlink():
+                    continue
+                yield from self._walk(entry.path)
+            return
+
+        for entry in scan_tree(root, pattern=None, include_hidden=True):
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+
+    def _baseline(self, root: str) -> Dict[str, Tuple]:
+        """Get baseline rows at or below ``root``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, inode, algorithm, hash, ctime_ns FROM files "
+                "WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, *subtree_bounds(root)),
+            ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def _hash_many(self, jobs: List[Tuple[str, str]],
+                   total_bytes: int) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Hash (path, algorithm) jobs, in a process pool when the batch is large."""
+        paths = [path for path, _ in jobs]
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers > 1 and (len(jobs) >= PARALLEL_MIN_FILES or total_bytes >= PARALLEL_MIN_BYTES):
+            try:
+                # Forking copies the locks of the sampler, audit writer and
+                # other background threads in whatever state they are in
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    results = list(executor.map(_hash_job, jobs, chunksize=32))
+                for path, (digest, error) in zip(paths, results):
+                    yield path, digest, error
+                return
+            except (OSError, RuntimeError):
+                # No process support here (sandbox, frozen app); hash inline
+                pass
+        for path, job in zip(paths, jobs):
+            digest, error = _hash_job(job)
+            yield path, digest, error
+
+    def check(self, paths: Union[str, Iterable[str]], algorithm: str = "sha256",
+              update: bool = False) -> IntegrityReport:
+        """Compare files with the baseline.
+
+        Paths without a baseline get one. Files whose stat data changed are
+        re-hashed with the algorithm their baseline was recorded with; a
+        changed hash is reported as modified. The baseline is only replaced
+        with ``update``.
+
+        Args:
+            paths: Files or directories to check.
+            algorithm: Any ``hashlib`` algorithm name, used for new baselines.
+            update: Accept the changes found into the baseline.
+        """
+        hashlib.new(algorithm)  # Fail early on unknown algorithms
+        roots = [paths] if isinstance(paths, str) else list(paths)
+        roots = [os.path.abspath(os.path.expanduser(p)) for p in roots]
+        report = IntegrityReport(paths=roots, algorithm=algorithm)
+        start = time.perf_counter()
+
+        baseline: Dict[str, Tuple] = {}
+        current: Dict[str, os.stat_result] = {}
+        seeding = set()
+        for root in roots:
+            known = self._baseline(root)
+            if not known:
+                report.new_baselines.append(root)
+            baseline.update(known)
+            for path, st in self._walk(root):
+                current[path] = st
+                if not known:
+                    seeding.add(path)
+
+        to_hash = []
+        total_bytes = 0
+        for path, st in current.items():
+            known = baseline.get(path)
+            if known is not None and known[:3] == (st.st_size, st.st_mtime_ns, st.st_ino) \
+                    and known[5] == st.st_ctime_ns:
+                report.unchanged += 1
+                continue
+            # Compare like with like: a digest is only comparable under its own algorithm
+            to_hash.append((path, known[3] if known is not None else algorithm))
+            total_bytes += st.st_size
+
+        now = time.time()
+        rows = []
+        hashed_with = dict(to_hash)
+        for path, digest, error in self._hash_many(to_hash, total_bytes):
+            if digest is None:
+                report.errors.append({"file": path, "error": error})
+                continue
+            report.hashed += 1
+            st = current[path]
+            known = baseline.get(path)
+            info = {
+                "file": path,
+                "size": st.st_size,
+                "last_modified": time.ctime(st.st_mtime),
+                "hash": digest,
+            }
+            if known is None:
+                if path not in seeding:
+                    report.added.append(info)
+                if path in seeding or update:
+                    rows.append((path, st, digest))
+            elif known[4] != digest:
+                info.update(old_hash=known[4], old_size=known[0])
+                report.modified.append(info)
+                if update:
+                    rows.append((path, st, digest))
+            else:
+                # Touched but identical; refresh stat data so it is skipped next time
+                report.unchanged += 1
+                rows.append((path, st, digest))
+
+        removed = [path for path in baseline if path not in current]
+        report.removed = [
+            {"file": path, "size": baseline[path][0], "hash": baseline[path][4]}
+            for path in sorted(removed)
+        ]
+        report.added.sort(key=lambda x: x["file"])
+        report.modified.sort(key=lambda x: x["file"])
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files "
+                "(path, size, mtime_ns, ctime_ns, inode, algorithm, hash, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((path, st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, hashed_with[path], digest, now)
+                 for path, st, digest in rows),
+            )
+            if update and removed:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+            self._conn.commit()
+
+        report.duration = time.perf_counter() - start
+        return report
+
+    def forget(self, path: str) -> int:
+        """Drop the baseline at or below ``path``."""
+        path = os.path.abspath(os.path.expanduser(path))
+        with self._lock:
+            count = self._conn.execute(
+                "DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, *subtree_bounds(path)),
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global instance
+_integrity_db: Optional[IntegrityDB] = None
+_integrity_db_lock = threading.Lock()
+
+
+def get_integrity_db() -> IntegrityDB:
+    """Get the global integrity database instance."""
+    global _integrity_db
+    if _integrity_db is None:
+        with _integrity_db_lock:
+            if _integrity_db is None:
+                _integrity_db = IntegrityDB()
+    return _integrity_db
@@ -0,0 +1,230 @@
+"""
+Incremental log follower for SysAgent CLI.
+
+``LogFollower`` keeps a checkpoint (device, inode and byte offset) for each
+log file it watches and reads only the bytes appended since the last poll.
+On the first poll of a file it seeks backwards from the end to pick up the
+last few lines instead of reading the whole file. A changed inode means the
+file was rotated: the rest of the old file is read from ``<name>.1`` when it
+is still there, then the new file is read from the start. A file that shrank
+was truncated and is read from the start.
+
+Lines are matched against one compiled regular expression built from all
+keywords, and matches go into a bounded in-memory event buffer with
+sequence numbers, so several consumers (SecurityTool, ProactiveMonitor) can
+each read only the events they have not seen yet.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_LOG_FILES = [
+    "/var/log/auth.log",
+    "/var/log/syslog",
+    "/var/log/messages",
+]
+
+DEFAULT_KEYWORDS = ["failed", "error", "denied", "unauthorized", "attack"]
+
+# Lines read from the end of a file the first time it is seen
+COLD_START_LINES = 50
+
+# Bytes read from one file per poll, so a burst cannot stall the caller
+MAX_READ_BYTES = 8 * 1024 * 1024
+
+# Events kept in memory
+BUFFER_SIZE = 1000
+
+_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass
+class LogEvent:
+    """A log line that matched a keyword."""
+    seq: int
+    log_file: str
+    event: str
+    keyword: str
+    timestamp: float
+
+
+@dataclass
+class _Checkpoint:
+    dev: int
+    inode: int
+    offset: int
+
+
+def _tail_offset(f, lines: int, size: int) -> int:
+    """Find the offset where the last ``lines`` lines of a file start."""
+    position = size
+    found = 0
+    # A trailing newline ends the last line rather than starting a new one
+    skip_last = True
+    while position > 0:
+        step = min(_BLOCK_SIZE, position)
+        position -= step
+        f.seek(position)
+        block = f.read(step)
+        end = len(block)
+        if skip_last and block.endswith(b"\n"):
+            end -= 1
+        skip_last = False
+        while True:
+            end = block.rfind(b"\n", 0, end)
+            if end == -1:
+                break
+            found += 1
+            if found == lines:
+                return position + end + 1
+    return 0
+
+
+class LogFollower:
+    """Follow log files incrementally and buffer keyword matches."""
+
+    def __init__(self, paths: Iterable[str] = DEFAULT_LOG_FILES,
+                 keywords: Iterable[str] = DEFAULT_KEYWORDS,
+                 state_file: Optional[Path] = None,
+                 buffer_size: int = BUFFER_SIZE,
+                 cold_start_lines: int = COLD_START_LINES):
+        self.paths = [str(p) for p in paths]
+        self.keywords = [k.lower() for k in keywords]
+        self.pattern = re.compile("|".join(re.escape(k) for k in self.keywords), re.IGNORECASE)
+        self.state_file = state_file or Path.home() / ".config" / "sysagent" / "security" / "log_offsets.json"
+        self.cold_start_lines = cold_start_lines
+
+        self._events: deque = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._checkpoints: Dict[str, _Checkpoint] = {}
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._load_checkpoints()
+
+    def _load_checkpoints(self):
+        try:
+            data = json.loads(self.state_file.read_text())
+            self._checkpoints = {path: _Checkpoint(**cp) for path, cp in data.items()}
+        except Exception:
+            self._checkpoints = {}
+
+    def _save_checkpoints(self):
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps({p: asdict(cp) for p, cp in self._checkpoints.items()}))
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass
+
+    def _read_lines(self, path: str, f, start: int, end: int) -> Tuple[int, int]:
+        """Match whole lines between ``start`` and ``end``.
+
+        Returns the offset after the last complete line and the number of
+        events added.
+        """
+        end = min(end, start + MAX_READ_BYTES)
+        if end <= start:
+            return start, 0
+        f.seek(start)
+        data = f.read(end - start)
+        complete = data.rfind(b"\n") + 1
+        if complete == 0:
+            # No complete line yet; an over-long line is taken as it is
+            if len(data) < MAX_READ_BYTES:
+                return start, 0
+            complete = len(data)
+
+        added = 0
+        now = time.time()
+        text = data[:complete].decode("utf-8", errors="replace")
+        search = self.pattern.search
+        for line in text.splitlines():
+            match = search(line)
+            if match:
+                with self._lock:
+                    self._seq += 1
+                    self._events.append(LogEvent(
+                        seq=self._seq,
+                        log_file=path,
+                        event=line.strip(),
+                        keyword=match.group(0).lower(),
+                        timestamp=now,
+                    ))
+                added += 1
+        return start + complete, added
+
+    def _follow(self, path: str) -> int:
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return 0
+        added = 0
+        with f:
+            st = os.fstat(f.fileno())
+            checkpoint = self._checkpoints.get(path)
+
+            if checkpoint is not None and (checkpoint.dev, checkpoint.inode) != (st.st_dev, st.st_ino):
+                # Rotated: finish the old file if it was renamed to <name>.1
+                rotated = f"{path}.1"
+                try:
+                    with open(rotated, "rb") as old:
+                        old_st = os.fstat(old.fileno())
+                        if (old_st.st_dev, old_st.st_ino) == (checkpoint.dev, checkpoint.inode):
+                            _, added = self._read_lines(path, old, checkpoint.offset, old_st.st_size)
+                except OSError:
+                    pass
+                checkpoint = _Checkpoint(st.st_dev, st.st_ino, 0)
+            elif checkpoint is not None and st.st_size < checkpoint.offset:
+                # Truncated in place
+                checkpoint.offset = 0
+            elif checkpoint is None:
+                checkpoint = _Checkpoint(
+                    st.st_dev, st.st_ino, _tail_offset(f, self.cold_start_lines, st.st_size)
+                )
+
+            offset, count = self._read_lines(path, f, checkpoint.offset, st.st_size)
+            checkpoint.offset = offset
+            self._checkpoints[path] = checkpoint
+        return added + count
+
+    def poll(self) -> int:
+        """Read what was appended to every file; returns the new event count."""
+        with self._poll_lock:
+            added = sum(self._follow(path) for path in self.paths)
+            self._save_checkpoints()
+        return added
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def events_since(self, seq: int = 0, limit: Optional[int] = None) -> List[LogEvent]:
+        """Get buffered events newer than ``seq``, oldest first."""
+        with self._lock:
+            events = [e for e in self._events if e.seq > seq]
+        if limit is not None:
+            events = events[-limit:]
+        return events
+
+
+_follower: Optional[LogFollower] = None
+_follower_lock = threading.Lock()
+
+
+def get_log_follower() -> LogFollower:
+    """Get the global follower for the system security logs."""
+    global _follower
+    if _follower is None:
+        with _follower_lock:
+            if _follower is None:
+                _follower = LogFollower()
+    return _follower
@@ -0,0 +1,486 @@
+"""
+Performance baselines, anomaly detection and forecasts for SysAgent CLI.
+
+Works on metric history read from the time-series store as NumPy arrays.
+
+- Baselines are quantiles of each metric per hour of the week (local time),
+  so "normal" on Monday 10:00 is judged against earlier Monday mornings.
+- Anomalies are scored with robust (median/MAD) z-scores over a sliding
+  window of recent samples and, when a baseline exists, against the
+  quantiles of the sample's hour-of-week slot.
+- Forecasts fit a least-squares line and, given enough history, an additive
+  Holt-Winters model (daily season) whose smoothing parameters are chosen by
+  a grid search run for all parameter combinations at once, fitted to the
+  newest run of samples without gaps. The model with
+  the lower error on held-out recent history is used to estimate when a
+  threshold will be crossed.
+"""
+
+import itertools
+import json
+import math
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+HOURS_PER_WEEK = 168
+
+BASELINE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Samples in an hour-of-week slot for full confidence in its quantiles
+FULL_CONFIDENCE_SAMPLES = 24
+
+# Modified z-score above which a sample is anomalous (Iglewicz and Hoaglin)
+ANOMALY_THRESHOLD = 3.5
+
+# Samples before each point that its rolling z-score is computed from
+ANOMALY_WINDOW = 60
+
+# Days of history after which forecast confidence is no longer discounted
+FULL_CONFIDENCE_DAYS = 7.0
+
+# Smoothing parameters tried when fitting Holt-Winters models
+_ALPHAS = (0.05, 0.1, 0.2, 0.4, 0.7)
+_BETAS = (0.0, 0.01, 0.05, 0.1, 0.3)
+_GAMMAS = (0.05, 0.1, 0.3, 0.5)
+
+_MAD_SCALE = 0.6745
+_IQR_SCALE = 1.349
+
+
+def hour_of_week(ts: "np.ndarray") -> "np.ndarray":
+    """Map epoch timestamps to local hour of the week (Monday 00:00 is 0)."""
+    ts = np.asarray(ts, dtype=np.float64)
+    if not len(ts):
+        return np.zeros(0, dtype=np.int64)
+    hours = np.floor_divide(ts, 3600).astype(np.int64)
+    # UTC offsets only change at hour boundaries, so look each hour up once
+    unique, inverse = np.unique(hours, return_inverse=True)
+    offsets = np.fromiter(
+        (time.localtime(int(h) * 3600).tm_gmtoff for h in unique),
+        dtype=np.int64, count=len(unique)
+    )
+    local_hours = np.floor_divide(ts + offsets[inverse], 3600).astype(np.int64)
+    # 1970-01-01 was a Thursday
+    return (local_hours + 3 * 24) % HOURS_PER_WEEK
+
+
+class Baseline:
+    """Per hour-of-week quantiles of one metric."""
+
+    def __init__(self, metric: str, quantiles: Sequence[float], values: "np.ndarray",
+                 counts: "np.ndarray", samples: int, span_days: float,
+                 created: Optional[float] = None):
+        self.metric = metric
+        self.quantiles = tuple(quantiles)
+        self.values = values
+        self.counts = counts
+        self.samples = samples
+        self.span_days = span_days
+        self.created = created or time.time()
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of hour-of-week slots with samples."""
+        return float(np.count_nonzero(self.counts)) / HOURS_PER_WEEK
+
+    def slot_confidence(self, slots: "np.ndarray") -> "np.ndarray":
+        return np.minimum(1.0, self.counts[slots] / FULL_CONFIDENCE_SAMPLES)
+
+    def quantile(self, q: float, slots: "np.ndarray") -> "np.ndarray":
+        return self.values[slots, self.quantiles.index(q)]
+
+    def slot(self, ts: Optional[float] = None) -> Dict[str, Any]:
+        """Describe the slot a timestamp (default: now) falls in."""
+        slot = int(hour_of_week(np.array([time.time() if ts is None else ts]))[0])
+        row = self.values[slot]
+        return {
+            "hour_of_week": slot,
+            "quantiles": {
+                f"p{int(round(q * 100)):02d}": None if math.isnan(v) else round(float(v), 2)
+                for q, v in zip(self.quantiles, row)
+            },
+            "samples": int(self.counts[slot]),
+            "confidence": round(float(self.slot_confidence(np.array([slot]))[0]), 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "quantiles": list(self.quantiles),
+            "values": [[None if math.isnan(v) else float(v) for v in row] for row in self.values],
+            "counts": self.counts.tolist(),
+            "samples": self.samples,
+            "span_days": self.span_days,
+            "created": self.created,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Baseline":
+        values = np.array(
+            [[np.nan if v is None else v for v in row] for row in data["values"]],
+            dtype=np.float64
+        )
+        return cls(
+            data["metric"], data["quantiles"], values,
+            np.array(data["counts"], dtype=np.int64),
+            data["samples"], data["span_days"], data["created"]
+        )
+
+
+def compute_baseline(metric: str, ts: "np.ndarray", values: "np.ndarray",
+                     quantiles: Sequence[float] = BASELINE_QUANTILES) -> Baseline:
+    """Compute per hour-of-week quantiles with linear interpolation."""
+    ts = np.asarray(ts, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    keep = np.isfinite(values)
+    ts, values = ts[keep], values[keep]
+    q = np.asarray(quantiles, dtype=np.float64)
+
+    slots = hour_of_week(ts)
+    order = np.lexsort((values, slots))
+    ordered = values[order]
+    counts = np.bincount(slots, minlength=HOURS_PER_WEEK)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Interpolate every (slot, quantile) pair at once
+    position = starts[:, None] + q[None, :] * np.maximum(counts[:, None] - 1, 0)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    result = np.full((HOURS_PER_WEEK, len(q)), np.nan)
+    filled = counts > 0
+    if len(ordered):
+        low = np.clip(low, 0, len(ordered) - 1)
+        high = np.clip(high, 0, len(ordered) - 1)
+        interpolated = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+        result[filled] = interpolated[filled]
+
+    span = float(ts[-1] - ts[0]) / 86400 if len(ts) > 1 else 0.0
+    return Baseline(metric, quantiles, result, counts, int(len(values)), round(span, 2))
+
+
+def save_baselines(path: Path, baselines: Dict[str, Baseline]):
+    """Write baselines to a JSON file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_suffix(".tmp")
+    with open(temp_file, "w") as f:
+        json.dump({name: b.to_dict() for name, b in baselines.items()}, f)
+    os.replace(temp_file, path)
+
+
+def load_baselines(path: Path) -> Dict[str, Baseline]:
+    """Read baselines saved by ``save_baselines``."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return {name: Baseline.from_dict(item) for name, item in data.items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def rolling_robust_z(values: "np.ndarray", window: int = ANOMALY_WINDOW) -> "np.ndarray":
+    """Modified z-score of each sample against the ``window`` samples before it.
+
+    The first ``window`` samples have no score (NaN).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scores = np.full(len(values), np.nan)
+    if len(values) <= window:
+        return scores
+    windows = sliding_window_view(values[:-1], window)
+    median = np.median(windows, axis=1)
+    deviation = np.abs(windows - median[:, None])
+    mad = np.median(deviation, axis=1)
+    # Fall back to the mean absolute deviation when over half the window is
+    # identical, and to a small floor for a constant window
+    mean_ad = deviation.mean(axis=1) * 1.2533
+    spread = np.where(mad > 0, mad / _MAD_SCALE, mean_ad)
+    spread = np.maximum(spread, 1e-3 * np.maximum(1.0, np.abs(median)))
+    scores[window:] = (values[window:] - median) / spread
+    return scores
+
+
+def seasonal_z(baseline: Baseline, ts: "np.ndarray", values: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Z-score of samples against their hour-of-week slot; returns (z, confidence)."""
+    slots = hour_of_week(ts)
+    median = baseline.quantile(0.5, slots)
+    spread = (baseline.quantile(0.75, slots) - baseline.quantile(0.25, slots)) / _IQR_SCALE
+    spread = np.maximum(np.nan_to_num(spread), 1e-3 * np.maximum(1.0, np.abs(np.nan_to_num(median))))
+    z = (np.asarray(values, dtype=np.float64) - median) / spread
+    return z, baseline.slot_confidence(slots)
+
+
+def detect_anomalies(ts: "np.ndarray", values: "np.ndarray", baseline: Optional[Baseline] = None,
+                     window: int = ANOMALY_WINDOW,
+                     threshold: float = ANOMALY_THRESHOLD) -> Dict[str, Any]:
+    """Flag samples that deviate from recent history or from the baseline.
+
+    Consecutive flagged samples are grouped into episodes.
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    result: Dict[str, Any] = {"samples": int(len(values)), "episodes": [], "current": None}
+    if not len(values):
+        return result
+
+    window = max(3, min(window, len(values) // 2))
+    rolling = rolling_robust_z(values, window)
+    signed = np.nan_to_num(rolling)
+    flagged = np.abs(signed) > threshold
+    method = np.where(flagged, "rolling", "")
+
+    seasonal = confidence = None
+    if baseline is not None:
+        seasonal, confidence = seasonal_z(baseline, ts, values)
+        # Only trust slots with a reasonable number of samples
+        trusted = np.where(confidence >= 0.5, seasonal, 0.0)
+        seasonal_flag = np.abs(trusted) > threshold
+        method = np.where(seasonal_flag & flagged, "rolling+seasonal",
+                          np.where(seasonal_flag, "seasonal", method))
+        signed = np.where(np.abs(trusted) > np.abs(signed), trusted, signed)
+        flagged |= seasonal_flag
+    score = np.abs(signed)
+
+    indices = np.flatnonzero(flagged)
+    if len(indices):
+        # Split where flagged samples are not adjacent
+        breaks = np.flatnonzero(np.diff(indices) > 1) + 1
+        for group in np.split(indices, breaks):
+            peak = group[np.argmax(score[group])]
+            result["episodes"].append({
+                "start": datetime.fromtimestamp(ts[group[0]]).isoformat(),
+                "end": datetime.fromtimestamp(ts[group[-1]]).isoformat(),
+                "samples": int(len(group)),
+                "peak_value": round(float(values[peak]), 2),
+                "score": round(float(score[peak]), 2),
+                "direction": "high" if signed[peak] > 0 else "low",
+                "method": str(method[peak]),
+            })
+
+    last = len(values) - 1
+    current = {
+        "value": round(float(values[last]), 2),
+        "rolling_z": None if math.isnan(rolling[last]) else round(float(rolling[last]), 2),
+        "anomalous": bool(flagged[last]),
+    }
+    if baseline is not None:
+        slot = baseline.slot(ts[last])
+        current.update(
+            seasonal_z=round(float(seasonal[last]), 2),
+            expected_range=[slot["quantiles"].get("p05"), slot["quantiles"].get("p95")],
+            confidence=round(float(confidence[last]), 2),
+        )
+    else:
+        # Without a baseline, confidence grows with the rolling window filled
+        current["confidence"] = round(min(1.0, len(values) / (2.0 * ANOMALY_WINDOW)), 2)
+    result["current"] = current
+    return result
+
+
+def fit_linear(t: "np.ndarray", y: "np.ndarray") -> Dict[str, float]:
+    """Least-squares line; returns slope, intercept, slope standard error and r2."""
+    n = len(t)
+    t_mean, y_mean = t.mean(), y.mean()
+    sxx = float(((t - t_mean) ** 2).sum())
+    if n < 3 or sxx == 0:
+        return {"slope": 0.0, "intercept": float(y_mean), "slope_se": math.inf, "r2": 0.0, "sigma": 0.0}
+    slope = float(((t - t_mean) * (y - y_mean)).sum() / sxx)
+    intercept = float(y_mean - slope * t_mean)
+    residuals = y - (intercept + slope * t)
+    sse = float((residuals ** 2).sum())
+    sst = float(((y - y_mean) ** 2).sum())
+    sigma = math.sqrt(sse / (n - 2))
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "slope_se": sigma / math.sqrt(sxx),
+        "r2": 1.0 - sse / sst if sst > 0 else 1.0,
+        "sigma": sigma,
+    }
+
+
+def fit_holt_winters(y: "np.ndarray", season: int) -> Optional[Dict[str, Any]]:
+    """Fit additive Holt-Winters by grid search over the smoothing parameters.
+
+    The recursion steps through time once, updating every parameter
+    combination together as a vector. Returns None without two full seasons.
+    """
+    n = len(y)
+    if n < 2 * season + 2:
+        return None
+    grid = np.array(list(itertools.product(_ALPHAS, _BETAS, _GAMMAS)))
+    alpha, beta, gamma = grid[:, 0], grid[:, 1], grid[:, 2]
+    combos = len(grid)
+
+    first = y[:season].mean()
+    level = np.full(combos, first)
+    trend = np.full(combos, (y[season:2 * season].mean() - first) / season)
+    seasonal = np.tile(y[:season] - first, (combos, 1))
+    sse = np.zeros(combos)
+
+    for i in range(season, n):
+        k = i % season
+        s = seasonal[:, k]
+        error = y[i] - (level + trend + s)
+        sse += error * error
+        new_level = alpha * (y[i] - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, k] = gamma * (y[i] - new_level) + (1 - gamma) * s
+        level = new_level
+
+    best = int(np.argmin(sse))
+    return {
+        "alpha": float(alpha[best]),
+        "beta": float(beta[best]),
+        "gamma": float(gamma[best]),
+        "level": float(level[best]),
+        "trend": float(trend[best]),
+        "seasonal": seasonal[best].copy(),
+        "season": season,
+        "n": n,
+        "sigma": math.sqrt(float(sse[best]) / max(1, n - season)),
+    }
+
+
+def _holt_winters_path(model: Dict[str, Any], steps: int) -> "np.ndarray":
+    h = np.arange(1, steps + 1)
+    season_index = (model["n"] - 1 + h) % model["season"]
+    return model["level"] + model["trend"] * h + model["seasonal"][season_index]
+
+
+def _first_crossing(path: "np.ndarray", threshold: float) -> Optional[int]:
+    above = np.flatnonzero(path >= threshold)
+    return int(above[0]) + 1 if len(above) else None
+
+
+def forecast_threshold(ts: "np.ndarray", values: "np.ndarray", threshold: float,
+                       step_seconds: float, season: int = 24,
+                       horizon_days: float = 365.0) -> Dict[str, Any]:
+    """Forecast when a metric will reach ``threshold``.
+
+    Args:
+        ts: Epoch timestamps, about ``step_seconds`` apart. Holt-Winters is
+            only fitted to the samples after the last gap.
+        values: Metric values.
+        threshold: Level to forecast, e.g. 90 for a disk at 90% full.
+        step_seconds: Spacing of the samples.
+        season: Samples per seasonal cycle for Holt-Winters.
+        horizon_days: How far ahead to look for a crossing.
+
+    Returns:
+        Model used, trend per day, estimated days until the threshold (None if
+        not reached within the horizon) with a low/high range, and a 0-1
+        confidence based on held-out error and history length.
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+    keep = np.isfinite(y)
+    ts, y = ts[keep], y[keep]
+    n = len(y)
+    result: Dict[str, Any] = {"samples": int(n), "threshold": threshold}
+    if n < 3:
+        result.update(model=None, confidence=0.0, time_to_threshold_days=None,
+                      message="Not enough history to forecast")
+        return result
+
+    days = (ts - ts[-1]) / 86400
+    span_days = float(-days[0])
+    steps_per_day = 86400 / step_seconds
+    horizon = int(horizon_days * steps_per_day)
+    result.update(current=round(float(y[-1]), 2), span_days=round(span_days, 2))
+
+    # Holt-Winters treats samples as evenly spaced, so it only sees the
+    # newest run without gaps; the line is fitted on real time
+    gaps = np.flatnonzero(np.diff(ts) > 1.5 * step_seconds)
+    regular = int(gaps[-1]) + 1 if len(gaps) else 0
+
+    # Pick the model with the lower error on the most recent fifth
+    split = int(n * 0.8)
+    holdout = n - split
+    candidates = {}
+    if holdout >= 2 and split >= 3:
+        line = fit_linear(days[:split], y[:split])
+        predicted = line["intercept"] + line["slope"] * days[split:]
+        candidates["linear"] = float(np.abs(y[split:] - predicted).mean())
+        hw = fit_holt_winters(y[regular:split], season) if regular < split else None
+        if hw is not None:
+            candidates["holt_winters"] = float(np.abs(y[split:] - _holt_winters_path(hw, holdout)).mean())
+    model_name = min(candidates, key=candidates.get) if candidates else "linear"
+
+    line = fit_linear(days, y)
+    hw = fit_holt_winters(y[regular:], season) if model_name == "holt_winters" else None
+    if hw is None:
+        model_name = "linear"
+
+    scale = float(y.std()) or 1.0
+    if candidates:
+        fit_quality = max(0.0, 1.0 - candidates[model_name] / scale)
+    else:
+        fit_quality = max(0.0, line["r2"])
+    confidence = fit_quality * min(1.0, span_days / FULL_CONFIDENCE_DAYS)
+
+    if model_name == "holt_winters":
+        slope_per_day = hw["trend"] * steps_per_day
+        path = _holt_winters_path(hw, horizon)
+        band = 1.96 * hw["sigma"] * np.sqrt(np.arange(1, horizon + 1))
+        crossing = _first_crossing(path, threshold)
+        earliest = _first_crossing(path + band, threshold)
+        latest = _first_crossing(path - band, threshold)
+        estimate, low, high = (
+            None if steps is None else round(steps / steps_per_day, 2)
+            for steps in (crossing, earliest, latest)
+        )
+        result["parameters"] = {k: round(hw[k], 3) for k in ("alpha", "beta", "gamma")}
+    else:
+        slope_per_day = line["slope"]
+        now_value = line["intercept"]  # days are relative to the last sample
+
+        def crossing_days(slope):
+            if now_value >= threshold:
+                return 0.0
+            if slope <= 0:
+                return None
+            value = (threshold - now_value) / slope
+            return round(value, 2) if value <= horizon_days else None
+
+        margin = 1.96 * line["slope_se"]
+        estimate = crossing_days(line["slope"])
+        low = crossing_days(line["slope"] + margin) if math.isfinite(margin) else None
+        high = crossing_days(line["slope"] - margin) if math.isfinite(margin) else None
+        result["r2"] = round(line["r2"], 3)
+
+    if y[-1] >= threshold:
+        estimate = low = 0.0
+    result.update(
+        model=model_name,
+        holdout_mae={k: round(v, 3) for k, v in candidates.items()},
+        trend_per_day=round(slope_per_day, 4),
+        time_to_threshold_days=estimate,
+        time_to_threshold_range_days=[low, high],
+        eta=None if estimate is None else datetime.fromtimestamp(ts[-1] + estimate * 86400).isoformat(),
+        confidence=round(confidence, 2),
+    )
+    return result
+
+
+def series_arrays(store, name: str, start: Optional[float] = None,
+                  resolution: Optional[str] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Read (timestamps, values) of a series; rollups give bucket averages."""
+    columns = store.arrays(name, start=start, resolution=resolution)
+    ts = np.frombuffer(columns[0], dtype=np.float64)
+    if resolution is None:
+        return ts, np.frombuffer(columns[1], dtype=np.float64)
+    total = np.frombuffer(columns[3], dtype=np.float64)
+    count = np.frombuffer(columns[4], dtype=np.float64)
+    return ts, total / np.maximum(count, 1)
@@ -0,0 +1,271 @@
+"""
+Shared system metrics sampler for SysAgent CLI.
+
+A single background thread reads CPU, memory, disk, network and battery
+counters once per tick and turns them into a ``Snapshot``. CPU usage and I/O
+rates are computed from the difference between consecutive ticks, so no
+caller ever has to block in ``psutil.cpu_percent(interval=...)``. Monitors and
+tools read the latest snapshot, or a short history, instead of sampling the
+same counters themselves.
+"""
+
+import atexit
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# Minimum time between the baseline and the first snapshot, so that the
+# first CPU reading is not computed over a near-zero interval
+_MIN_DELTA = 0.1
+
+# Metrics kept in the time-series store for each snapshot: name -> (unit, category)
+METRIC_UNITS = {
+    "cpu_percent": ("%", "cpu"),
+    "memory_percent": ("%", "memory"),
+    "memory_used": ("GB", "memory"),
+    "memory_available": ("GB", "memory"),
+    "disk_percent": ("%", "disk"),
+    "disk_used": ("GB", "disk"),
+    "disk_free": ("GB", "disk"),
+}
+
+
+@dataclass
+class Snapshot:
+    """System metrics captured at one sampler tick."""
+    timestamp: float
+    cpu_percent: float
+    cpu_per_core: List[float]
+    memory: Any
+    swap: Any
+    disk: Any
+    battery: Any = None
+    disk_read_bytes_per_sec: float = 0.0
+    disk_write_bytes_per_sec: float = 0.0
+    net_sent_bytes_per_sec: float = 0.0
+    net_recv_bytes_per_sec: float = 0.0
+    net_io: Any = None
+    disk_io: Any = None
+    load_average: tuple = (0.0, 0.0, 0.0)
+    process_count: int = 0
+
+    def to_metrics(self) -> Dict[str, float]:
+        """Flatten the snapshot into the metrics named in ``METRIC_UNITS``."""
+        gb = 1024 ** 3
+        return {
+            "cpu_percent": self.cpu_percent,
+            "memory_percent": self.memory.percent,
+            "memory_used": self.memory.used / gb,
+            "memory_available": self.memory.available / gb,
+            "disk_percent": self.disk.percent,
+            "disk_used": self.disk.used / gb,
+            "disk_free": self.disk.free / gb,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the snapshot to plain JSON-friendly values."""
+        def plain(value):
+            return value._asdict() if hasattr(value, "_asdict") else value
+
+        return {
+            "timestamp": self.timestamp,
+            "cpu_percent": self.cpu_percent,
+            "cpu_per_core": list(self.cpu_per_core),
+            "memory": plain(self.memory),
+            "swap": plain(self.swap),
+            "disk": plain(self.disk),
+            "battery": plain(self.battery),
+            "disk_read_bytes_per_sec": self.disk_read_bytes_per_sec,
+            "disk_write_bytes_per_sec": self.disk_write_bytes_per_sec,
+            "net_sent_bytes_per_sec": self.net_sent_bytes_per_sec,
+            "net_recv_bytes_per_sec": self.net_recv_bytes_per_sec,
+            "net_io": plain(self.net_io),
+            "disk_io": plain(self.disk_io),
+            "load_average": list(self.load_average),
+            "process_count": self.process_count,
+        }
+
+
+def _busy_percent(before, after) -> float:
+    """Compute CPU busy percentage between two ``cpu_times`` readings."""
+    def split(times):
+        values = times._asdict()
+        # guest time is already counted in user time on Linux
+        total = sum(v for k, v in values.items() if k not in ("guest", "guest_nice"))
+        idle = values.get("idle", 0.0) + values.get("iowait", 0.0)
+        return total, idle
+
+    total_before, idle_before = split(before)
+    total_after, idle_after = split(after)
+    total = total_after - total_before
+    if total <= 0:
+        return 0.0
+    busy = total - (idle_after - idle_before)
+    return round(max(0.0, min(100.0, busy / total * 100)), 1)
+
+
+class MetricsSampler:
+    """Background sampler that keeps the latest system metrics snapshot."""
+
+    def __init__(self, interval: float = 2.0, history_size: int = 300, disk_path: str = "/"):
+        self.interval = interval
+        self.disk_path = disk_path
+        self._history: deque = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._baseline: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampler thread."""
+        if not PSUTIL_AVAILABLE:
+            raise RuntimeError("psutil is required for system metrics")
+        with self._lock:
+            if self.running:
+                return
+            if self._baseline is None:
+                self._baseline = self._read_counters()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sysagent-metrics-sampler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                pass
+
+    def _read_counters(self) -> Dict[str, Any]:
+        """Read the cumulative counters used for deltas."""
+        counters = {
+            "time": time.monotonic(),
+            "cpu": psutil.cpu_times(),
+            "cpu_per_core": psutil.cpu_times(percpu=True),
+            "net_io": None,
+            "disk_io": None,
+        }
+        try:
+            counters["net_io"] = psutil.net_io_counters()
+        except Exception:
+            pass
+        try:
+            counters["disk_io"] = psutil.disk_io_counters()
+        except Exception:
+            pass
+        return counters
+
+    def sample(self) -> Snapshot:
+        """Take a snapshot now, using the previous tick as the baseline."""
+        with self._tick_lock:
+            if self._baseline is None:
+                self._baseline = self._read_counters()
+            wait = _MIN_DELTA - (time.monotonic() - self._baseline["time"])
+            if wait > 0:
+                time.sleep(wait)
+
+            before = self._baseline
+            after = self._read_counters()
+            elapsed = max(after["time"] - before["time"], 1e-6)
+
+            def rate(key, attr):
+                if before[key] is None or after[key] is None:
+                    return 0.0
+                return max(0, getattr(after[key], attr) - getattr(before[key], attr)) / elapsed
+
+            try:
+                battery = psutil.sensors_battery()
+            except Exception:
+                battery = None
+            try:
+                load_average = psutil.getloadavg()
+            except Exception:
+                load_average = (0.0, 0.0, 0.0)
+
+            snapshot = Snapshot(
+                timestamp=time.time(),
+                cpu_percent=_busy_percent(before["cpu"], after["cpu"]),
+                cpu_per_core=[
+                    _busy_percent(b, a)
+                    for b, a in zip(before["cpu_per_core"], after["cpu_per_core"])
+                ],
+                memory=psutil.virtual_memory(),
+                swap=psutil.swap_memory(),
+                disk=psutil.disk_usage(self.disk_path),
+                battery=battery,
+                disk_read_bytes_per_sec=rate("disk_io", "read_bytes"),
+                disk_write_bytes_per_sec=rate("disk_io", "write_bytes"),
+                net_sent_bytes_per_sec=rate("net_io", "bytes_sent"),
+                net_recv_bytes_per_sec=rate("net_io", "bytes_recv"),
+                net_io=after["net_io"],
+                disk_io=after["disk_io"],
+                load_average=tuple(load_average),
+                process_count=len(psutil.pids()),
+            )
+            self._baseline = after
+
+        with self._lock:
+            self._history.append(snapshot)
+        return snapshot
+
+    def latest(self, max_age: Optional[float] = None) -> Snapshot:
+        """Get the most recent snapshot.
+
+        Args:
+            max_age: If the newest snapshot is older than this many seconds,
+                take a fresh one instead.
+        """
+        with self._lock:
+            snapshot = self._history[-1] if self._history else None
+        if snapshot is None or (max_age is not None and time.time() - snapshot.timestamp > max_age):
+            snapshot = self.sample()
+        return snapshot
+
+    def history(self, seconds: Optional[float] = None) -> List[Snapshot]:
+        """Get recent snapshots, oldest first."""
+        with self._lock:
+            snapshots = list(self._history)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            snapshots = [s for s in snapshots if s.timestamp >= cutoff]
+        return snapshots
+
+
+_sampler: Optional[MetricsSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> MetricsSampler:
+    """Get the global metrics sampler, starting it on first use."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = MetricsSampler()
+                sampler.start()
+                atexit.register(sampler.stop)
+                _sampler = sampler
+    return _sampler
@@ -0,0 +1,286 @@
+"""
+Concurrent TCP port scanner for SysAgent CLI.
+
+``PortScanner`` connects to many (host, port) pairs at once from a single
+asyncio event loop using non-blocking sockets. A fixed pool of workers pulls
+targets from a shared iterator, so a large range never creates more than
+``concurrency`` sockets or tasks at a time. Connect timeouts adapt to each
+host: every answer (accepted or refused) is an RTT sample, and the timeout
+follows the smoothed RTT plus four deviations, as TCP retransmission timers
+do, bounded by ``min_timeout`` and ``timeout``. Results are delivered as they
+arrive, through a callback or the ``iter_scan`` generator.
+"""
+
+import asyncio
+import errno
+import ipaddress
+import queue
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3306, 5432, 8080]
+
+# Connects in flight at once
+DEFAULT_CONCURRENCY = 500
+
+# Lower bound for the adaptive connect timeout, in seconds
+MIN_TIMEOUT = 0.25
+
+# Hosts expanded from one CIDR range at most
+MAX_HOSTS = 65536
+
+# Errors that mean the port answered but is not listening
+_CLOSED_ERRNOS = {errno.ECONNREFUSED, errno.ECONNRESET}
+
+
+@dataclass
+class PortResult:
+    """Outcome of one connect attempt."""
+    host: str
+    port: int
+    state: str  # open, closed or filtered
+    rtt_ms: Optional[float] = None
+
+
+@dataclass
+class ScanSummary:
+    """Results of a scan, grouped by host.
+
+    Closed ports are only listed for single-host scans; multi-host scans
+    keep open and filtered results and count closed ports in ``closed``.
+    """
+    hosts: Dict[str, List[PortResult]] = field(default_factory=dict)
+    closed: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+    unresolved: List[str] = field(default_factory=list)
+
+    def ports(self, host: str, state: str) -> List[int]:
+        return sorted(r.port for r in self.hosts.get(host, []) if r.state == state)
+
+    def count(self, host: str, state: str) -> int:
+        if state == "closed":
+            return self.closed.get(host, 0)
+        return sum(1 for r in self.hosts.get(host, []) if r.state == state)
+
+
+def parse_ports(spec: Optional[str], default: Sequence[int] = COMMON_PORTS) -> List[int]:
+    """Parse a port list such as ``"22,80,8000-8100"``."""
+    if spec is None or str(spec).strip() == "":
+        return list(default)
+    ports = []
+    seen = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(p) for p in part.split("-", 1))
+            candidates = range(start, end + 1)
+        else:
+            candidates = [int(part)]
+        for port in candidates:
+            if not 0 < port < 65536:
+                raise ValueError(f"Invalid port: {port}")
+            if port not in seen:
+                seen.add(port)
+                ports.append(port)
+    return ports
+
+
+def expand_hosts(spec: str, max_hosts: int = MAX_HOSTS) -> List[str]:
+    """Expand a host list such as ``"10.0.0.0/24,example.com"``."""
+    hosts = []
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "/" in part:
+            network = ipaddress.ip_network(part, strict=False)
+            if network.num_addresses > max_hosts:
+                raise ValueError(f"{part} has more than {max_hosts} addresses")
+            addresses = list(network.hosts()) or [network.network_address]
+            hosts.extend(str(a) for a in addresses)
+        else:
+            hosts.append(part)
+    return hosts
+
+
+def _fd_limit(requested: int) -> int:
+    """Cap concurrency below the open-file limit."""
+    if resource is None:
+        return requested
+    try:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ValueError, OSError):
+        return requested
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - 64))
+
+
+class _RttEstimator:
+    """Smoothed RTT and deviation for one host (RFC 6298 style)."""
+
+    def __init__(self, min_timeout: float, max_timeout: float):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, self.srtt + 4 * self.rttvar))
+
+
+class PortScanner:
+    """TCP connect scanner with bounded concurrency and adaptive timeouts."""
+
+    def __init__(self, timeout: float = 5.0, concurrency: int = DEFAULT_CONCURRENCY,
+                 min_timeout: float = MIN_TIMEOUT, adaptive: bool = True):
+        self.timeout = float(timeout)
+        self.min_timeout = min(float(min_timeout), self.timeout)
+        self.concurrency = _fd_limit(max(1, int(concurrency)))
+        self.adaptive = adaptive
+
+    async def _resolve(self, loop, host: str):
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return None
+        # Prefer IPv4, like socket.create_connection on most systems
+        infos.sort(key=lambda info: info[0] != socket.AF_INET)
+        family, _, _, _, sockaddr = infos[0]
+        return family, sockaddr[0]
+
+    async def _probe(self, loop, family: int, address: str, port: int, timeout: float):
+        """Connect once; returns (state, rtt seconds or None)."""
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (address, port)), timeout)
+            return "open", time.perf_counter() - start
+        except asyncio.TimeoutError:
+            return "filtered", None
+        except OSError as e:
+            if e.errno in _CLOSED_ERRNOS or isinstance(e, ConnectionRefusedError):
+                return "closed", time.perf_counter() - start
+            # Unreachable networks and similar ICMP errors
+            return "filtered", None
+        finally:
+            sock.close()
+
+    async def scan_async(self, hosts: Iterable[str], ports: Sequence[int],
+                         on_result: Optional[Callable[[PortResult], None]] = None) -> ScanSummary:
+        """Scan every port on every host, calling ``on_result`` per answer."""
+        loop = asyncio.get_running_loop()
+        summary = ScanSummary()
+        start = time.perf_counter()
+
+        hosts = list(dict.fromkeys(hosts))
+        resolved = await asyncio.gather(*(self._resolve(loop, h) for h in hosts))
+        targets = {}
+        for host, address in zip(hosts, resolved):
+            if address is None:
+                summary.unresolved.append(host)
+            else:
+                targets[host] = address
+                summary.hosts[host] = []
+                summary.closed[host] = 0
+        keep_closed = len(targets) == 1
+        estimators = {h: _RttEstimator(self.min_timeout, self.timeout) for h in targets}
+
+        # Port-major order spreads load across hosts in multi-host scans
+        pairs = ((host, port) for port in ports for host in targets)
+
+        async def worker():
+            for host, port in pairs:
+                family, address = targets[host]
+                estimator = estimators[host]
+                timeout = estimator.timeout if self.adaptive else self.timeout
+                state, rtt = await self._probe(loop, family, address, port, timeout)
+                if rtt is not None:
+                    estimator.sample(rtt)
+                result = PortResult(host, port, state, round(rtt * 1000, 3) if rtt is not None else None)
+                if state == "closed":
+                    summary.closed[host] += 1
+                if state != "closed" or keep_closed:
+                    summary.hosts[host].append(result)
+                if on_result is not None:
+                    on_result(result)
+
+        total = len(targets) * len(ports)
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, total))]
+        try:
+            if workers:
+                await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        summary.duration = time.perf_counter() - start
+        return summary
+
+    def scan(self, hosts: Iterable[str], ports: Sequence[int],
+             on_result: Optional[Callable[[PortResult], None]] = None) -> ScanSummary:
+        """Blocking scan; runs its own event loop (in a thread if one is running)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.scan_async(hosts, ports, on_result))
+
+        outcome = {}
+
+        def run():
+            try:
+                outcome["summary"] = asyncio.run(self.scan_async(hosts, ports, on_result))
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, name="sysagent-port-scan", daemon=True)
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["summary"]
+
+    def iter_scan(self, hosts: Iterable[str], ports: Sequence[int]) -> Iterator[PortResult]:
+        """Yield results as they arrive, scanning in a background thread."""
+        results: "queue.Queue" = queue.Queue()
+        done = object()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self.scan_async(hosts, ports, results.put))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                results.put(done)
+
+        threading.Thread(target=run, name="sysagent-port-scan", daemon=True).start()
+        while True:
+            item = results.get()
+            if item is done:
+                break
+            yield item
+        if errors:
+            raise errors[0]
@@ -0,0 +1,249 @@
+"""
+Incremental process table for SysAgent CLI.
+
+Keeps one entry per running process and refreshes it by diffing PIDs: only
+new processes have their static attributes (name, cmdline, ppid, create time)
+read, exited processes are dropped, and CPU usage is computed from the CPU
+time consumed between refreshes. Name and parent indexes make lookups by name
+and process tree builds proportional to the number of matching processes
+rather than to the size of the process table.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import psutil
+
+
+# Processes younger than this (seconds) when first seen are re-read once
+YOUNG_PROCESS_AGE = 1.0
+
+
+@dataclass
+class ProcessEntry:
+    """A cached process table row."""
+    pid: int
+    name: str
+    cmdline: List[str]
+    ppid: int
+    create_time: float
+    process: Any = field(repr=False, default=None)
+    cpu_percent: float = 0.0
+    memory_percent: float = 0.0
+    rss: int = 0
+    status: str = ""
+
+
+class ProcessTable:
+    """Process table refreshed incrementally from PID diffs."""
+
+    def __init__(self, max_age: float = 1.0):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._entries: Dict[int, ProcessEntry] = {}
+        self._by_name: Dict[str, Set[int]] = {}
+        self._children: Dict[int, Set[int]] = {}
+        # Processes seen right after they started; they may not have exec'd yet
+        self._young: Set[int] = set()
+        self._last_refresh = 0.0
+        self._last_sample = 0.0
+
+    def _add(self, pid: int) -> Optional[ProcessEntry]:
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name()
+                ppid = proc.ppid()
+                create_time = proc.create_time()
+                try:
+                    cmdline = proc.cmdline()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    cmdline = []
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+        entry = ProcessEntry(pid, name, cmdline, ppid, create_time, proc)
+        if time.time() - create_time < YOUNG_PROCESS_AGE:
+            self._young.add(pid)
+        self._entries[pid] = entry
+        self._by_name.setdefault(name, set()).add(pid)
+        self._children.setdefault(ppid, set()).add(pid)
+        return entry
+
+    def _remove(self, pid: int):
+        self._young.discard(pid)
+        entry = self._entries.pop(pid, None)
+        if entry is None:
+            return
+        names = self._by_name.get(entry.name)
+        if names:
+            names.discard(pid)
+            if not names:
+                del self._by_name[entry.name]
+        siblings = self._children.get(entry.ppid)
+        if siblings:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[entry.ppid]
+
+    def _reparent(self, entry: ProcessEntry):
+        try:
+            ppid = entry.process.ppid()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        if ppid != entry.ppid:
+            siblings = self._children.get(entry.ppid)
+            if siblings:
+                siblings.discard(entry.pid)
+                if not siblings:
+                    del self._children[entry.ppid]
+            entry.ppid = ppid
+            self._children.setdefault(ppid, set()).add(entry.pid)
+
+    def refresh(self, sample: bool = False, max_age: Optional[float] = None):
+        """Bring the table up to date.
+
+        Args:
+            sample: Also sample CPU, memory and status of every process.
+            max_age: Skip the refresh if the table is younger than this many
+                seconds (default: the table's ``max_age``).
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            now = time.monotonic()
+            fresh = now - self._last_refresh < max_age
+            if fresh and (not sample or now - self._last_sample < max_age):
+                return
+
+            if not fresh:
+                pids = set(psutil.pids())
+                orphans = set()
+                for pid in set(self._entries) - pids:
+                    orphans.update(self._children.get(pid, ()))
+                    self._remove(pid)
+                # Re-read static attributes of processes that were cached
+                # before they had a chance to exec
+                for pid in self._young & pids:
+                    self._remove(pid)
+                self._young.clear()
+                for pid in pids - set(self._entries):
+                    self._add(pid)
+                # Children of exited processes have been reparented
+                for pid in orphans & set(self._entries):
+                    self._reparent(self._entries[pid])
+                self._last_refresh = now
+
+            if sample:
+                self._sample()
+                self._last_sample = now
+
+    def _sample(self):
+        """Sample dynamic attributes; drops processes whose PID was reused."""
+        total_memory = psutil.virtual_memory().total or 1
+        for pid, entry in list(self._entries.items()):
+            proc = entry.process
+            try:
+                with proc.oneshot():
+                    if proc.create_time() != entry.create_time:
+                        # PID was reused by a new process
+                        self._remove(pid)
+                        self._add(pid)
+                        continue
+                    entry.cpu_percent = proc.cpu_percent(None)
+                    entry.rss = proc.memory_info().rss
+                    entry.memory_percent = entry.rss / total_memory * 100
+                    entry.status = proc.status()
+            except psutil.NoSuchProcess:
+                self._remove(pid)
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+    def processes(self, sample: bool = False) -> List[ProcessEntry]:
+        """Get all processes."""
+        self.refresh(sample=sample)
+        with self._lock:
+            return list(self._entries.values())
+
+    def get(self, pid: int) -> Optional[ProcessEntry]:
+        """Get a process by PID."""
+        self.refresh()
+        if pid not in self._entries:
+            # May have started since the last refresh
+            self.refresh(max_age=0)
+        with self._lock:
+            return self._entries.get(pid)
+
+    def find_by_name(self, name: str) -> List[ProcessEntry]:
+        """Get processes with exactly this name."""
+        self.refresh()
+        if name not in self._by_name:
+            self.refresh(max_age=0)
+        with self._lock:
+            return [self._entries[pid] for pid in sorted(self._by_name.get(name, ()))]
+
+    def search(self, pattern: str) -> List[ProcessEntry]:
+        """Get processes whose name or command line contains ``pattern``."""
+        self.refresh()
+        needle = pattern.lower()
+        with self._lock:
+            return [
+                entry for entry in self._entries.values()
+                if needle in entry.name.lower()
+                or any(needle in arg.lower() for arg in entry.cmdline)
+            ]
+
+    def children(self, pid: int) -> List[ProcessEntry]:
+        """Get direct children of a process."""
+        self.refresh()
+        with self._lock:
+            return [
+                self._entries[child] for child in sorted(self._children.get(pid, ()))
+                if child != pid
+            ]
+
+    def tree(self, pid: int) -> Dict[str, Any]:
+        """Get the process tree rooted at ``pid`` as nested dicts."""
+        self.get(pid)
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is None:
+                return {}
+            return self._subtree(entry, set())
+
+    def roots(self) -> List[Dict[str, Any]]:
+        """Get trees for processes started by init (or with no parent)."""
+        self.refresh()
+        with self._lock:
+            return [
+                self._subtree(entry, set())
+                for entry in sorted(self._entries.values(), key=lambda e: e.pid)
+                if entry.ppid in (0, 1)
+            ]
+
+    def _subtree(self, entry: ProcessEntry, seen: Set[int]) -> Dict[str, Any]:
+        seen.add(entry.pid)
+        return {
+            "pid": entry.pid,
+            "name": entry.name,
+            "children": [
+                self._subtree(self._entries[child], seen)
+                for child in sorted(self._children.get(entry.pid, ()))
+                if child not in seen
+            ],
+        }
+
+
+_process_table: Optional[ProcessTable] = None
+_process_table_lock = threading.Lock()
+
+
+def get_process_table() -> ProcessTable:
+    """Get the global process table instance."""
+    global _process_table
+    if _process_table is None:
+        with _process_table_lock:
+            if _process_table is None:
+                _process_table = ProcessTable()
+    return _process_table
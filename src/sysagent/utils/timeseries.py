@@ -0,0 +1,456 @@
+"""
+Fixed-capacity time-series store for SysAgent CLI.
+
+Each metric is kept in a ring of memory-mapped columns of doubles (epoch
+timestamp, value) so that weeks of samples fit in a bounded file whose pages
+are managed by the OS rather than held on the Python heap. Samples are kept in
+timestamp order, which makes range queries a binary search. Every append also
+updates 1m/5m/1h rollup rings (min, max, sum, count) so downsampled queries
+over long ranges never have to scan raw samples.
+
+Several processes may share a store directory: every operation holds an
+exclusive lock on ``series.lock`` and re-reads the ring headers first.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows; the store is then shared between threads only
+    fcntl = None
+
+
+# Rollup resolutions in seconds
+RESOLUTIONS = {"1m": 60, "5m": 300, "1h": 3600}
+
+# Two weeks of 5 second samples
+DEFAULT_CAPACITY = 14 * 24 * 3600 // 5
+
+# Rows kept per rollup resolution
+ROLLUP_CAPACITY = {
+    "1m": 14 * 24 * 60,
+    "5m": 30 * 24 * 12,
+    "1h": 365 * 24,
+}
+
+# magic, version, columns, capacity, count, head
+_HEADER = struct.Struct("<8sIIQQQ")
+_HEADER_SIZE = 64
+_MAGIC = b"SATSRING"
+_VERSION = 1
+
+
+class RingFile:
+    """A memory-mapped ring buffer of rows of doubles.
+
+    Column 0 holds epoch timestamps and must be non-decreasing across
+    appends; the remaining columns are free-form values. Once ``capacity``
+    rows have been written, each append overwrites the oldest row.
+    """
+
+    def __init__(self, path: Path, columns: int, capacity: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists() and self.path.stat().st_size >= _HEADER_SIZE:
+            with open(self.path, "rb") as f:
+                magic, version, file_columns, file_capacity, _, _ = _HEADER.unpack(
+                    f.read(_HEADER.size)
+                )
+            if magic == _MAGIC and version == _VERSION and file_columns == columns:
+                # Keep the capacity the file was created with
+                capacity = file_capacity
+            else:
+                self.path.unlink()
+
+        self.columns = columns
+        self.capacity = capacity
+        size = _HEADER_SIZE + columns * capacity * 8
+
+        if not self.path.exists():
+            with open(self.path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, columns, capacity, 0, 0))
+                f.truncate(size)
+
+        self._file = open(self.path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self.refresh()
+
+        view = memoryview(self._mmap)
+        stride = capacity * 8
+        self._cols = [
+            view[_HEADER_SIZE + c * stride:_HEADER_SIZE + (c + 1) * stride].cast("d")
+            for c in range(columns)
+        ]
+        view.release()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def refresh(self):
+        """Re-read count and head, which another process may have moved."""
+        _, _, _, _, self.count, self.head = _HEADER.unpack_from(self._mmap, 0)
+
+    def _physical(self, i: int) -> int:
+        """Map a logical row index (0 is the oldest row) to a slot."""
+        return (self.head - self.count + i) % self.capacity
+
+    def append(self, row: Tuple[float, ...]):
+        """Append a row, overwriting the oldest one when full."""
+        slot = self.head
+        for c, value in enumerate(row):
+            self._cols[c][slot] = value
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        struct.pack_into("<QQ", self._mmap, 24, self.count, self.head)
+
+    def replace_last(self, row: Tuple[float, ...]):
+        """Overwrite the newest row."""
+        slot = self._physical(self.count - 1)
+        for c, value in enumerate(row):
+            self._cols[c][slot] = value
+
+    def row(self, i: int) -> Tuple[float, ...]:
+        """Get a row by logical index."""
+        slot = self._physical(i)
+        return tuple(col[slot] for col in self._cols)
+
+    def timestamp(self, i: int) -> float:
+        """Get the timestamp of a row by logical index."""
+        return self._cols[0][self._physical(i)]
+
+    def last_timestamp(self) -> Optional[float]:
+        """Get the timestamp of the newest row."""
+        return self.timestamp(self.count - 1) if self.count else None
+
+    def bisect_left(self, ts: float) -> int:
+        """Get the logical index of the first row with timestamp >= ts."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Tuple[float, ...]]:
+        """Yield rows with start <= timestamp < end, oldest first."""
+        i = self.bisect_left(start) if start is not None else 0
+        stop = self.bisect_left(end) if end is not None else self.count
+        for index in range(i, stop):
+            yield self.row(index)
+
+    def arrays(self, start: Optional[float] = None, end: Optional[float] = None) -> List[array]:
+        """Copy rows with start <= timestamp < end into one array per column."""
+        i = self.bisect_left(start) if start is not None else 0
+        stop = self.bisect_left(end) if end is not None else self.count
+        first = self._physical(i)
+        # The range wraps around the end of the ring at most once
+        spans = [(first, min(first + stop - i, self.capacity))]
+        if first + stop - i > self.capacity:
+            spans.append((0, first + stop - i - self.capacity))
+        result = []
+        for col in self._cols:
+            values = array("d")
+            for lo, hi in spans:
+                if hi > lo:
+                    values.frombytes(col[lo:hi].cast("B"))
+            result.append(values)
+        return result
+
+    def flush(self):
+        """Flush dirty pages to disk."""
+        self._mmap.flush()
+
+    def close(self):
+        """Unmap and close the file."""
+        if self._mmap.closed:
+            return
+        for col in self._cols:
+            col.release()
+        self._cols = []
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
+
+
+class TimeSeries:
+    """Raw samples and rollups for a single metric."""
+
+    def __init__(self, directory: Path, key: str, capacity: int):
+        self.raw = RingFile(directory / f"{key}.raw", 2, capacity)
+        self.rollups = {
+            res: RingFile(directory / f"{key}.{res}", 5, ROLLUP_CAPACITY[res])
+            for res in RESOLUTIONS
+        }
+        self._repair_rollups()
+
+    def _repair_rollups(self):
+        """Rebuild rollups that were lost or reset from the raw samples."""
+        if not len(self.raw):
+            return
+        for res, ring in self.rollups.items():
+            if not len(ring):
+                for ts, value in self.raw.range():
+                    self._roll(ring, RESOLUTIONS[res], ts, value)
+
+    @staticmethod
+    def _roll(ring: RingFile, seconds: int, ts: float, value: float):
+        bucket = ts - ts % seconds
+        last = ring.last_timestamp()
+        if last is not None and last == bucket:
+            _, low, high, total, count = ring.row(len(ring) - 1)
+            ring.replace_last((bucket, min(low, value), max(high, value), total + value, count + 1))
+        else:
+            ring.append((bucket, value, value, value, 1.0))
+
+    def append(self, ts: float, value: float):
+        """Append a sample, keeping timestamps non-decreasing."""
+        last = self.raw.last_timestamp()
+        if last is not None and ts < last:
+            ts = last
+        self.raw.append((ts, value))
+        for res, ring in self.rollups.items():
+            self._roll(ring, RESOLUTIONS[res], ts, value)
+
+    def refresh(self):
+        self.raw.refresh()
+        for ring in self.rollups.values():
+            ring.refresh()
+
+    def flush(self):
+        self.raw.flush()
+        for ring in self.rollups.values():
+            ring.flush()
+
+    def close(self):
+        self.raw.close()
+        for ring in self.rollups.values():
+            ring.close()
+
+
+class TimeSeriesStore:
+    """Memory-mapped, fixed-capacity store of named metric series."""
+
+    def __init__(self, directory: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY):
+        self.directory = Path(directory or Path.home() / ".sysagent" / "metrics")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.meta_file = self.directory / "series.json"
+        self.lock_path = self.directory / "series.lock"
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._series: Dict[str, TimeSeries] = {}
+        self._meta: Dict[str, Dict[str, str]] = {}
+        with self._locked():
+            self._load_meta()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the store lock against other threads and other processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            if self._lock_file is None:
+                self._lock_file = open(self.lock_path, "a+b")
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _load_meta(self):
+        if self.meta_file.exists():
+            try:
+                with open(self.meta_file, "r") as f:
+                    self._meta = json.load(f)
+            except (OSError, ValueError):
+                self._meta = {}
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+    def _get_series(self, name: str, create: bool = False, unit: str = "",
+                    category: str = "") -> Optional[TimeSeries]:
+        series = self._series.get(name)
+        if series is not None:
+            series.refresh()
+            return series
+        if name not in self._meta:
+            # Another process may have created it since
+            self._load_meta()
+        if name not in self._meta:
+            if not create:
+                return None
+            self._meta[name] = {"unit": unit, "category": category}
+            self._save_meta()
+        series = TimeSeries(self.directory, self._key(name), self.capacity)
+        self._series[name] = series
+        return series
+
+    def _save_meta(self):
+        temp_file = self.meta_file.with_suffix(".tmp")
+        with open(temp_file, "w") as f:
+            json.dump(self._meta, f, indent=2)
+        os.replace(temp_file, self.meta_file)
+
+    def append(self, name: str, value: float, timestamp: Optional[float] = None,
+               unit: str = "", category: str = ""):
+        """Append a sample to a series, creating the series if needed."""
+        ts = time.time() if timestamp is None else timestamp
+        with self._locked():
+            self._get_series(name, True, unit, category).append(ts, float(value))
+
+    def append_many(self, values: Dict[str, float], timestamp: Optional[float] = None,
+                    units: Optional[Dict[str, Tuple[str, str]]] = None):
+        """Append one sample to each of several series.
+
+        Args:
+            values: Mapping of series name to value.
+            timestamp: Epoch timestamp shared by all samples (default: now).
+            units: Optional mapping of series name to (unit, category), used
+                when a series is created.
+        """
+        ts = time.time() if timestamp is None else timestamp
+        units = units or {}
+        with self._locked():
+            for name, value in values.items():
+                unit, category = units.get(name, ("", ""))
+                self._get_series(name, True, unit, category).append(ts, float(value))
+
+    def names(self) -> List[str]:
+        """List series names."""
+        with self._locked():
+            self._load_meta()
+            return list(self._meta)
+
+    def info(self, name: str) -> Dict[str, str]:
+        """Get the unit and category of a series."""
+        return dict(self._meta.get(name, {"unit": "", "category": ""}))
+
+    def latest(self, name: str) -> Optional[Tuple[float, float]]:
+        """Get the newest (timestamp, value) of a series."""
+        with self._locked():
+            series = self._get_series(name)
+            if series is None or not len(series.raw):
+                return None
+            return series.raw.row(len(series.raw) - 1)
+
+    def query(self, name: str, start: Optional[float] = None, end: Optional[float] = None,
+              resolution: Optional[str] = None) -> List[Dict[str, float]]:
+        """Get samples of a series with start <= timestamp < end.
+
+        Args:
+            name: Series name.
+            start: Epoch start time (inclusive), or None for the oldest sample.
+            end: Epoch end time (exclusive), or None for the newest sample.
+            resolution: None for raw samples, or one of '1m', '5m', '1h' for
+                rollups with min/max/avg/count per bucket.
+        """
+        if resolution is not None and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        with self._locked():
+            series = self._get_series(name)
+            if series is None:
+                return []
+            if resolution is None:
+                return [
+                    {"timestamp": ts, "value": value}
+                    for ts, value in series.raw.range(start, end)
+                ]
+
+            ring = series.rollups[resolution]
+            if start is not None:
+                # Include the bucket that contains the start time
+                start -= start % RESOLUTIONS[resolution]
+            return [
+                {
+                    "timestamp": ts,
+                    "min": low,
+                    "max": high,
+                    "avg": total / count,
+                    "count": int(count),
+                }
+                for ts, low, high, total, count in ring.range(start, end)
+            ]
+
+    def arrays(self, name: str, start: Optional[float] = None, end: Optional[float] = None,
+                resolution: Optional[str] = None) -> List[array]:
+        """Get samples of a series as one ``array('d')`` per column.
+
+        Raw samples have (timestamp, value) columns; rollups have (timestamp,
+        min, max, sum, count). The arrays support the buffer protocol, so
+        numerical code can wrap them without copying.
+        """
+        if resolution is not None and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        with self._locked():
+            series = self._get_series(name)
+            if series is None:
+                return [array("d"), array("d")] if resolution is None else [array("d") for _ in range(5)]
+            if resolution is None:
+                return series.raw.arrays(start, end)
+            if start is not None:
+                start -= start % RESOLUTIONS[resolution]
+            return series.rollups[resolution].arrays(start, end)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._locked():
+            stats = {}
+            for name in self._meta:
+                series = self._get_series(name)
+                raw = series.raw
+                stats[name] = {
+                    "samples": len(raw),
+                    "capacity": raw.capacity,
+                    "oldest": raw.timestamp(0) if len(raw) else None,
+                    "newest": raw.last_timestamp(),
+                }
+            return {"directory": str(self.directory), "series": stats}
+
+    def flush(self):
+        """Flush all series to disk."""
+        with self._locked():
+            for series in self._series.values():
+                series.flush()
+
+    def close(self):
+        """Flush and close all series."""
+        with self._locked():
+            for series in self._series.values():
+                series.close()
+            self._series.clear()
+        with self._lock:
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+
+_metrics_store: Optional[TimeSeriesStore] = None
+_metrics_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> TimeSeriesStore:
+    """Get the global metrics store instance."""
+    global _metrics_store
+    if _metrics_store is None:
+        with _metrics_store_lock:
+            if _metrics_store is None:
+                _metrics_store = TimeSeriesStore()
+    return _metrics_store
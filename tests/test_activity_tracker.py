@@ -0,0 +1,61 @@
+"""
+Tests for the activity tracker storage.
+"""
+
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sysagent.core.activity_tracker import ActivityTracker, ActivityType
+
+
+def test_log_appends_and_reloads():
+    """Test that activities are appended and survive a restart."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tracker = ActivityTracker(Path(temp_dir))
+        for i in range(10):
+            tracker.log_tool_call("file_tool", "list", duration_ms=10)
+        tracker.log_error("boom")
+        tracker.close()
+        
+        day_file = tracker._get_day_file()
+        assert len(day_file.read_text().splitlines()) == 11
+        
+        tracker = ActivityTracker(Path(temp_dir))
+        assert len(tracker.get_recent(limit=100)) == 11
+        assert tracker.get_recent(limit=1, activity_type=ActivityType.ERROR)[0].action == "error"
+        
+        stats = tracker.get_statistics(days=1)
+        assert stats["total_activities"] == 11
+        assert stats["top_tools"] == [("file_tool", 10)]
+        assert stats["error_count"] == 1
+        
+        activity = tracker.log_chat("hello")
+        assert activity.id.endswith("000012")
+
+
+def test_legacy_day_files_are_compacted():
+    """Test that whole-day JSON files are converted to JSONL."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = Path(temp_dir)
+        day = datetime.now() - timedelta(days=2)
+        legacy = [{
+            "id": "legacy-1",
+            "type": "chat",
+            "action": "chat_message",
+            "timestamp": day.isoformat(),
+            "details": {},
+            "duration_ms": 0,
+            "success": True,
+            "user_id": None,
+            "session_id": None,
+        }]
+        (storage / f"{day:%Y-%m-%d}.json").write_text(json.dumps(legacy))
+        
+        tracker = ActivityTracker(storage)
+        
+        assert not (storage / f"{day:%Y-%m-%d}.json").exists()
+        assert (storage / f"{day:%Y-%m-%d}.summary.json").exists()
+        assert [a.id for a in tracker.get_by_date(day)] == ["legacy-1"]
+        assert tracker.get_statistics(days=3)["total_activities"] == 1
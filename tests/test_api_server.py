@@ -0,0 +1,231 @@
+"""
+Tests for the threaded API server.
+"""
+
+import http.client
+import json
+import threading
+import time
+
+from sysagent.api.server import SysAgentAPIServer
+
+
+class SlowAgent:
+    """Agent whose chat calls block until released."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+    
+    def process_command(self, message):
+        self.release.wait(5)
+        return {"success": True, "message": message, "tools_used": []}
+    
+    def process_command_streaming(self, message):
+        yield {"type": "token", "content": message}
+        yield {"type": "complete", "success": True}
+
+
+def test_slow_chat_does_not_block_and_overflow_gets_503():
+    """Test concurrency limits, keep-alive and SSE streaming."""
+    agent = SlowAgent()
+    server = SysAgentAPIServer(
+        port=0, require_auth=False, agent=agent,
+        concurrency={"chat": (1, 0)}
+    )
+    server.rate_limiter.requests_per_minute = 1000
+    server.start()
+    try:
+        slow = http.client.HTTPConnection("localhost", server.port, timeout=10)
+        slow.request("POST", "/api/chat", json.dumps({"message": "slow"}))
+        time.sleep(0.2)
+        
+        # Health checks are answered on one keep-alive connection meanwhile
+        conn = http.client.HTTPConnection("localhost", server.port, timeout=2)
+        for _ in range(2):
+            conn.request("GET", "/api/health")
+            response = conn.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())["status"] == "healthy"
+        
+        # The single chat slot is taken and the queue is empty
+        conn.request("POST", "/api/chat", json.dumps({"message": "more"}))
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 503
+        assert response.getheader("Retry-After") == "1"
+        
+        agent.release.set()
+        assert json.loads(slow.getresponse().read())["message"] == "slow"
+        
+        conn.request("POST", "/api/chat", json.dumps({"message": "hi", "stream": True}))
+        response = conn.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+        body = response.read().decode()
+        assert "event: token" in body
+        assert body.rstrip().endswith("event: done\ndata: {}")
+    finally:
+        server.stop()
+
+
+def test_chat_runs_one_at_a_time_unless_agent_is_thread_safe():
+    """Test that overlapping chats are only allowed for thread-safe agents."""
+    for agent, expected in ((SlowAgent(), 1), (type("SafeAgent", (SlowAgent,), {"thread_safe": True})(), 4)):
+        server = SysAgentAPIServer(port=0, require_auth=False, agent=agent)
+        try:
+            assert server.concurrency_limiter.limits["chat"] == (expected, 16)
+        finally:
+            server.key_manager.close()
+
+
+def test_bodies_are_capped_and_read_after_auth(monkeypatch):
+    """Test that oversized and unauthenticated bodies are rejected unread."""
+    import socket
+    from sysagent.api import server as server_module
+    
+    monkeypatch.setattr(server_module, "MAX_BODY_BYTES", 1000)
+    server = SysAgentAPIServer(port=0, require_auth=True)
+    server.start()
+    try:
+        def send_headers(length):
+            sock = socket.create_connection(("localhost", server.port), timeout=2)
+            sock.sendall(
+                f"POST /api/chat HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode()
+            )
+            response = sock.makefile("rb").read().decode()
+            sock.close()
+            return response
+        
+        # Neither request sends its body; both are answered and closed anyway
+        too_large = send_headers(10 ** 9)
+        assert too_large.startswith("HTTP/1.1 413")
+        assert "Connection: close" in too_large
+        assert send_headers(500).startswith("HTTP/1.1 401")
+    finally:
+        server.stop()
+
+
+def test_key_validation_is_served_from_memory(tmp_path):
+    """Test write-behind usage counters and hot reload of the key file."""
+    from sysagent.api.server import APIKeyManager
+    
+    key_file = tmp_path / "api_keys.json"
+    manager = APIKeyManager(key_file, reload_interval=0)
+    key = manager.create_key("test")
+    mtime = key_file.stat().st_mtime_ns
+    
+    for _ in range(3):
+        info = manager.validate_key(key)
+    assert info["request_count"] == 3
+    assert key_file.stat().st_mtime_ns == mtime
+    
+    manager.close()
+    usage = json.loads(manager.usage.storage_path.read_text())
+    assert list(usage.values())[0]["request_count"] == 3
+    
+    # Another process revokes the key and adds a new one
+    other = APIKeyManager(key_file)
+    key_hash = next(iter(other.keys))
+    new_key = other.create_key("other")
+    assert other.revoke_key(key_hash)
+    
+    assert manager.validate_key(key) is None
+    assert manager.validate_key(new_key)["name"] == "other"
+    manager.close()
+    other.close()
+
+
+def test_rate_limiter_buckets_and_headers():
+    """Test per-client, per-endpoint and global limits and LRU eviction."""
+    from sysagent.api.server import RateLimiter
+    
+    limiter = RateLimiter(
+        requests_per_minute=3, endpoint_limits={"chat": 2},
+        global_limits={"tool": 4}, max_clients=4
+    )
+    results = [limiter.check("a") for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    headers = results[-1].headers()
+    assert headers["X-RateLimit-Limit"] == "3"
+    assert int(headers["Retry-After"]) >= 1
+    
+    # The chat limit is tighter than the client limit
+    assert [limiter.check("b", "chat").allowed for _ in range(3)] == [True, True, False]
+    
+    # The tool limit is shared by all clients
+    assert all(limiter.check(c, "tool").allowed for c in ("c", "d", "e", "f"))
+    assert not limiter.check("g", "tool").allowed
+    
+    assert len(limiter._buckets) <= 4
+    
+    # Churning through clients does not evict the shared tool bucket
+    for i in range(20):
+        limiter.check(f"churn{i}")
+    assert not limiter.check("h", "tool").allowed
+
+
+def test_unknown_keys_share_the_address_bucket(tmp_path):
+    """Test that random API keys cannot be used to get fresh rate limit buckets."""
+    from sysagent.api.server import APIKeyManager, RateLimiter, SysAgentAPIHandler
+    
+    server = SysAgentAPIServer(
+        port=0, require_auth=True, rate_limiter=RateLimiter(requests_per_minute=3)
+    )
+    server.key_manager.close()
+    server.key_manager = SysAgentAPIHandler.key_manager = APIKeyManager(tmp_path / "keys.json")
+    key = server.key_manager.create_key("test")
+    server.start()
+    try:
+        conn = http.client.HTTPConnection("localhost", server.port, timeout=2)
+        statuses = []
+        for i in range(4):
+            conn.request("GET", "/api/tools", headers={"X-API-Key": f"random-{i}"})
+            response = conn.getresponse()
+            response.read()
+            statuses.append(response.status)
+        assert statuses == [401, 401, 401, 429]
+        
+        # A valid key has its own bucket
+        conn.request("GET", "/api/tools", headers={"X-API-Key": key})
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 200
+    finally:
+        server.stop()
+
+
+def test_throttled_clients_do_not_take_worker_slots():
+    """Test that rate limits are checked before queueing and cover DELETE."""
+    from sysagent.api.server import RateLimiter
+    
+    agent = SlowAgent()
+    server = SysAgentAPIServer(
+        port=0, require_auth=False, agent=agent, concurrency={"chat": (1, 0)},
+        rate_limiter=RateLimiter(requests_per_minute=1000, endpoint_limits={"chat": 1})
+    )
+    server.start()
+    try:
+        slow = http.client.HTTPConnection("localhost", server.port, timeout=10)
+        slow.request("POST", "/api/chat", json.dumps({"message": "slow"}))
+        time.sleep(0.2)
+        
+        # Over its chat limit: refused as throttled, not as busy
+        conn = http.client.HTTPConnection("localhost", server.port, timeout=2)
+        conn.request("POST", "/api/chat", json.dumps({"message": "more"}))
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 429
+        assert server.concurrency_limiter.rejected["chat"] == 0
+        agent.release.set()
+        slow.getresponse().read()
+        
+        server.rate_limiter.requests_per_minute = 1
+        statuses = []
+        for _ in range(2):
+            conn.request("DELETE", "/api/session/missing")
+            response = conn.getresponse()
+            response.read()
+            statuses.append(response.status)
+        assert statuses[-1] == 429
+    finally:
+        server.stop()
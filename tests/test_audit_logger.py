@@ -0,0 +1,155 @@
+"""
+Tests for the audit logger.
+"""
+
+import json
+import tempfile
+
+import pytest
+
+from sysagent.core.logging import (
+    AuditLogger,
+    AuditLogIndex,
+    BackpressurePolicy,
+    DurabilityPolicy,
+    EventType,
+)
+
+
+@pytest.fixture
+def audit_logger():
+    """Create a fresh audit logger in a temporary directory."""
+    AuditLogger._instance = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger = AuditLogger(temp_dir)
+        yield logger
+        logger.close()
+    AuditLogger._instance = None
+
+
+def test_indexed_queries(audit_logger):
+    """Test that queries use and agree with the sidecar index."""
+    for i in range(600):
+        if i % 3 == 0:
+            audit_logger.log_error("test_error", f"error {i}")
+        else:
+            audit_logger.log_tool_execution("file_tool", "list", {"i": i}, None)
+    
+    errors = audit_logger.get_events(event_types=[EventType.ERROR.value], limit=1000)
+    assert len(errors) == 200
+    assert all(e.event_type == EventType.ERROR.value for e in errors)
+    
+    since = errors[100].timestamp
+    recent_errors = audit_logger.get_events(
+        start_date=since, event_types=[EventType.ERROR.value], limit=1000
+    )
+    assert len(recent_errors) == len([e for e in errors if e.timestamp >= since])
+    
+    assert len(audit_logger.get_session_events()) == 600
+    assert audit_logger.get_session_events("unknown-session") == []
+    
+    log_file = audit_logger._current_log_file
+    index = AuditLogIndex(log_file)
+    index.load()
+    assert index.count == 600
+    assert len(index.types[EventType.ERROR.value]) == 200
+
+
+def test_export_streams_events(audit_logger):
+    """Test exporting events to JSON."""
+    for i in range(5):
+        audit_logger.log_config_change(f"key_{i}", None, i)
+    
+    output = audit_logger._log_dir / "export.json"
+    audit_logger.export_events(str(output), limit=3)
+    
+    exported = json.loads(output.read_text())
+    assert [e["action"] for e in exported] == ["config_set_key_0", "config_set_key_1", "config_set_key_2"]
+
+
+def test_malformed_lines_are_skipped(audit_logger):
+    """Test that lines that are not event objects do not break queries."""
+    audit_logger.log_error("test_error", "before")
+    audit_logger.flush()
+    with open(audit_logger._current_log_file, "a", encoding="utf-8") as f:
+        f.write("[]\n{\"x\": 1}\nnot json\n")
+    audit_logger.log_error("test_error", "after")
+    audit_logger.flush()
+    
+    events = audit_logger.get_events(limit=10)
+    assert [e.error for e in events] == ["before", "after"]
+
+
+def test_background_writer_flushes_batches():
+    """Test that the background writer batches events and flushes on close."""
+    AuditLogger._instance = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger = AuditLogger(
+            temp_dir,
+            durability=DurabilityPolicy.BATCH,
+            backpressure=BackpressurePolicy.BLOCK,
+            queue_size=16,
+            batch_size=8,
+            flush_interval=60
+        )
+        for i in range(100):
+            logger.log_security_event(f"event_{i}", {})
+        logger.close()
+        
+        lines = logger._current_log_file.read_text().splitlines()
+        assert len(lines) == 100
+        assert json.loads(lines[-1])["action"] == "event_99"
+        
+        stats = logger.get_writer_stats()
+        assert stats["events_written"] == 100
+        assert stats["events_dropped"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] <= 16
+    AuditLogger._instance = None
+
+
+def test_writer_stays_closed():
+    """Test that events after close are written without restarting the thread."""
+    AuditLogger._instance = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger = AuditLogger(temp_dir, durability=DurabilityPolicy.BATCH, flush_interval=60)
+        logger.log_security_event("before", {})
+        logger.close()
+        
+        logger.log_security_event("after", {})
+        assert logger._writer._thread is None or not logger._writer._thread.is_alive()
+        assert logger._writer.flush(timeout=0.1)
+        
+        lines = logger._current_log_file.read_text().splitlines()
+        assert [json.loads(line)["action"] for line in lines] == ["before", "after"]
+    AuditLogger._instance = None
+
+
+def test_queries_do_not_wait_for_a_stalled_writer():
+    """Test that queries read what is on disk when the writer is stuck."""
+    import threading
+    import time
+    
+    AuditLogger._instance = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        logger = AuditLogger(temp_dir, flush_interval=0.01)
+        logger.log_security_event("written", {})
+        assert logger.flush(timeout=5)
+        
+        release = threading.Event()
+        write_batch = logger._writer._write_batch
+        
+        def stalled(lines):
+            release.wait(10)
+            write_batch(lines)
+        
+        logger._writer._write_batch = stalled
+        logger.log_security_event("stuck", {})
+        start = time.monotonic()
+        events = list(logger.iter_events(flush_timeout=0.2))
+        assert time.monotonic() - start < 2
+        assert [e.action for e in events] == ["written"]
+        
+        release.set()
+        logger.close()
+    AuditLogger._instance = None
@@ -127,5 +127,22 @@ def test_tool_execution():
     assert isinstance(result.message, str)
 
 
+def test_lazy_tool_registration():
+    """Test that lazily registered tools are loaded on first execution."""
+    from sysagent.tools.base import ToolExecutor
+    
+    executor = ToolExecutor()
+    executor.register_builtin_tools()
+    
+    assert "file_tool" in executor.list_available_tools()
+    assert not executor.factory.is_loaded("file_tool")
+    
+    result = executor.execute_tool("file_tool", action="list", path=".")
+    assert isinstance(result.success, bool)
+    assert executor.factory.is_loaded("file_tool")
+    assert "file_tool" in executor.get_load_times()
+    assert not executor.factory.is_loaded("voice_tool")
+
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
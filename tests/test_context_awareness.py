@@ -0,0 +1,64 @@
+"""
+Tests for cached context probes.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sysagent.core.context_awareness import ContextAwareness
+
+
+def test_probes_are_cached_and_fetched_on_demand():
+    """Test that probes are read once per TTL and only for requested fields."""
+    awareness = ContextAwareness()
+    calls = {"window": 0, "clipboard": 0}
+
+    def window():
+        calls["window"] += 1
+        return ("Code", "main.py - Code")
+
+    def clipboard():
+        calls["clipboard"] += 1
+        return "https://example.com"
+
+    awareness._probes["window"].fetch = window
+    awareness._probes["clipboard"].fetch = clipboard
+
+    context = awareness.get_current_context(fields=["active_app"])
+    assert context.active_app == "Code"
+    assert context.active_window == "main.py - Code"
+    assert context.clipboard_content == ""
+    assert calls == {"window": 1, "clipboard": 0}
+
+    for _ in range(10):
+        awareness.get_current_context(fields=["active_app", "clipboard_content"])
+    assert calls == {"window": 1, "clipboard": 1}
+
+    awareness.invalidate("window")
+    assert awareness.get_current_context(fields=["active_window"]).active_window == "main.py - Code"
+    assert calls["window"] == 2
+
+    # Rules only ask for the fields their conditions use
+    suggestions = awareness.get_suggestions(limit=20)
+    assert "open clipboard url" in [s.command for s in suggestions]
+
+
+def test_recent_files_follow_directory_changes():
+    """Test that recent files are re-read when a watched directory changes."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        awareness = ContextAwareness()
+        awareness._recent_dirs = lambda: [root]
+        probe = awareness._probes["recent_files"]
+        probe.ttl = 3600
+
+        (root / "old.txt").write_text("old")
+        os.utime(root / "old.txt", (time.time() - 60, time.time() - 60))
+        assert awareness.get_current_context(fields=["recent_files"]).recent_files == [str(root / "old.txt")]
+
+        (root / "new.txt").write_text("new")
+        os.utime(root, ns=(time.time_ns(), time.time_ns() + 10**9))
+        recent = awareness.get_current_context(fields=["recent_files"]).recent_files
+        assert recent == [str(root / "new.txt"), str(root / "old.txt")]
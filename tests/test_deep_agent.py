@@ -0,0 +1,216 @@
+"""
+Tests for DeepAgent plan execution.
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sysagent.core.deep_agent import (
+    DeepAgent, PlanCache, SubTask, TaskPlan, TaskStatus, normalize_goal,
+)
+
+
+class FakeAgent:
+    """Base agent stand-in that sleeps per command and records overlap."""
+
+    thread_safe = True
+
+    def __init__(self, delay=0.1, failures=None):
+        self.delay = delay
+        self.failures = failures or {}
+        self.started = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def process_command(self, command):
+        with self._lock:
+            self.started.append(command)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+            if self.failures.get(command, 0) > 0:
+                self.failures[command] -= 1
+                return {"success": False, "message": "temporary failure"}
+        return {"success": True, "message": f"done: {command}"}
+
+
+class FakeLLM:
+    """Planner stand-in that counts decomposition calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        content = '[{"description": "check disk", "depends_on": []}, ' \
+                  '{"description": "list processes", "depends_on": []}]'
+        return type("Response", (), {"content": content})()
+
+
+def test_independent_subtasks_run_in_parallel():
+    """Test that ready subtasks run concurrently and dependents wait."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = FakeAgent(delay=0.2, failures={"check memory": 1})
+        agent = DeepAgent(base, config_dir=Path(temp_dir), max_parallel=4)
+        agent.retry_base_delay = 0.01
+        plan = TaskPlan(id="plan_1", goal="check disk, check memory, list processes", subtasks=[
+            SubTask(id="step_1", description="check disk"),
+            SubTask(id="step_2", description="check memory"),
+            SubTask(id="step_3", description="list processes"),
+            SubTask(id="step_4", description="summarize", depends_on=["step_1", "step_2", "step_3"]),
+        ])
+
+        start = time.perf_counter()
+        events = list(agent.execute_plan(plan))
+        elapsed = time.perf_counter() - start
+
+        assert plan.status == TaskStatus.COMPLETED.value
+        assert base.peak == 3
+        assert base.started[-1] == "summarize"
+        assert plan.subtasks[1].attempts == 2
+        # Serial execution would take at least 5 x 0.2s
+        assert elapsed < 0.9
+
+        results = [e for e in events if e["type"] == "step_result"]
+        assert [e["id"] for e in results][-1] == "step_4"
+        assert results[0]["id"] in ("step_1", "step_3")
+        assert events[-1] == {"type": "complete", "success": True, "duration_ms": plan.total_duration_ms}
+        agent.shutdown()
+
+
+def test_agents_not_thread_safe_run_subtasks_serially():
+    """Test that subtasks do not overlap unless the base agent is thread-safe."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = FakeAgent(delay=0.02)
+        base.thread_safe = False
+        agent = DeepAgent(base, config_dir=Path(temp_dir), max_parallel=4)
+        assert agent.max_parallel == 1
+        plan = TaskPlan(id="plan_serial", goal="check disk and list processes", subtasks=[
+            SubTask(id="step_1", description="check disk"),
+            SubTask(id="step_2", description="list processes"),
+        ])
+
+        list(agent.execute_plan(plan))
+
+        assert plan.status == TaskStatus.COMPLETED.value
+        assert base.peak == 1
+        assert DeepAgent(FakeAgent(), config_dir=Path(temp_dir)).max_parallel == 4
+        agent.shutdown()
+
+
+def test_failed_subtask_cancels_dependents():
+    """Test that dependents of an unrecoverable failure are cancelled."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = FakeAgent(delay=0.01, failures={"delete file": 10, "Alternative approach: delete file": 10})
+        agent = DeepAgent(base, config_dir=Path(temp_dir), max_parallel=2)
+        agent.retry_base_delay = 0.001
+        plan = TaskPlan(id="plan_2", goal="delete file and report", max_parallel=1, subtasks=[
+            SubTask(id="step_1", description="delete file"),
+            SubTask(id="step_2", description="report", depends_on=["step_1"]),
+        ])
+
+        events = list(agent.execute_plan(plan))
+
+        assert plan.status == TaskStatus.FAILED.value
+        assert plan.subtasks[0].status == TaskStatus.FAILED.value
+        assert plan.subtasks[1].status == TaskStatus.CANCELLED.value
+        assert "report" not in base.started
+        assert events[-1]["success"] is False
+        agent.shutdown()
+
+
+def test_llm_dependencies_only_point_backwards():
+    """Test parsing of depends_on from a decomposed plan."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agent = DeepAgent(FakeAgent(), config_dir=Path(temp_dir))
+        assert agent._parse_dependencies({}, 0) == []
+        assert agent._parse_dependencies({}, 2) == ["step_2"]
+        assert agent._parse_dependencies({"depends_on": []}, 2) == []
+        assert agent._parse_dependencies({"depends_on": [1, "step_2", 3, 9, "x"]}, 2) == ["step_1", "step_2"]
+        assert agent._retry_delay(1) == 1.0
+        assert agent._retry_delay(3) == 4.0
+        assert agent._retry_delay(10) == 8.0
+
+
+def test_plan_cache_skips_llm_for_repeat_goals():
+    """Test that successful plans are reused and dropped on bad feedback."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = FakeAgent(delay=0)
+        base.llm = FakeLLM()
+        agent = DeepAgent(base, config_dir=Path(temp_dir))
+
+        plan = agent.create_plan("Check disk and then list processes")
+        assert base.llm.calls == 1
+        list(agent.execute_plan(plan))
+
+        again = agent.create_plan("check disk, and then list the processes please")
+        assert base.llm.calls == 1
+        assert [st.description for st in again.subtasks] == ["check disk", "list processes"]
+
+        stats = agent.get_statistics()["plan_cache"]
+        assert (stats["misses"], stats["hits"], stats["size"]) == (1, 1, 1)
+
+        # The cache survives a restart
+        reloaded = DeepAgent(base, config_dir=Path(temp_dir))
+        reloaded.create_plan("check disk and then list processes")
+        assert base.llm.calls == 1
+
+        agent.record_feedback(plan.id, rating=1)
+        assert agent.get_statistics()["plan_cache"]["size"] == 0
+        agent.create_plan("check disk and then list processes")
+        assert base.llm.calls == 2
+        agent.shutdown()
+
+
+def test_goal_arguments_are_kept_verbatim():
+    """Test that paths and file names are part of the cache key."""
+    assert normalize_goal("Copy /tmp/A.txt to a/b.txt, please.") == "copy /tmp/A.txt a/b.txt"
+    assert normalize_goal("copy backup.txt to report.txt") != normalize_goal("copy report.txt to backup.txt")
+
+
+def test_similar_plans_are_reused_only_on_request():
+    """Test that similar goals reuse plans only when enabled and with the same arguments."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = FakeAgent(delay=0)
+        base.llm = FakeLLM()
+        agent = DeepAgent(base, config_dir=Path(temp_dir) / "default")
+        list(agent.execute_plan(agent.create_plan("copy backup.txt to report.txt and then check all files")))
+        agent.create_plan("copy backup.txt to report.txt and then check all files now")
+        assert base.llm.calls == 2
+        agent.shutdown()
+
+        base.llm = FakeLLM()
+        agent = DeepAgent(base, config_dir=Path(temp_dir) / "opt_in", reuse_similar_plans=True)
+        list(agent.execute_plan(agent.create_plan("copy backup.txt to report.txt and then check all files")))
+        agent.create_plan("copy backup.txt to report.txt and then check all files now")
+        assert base.llm.calls == 1
+        agent.create_plan("copy report.txt to backup.txt and then check all files")
+        assert base.llm.calls == 2
+
+        stats = agent.get_statistics()["plan_cache"]
+        assert (stats["misses"], stats["similar_hits"]) == (2, 1)
+        assert agent._extract_pattern_key("delete old.log then check disk") != \
+            agent._extract_pattern_key("delete new.log then check disk")
+        agent.shutdown()
+
+
+def test_plan_cache_expires_and_evicts():
+    """Test TTL expiry and LRU eviction of cached plans."""
+    cache = PlanCache(max_entries=2, ttl=60)
+    steps = [{"description": "step"}]
+    cache.put("check disk usage", "env", steps)
+    cache.put("list running processes", "env", steps)
+    assert cache.get("check disk usage", "env") == steps
+    cache.put("show network connections", "env", steps)
+    assert cache.get("list running processes", "env") is None
+    assert cache.get("check disk usage", "other-env") is None
+    assert cache.stats["evictions"] == 1
+
+    cache.ttl = -1
+    assert cache.get("check disk usage", "env") is None
+    assert len(cache) == 0
@@ -0,0 +1,107 @@
+"""
+Tests for the disk usage analyzer.
+"""
+
+import os
+
+import pytest
+
+import sysagent.utils.disk_usage as disk_usage
+from sysagent.utils.disk_usage import DiskUsageAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def no_racy_window(monkeypatch):
+    """Trust mtimes of directories created a moment ago."""
+    monkeypatch.setattr(disk_usage, "_RACY_NS", 0)
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def _tree(root):
+    _write(root / "a" / "big.bin", 5000)
+    _write(root / "a" / "small.txt", 10)
+    _write(root / "a" / "deep" / "mid.bin", 3000)
+    _write(root / "b" / "one.bin", 1000)
+    _write(root / ".hidden" / "h.bin", 700)
+    _write(root / "top.txt", 1)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_sizes_and_top_k(tmp_path, workers):
+    """Test aggregate sizes and the largest files and directories."""
+    _tree(tmp_path)
+    analyzer = DiskUsageAnalyzer(workers=workers)
+    report = analyzer.scan([str(tmp_path)], top_files=2, top_dirs=2)
+    analyzer.shutdown()
+
+    assert report.total_bytes == 9711
+    assert report.total_files == 6
+    assert report.size_of(str(tmp_path / "a")) == 8010
+    assert report.size_of(str(tmp_path / "a" / "deep")) == 3000
+    assert [f["path"] for f in report.largest_files] == [
+        str(tmp_path / "a" / "big.bin"), str(tmp_path / "a" / "deep" / "mid.bin")
+    ]
+    assert [d["path"] for d in report.largest_dirs] == [
+        str(tmp_path / "a"), str(tmp_path / "a" / "deep")
+    ]
+
+    filtered = DiskUsageAnalyzer(workers=workers).scan(
+        [str(tmp_path)], include_hidden=False, exclude_dirs={"deep"}, min_file_size=1000
+    )
+    assert filtered.total_bytes == 6011
+    assert [f["size"] for f in filtered.largest_files] == [5000, 1000]
+
+
+def test_repeat_scans_reuse_unchanged_directories(tmp_path):
+    """Test that only directories whose mtime changed are listed again."""
+    _tree(tmp_path)
+    analyzer = DiskUsageAnalyzer(workers=1)
+    first = analyzer.scan([str(tmp_path)])
+    assert first.dirs_listed == 5 and first.dirs_reused == 0
+
+    second = analyzer.scan([str(tmp_path)])
+    assert second.dirs_listed == 0 and second.dirs_reused == 5
+    assert second.total_bytes == first.total_bytes
+
+    _write(tmp_path / "b" / "two.bin", 2000)
+    (tmp_path / "a" / "small.txt").unlink()
+    third = analyzer.scan([str(tmp_path)])
+    assert third.dirs_listed == 2
+    assert third.total_bytes == first.total_bytes + 2000 - 10
+    assert third.largest_files[1]["path"] == str(tmp_path / "a" / "deep" / "mid.bin")
+
+    # A removed subtree drops out of the totals and the cache
+    (tmp_path / "a" / "deep" / "mid.bin").unlink()
+    os.rmdir(tmp_path / "a" / "deep")
+    fourth = analyzer.scan([str(tmp_path)])
+    assert fourth.size_of(str(tmp_path / "a" / "deep")) is None
+    assert fourth.total_bytes == third.total_bytes - 3000
+
+
+def test_max_age_and_hard_links(tmp_path):
+    """Test that old summaries are refreshed and hard links count once."""
+    _write(tmp_path / "d" / "f.bin", 100)
+    os.link(tmp_path / "d" / "f.bin", tmp_path / "link.bin")
+    analyzer = DiskUsageAnalyzer(workers=1, max_age=0)
+    report = analyzer.scan([str(tmp_path)])
+    assert report.total_bytes == 100 and report.total_files == 1
+
+    # Grows in place: the directory mtime stays the same
+    with open(tmp_path / "d" / "f.bin", "ab") as f:
+        f.write(b"y" * 50)
+    assert analyzer.scan([str(tmp_path)]).total_bytes == 150
+
+
+def test_nested_and_missing_roots(tmp_path):
+    """Test that nested roots are not counted twice."""
+    _tree(tmp_path)
+    report = DiskUsageAnalyzer(workers=1).scan(
+        [str(tmp_path), str(tmp_path / "a"), str(tmp_path / "missing")]
+    )
+    assert report.roots == [str(tmp_path)]
+    assert report.total_bytes == 9711
+    assert report.size_of(str(tmp_path / "a")) == 8010
@@ -0,0 +1,210 @@
+"""
+Tests for the persistent file index.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from sysagent.utils.file_index import FileIndex
+
+
+def _wait_scanned(index, root):
+    deadline = time.time() + 10
+    while not index.is_scanned(root) and time.time() < deadline:
+        time.sleep(0.01)
+    assert index.is_scanned(root)
+
+
+def test_search_and_incremental_rescan():
+    """Test name/extension/recency queries and diff-based rescans."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "root"
+        (root / "docs").mkdir(parents=True)
+        (root / "node_modules").mkdir()
+        (root / "docs" / "Report.PDF").write_text("report")
+        (root / "docs" / "notes.txt").write_text("notes")
+        (root / "node_modules" / "report.js").write_text("ignored")
+        
+        index = FileIndex(Path(temp_dir) / "files.db", watch=False)
+        try:
+            results = index.search("report", root=str(root))
+            assert [r["name"] for r in results] == ["Report.PDF"]
+            assert index.by_extension(".txt", root=str(root))[0]["name"] == "notes.txt"
+            assert len(index.recent(root=str(root), days=1)) == 2
+            _wait_scanned(index, str(root))
+            
+            (root / "docs" / "notes.txt").unlink()
+            (root / "docs" / "report_v2.md").write_text("v2")
+            counts = index.rescan(str(root))
+            assert counts["added"] == 1
+            assert counts["removed"] == 1
+            
+            names = sorted(r["name"] for r in index.search("report", root=str(root)))
+            assert names == ["Report.PDF", "report_v2.md"]
+            assert index.search("notes", root=str(root)) == []
+        finally:
+            index.close()
+
+
+def test_queries_stay_in_the_requested_subtree(monkeypatch):
+    """Test scoping below a root and the walk used before the first scan."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "root"
+        for name in ("a", "b"):
+            (root / name).mkdir(parents=True)
+            (root / name / f"{name}_report.txt").write_text(name)
+        
+        index = FileIndex(Path(temp_dir) / "files.db", watch=False)
+        try:
+            # The first scan has not finished; the query walks the path itself
+            monkeypatch.setattr(index, "rescan_async", lambda root: None)
+            results = index.search("report", root=str(root / "a"))
+            assert [r["name"] for r in results] == ["a_report.txt"]
+            assert not index.is_scanned(str(root / "a"))
+            monkeypatch.undo()
+            
+            index.add_root(str(root))
+            assert [r["name"] for r in index.search("report", root=str(root / "a"))] == ["a_report.txt"]
+            assert len(index.search("report", root=str(root))) == 2
+        finally:
+            index.close()
+
+
+def test_refresh_path_respects_prune_and_depth():
+    """Test that event updates skip pruned subtrees and paths below max_depth."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "root"
+        (root / "a" / "b" / "c").mkdir(parents=True)
+        index = FileIndex(Path(temp_dir) / "files.db", watch=False, max_depth=1)
+        try:
+            index.add_root(str(root))
+            deep = root / "a" / "b" / "c" / "deep.txt"
+            pruned = root / "a" / "node_modules" / "pkg" / "index.js"
+            pruned.parent.mkdir(parents=True)
+            for path in (deep, pruned, root / "a" / "shallow.txt"):
+                path.write_text("x")
+                index.refresh_path(str(path))
+            index.refresh_path(str(root / "a" / "node_modules"))
+            
+            names = sorted(r["name"] for r in index.search("", root=str(root), limit=100))
+            assert names == ["a", "b", "shallow.txt"]
+        finally:
+            index.close()
+
+
+def test_content_index_ranks_line_hits():
+    """Test trigram candidates, ranking, and skipping of binary files."""
+    from sysagent.utils.content_index import ContentIndex
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "root"
+        root.mkdir()
+        (root / "a.py").write_text("# TODO one\nx = 1\n# todo two\n")
+        (root / "b.py").write_text("# TODO once\n")
+        (root / "c.txt").write_text("nothing to see\n")
+        (root / "data.bin").write_bytes(b"\0TODO")
+        
+        index = ContentIndex(Path(temp_dir) / "content.db")
+        try:
+            # Not a root yet: files are read directly and nothing is indexed
+            results = index.search("todo", root=str(root))
+            assert [Path(r["path"]).name for r in results] == ["a.py", "b.py"]
+            assert index.roots() == {} and index.get_stats()["files"] == 0
+            
+            index.add_root(str(root))
+            results = index.search("todo", root=str(root))
+            assert [Path(r["path"]).name for r in results] == ["a.py", "b.py"]
+            assert [hit["line"] for hit in results[0]["lines"]] == [1, 3]
+            assert index.get_stats()["skipped_files"] == 1
+            
+            (root / "c.txt").write_text("added a todo\n")
+            candidates = index.candidates("todo", root=str(root), fresh=True)
+            assert str(root / "c.txt") in candidates
+            
+            # Results stay below the requested directory
+            (root / "sub").mkdir()
+            (root / "sub" / "d.py").write_text("# TODO below\n")
+            index.refresh(str(root))
+            results = index.search("todo", root=str(root / "sub"))
+            assert [Path(r["path"]).name for r in results] == ["d.py"]
+        finally:
+            index.close()
+
+
+def test_scan_tree_prunes_and_stops_early():
+    """Test pattern, size and pruning filters and early stop of the walker."""
+    from sysagent.utils.fs_walk import DEFAULT_PRUNE, scan_tree
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "src" / "pkg").mkdir(parents=True)
+        (root / "node_modules" / "dep").mkdir(parents=True)
+        (root / "src" / "a.py").write_text("a")
+        (root / "src" / "pkg" / "b.py").write_text("b" * 100)
+        (root / "node_modules" / "dep" / "c.py").write_text("c")
+        (root / ".hidden.py").write_text("h")
+        
+        names = sorted(e.name for e in scan_tree(root, "*.py", exclude_dirs=DEFAULT_PRUNE))
+        assert names == ["a.py", "b.py"]
+        assert sorted(e.name for e in scan_tree(root, "*.py")) == ["a.py", "b.py", "c.py"]
+        assert [e.name for e in scan_tree(root, "*.py", min_size=50)] == ["b.py"]
+        assert len(list(scan_tree(root, "*.py", max_results=1))) == 1
+        assert ".hidden.py" in [e.name for e in scan_tree(root, recursive=False, include_hidden=True)]
+
+
+def test_file_tool_content_search_without_refresh(monkeypatch):
+    """Test that content searches check files the index has not read as they are."""
+    import sysagent.utils.content_index as content_index
+    from sysagent.tools.file_tool import FileTool
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "root"
+        root.mkdir()
+        (root / "hit.txt").write_text("needle here\n")
+        (root / "miss.txt").write_text("nothing\n")
+        (root / "big.txt").write_text("needle\n" + "x" * 2048)
+        (root / "blob.dat").write_bytes(b"\0needle")
+        
+        index = content_index.ContentIndex(
+            Path(temp_dir) / "content.db", refresh_interval=3600, max_file_size=1024
+        )
+        monkeypatch.setattr(content_index, "_content_index", index)
+        try:
+            index.add_root(str(root))
+            # Changed after the last refresh
+            (root / "miss.txt").write_text("a needle now\n")
+            refreshed = index.roots()[str(root)]
+            
+            result = FileTool()._search_files(path=str(root), content_contains="needle")
+            names = sorted(Path(f["path"]).name for f in result.data["files"])
+            assert names == ["big.txt", "blob.dat", "hit.txt", "miss.txt"]
+            assert index.roots()[str(root)] == refreshed
+        finally:
+            index.close()
+
+
+def test_file_tool_prunes_only_on_request():
+    """Test that list and search descend everywhere unless asked to prune."""
+    from sysagent.tools.file_tool import FileTool
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "build").mkdir()
+        (root / "node_modules" / "pkg" / "index.js").write_text("")
+        (root / "build" / "out.js").write_text("")
+        (root / "main.js").write_text("")
+        tool = FileTool()
+        
+        def names(**kwargs):
+            result = tool._search_files(path=str(root), pattern="*.js", **kwargs)
+            return sorted(Path(f["path"]).name for f in result.data["files"])
+        
+        assert names() == ["index.js", "main.js", "out.js"]
+        assert names(prune=True) == ["main.js", "out.js"]
+        # A single name is not split into characters
+        assert names(exclude_dirs="build") == ["index.js", "main.js"]
+        
+        listed = tool._list_files(path=str(root), pattern="*.js", recursive=True)
+        assert listed.data["count"] == 3
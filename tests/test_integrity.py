@@ -0,0 +1,144 @@
+"""
+Tests for the file integrity baseline.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+import sysagent.utils.integrity as integrity
+from sysagent.utils.integrity import IntegrityDB, hash_file
+
+
+def _tree(root, count=5):
+    for i in range(count):
+        sub = root / f"d{i % 2}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"f{i}.txt").write_text(f"content {i}\n")
+
+
+def test_hash_file_streams(tmp_path):
+    """Test that chunked hashing matches hashing the whole content."""
+    data = os.urandom(3 * 1024 + 17)
+    path = tmp_path / "blob"
+    path.write_bytes(data)
+    assert hash_file(str(path), "sha256", chunk_size=1024) == hashlib.sha256(data).hexdigest()
+    assert hash_file(str(path), "md5") == hashlib.md5(data).hexdigest()
+
+
+def test_baseline_then_diff(tmp_path):
+    """Test that later checks report added, removed and modified files."""
+    root = tmp_path / "tree"
+    root.mkdir()
+    _tree(root)
+    db = IntegrityDB(tmp_path / "integrity.db")
+
+    first = db.check(str(root))
+    assert first.new_baselines == [str(root)]
+    assert first.hashed == 5 and not first.changed
+
+    second = db.check(str(root))
+    assert second.unchanged == 5 and second.hashed == 0
+
+    (root / "d0" / "f0.txt").write_text("tampered\n")
+    (root / "d1" / "f1.txt").unlink()
+    (root / "d1" / "new.txt").write_text("new\n")
+    # Same content, new mtime: re-hashed once, not reported
+    os.utime(root / "d0" / "f2.txt", ns=(1, 1))
+
+    report = db.check(str(root))
+    assert [m["file"] for m in report.modified] == [str(root / "d0" / "f0.txt")]
+    assert report.modified[0]["old_hash"] != report.modified[0]["hash"]
+    assert [r["file"] for r in report.removed] == [str(root / "d1" / "f1.txt")]
+    assert [a["file"] for a in report.added] == [str(root / "d1" / "new.txt")]
+    assert report.hashed == 3
+
+    # Changes are reported until they are accepted
+    again = db.check(str(root), update=True)
+    assert len(again.modified) == 1 and len(again.added) == 1 and len(again.removed) == 1
+    clean = db.check(str(root))
+    assert not clean.changed and clean.hashed == 0 and clean.unchanged == 5
+
+
+def test_single_files_and_persistence(tmp_path):
+    """Test checking individual files across database instances."""
+    target = tmp_path / "hosts"
+    target.write_text("127.0.0.1 localhost\n")
+    db_path = tmp_path / "integrity.db"
+    IntegrityDB(db_path).check([str(target)])
+
+    target.write_text("127.0.0.1 evil\n")
+    report = IntegrityDB(db_path).check([str(target), str(tmp_path / "missing")])
+    assert [m["file"] for m in report.modified] == [str(target)]
+    assert report.new_baselines == [str(tmp_path / "missing")]
+
+
+def test_other_algorithms_do_not_replace_the_baseline(tmp_path):
+    """Test that a check with another algorithm still compares against the baseline."""
+    target = tmp_path / "passwd"
+    target.write_text("root:x:0:0\n")
+    db = IntegrityDB(tmp_path / "integrity.db")
+    db.check(str(target), "sha256")
+
+    target.write_text("root:x:0:0\nevil:x:0:0\n")
+    md5 = db.check(str(target), "md5")
+    sha256 = db.check(str(target), "sha256")
+    assert [m["file"] for m in md5.modified] == [str(target)]
+    assert [m["file"] for m in sha256.modified] == [str(target)]
+    assert sha256.modified[0]["old_hash"] == md5.modified[0]["old_hash"]
+    assert sha256.modified[0]["hash"] == hashlib.sha256(target.read_bytes()).hexdigest()
+
+
+def test_restored_mtime_does_not_hide_an_edit(tmp_path):
+    """Test that a same-size edit with the old mtime put back is still found."""
+    target = tmp_path / "passwd"
+    target.write_text("root:x:0:0\n")
+    db = IntegrityDB(tmp_path / "integrity.db")
+    db.check(str(target))
+
+    st = target.stat()
+    time.sleep(0.01)
+    target.write_text("evil:x:0:0\n")
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert target.stat().st_size == st.st_size
+    assert [m["file"] for m in db.check(str(target)).modified] == [str(target)]
+
+
+def test_baselines_without_ctime_are_migrated(tmp_path):
+    """Test that an old table gains the ctime column and is re-hashed once."""
+    target = tmp_path / "hosts"
+    target.write_text("127.0.0.1 localhost\n")
+    db_path = tmp_path / "integrity.db"
+    st = target.stat()
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+        "inode INTEGER NOT NULL, algorithm TEXT NOT NULL, hash TEXT NOT NULL, checked REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO files VALUES (?, ?, ?, ?, 'sha256', ?, 0)",
+        (str(target), st.st_size, st.st_mtime_ns, st.st_ino, hash_file(str(target))),
+    )
+    conn.commit()
+    conn.close()
+
+    db = IntegrityDB(db_path)
+    first = db.check(str(target))
+    assert first.hashed == 1 and not first.changed
+    second = db.check(str(target))
+    assert second.hashed == 0 and second.unchanged == 1
+
+
+def test_process_pool_hashing(tmp_path, monkeypatch):
+    """Test that large batches give the same hashes through the pool."""
+    monkeypatch.setattr(integrity, "PARALLEL_MIN_FILES", 4)
+    root = tmp_path / "tree"
+    root.mkdir()
+    _tree(root, count=12)
+    db = IntegrityDB(tmp_path / "integrity.db", max_workers=2)
+    report = db.check(str(root))
+    assert report.hashed == 12 and not report.errors
+
+    (root / "d1" / "f3.txt").write_text("changed\n")
+    assert [m["file"] for m in db.check(str(root)).modified] == [str(root / "d1" / "f3.txt")]
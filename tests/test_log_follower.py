@@ -0,0 +1,95 @@
+"""
+Tests for the incremental log follower.
+"""
+
+import os
+
+from sysagent.utils.log_follower import LogFollower
+
+
+def _append(path, lines):
+    with open(path, "a") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+def _follower(tmp_path, log, **kwargs):
+    return LogFollower([str(log)], state_file=tmp_path / "offsets.json", **kwargs)
+
+
+def test_cold_start_reads_tail_only(tmp_path):
+    """Test that the first poll only looks at the last lines."""
+    log = tmp_path / "auth.log"
+    _append(log, [f"line {i} failed" for i in range(500)])
+    follower = _follower(tmp_path, log, cold_start_lines=50)
+
+    assert follower.poll() == 50
+    events = follower.events_since(0)
+    assert events[0].event == "line 450 failed"
+    assert events[-1].event == "line 499 failed"
+    assert follower.poll() == 0
+
+
+def test_appends_and_partial_lines(tmp_path):
+    """Test that only new complete lines are matched."""
+    log = tmp_path / "auth.log"
+    _append(log, ["boot ok"])
+    follower = _follower(tmp_path, log)
+    follower.poll()
+    seq = follower.last_seq
+
+    _append(log, ["sshd: Failed password for root", "session opened"])
+    with open(log, "a") as f:
+        f.write("Permission DENIED for")
+    assert follower.poll() == 1
+    with open(log, "a") as f:
+        f.write(" user bob\n")
+    assert follower.poll() == 1
+
+    events = follower.events_since(seq)
+    assert [e.keyword for e in events] == ["failed", "denied"]
+    assert events[1].event == "Permission DENIED for user bob"
+
+
+def test_rotation_and_truncation(tmp_path):
+    """Test that rotated and truncated files are followed."""
+    log = tmp_path / "syslog"
+    _append(log, ["start"])
+    follower = _follower(tmp_path, log)
+    follower.poll()
+
+    _append(log, ["error before rotate"])
+    os.rename(log, str(log) + ".1")
+    _append(log, ["error after rotate"])
+    assert follower.poll() == 2
+    assert [e.event for e in follower.events_since(0)] == ["error before rotate", "error after rotate"]
+
+    with open(log, "w") as f:
+        f.write("attack\n")
+    assert follower.poll() == 1
+    assert follower.events_since(0)[-1].event == "attack"
+
+
+def test_checkpoints_persist(tmp_path):
+    """Test that a new follower resumes from the saved offset."""
+    log = tmp_path / "auth.log"
+    _append(log, ["old error"])
+    _follower(tmp_path, log).poll()
+
+    _append(log, ["new error"])
+    follower = _follower(tmp_path, log)
+    assert follower.poll() == 1
+    assert follower.events_since(0)[0].event == "new error"
+
+
+def test_buffer_is_bounded(tmp_path):
+    """Test that the event buffer keeps the newest events."""
+    log = tmp_path / "auth.log"
+    log.touch()
+    follower = _follower(tmp_path, log, buffer_size=10)
+    follower.poll()
+    _append(log, [f"failed {i}" for i in range(25)])
+    assert follower.poll() == 25
+    events = follower.events_since(0)
+    assert len(events) == 10
+    assert events[-1].seq == follower.last_seq == 25
+    assert follower.events_since(0, limit=3)[0].event == "failed 22"
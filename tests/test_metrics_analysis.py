@@ -0,0 +1,140 @@
+"""
+Tests for metric baselines, anomaly detection and forecasts.
+"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sysagent.utils.metrics_analysis import (
+    HOURS_PER_WEEK, Baseline, compute_baseline, detect_anomalies, fit_holt_winters,
+    forecast_threshold, hour_of_week, load_baselines, rolling_robust_z, save_baselines,
+    series_arrays,
+)
+from sysagent.utils.timeseries import TimeSeriesStore
+
+
+def _hourly(days, start=None):
+    start = start if start is not None else time.time() - days * 86400
+    return start + np.arange(days * 24) * 3600.0
+
+
+def test_hour_of_week_matches_localtime():
+    """Test the vectorized slot against time.localtime."""
+    ts = _hourly(8) + 1234.0
+    expected = [
+        time.localtime(t).tm_wday * 24 + time.localtime(t).tm_hour for t in ts
+    ]
+    assert hour_of_week(ts).tolist() == expected
+
+
+def test_baseline_quantiles_and_round_trip(tmp_path):
+    """Test per-slot quantiles and saving them to disk."""
+    ts = _hourly(28)
+    slots = hour_of_week(ts)
+    # Busy weekday working hours, quiet otherwise
+    values = np.where((slots % 24 >= 9) & (slots % 24 < 17) & (slots < 120), 80.0, 10.0)
+    baseline = compute_baseline("cpu_percent", ts, values)
+
+    assert baseline.coverage == 1.0
+    assert baseline.counts.sum() == len(ts)
+    assert baseline.quantile(0.5, np.array([10]))[0] == 80.0  # Monday 10:00
+    assert baseline.quantile(0.5, np.array([130]))[0] == 10.0  # Saturday 10:00
+
+    path = tmp_path / "baseline.json"
+    save_baselines(path, {"cpu_percent": baseline})
+    loaded = load_baselines(path)["cpu_percent"]
+    assert isinstance(loaded, Baseline)
+    assert np.array_equal(loaded.values, baseline.values)
+    assert load_baselines(tmp_path / "missing.json") == {}
+
+
+def test_empty_slots_are_missing():
+    """Test that slots without samples have no quantiles and no confidence."""
+    ts = _hourly(1)
+    baseline = compute_baseline("memory_percent", ts, np.full(len(ts), 50.0))
+    assert np.count_nonzero(baseline.counts) == 24
+    assert np.isnan(baseline.values).any(axis=1).sum() == HOURS_PER_WEEK - 24
+    slot = baseline.slot(ts[0])
+    assert slot["quantiles"]["p50"] == 50.0 and slot["confidence"] == pytest.approx(1 / 24, abs=0.01)
+
+
+def test_rolling_and_seasonal_anomalies():
+    """Test that spikes are flagged and grouped into episodes."""
+    rng = np.random.default_rng(1)
+    values = 20 + rng.uniform(-1, 1, 500)
+    values[300:303] = 95.0
+    ts = time.time() - 500 * 5 + np.arange(500) * 5.0
+
+    z = rolling_robust_z(values, 60)
+    assert np.isnan(z[:60]).all() and z[300] > 10
+
+    result = detect_anomalies(ts, values)
+    assert [(e["samples"], e["direction"]) for e in result["episodes"]] == [(3, "high")]
+    assert not result["current"]["anomalous"]
+
+    # A level that is normal recently but not for this hour of the week
+    history = time.time() - 28 * 86400 + np.arange(28 * 288) * 300.0
+    baseline = compute_baseline("cpu_percent", history, 5.0 + rng.normal(0, 1, len(history)))
+    steady = np.full(200, 60.0) + rng.normal(0, 0.5, 200)
+    result = detect_anomalies(ts[-200:], steady, baseline)
+    assert result["current"]["anomalous"]
+    assert result["current"]["seasonal_z"] > 3.5
+    assert result["episodes"][0]["method"] == "seasonal"
+
+
+def test_linear_forecast_time_to_threshold():
+    """Test that a steady trend gives the expected crossing time."""
+    ts = _hourly(30)
+    values = 50 + np.arange(len(ts)) / 24.0  # one percent a day
+    result = forecast_threshold(ts, values, 90.0, step_seconds=3600)
+    assert result["model"] == "linear"
+    assert result["trend_per_day"] == pytest.approx(1.0, abs=0.01)
+    assert result["time_to_threshold_days"] == pytest.approx(90 - values[-1], abs=0.5)
+    assert result["confidence"] > 0.9
+
+    falling = forecast_threshold(ts, values[::-1], 90.0, step_seconds=3600)
+    assert falling["time_to_threshold_days"] is None
+    assert forecast_threshold(ts[:2], values[:2], 90.0, 3600)["model"] is None
+
+
+def test_holt_winters_seasonal_forecast():
+    """Test that a daily cycle on a trend is fitted by Holt-Winters."""
+    rng = np.random.default_rng(2)
+    n = 21 * 24
+    hours = np.arange(n)
+    values = 40 + hours * 0.02 + 10 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 0.3, n)
+
+    model = fit_holt_winters(values, 24)
+    assert model is not None and model["trend"] > 0
+    assert fit_holt_winters(values[:40], 24) is None
+
+    result = forecast_threshold(_hourly(21), values, 90.0, step_seconds=3600)
+    assert result["model"] == "holt_winters"
+    # Peaks reach 90 before the trend line does
+    assert result["time_to_threshold_days"] < (90 - 40 - n * 0.02) / 0.48
+    low, high = result["time_to_threshold_range_days"]
+    assert low <= result["time_to_threshold_days"]
+
+    # Holt-Winters is not fitted across a gap in the history
+    keep = np.ones(n, dtype=bool)
+    keep[n - 40:n - 30] = False
+    gapped = forecast_threshold(_hourly(21)[keep], values[keep], 90.0, step_seconds=3600)
+    assert gapped["model"] == "linear"
+
+
+def test_series_arrays_from_store(tmp_path):
+    """Test reading raw samples and rollup averages as arrays."""
+    store = TimeSeriesStore(tmp_path, capacity=1000)
+    base = 1_700_000_000.0
+    for i in range(120):
+        store.append("cpu_percent", float(i % 2) * 10, timestamp=base + i * 5)
+
+    ts, values = series_arrays(store, "cpu_percent")
+    assert len(ts) == 120 and values[:2].tolist() == [0.0, 10.0]
+    ts, values = series_arrays(store, "cpu_percent", resolution="1m")
+    assert np.allclose(values[:-1], 5.0)
+    assert len(series_arrays(store, "missing")[0]) == 0
+    store.close()
@@ -0,0 +1,30 @@
+"""
+Tests for the shared metrics sampler.
+"""
+
+import time
+
+from sysagent.utils.metrics_sampler import MetricsSampler
+
+
+def test_sampler_serves_snapshots_without_blocking():
+    """Test that snapshots come from the background thread and are cached."""
+    sampler = MetricsSampler(interval=0.05, history_size=5)
+    sampler.start()
+    try:
+        first = sampler.latest()
+        assert 0.0 <= first.cpu_percent <= 100.0
+        assert first.memory.total > 0
+        
+        start = time.perf_counter()
+        sampler.latest()
+        assert time.perf_counter() - start < 0.05
+        
+        time.sleep(0.3)
+        history = sampler.history()
+        assert 2 <= len(history) <= 5
+        assert history[-1].timestamp > first.timestamp
+        assert "net_sent_bytes_per_sec" in history[-1].to_dict()
+    finally:
+        sampler.stop()
+    assert not sampler.running
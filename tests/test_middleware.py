@@ -0,0 +1,69 @@
+"""
+Tests for middleware state snapshots.
+"""
+
+import copy
+import random
+import tempfile
+
+from sysagent.core.middleware import HumanInTheLoopMiddleware
+
+
+def _conversation_steps(rng, count):
+    """Yield message lists that grow, slide, get rewritten and repeat."""
+    system = {"role": "system", "content": "You are helpful."}
+    history = []
+    for i in range(count):
+        action = rng.random()
+        if action < 0.6:
+            for _ in range(rng.randint(0, 3)):
+                history.append({"role": rng.choice(["user", "assistant"]), "content": rng.choice(["ok", f"m{i}"])})
+        elif action < 0.8 and history:
+            history.pop(rng.randrange(len(history)))
+        elif history:
+            history[rng.randrange(len(history))] = {"role": "user", "content": f"edited {i}"}
+        window = history[-8:]
+        yield [system] + window if rng.random() < 0.7 else list(window)
+
+
+def test_snapshots_match_full_copies():
+    """Test that delta snapshots rebuild the same states as full copies."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for spill_dir in (None, temp_dir):
+            middleware = HumanInTheLoopMiddleware(snapshot_dir=spill_dir)
+            middleware._max_history_size = 10
+            expected = []
+            for messages in _conversation_steps(rng, 300):
+                middleware._current_step += 1
+                snapshot = middleware.save_state(messages, pending_action={"tool": "x"})
+                expected.append((snapshot.id, snapshot.step_number, copy.deepcopy(messages)))
+                messages.append({"role": "user", "content": "not saved"})
+                assert snapshot.messages == expected[-1][2]
+
+                if rng.random() < 0.05:
+                    back = rng.randint(1, 5)
+                    rolled = middleware.rollback_steps(back)
+                    if rolled is not None:
+                        index = [e[0] for e in expected].index(rolled.id)
+                        del expected[index + 1:]
+                        assert rolled.messages == expected[-1][2]
+
+            history = middleware.get_state_history()
+            assert 0 < len(history) <= 10
+            for snapshot, (snapshot_id, step, messages) in zip(history, expected[-len(history):]):
+                assert (snapshot.id, snapshot.step_number, snapshot.messages) == (snapshot_id, step, messages)
+                assert middleware.get_state_at(step).messages == messages
+
+            oldest = expected[0]
+            if spill_dir:
+                # Trimmed snapshots are still reachable from the spill files
+                assert middleware.get_state_at(oldest[1]).messages == oldest[2]
+                assert middleware.rollback_to(oldest[0]).messages == oldest[2]
+                assert [s.id for s in middleware.get_state_history()] == [oldest[0]]
+                middleware._current_step += 1
+                snapshot = middleware.save_state(oldest[2] + [{"role": "user", "content": "again"}])
+                assert snapshot.messages[:-1] == oldest[2]
+            else:
+                assert middleware.get_state_at(oldest[1]) is None
+                assert middleware.rollback_to(oldest[0]) is None
@@ -0,0 +1,90 @@
+"""
+Tests for the concurrent port scanner.
+"""
+
+import socket
+
+import pytest
+
+from sysagent.tools.network_tool import NetworkTool
+from sysagent.utils.port_scanner import PortScanner, expand_hosts, parse_ports
+
+
+def _listeners(count):
+    sockets = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(16)
+        sockets.append(sock)
+    return sockets
+
+
+def _free_ports(count):
+    """Ports that were just free, so connects to them are refused."""
+    sockets = _listeners(count)
+    ports = [s.getsockname()[1] for s in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def test_parse_ports_and_hosts():
+    """Test port ranges and CIDR expansion."""
+    assert parse_ports("22, 80,8000-8002,80") == [22, 80, 8000, 8001, 8002]
+    assert parse_ports(None)[:2] == [21, 22]
+    with pytest.raises(ValueError):
+        parse_ports("0-2")
+    assert expand_hosts("192.168.1.0/30,example.com") == ["192.168.1.1", "192.168.1.2", "example.com"]
+    with pytest.raises(ValueError):
+        expand_hosts("10.0.0.0/8", max_hosts=1024)
+
+
+def test_scan_streams_open_and_closed_ports():
+    """Test that a concurrent scan finds listeners and streams every result."""
+    listeners = _listeners(5)
+    try:
+        open_ports = sorted(s.getsockname()[1] for s in listeners)
+        closed_ports = _free_ports(20)
+        seen = []
+        scanner = PortScanner(timeout=2, concurrency=50)
+        summary = scanner.scan(["127.0.0.1", "no-such-host.invalid"], open_ports + closed_ports, seen.append)
+
+        assert summary.ports("127.0.0.1", "open") == open_ports
+        assert summary.ports("127.0.0.1", "closed") == sorted(closed_ports)
+        assert summary.unresolved == ["no-such-host.invalid"]
+        assert summary.count("127.0.0.1", "closed") == len(closed_ports)
+        assert len(seen) == 25
+        assert all(r.rtt_ms is not None for r in seen)
+
+        streamed = list(scanner.iter_scan(["127.0.0.1"], open_ports))
+        assert sorted(r.port for r in streamed if r.state == "open") == open_ports
+
+        result = NetworkTool()._scan_ports("127.0.0.1", ",".join(map(str, open_ports + closed_ports)), timeout=2)
+        assert result.success
+        assert result.data["open_ports"] == open_ports
+        assert result.data["closed_count"] == 20
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_multi_host_scans_count_closed_ports():
+    """Test that multi-host scans keep open ports but only count closed ones."""
+    listeners = _listeners(2)
+    try:
+        open_ports = sorted(sock.getsockname()[1] for sock in listeners)
+        closed_ports = _free_ports(10)
+        seen = []
+        scanner = PortScanner(timeout=2, concurrency=20)
+        summary = scanner.scan(["127.0.0.1", "127.0.0.2"], open_ports + closed_ports, seen.append)
+
+        assert len(seen) == 24
+        assert summary.ports("127.0.0.1", "open") == open_ports
+        assert summary.ports("127.0.0.1", "closed") == []
+        assert summary.count("127.0.0.1", "closed") == len(closed_ports)
+        assert summary.count("127.0.0.2", "closed") == len(open_ports) + len(closed_ports)
+        assert all(r.state != "closed" for results in summary.hosts.values() for r in results)
+    finally:
+        for sock in listeners:
+            sock.close()
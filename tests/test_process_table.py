@@ -0,0 +1,37 @@
+"""
+Tests for the incremental process table.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+from sysagent.utils.process_table import ProcessTable
+
+
+def test_incremental_refresh_and_indexes():
+    """Test that new and exited processes are picked up and indexed."""
+    table = ProcessTable(max_age=0)
+    me = table.get(os.getpid())
+    assert me is not None
+    assert me.pid in [e.pid for e in table.find_by_name(me.name)]
+    
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", "sysagent-marker"])
+    try:
+        # Wait for the child to exec so its command line is final
+        while "sysagent-marker" not in psutil.Process(child.pid).cmdline():
+            time.sleep(0.01)
+        assert child.pid in [e.pid for e in table.children(os.getpid())]
+        assert [e.pid for e in table.search("sysagent-marker")] == [child.pid]
+        tree = table.tree(os.getpid())
+        assert child.pid in [c["pid"] for c in tree["children"]]
+    finally:
+        child.kill()
+        child.wait()
+    
+    assert table.get(child.pid) is None
+    assert table.search("sysagent-marker") == []
+    assert all(e.cpu_percent >= 0 for e in table.processes(sample=True))
@@ -0,0 +1,84 @@
+"""
+Tests for append-only session storage.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from sysagent.core.session_manager import SessionManager
+
+
+def test_append_log_search_and_compaction():
+    """Test that messages are appended, searchable, and survive a reopen."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = Path(temp_dir)
+        sm = SessionManager(storage, compact_threshold=4)
+        session = sm.create_session()
+        sm.add_message("user", "How do I free disk space?")
+        for i in range(20):
+            sm.add_message("assistant", f"Step {i}: remove the Flatpak cache")
+
+        log_file = storage / f"{session.id}.jsonl"
+        assert len(log_file.read_text().splitlines()) == 22
+
+        assert [s["id"] for s in sm.list_sessions(search="flatpak CACHE")] == [session.id]
+        assert [s["id"] for s in sm.list_sessions(search="p 7")] == [session.id]
+        assert sm.list_sessions(search="docker") == []
+
+        # Header-only saves are superseded records; they trigger compaction
+        for _ in range(25):
+            sm.save_session()
+        assert len(log_file.read_text().splitlines()) < 30
+
+        other = SessionManager(storage)
+        assert other.sessions_index[session.id]["message_count"] == 21
+        loaded = other.load_session(session.id)
+        assert loaded.title == "How do I free disk space?"
+        assert [m.content for m in loaded.messages] == [m.content for m in session.messages]
+
+        # Changes made through one manager show up in another
+        other.add_message("user", "and the docker images?")
+        assert [s["id"] for s in sm.list_sessions(search="docker")] == [session.id]
+
+        other.clear_current_session()
+        assert len(log_file.read_text().splitlines()) == 1
+        assert other.list_sessions(search="flatpak") == []
+
+        assert sm.delete_session(session.id)
+        assert not log_file.exists()
+        assert not sm.delete_session(session.id)
+        sm.close()
+        other.close()
+
+
+def test_legacy_sessions_are_migrated():
+    """Test that index.json and per-session JSON files are imported."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage = Path(temp_dir)
+        legacy = {
+            "id": "abc12345",
+            "title": "Old session",
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+            "messages": [
+                {"role": "user", "content": "check nginx logs", "timestamp": "2024-01-01T00:00:00"}
+            ],
+            "metadata": {}
+        }
+        (storage / "abc12345.json").write_text(json.dumps(legacy))
+        (storage / "index.json").write_text(json.dumps({
+            "abc12345": {"id": "abc12345", "title": "Old session", "created_at": legacy["created_at"],
+                         "updated_at": legacy["updated_at"], "message_count": 1, "preview": "check nginx logs"}
+        }))
+
+        sm = SessionManager(storage)
+        assert not (storage / "index.json").exists()
+        assert [s["id"] for s in sm.list_sessions(search="NGINX")] == ["abc12345"]
+
+        session = sm.load_session("abc12345")
+        assert session.messages[0].content == "check nginx logs"
+        sm.add_message("assistant", "done")
+        assert not (storage / "abc12345.json").exists()
+        assert len((storage / "abc12345.jsonl").read_text().splitlines()) == 3
+        sm.close()
@@ -0,0 +1,73 @@
+"""
+Tests for learning system persistence.
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sysagent.core.smart_learning import SmartLearningSystem
+
+
+def test_dirty_stores_are_flushed_in_batches():
+    """Test that only changed stores are written, after the flush delay."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(temp_dir)
+        learning = SmartLearningSystem(data_dir, flush_delay=0.2)
+        for i in range(5):
+            learning.record_command(f"check disk {i}")
+        assert not (data_dir / "history.json").exists()
+
+        deadline = time.time() + 5
+        # One flush writes several stores, one file at a time
+        while not all((data_dir / name).exists() for name in ("history.json", "commands.json")) \
+                and time.time() < deadline:
+            time.sleep(0.05)
+        assert len(json.loads((data_dir / "history.json").read_text())) == 5
+        assert (data_dir / "commands.json").exists()
+        assert not (data_dir / "shortcuts.json").exists()
+        assert not (data_dir / "patterns.json").exists()
+
+        learning.add_shortcut("du", "disk usage")
+        learning.close()
+        assert json.loads((data_dir / "shortcuts.json").read_text())["du"]["command"] == "disk usage"
+        assert not list(data_dir.glob("*.tmp"))
+
+        # Changes after shutdown are written through
+        learning.save_snippet("logs", "journalctl -f")
+        assert len(json.loads((data_dir / "snippets.json").read_text())) == 1
+
+        reloaded = SmartLearningSystem(data_dir)
+        assert len(reloaded.command_history) == 5
+        assert reloaded.get_shortcut("du") == "disk usage"
+        reloaded.close()
+
+
+def test_suggestions_rank_matches_and_followers():
+    """Test that indexed suggestions rank prefix matches and learned followers."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        learning = SmartLearningSystem(Path(temp_dir), flush_delay=60)
+        for i in range(200):
+            learning.record_command(f"list files {i}")
+        assert len(learning.get_suggestions(limit=5)) == 5
+
+        for _ in range(3):
+            learning.record_command("git status")
+            learning.record_command("git diff")
+        learning.record_command("git status")
+        learning.record_command("git log")
+        learning.record_command("show git branches", context="repo")
+
+        suggestions = learning.get_suggestions("git", limit=3)
+        assert [s["command"] for s in suggestions[:2]] == ["git status", "git diff"]
+        assert suggestions[0]["score"] >= suggestions[1]["score"] >= suggestions[2]["score"]
+
+        # Substring and context matches are found outside the prefix range
+        commands = [s["command"] for s in learning.get_suggestions("branches", limit=1)]
+        assert commands == ["show git branches"]
+        assert learning.get_suggestions(context="repo", limit=1)[0]["command"] == "show git branches"
+
+        assert learning.get_next_command_suggestions("git status", limit=2) == ["git diff", "git log"]
+        assert learning.get_next_command_suggestions("unknown") == []
+        learning.close()
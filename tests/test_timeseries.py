@@ -0,0 +1,78 @@
+"""
+Tests for the ring-buffer time-series store.
+"""
+
+import multiprocessing
+import tempfile
+
+import pytest
+
+from sysagent.utils import timeseries
+from sysagent.utils.timeseries import TimeSeriesStore
+
+
+T0 = 1_700_000_000.0
+
+
+def test_ring_range_queries_and_rollups():
+    """Test wraparound, range queries, rollups and reopening from disk."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir, capacity=100)
+        for i in range(250):
+            store.append("cpu_percent", i, T0 + i * 5, "%", "cpu")
+        
+        samples = store.query("cpu_percent")
+        assert len(samples) == 100
+        assert samples[0] == {"timestamp": T0 + 750, "value": 150.0}
+        
+        window = store.query("cpu_percent", start=T0 + 1000, end=T0 + 1020)
+        assert [s["value"] for s in window] == [200.0, 201.0, 202.0, 203.0]
+        
+        # Array reads copy across the wraparound point in one go
+        ts, values = store.arrays("cpu_percent", start=T0 + 990)
+        assert list(values) == [float(v) for v in range(198, 250)]
+        assert ts[0] == T0 + 990 and ts[-1] == T0 + 1245
+        assert list(store.arrays("cpu_percent")[1]) == [s["value"] for s in samples]
+        assert [list(c) for c in store.arrays("missing", resolution="1h")] == [[]] * 5
+        
+        # Rollups cover samples that were overwritten in the raw ring
+        buckets = store.query("cpu_percent", resolution="1h")
+        assert sum(b["count"] for b in buckets) == 250
+        assert min(b["min"] for b in buckets) == 0.0
+        assert max(b["max"] for b in buckets) == 249.0
+        store.close()
+        
+        store = TimeSeriesStore(temp_dir, capacity=100)
+        assert store.latest("cpu_percent") == (T0 + 1245, 249.0)
+        assert store.info("cpu_percent") == {"unit": "%", "category": "cpu"}
+        store.close()
+
+
+def _append_from_process(directory, offset):
+    store = TimeSeriesStore(directory, capacity=5000)
+    for i in range(500):
+        store.append_many({"cpu_percent": 1.0, f"worker_{offset}": 1.0}, T0 + offset + i)
+    store.close()
+
+
+@pytest.mark.skipif(timeseries.fcntl is None, reason="needs fcntl")
+def test_processes_share_a_store():
+    """Test that appends from several processes are all kept."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = TimeSeriesStore(temp_dir, capacity=5000)
+        store.append("cpu_percent", 1.0, T0)
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_append_from_process, args=(temp_dir, n)) for n in (1, 2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert [w.exitcode for w in workers] == [0, 0]
+
+        # The store opened before the other processes wrote sees their rows
+        assert len(store.query("cpu_percent")) == 1001
+        assert sum(b["count"] for b in store.query("cpu_percent", resolution="1m")) == 1001
+        assert sorted(store.names()) == ["cpu_percent", "worker_1", "worker_2"]
+        assert len(store.query("worker_2")) == 500
+        store.close()